@@ -0,0 +1,119 @@
+"""
+Geometry and CAM benchmarks.
+
+    python -m benchmarks run                     # saved to benchmarks/results
+    python -m benchmarks run -k korry --save baseline.json
+    python -m benchmarks compare baseline.json   # against the latest run
+    python -m benchmarks compare old.json new.json --threshold 0.2
+
+The geometry caches are disabled while running so builders are measured
+cold; pass --cached to measure cache hits instead.
+"""
+import argparse
+import glob
+import os
+import sys
+
+from benchmarks import harness
+
+
+def print_stats(name, stats):
+    if stats.error:
+        print(f"{name:<40} FAILED")
+        print("    " + stats.error.strip().replace("\n", "\n    "))
+        return
+    print(
+        f"{name:<40} {stats.median * 1000:10.2f} {stats.min * 1000:10.2f} "
+        f"{stats.stddev * 1000:9.2f} {stats.rounds:6d}"
+    )
+
+
+def latest_result():
+    runs = sorted(glob.glob(os.path.join(harness.results_path, "*.json")))
+    if not runs:
+        sys.exit("No saved benchmark runs, use `python -m benchmarks run` first")
+    return max(runs, key=os.path.getmtime)
+
+
+def run(args):
+    if not args.cached:
+        from cad.cache import geometry_cache
+        from cad.cache.mesh import mesh_cache
+        from cad.fonts.glyphs import glyph_cache
+
+        geometry_cache.enabled = False
+        glyph_cache.enabled = False
+        mesh_cache.enabled = False
+
+    harness.load_suites(args.suite)
+    print(
+        f"{'benchmark':<40} {'median ms':>10} {'min ms':>10} "
+        f"{'stddev':>9} {'rounds':>6}"
+    )
+    result = harness.run(args.filter, args.rounds, on_result=print_stats)
+    path = args.save or os.path.join(
+        harness.results_path, result.started.replace(":", "-") + ".json"
+    )
+    result.save(path)
+    print(f"Saved to {os.path.relpath(path)}")
+    return 1 if any(s.error for s in result.benchmarks.values()) else 0
+
+
+def compare(args):
+    baseline = harness.Run.load(args.baseline)
+    current = harness.Run.load(args.current or latest_result())
+    for library, version in current.versions.items():
+        if baseline.versions.get(library) != version:
+            print(f"{library}: {baseline.versions.get(library)} -> {version}")
+
+    print(f"{'benchmark':<40} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    regressions = 0
+    for comparison in harness.compare(baseline, current, args.metric):
+        if comparison.change is None:
+            # Missing or failed on one side
+            before, after = (
+                "-" if value is None else f"{value * 1000:.2f}"
+                for value in (comparison.baseline, comparison.current)
+            )
+            print(f"{comparison.name:<40} {before:>12} {after:>12}")
+            continue
+        flag = ""
+        if comparison.regressed(args.threshold):
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{comparison.name:<40} {comparison.baseline * 1000:12.2f} "
+            f"{comparison.current * 1000:12.2f} {comparison.change:+8.1%}{flag}"
+        )
+    if regressions:
+        print(f"{regressions} benchmark(s) slower than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("-k", "--filter", help="only names containing this")
+    run_parser.add_argument("--rounds", type=int, default=None)
+    run_parser.add_argument("--suite", action="append", help="e.g. benchmarks.cam")
+    run_parser.add_argument("--save", help="result file, default timestamped")
+    run_parser.add_argument("--cached", action="store_true")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    compare_parser.add_argument(
+        "--metric", choices=["median", "min", "mean"], default="median"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
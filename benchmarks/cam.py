@@ -0,0 +1,80 @@
+"""
+CAM generation: job setup, profile and pocket operations and G-code
+post-processing for the Korry parts and the autobrake diffusers.
+"""
+from benchmarks.harness import benchmark
+from cad.common.buttons.korry.korry import KorrySwitch
+
+korry = KorrySwitch(19.5, 19.5)
+
+
+def _endmill():
+    from ocp_freecad_cam import Endmill
+
+    return Endmill(diameter=1)
+
+
+def _sleeve_job():
+    from ocp_freecad_cam import Job
+
+    sleeve = korry.sleeve(4).part
+    faces = sleeve.faces().group_by()
+    endmill = _endmill()
+    return (
+        Job(faces[0][0], sleeve, "grbl")
+        .profile(faces[1], endmill)
+        .profile(faces[-1][0], endmill, holes=True)
+    )
+
+
+def _diffuser_job():
+    from ocp_freecad_cam import Job
+
+    diffuser = korry.diffuser().part
+    faces = diffuser.faces().group_by()
+    endmill = _endmill()
+    return (
+        Job(faces[0][0], diffuser, "grbl")
+        .pocket(faces[1], endmill, pattern="offset")
+        .profile(faces[-1], endmill)
+    )
+
+
+@benchmark(rounds=3)
+def sleeve_profile():
+    _sleeve_job()
+
+
+@benchmark(rounds=3)
+def diffuser_pocket_profile():
+    _diffuser_job()
+
+
+@benchmark(setup=lambda: (_sleeve_job(),), rounds=3)
+def sleeve_to_gcode(job):
+    job.to_gcode()
+
+
+@benchmark(setup=lambda: (_diffuser_job(),), rounds=3)
+def diffuser_to_gcode(job):
+    job.to_gcode()
+
+
+@benchmark(rounds=3)
+def regress_catalogue():
+    # fastcam regeneration and semantic diff of every committed program
+    from cad.nc.regress import check_all
+
+    check_all("fast", max_workers=1)
+
+
+@benchmark(rounds=3)
+def grbl_stream():
+    # Character counting sender against the pty controller, instant execution
+    import asyncio
+    import os
+
+    from cad.nc.analyze import default_paths
+    from cad.nc.grbl import simulate
+
+    asyncio.run(simulate(os.path.join(default_paths[1], "front.ngc")))
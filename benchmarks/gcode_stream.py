@@ -0,0 +1,82 @@
+"""
+Peak memory and time of the streaming G-code writer versus the previous
+split/slice/join implementation of save_gcode.
+
+    python -m benchmarks.gcode_stream --repeat 200
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+import tracemalloc
+
+from cad.nc import drop_header, gcode_lines, write_gcode
+
+_nc_path = os.path.join(os.path.dirname(__file__), os.pardir, "cad", "nc")
+
+
+class ProgramJob:
+    """Stands in for a Job, to_gcode() returns a fixed program"""
+
+    def __init__(self, gcode):
+        self.gcode = gcode
+
+    def to_gcode(self):
+        return self.gcode
+
+
+def synthetic_program(repeat):
+    programs = []
+    for path in sorted(glob.glob(os.path.join(_nc_path, "*", "*.nc"))):
+        with open(path) as f:
+            programs.append(f.read())
+    return "\n".join(programs * repeat)
+
+
+def materialized(job, full_path):
+    with open(full_path, "w") as f:
+        gcode_lines = job.to_gcode().split("\n")
+        gcode = "\n".join(gcode_lines[:1] + gcode_lines[3:])
+        f.write(gcode)
+
+
+def streaming(job, full_path):
+    write_gcode(drop_header(gcode_lines(job)), full_path)
+
+
+def measure(writer, job, full_path):
+    start = time.perf_counter()
+    writer(job, full_path)
+    seconds = time.perf_counter() - start
+
+    # Measured separately, tracing allocations slows down the writers
+    tracemalloc.start()
+    writer(job, full_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    job = ProgramJob(synthetic_program(args.repeat))
+    lines = job.gcode.count("\n") + 1
+    print(f"program: {len(job.gcode) / 2**20:.1f} MiB, {lines} lines")
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {}
+        for writer in (materialized, streaming):
+            full_path = os.path.join(tmp, writer.__name__ + ".nc")
+            seconds, peak = measure(writer, job, full_path)
+            with open(full_path) as f:
+                outputs[writer.__name__] = f.read()
+            peak_mib = peak / 2**20
+            print(f"{writer.__name__:<14} {seconds:7.3f}s  peak {peak_mib:8.2f} MiB")
+        assert outputs["materialized"] == outputs["streaming"], "outputs differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Geometry construction: every KorrySwitch builder, the full assembly, the
+autobrake diffuser grid, the face selections used by the CAM scripts, DXF
+and glTF export.
+"""
+import itertools
+import os
+import tempfile
+from functools import lru_cache
+
+from benchmarks.harness import benchmark
+from cad.common.buttons.korry.korry import KorrySwitch
+from cad.common.mesh import export_gltf
+from cad.common.topology import TopologyIndex
+from cad.dxf import save_dxf
+
+korry = KorrySwitch(19.5, 19.5)
+
+
+@benchmark()
+def sleeve():
+    korry.sleeve(4)
+
+
+@benchmark()
+def sleeve_no_ledges():
+    korry.sleeve(4, left_ledge=False, right_ledge=False)
+
+
+@benchmark()
+def slider():
+    korry.slider(3)
+
+
+@benchmark()
+def cover():
+    korry.cover()
+
+
+@benchmark()
+def diffuser_blank():
+    korry.diffuser()
+
+
+@benchmark()
+def diffuser_legend():
+    korry.diffuser(text="DECEL", frame=True)
+
+
+@benchmark()
+def diffuser_triangle():
+    korry.diffuser(triangle=True)
+
+
+@benchmark()
+def pcb():
+    korry.pcb()
+
+
+@benchmark()
+def connector():
+    korry.connector()
+
+
+@benchmark(rounds=3)
+def assembly():
+    korry.assembly("FAULT", "ON")
+
+
+def _autobrake_panel():
+    from cad.glareshield.autobrake.panel.autobrake import Autobrake
+
+    panel = Autobrake().panel()
+    panel.part
+    return (panel, itertools.cycle(["LO", "MED", "MAX"]))
+
+
+@benchmark(setup=_autobrake_panel, rounds=3)
+def panel_legend_edit(panel, legends):
+    # Rebuilds one diffuser and re-places the other 17 parts
+    panel.find("med/diffuser_upper").update(text=next(legends))
+    return panel.part
+
+
+@benchmark(rounds=3)
+def autobrake_diffusers():
+    from cad.glareshield.autobrake.panel.autobrake import Autobrake
+
+    Autobrake().diffusers()
+
+
+@benchmark(setup=lambda: (korry.sleeve(4).part,), rounds=20)
+def sleeve_group_by(part):
+    # Face selection of cam_sleeve
+    faces = part.faces().group_by()
+    return faces[-1][0], faces[0][0], faces[1]
+
+
+@benchmark(setup=lambda: (korry.slider(3).part,), rounds=20)
+def slider_group_by(part):
+    # Face selection of cam_slider
+    faces = part.faces().group_by()
+    return faces[-1][0], faces[0][0], faces[-2]
+
+
+@benchmark(setup=lambda: (korry.sleeve(4).part,), rounds=20)
+def sleeve_topology_index(part):
+    faces = TopologyIndex(part)
+    return faces.top(), faces.bottom(), faces.level(1)
+
+
+@benchmark(setup=lambda: (korry.slider(3).part,), rounds=20)
+def slider_topology_index(part):
+    faces = TopologyIndex(part)
+    return faces.top(), faces.bottom(), faces.level(-2)
+
+
+@lru_cache(maxsize=None)
+def _panel():
+    from cad.glareshield.autobrake.panel.autobrake import Autobrake
+
+    return Autobrake().diffusers()
+
+
+@benchmark(setup=lambda: (_panel(),), rounds=5)
+def panel_group_by(panel):
+    # Face selection of cnc_diffusers on the 15 diffuser compound
+    top = panel.faces().group_by()[-1]
+    return panel.faces().sort_by()[0], panel.faces().group_by()[1], top
+
+
+@benchmark(setup=lambda: (_panel(),), rounds=5)
+def panel_topology_index(panel):
+    faces = TopologyIndex(panel)
+    return faces.bottom(), faces.level(1), faces.level(-1)
+
+
+def _bottom_face():
+    return (korry.slider(3).part.faces().sort_by()[0],)
+
+
+@benchmark(setup=_bottom_face, rounds=10)
+def slider_dxf(face):
+    with tempfile.TemporaryDirectory() as tmp:
+        save_dxf(face, os.path.join(tmp, "slider"))
+
+
+def _artefact_index():
+    from cad.cache.index import ArtefactIndex
+    from cad.common.buttons.korry.korry_batch import LEDGES
+
+    index = ArtefactIndex(":memory:")
+    for i, (left, right) in itertools.product(range(250), LEDGES):
+        index.record(
+            "gcode",
+            "korry/sleeve",
+            f"korry/sleeve_{i}_{left}_{right}.nc",
+            parameters=dict(
+                part=KorrySwitch(19 + i / 250, 19.5),
+                sleeve=dict(stock_thickness=4, left_ledge=left, right_ledge=right),
+            ),
+        )
+    return (index,)
+
+
+@benchmark(setup=_artefact_index, rounds=10)
+def artefact_index_find(index):
+    # 1000 sleeve programs, 250 of them in range without a left ledge
+    return index.find(
+        "gcode", "korry/sleeve", width=(19.5, 20), left_ledge=False, existing=False
+    )
+
+
+@benchmark(setup=lambda: (korry.assembly("FAULT", "ON"),), rounds=5)
+def assembly_gltf(shape):
+    with tempfile.TemporaryDirectory() as tmp:
+        export_gltf(shape, os.path.join(tmp, "assembly.glb"))
+
+
+@benchmark(setup=lambda: (_panel(),), rounds=5)
+def panel_gltf(panel):
+    # 15 diffusers sharing 5 meshes
+    with tempfile.TemporaryDirectory() as tmp:
+        export_gltf(panel, os.path.join(tmp, "panel.glb"))
+
+
+def _switch_panel():
+    from cad.common.clearance import korry_panel
+
+    panel = korry_panel(19.5, 19.5, columns=3, rows=2)
+    for key in panel.keys():
+        panel.prototype(key)
+    return (panel,)
+
+
+@benchmark(setup=_switch_panel, rounds=3)
+def panel_clearance(panel):
+    from cad.common.clearance import check_clearance
+
+    return check_clearance(panel, clearance=0.05)
+
+
+def _overlay():
+    from cad.dxf.drawing import korry_overlay
+
+    drawing = korry_overlay()
+    drawing.shapes()
+    return (drawing,)
+
+
+@benchmark(setup=_overlay, rounds=10)
+def overlay_dxf(drawing):
+    # 45 placements of 6 footprints as block references
+    with tempfile.TemporaryDirectory() as tmp:
+        drawing.write_dxf(os.path.join(tmp, "overlay.dxf"))
+
+
+@benchmark(setup=_overlay, rounds=10)
+def overlay_svg(drawing):
+    with tempfile.TemporaryDirectory() as tmp:
+        drawing.write_svg(os.path.join(tmp, "overlay.svg"))
+
+
+def _sleeve_program():
+    from cad.nc.simulate import verify
+
+    # Builds and tessellates the intended sleeve outside of the timing
+    verify("korry/sleeve_19.5x19.5x4_r1.5875")
+    return ("korry/sleeve_19.5x19.5x4_r1.5875",)
+
+
+@benchmark(setup=_sleeve_program, rounds=5)
+def simulate_sleeve(path):
+    from cad.nc.simulate import verify
+
+    return verify(path)
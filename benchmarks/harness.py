@@ -0,0 +1,176 @@
+"""
+Minimal benchmark runner in the spirit of pytest-benchmark: functions are
+registered with @benchmark, timed over a number of rounds after warmup and
+the statistics saved as JSON for later comparison.
+"""
+import importlib
+import json
+import os
+import platform
+import statistics
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from cad.cache.cache import _library_version
+
+results_path = os.path.join(os.path.dirname(__file__), "results")
+suites = ["benchmarks.imports", "benchmarks.geometry", "benchmarks.cam"]
+libraries = ["build123d", "cadquery-ocp", "ocp_freecad_cam", "numpy"]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable
+    setup: Optional[Callable] = None
+    rounds: int = 5
+    warmup: int = 1
+
+    def run(self, rounds=None):
+        times = []
+        for i in range(self.warmup + (rounds or self.rounds)):
+            args = self.setup() if self.setup else ()
+            start = time.perf_counter()
+            self.func(*args)
+            elapsed = time.perf_counter() - start
+            if i >= self.warmup:
+                times.append(elapsed)
+        return Stats.of(times)
+
+
+@dataclass
+class Stats:
+    rounds: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+    error: Optional[str] = None
+
+    @classmethod
+    def of(cls, times):
+        return cls(
+            rounds=len(times),
+            min=min(times),
+            max=max(times),
+            mean=statistics.mean(times),
+            median=statistics.median(times),
+            stddev=statistics.stdev(times) if len(times) > 1 else 0.0,
+        )
+
+    @classmethod
+    def failed(cls, error):
+        return cls(0, 0.0, 0.0, 0.0, 0.0, 0.0, error=error)
+
+
+registry = {}
+
+
+def benchmark(name=None, setup=None, rounds=5, warmup=1):
+    """
+    Register a function as a benchmark. setup, if given, is called before
+    every round outside the timed region and its return value is passed to
+    the function as arguments.
+    """
+
+    def decorator(func):
+        module = func.__module__.rsplit(".", 1)[-1]
+        key = f"{module}.{name or func.__name__}"
+        registry[key] = Benchmark(key, func, setup, rounds, warmup)
+        return func
+
+    return decorator
+
+
+def load_suites(names=None):
+    for name in names or suites:
+        importlib.import_module(name)
+
+
+@dataclass
+class Run:
+    started: str = field(default_factory=lambda: datetime.now().isoformat())
+    machine: dict = field(
+        default_factory=lambda: {
+            "node": platform.node(),
+            "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        }
+    )
+    versions: dict = field(
+        default_factory=lambda: {name: _library_version(name) for name in libraries}
+    )
+    benchmarks: dict = field(default_factory=dict)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def to_dict(self):
+        return {
+            "started": self.started,
+            "machine": self.machine,
+            "versions": self.versions,
+            "benchmarks": {k: vars(v) for k, v in self.benchmarks.items()},
+        }
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            started=data["started"],
+            machine=data["machine"],
+            versions=data["versions"],
+            benchmarks={k: Stats(**v) for k, v in data["benchmarks"].items()},
+        )
+
+
+def run(pattern=None, rounds=None, on_result=None) -> Run:
+    """Run every registered benchmark whose name contains pattern"""
+    result = Run()
+    for name, bench in sorted(registry.items()):
+        if pattern and pattern not in name:
+            continue
+        try:
+            stats = bench.run(rounds)
+        except Exception:
+            stats = Stats.failed(traceback.format_exc(limit=3))
+        result.benchmarks[name] = stats
+        if on_result:
+            on_result(name, stats)
+    return result
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+
+    @property
+    def change(self):
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+    def regressed(self, threshold):
+        return self.change is not None and self.change > threshold
+
+
+def compare(baseline: Run, current: Run, metric="median"):
+    names = sorted(set(baseline.benchmarks) | set(current.benchmarks))
+
+    def value(run, name):
+        stats = run.benchmarks.get(name)
+        if stats is None or stats.error:
+            return None
+        return getattr(stats, metric)
+
+    return [Comparison(n, value(baseline, n), value(current, n)) for n in names]
@@ -0,0 +1,61 @@
+"""
+Start-up cost of the entry layer. Each benchmark runs a fresh interpreter,
+and fails if a heavy geometry or CAM library got imported on the way.
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks.harness import benchmark
+
+_root = os.path.join(os.path.dirname(__file__), os.pardir)
+heavy_modules = ("build123d", "OCP", "ocp_freecad_cam", "cq_viewer", "FreeCAD")
+
+_check = (
+    "import sys; "
+    f"loaded = [m for m in {heavy_modules!r} if m in sys.modules]; "
+    "sys.exit(f'imported {loaded}' if loaded else 0)"
+)
+
+
+def python(*args):
+    result = subprocess.run(
+        [sys.executable, *args], cwd=_root, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+    return result.stdout
+
+
+def import_light(module):
+    python("-c", f"import {module}; {_check}")
+
+
+@benchmark(rounds=10)
+def interpreter():
+    python("-c", "pass")
+
+
+@benchmark(rounds=10)
+def import_cad():
+    import_light("cad")
+
+
+@benchmark(rounds=10)
+def import_catalogue():
+    import_light("cad.catalogue")
+
+
+@benchmark(rounds=10)
+def import_korry_cam():
+    import_light("cad.common.buttons.korry.korry_cam")
+
+
+@benchmark(rounds=10)
+def import_nc():
+    import_light("cad.nc")
+
+
+@benchmark(rounds=10)
+def list_catalogue():
+    python("-c", f"from cad.__main__ import main; main(['--list']); {_check}")
@@ -0,0 +1,102 @@
+"""
+List and run the parts and CAM jobs of the catalogue.
+
+    python -m cad --list
+    python -m cad --list --kind cam
+    python -m cad korry/sleeve --brep out/
+    python -m cad korry/assembly --mesh out/     # glTF binary, for viewers
+    python -m cad autobrake/cam/diffusers --force
+    python -m cad korry/diffuser --trace trace.json --trace-memory
+"""
+import argparse
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+from cad import tracing
+from cad.catalogue import catalogue, find
+
+
+def print_catalogue(recipes):
+    width = max((len(recipe.name) for recipe in recipes), default=0)
+    for recipe in recipes:
+        print(f"{recipe.name:<{width}}  {recipe.kind:<4}  {recipe.description}")
+
+
+def export(result, directory, name, extension=".brep"):
+    from build123d import export_brep
+
+    from cad.common.mesh import export_gltf
+
+    shape = getattr(result, "part", result)
+    path = os.path.join(directory, name.replace("/", "_") + extension)
+    os.makedirs(directory, exist_ok=True)
+    if extension == ".glb":
+        export_gltf(shape, path)
+    else:
+        export_brep(shape, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="recipe names or name fragments")
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--kind", choices=["part", "cam"])
+    parser.add_argument("--force", action="store_true", help="regenerate G-code")
+    parser.add_argument("--brep", metavar="DIR", help="export built parts as BREP")
+    parser.add_argument("--mesh", metavar="DIR", help="export built parts as .glb")
+    parser.add_argument(
+        "--trace", metavar="JSON", help="write a Chrome trace and print a summary"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="record peak memory per span"
+    )
+    args = parser.parse_args(argv)
+
+    if args.list or not args.names:
+        recipes = [r for name in args.names or [None] for r in find(name, args.kind)]
+        print_catalogue(recipes)
+        return 0
+
+    recipes = []
+    for name in args.names:
+        matches = [catalogue[name]] if name in catalogue else find(name, args.kind)
+        if not matches:
+            parser.error(f"no recipe matching {name}")
+        recipes += matches
+
+    if args.trace:
+        trace = tracing.session(args.trace, memory=args.trace_memory)
+    else:
+        trace = nullcontext()
+    failed = 0
+    with trace:
+        for recipe in recipes:
+            start = time.perf_counter()
+            overrides = dict(force=True) if args.force and recipe.kind == "cam" else {}
+            with tracing.span(recipe.name, "recipe"):
+                result = recipe.run(**overrides)
+                if recipe.kind == "part" and (args.brep or args.mesh):
+                    paths = []
+                    if args.brep:
+                        paths.append(export(result, args.brep, recipe.name))
+                    if args.mesh:
+                        paths.append(export(result, args.mesh, recipe.name, ".glb"))
+                    result = ", ".join(paths)
+            seconds = time.perf_counter() - start
+            # Batch variants report failures in a VariantResult
+            if getattr(result, "error", None):
+                failed += 1
+                print(f"{recipe.name}: FAILED ({seconds:.2f}s)\n{result.error}")
+                continue
+            result = getattr(result, "path", result)
+            print(f"{recipe.name}: {result} ({seconds:.2f}s)")
+    if args.trace:
+        print(tracing.format_summary())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
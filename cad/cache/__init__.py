@@ -0,0 +1,8 @@
+from .cache import (
+    GeometryCache,
+    cached_builder,
+    geometry_cache,
+    hash_inputs,
+    instance_state,
+    source_fingerprint,
+)
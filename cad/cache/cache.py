@@ -0,0 +1,288 @@
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+
+from cad.tracing import annotate
+
+_default_path = os.path.join(os.path.dirname(__file__), "store")
+
+
+def _library_version(name):
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def _file_digest(path: str) -> str:
+    # Keyed on the modification time and size, so long lived processes such
+    # as the worker see edits to the source files
+    stat = os.stat(path)
+    return _file_content_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_content_digest(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def source_fingerprint(*objects, files=()) -> str:
+    """
+    Fingerprint of the source files defining the given objects plus any extra
+    files (fonts etc.) and the installed build123d version. Any edit to the
+    code invalidates everything derived from it.
+    """
+    digest = hashlib.sha256()
+    # Decorated functions are fingerprinted by the module defining them
+    paths = [inspect.getsourcefile(inspect.unwrap(obj)) for obj in objects]
+    paths += list(files)
+    for path in paths:
+        digest.update(_file_digest(os.path.abspath(path)).encode())
+    digest.update(str(_library_version("build123d")).encode())
+    return digest.hexdigest()[:16]
+
+
+def _normalize(value):
+    if is_dataclass(value) and not isinstance(value, type):
+        return {"__type__": type(value).__qualname__, **instance_state(value)}
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, float):
+        return repr(value)
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    return repr(value)
+
+
+def instance_state(obj) -> dict:
+    """Dataclass fields plus plain class level constants (e.g. slider_tolerance)"""
+    state = {}
+    for klass in reversed(type(obj).__mro__):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and isinstance(value, (bool, int, float, str)):
+                state[name] = getattr(obj, name)
+    if is_dataclass(obj):
+        for field in fields(obj):
+            state[field.name] = getattr(obj, field.name)
+    return {k: _normalize(v) for k, v in sorted(state.items())}
+
+
+def hash_inputs(**inputs) -> str:
+    payload = json.dumps(_normalize(inputs), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class GeometryCache:
+    """
+    Two level cache for OCC shapes: an in-process LRU in front of a size
+    bounded directory of BREP files. Shapes handed out are shallow copies
+    sharing the cached TShape, so callers are free to move them.
+    """
+
+    def __init__(self, path=_default_path, max_entries=128, max_bytes=512 * 2**20):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key, suffix):
+        return os.path.join(self.path, key[:2], key + suffix)
+
+    def entry_path(self, key) -> str:
+        """BREP file the shape stored under key is kept in"""
+        return self._entry_path(key, ".brep")
+
+    def get(self, key):
+        with self._lock:
+            shape = self._memory.get(key)
+            if shape is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return copy.copy(shape)
+
+        shape = self._load(key)
+        with self._lock:
+            if shape is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, shape)
+        return copy.copy(shape)
+
+    def put(self, key, shape):
+        shape = copy.copy(shape)
+        with self._lock:
+            self._remember(key, shape)
+        self._store(key, shape)
+        self._evict()
+
+    def clear(self, disk=True):
+        with self._lock:
+            self._memory.clear()
+        if disk:
+            for path, _ in self._disk_entries():
+                self._remove(path)
+
+    def _remember(self, key, shape):
+        self._memory[key] = shape
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        from build123d import Color, import_brep
+
+        brep_path = self._entry_path(key, ".brep")
+        if not os.path.exists(brep_path):
+            return None
+        try:
+            shape = import_brep(brep_path)
+            with open(self._entry_path(key, ".json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self._remove(brep_path)
+            return None
+        if meta.get("color") is not None:
+            shape.color = Color(*meta["color"])
+        shape.label = meta.get("label", "")
+        os.utime(brep_path)
+        return shape
+
+    def _store(self, key, shape):
+        from build123d import export_brep
+
+        brep_path = self._entry_path(key, ".brep")
+        os.makedirs(os.path.dirname(brep_path), exist_ok=True)
+        color = shape.color.to_tuple() if shape.color is not None else None
+        meta = {"color": color, "label": shape.label}
+
+        # Write to temporary files first so a concurrent reader never sees
+        # a half written entry
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        export_brep(shape, brep_path + tmp_suffix)
+        meta_path = self._entry_path(key, ".json")
+        with open(meta_path + tmp_suffix, "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + tmp_suffix, meta_path)
+        os.replace(brep_path + tmp_suffix, brep_path)
+
+    def _disk_entries(self):
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(".brep"):
+                    path = os.path.join(root, name)
+                    try:
+                        entries.append((path, os.stat(path)))
+                    except FileNotFoundError:
+                        pass
+        return entries
+
+    def _evict(self):
+        entries = self._disk_entries()
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= stat.st_size
+
+    @staticmethod
+    def _remove(brep_path):
+        for path in (brep_path, brep_path[: -len(".brep")] + ".json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+geometry_cache = GeometryCache(
+    path=os.environ.get("A320_GEOMETRY_CACHE_DIR", _default_path)
+)
+geometry_cache.enabled = os.environ.get("A320_GEOMETRY_CACHE", "1") != "0"
+
+
+def _as_builder(part):
+    from build123d import BuildPart, add
+
+    with BuildPart() as builder:
+        add(part)
+    builder.part.color = part.color
+    builder.part.label = part.label
+    return builder
+
+
+def cached_builder(*dependencies, cache=None):
+    """
+    Decorator for part builder methods returning a BuildPart. The cache key
+    covers the instance state, the bound method arguments and a fingerprint
+    of the defining source file plus any extra dependency files. Parts built
+    on a miss are recorded in the artefact index under the method's name.
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+        namespace = method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            active_cache = cache or geometry_cache
+            if not active_cache.enabled:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop(next(iter(signature.parameters)))
+            key = hash_inputs(
+                namespace=namespace,
+                state=instance_state(self),
+                arguments=arguments,
+                code=source_fingerprint(method, files=dependencies),
+            )
+
+            part = active_cache.get(key)
+            if part is not None:
+                annotate(cache="hit")
+                return _as_builder(part)
+
+            annotate(cache="miss")
+            start = time.perf_counter()
+            builder = method(self, *args, **kwargs)
+            seconds = time.perf_counter() - start
+            active_cache.put(key, builder.part)
+            from cad.cache.index import artefact_index
+
+            artefact_index.record(
+                "part",
+                namespace,
+                active_cache.entry_path(key),
+                parameters=dict(state=instance_state(self), arguments=arguments),
+                input_hash=key,
+                seconds=seconds,
+            )
+            return builder
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,382 @@
+"""
+SQLite index of the artefacts the repository generates: G-code written by
+save_gcode, DXF files written by save_dxf and the parts stored by
+@cached_builder builders (KorrySwitch.sleeve, ...). Each record holds the
+full parameter set flattened to dotted names, the input hash, the tool,
+the build time and the size, so outputs are found by their parameters
+instead of by parsing file names or walking cad/nc and cad/dxf.
+
+    python -m cad.cache.index find --kind gcode --name "korry/sleeve" \\
+        width=19.5:20 left_ledge=false
+    python -m cad.cache.index prune
+
+    artefact_index.find("part", "KorrySwitch.sleeve", width=(19.5, 20))
+    geometry_cache.get(artefact.input_hash)     # the part, without rebuilding
+
+Parameters match on their full dotted name ("sleeve.left_ledge") or their
+last component ("left_ledge"). A (low, high) tuple is an inclusive range,
+None leaving a side open; names are matched as GLOB patterns.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from cad.cache.cache import _normalize
+
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_default_path = os.path.join(os.path.dirname(__file__), "artefacts.sqlite")
+kinds = ("gcode", "dxf", "part")
+
+_schema = """
+CREATE TABLE IF NOT EXISTS artefacts (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    input_hash TEXT,
+    tool TEXT,
+    seconds REAL,
+    size INTEGER,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artefacts_input_hash ON artefacts (input_hash);
+CREATE INDEX IF NOT EXISTS artefacts_kind_name ON artefacts (kind, name);
+CREATE TABLE IF NOT EXISTS parameters (
+    artefact INTEGER NOT NULL REFERENCES artefacts (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    leaf TEXT NOT NULL,
+    value REAL,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS parameters_leaf ON parameters (leaf, value);
+CREATE INDEX IF NOT EXISTS parameters_name ON parameters (name, value);
+CREATE INDEX IF NOT EXISTS parameters_artefact ON parameters (artefact);
+"""
+_columns = (
+    "a.id, a.kind, a.name, a.path, a.input_hash, a.tool, a.seconds, a.size, a.created"
+)
+
+
+def _flatten(value, prefix=""):
+    """(dotted name, value) pairs of a normalized parameter structure"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from _flatten(item, f"{prefix}.{i}" if prefix else str(i))
+    else:
+        yield prefix, value
+
+
+def _encode(value):
+    """(value, text) columns; floats were normalized to their repr"""
+    if value is None:
+        return None, None
+    if isinstance(value, bool):
+        return float(value), "true" if value else "false"
+    if isinstance(value, int):
+        return float(value), str(value)
+    try:
+        return float(value), value
+    except ValueError:
+        return None, value
+
+
+def _decode(value, text):
+    if text in ("true", "false"):
+        return text == "true"
+    return text if value is None else value
+
+
+def _relative(path: str) -> str:
+    """Paths inside the repository are stored relative to it"""
+    path = os.path.abspath(path)
+    relative = os.path.relpath(path, _root)
+    if relative.startswith(os.pardir):
+        return path
+    return relative.replace(os.sep, "/")
+
+
+@dataclass
+class Artefact:
+    kind: str
+    name: str
+    path: str
+    input_hash: Optional[str] = None
+    tool: Optional[str] = None
+    seconds: Optional[float] = None
+    size: Optional[int] = None
+    created: float = 0.0
+    parameters: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def full_path(self) -> str:
+        return os.path.join(_root, self.path)
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.full_path)
+
+    def row(self):
+        seconds = "" if self.seconds is None else f"{self.seconds:7.2f}s"
+        size = "" if self.size is None else f"{self.size:9d}"
+        return f"{self.kind:<6} {self.path:<72} {size:>9} {seconds:>8}"
+
+
+class ArtefactIndex:
+    """
+    The index database, shared by processes: each process (and thread)
+    opens its own connection, writers wait up to timeout seconds for each
+    other. Failing to record an artefact only warns, the artefact itself
+    has been written.
+    """
+
+    def __init__(self, path=_default_path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self.enabled = True
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        # Pool workers forked from a process with an open connection must
+        # not share it
+        if getattr(local, "pid", None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(_schema)
+            local.connection, local.pid = connection, os.getpid()
+        return local.connection
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        path: str,
+        parameters=None,
+        input_hash=None,
+        tool=None,
+        seconds=None,
+        size=None,
+    ) -> Optional[Artefact]:
+        """Add the artefact at path, replacing any earlier record of it"""
+        if not self.enabled:
+            return None
+        if kind not in kinds:
+            raise ValueError(f"Unknown artefact kind {kind}, expected one of {kinds}")
+        if size is None and os.path.exists(path):
+            size = os.path.getsize(path)
+        if tool is not None and not isinstance(tool, str):
+            tool = json.dumps(_normalize(tool), sort_keys=True)
+        flat = dict(_flatten(_normalize(parameters or {})))
+        artefact = Artefact(
+            kind, name, _relative(path), input_hash, tool, seconds, size, time.time()
+        )
+        artefact.parameters = {
+            key: _decode(*_encode(value)) for key, value in flat.items()
+        }
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "DELETE FROM artefacts WHERE path = ?", (artefact.path,)
+                )
+                cursor = connection.execute(
+                    "INSERT INTO artefacts (kind, name, path, input_hash, tool, "
+                    "seconds, size, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, name, artefact.path, input_hash, tool, seconds, size)
+                    + (artefact.created,),
+                )
+                connection.executemany(
+                    "INSERT INTO parameters VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (cursor.lastrowid, key, key.rpartition(".")[2]) + _encode(value)
+                        for key, value in flat.items()
+                    ],
+                )
+        except sqlite3.Error as error:
+            warnings.warn(f"{artefact.path} not indexed: {error}")
+            return None
+        return artefact
+
+    def _select(self, conditions, arguments, existing) -> List[Artefact]:
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        connection = self._connection()
+        artefacts = {}
+        for row in connection.execute(
+            f"SELECT {_columns} FROM artefacts a{where} "
+            "ORDER BY a.kind, a.name, a.path",
+            arguments,
+        ):
+            artefacts[row[0]] = Artefact(*row[1:])
+        for artefact_id, name, value, text in connection.execute(
+            "SELECT artefact, name, value, text FROM parameters "
+            f"WHERE artefact IN (SELECT a.id FROM artefacts a{where})",
+            arguments,
+        ):
+            artefacts[artefact_id].parameters[name] = _decode(value, text)
+        found = list(artefacts.values())
+        if existing:
+            found = [artefact for artefact in found if artefact.exists]
+        return found
+
+    def find(
+        self, kind=None, name=None, where=None, existing=True, **parameters
+    ) -> List[Artefact]:
+        """
+        Artefacts of a kind, name (GLOB pattern) and parameter values, the
+        parameters given as keywords or, for dotted names, in where. With
+        existing, records of files since deleted are left out.
+        """
+        if not self.enabled:
+            return []
+        conditions, arguments = [], []
+        if kind is not None:
+            conditions.append("a.kind = ?")
+            arguments.append(kind)
+        if name is not None:
+            conditions.append("a.name GLOB ?")
+            arguments.append(name)
+        for key, wanted in {**(where or {}), **parameters}.items():
+            match = [f"p.{'name' if '.' in key else 'leaf'} = ?"]
+            arguments.append(key)
+            if isinstance(wanted, tuple):
+                low, high = wanted
+                if low is not None:
+                    match.append("p.value >= ?")
+                    arguments.append(float(low))
+                if high is not None:
+                    match.append("p.value <= ?")
+                    arguments.append(float(high))
+            else:
+                value, text = _encode(_normalize(wanted))
+                if value is not None:
+                    match.append("p.value = ?")
+                    arguments.append(value)
+                else:
+                    match.append("p.text = ?")
+                    arguments.append(text)
+            # Uncorrelated, each condition is one index range scan
+            conditions.append(
+                f"a.id IN (SELECT p.artefact FROM parameters p "
+                f"WHERE {' AND '.join(match)})"
+            )
+        return self._select(conditions, arguments, existing)
+
+    def lookup(self, input_hash: str, kind=None) -> Optional[Artefact]:
+        """Most recent existing artefact built from the same inputs"""
+        if not self.enabled or input_hash is None:
+            return None
+        conditions = ["a.input_hash = ?"]
+        arguments = [input_hash]
+        if kind is not None:
+            conditions.append("a.kind = ?")
+            arguments.append(kind)
+        found = self._select(conditions, arguments, existing=True)
+        return max(found, key=lambda artefact: artefact.created, default=None)
+
+    def get(self, path: str) -> Optional[Artefact]:
+        """Record of the artefact at path, whether or not the file still exists"""
+        if not self.enabled:
+            return None
+        found = self._select(["a.path = ?"], [_relative(path)], existing=False)
+        return found[0] if found else None
+
+    def remove(self, path: str):
+        if not self.enabled:
+            return
+        with self._connection() as connection:
+            connection.execute(
+                "DELETE FROM artefacts WHERE path = ?", (_relative(path),)
+            )
+
+    def prune(self) -> int:
+        """Drop the records of artefacts whose files are gone"""
+        missing = [a.path for a in self._select([], [], existing=False) if not a.exists]
+        with self._connection() as connection:
+            connection.executemany(
+                "DELETE FROM artefacts WHERE path = ?", [(path,) for path in missing]
+            )
+        return len(missing)
+
+    def summary(self) -> Dict[str, tuple]:
+        """Number and total size of the indexed artefacts of each kind"""
+        return {
+            kind: (count, size or 0)
+            for kind, count, size in self._connection().execute(
+                "SELECT kind, COUNT(*), SUM(size) FROM artefacts GROUP BY kind"
+            )
+        }
+
+
+artefact_index = ArtefactIndex(
+    path=os.environ.get("A320_ARTEFACT_INDEX_PATH", _default_path)
+)
+artefact_index.enabled = os.environ.get("A320_ARTEFACT_INDEX", "1") != "0"
+
+
+def parse_condition(text: str):
+    """name=value, name=low:high (either side may be empty), true/false"""
+    key, _, value = text.partition("=")
+    if ":" in value:
+        low, _, high = value.partition(":")
+        return key, (float(low) if low else None, float(high) if high else None)
+    if value.lower() in ("true", "false"):
+        return key, value.lower() == "true"
+    try:
+        return key, float(value)
+    except ValueError:
+        return key, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    find_parser = commands.add_parser("find")
+    find_parser.add_argument("conditions", nargs="*", help="name=value or low:high")
+    find_parser.add_argument("--kind", choices=kinds)
+    find_parser.add_argument("--name", help="GLOB pattern")
+    find_parser.add_argument("--missing", action="store_true", help="include deleted")
+    find_parser.add_argument("--json", action="store_true")
+    commands.add_parser("prune")
+    commands.add_parser("summary")
+    args = parser.parse_args(argv)
+
+    if args.command == "prune":
+        print(f"{artefact_index.prune()} records of missing artefacts removed")
+        return 0
+    if args.command == "summary":
+        for kind, (count, size) in sorted(artefact_index.summary().items()):
+            print(f"{kind:<6} {count:6d} artefacts {size / 2**20:9.1f} MiB")
+        return 0
+
+    found = artefact_index.find(
+        args.kind,
+        args.name,
+        where=dict(parse_condition(c) for c in args.conditions),
+        existing=not args.missing,
+    )
+    if args.json:
+        print(json.dumps([vars(artefact) for artefact in found], indent=2))
+        return 0
+    for artefact in found:
+        print(artefact.row())
+    print(f"{len(found)} artefacts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""
+Tessellation cache. Meshes are keyed by a digest of the shape's BREP (its
+location excluded) and the tolerances, and kept on disk as .npy vertex and
+triangle buffers that are memory-mapped when loaded, so a viewer refresh
+or export of an unchanged assembly tessellates nothing.
+
+    vertices, triangles = tessellate(korry.diffuser(text="ON").part)
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+_default_path = os.path.join(os.path.dirname(__file__), "meshes")
+
+
+class MeshCache:
+    """
+    In-process LRU of loaded meshes in front of a size bounded directory of
+    float32 vertex / uint32 triangle arrays
+    """
+
+    def __init__(self, path=_default_path, max_entries=256, max_bytes=256 * 2**20):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key, suffix):
+        return os.path.join(self.path, key[:2], key + suffix)
+
+    def get(self, key):
+        with self._lock:
+            mesh = self._memory.get(key)
+            if mesh is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return mesh
+
+        mesh = self._load(key)
+        with self._lock:
+            if mesh is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, mesh)
+        return mesh
+
+    def put(self, key, vertices, triangles):
+        mesh = (
+            np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3),
+            np.ascontiguousarray(triangles, dtype=np.uint32).reshape(-1, 3),
+        )
+        with self._lock:
+            self._remember(key, mesh)
+        self._store(key, mesh)
+        self._evict()
+        return mesh
+
+    def clear(self, disk=True):
+        with self._lock:
+            self._memory.clear()
+        if disk:
+            for path, _ in self._disk_entries():
+                self._remove(path)
+
+    def _remember(self, key, mesh):
+        self._memory[key] = mesh
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        vertices_path = self._entry_path(key, ".vertices.npy")
+        try:
+            # Read only maps, pages are only read when the mesh is used
+            vertices = np.load(vertices_path, mmap_mode="r")
+            triangles = np.load(self._entry_path(key, ".triangles.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        os.utime(vertices_path)
+        return vertices, triangles
+
+    def _store(self, key, mesh):
+        vertices_path = self._entry_path(key, ".vertices.npy")
+        os.makedirs(os.path.dirname(vertices_path), exist_ok=True)
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        triangles_path = self._entry_path(key, ".triangles.npy")
+        # Triangles first: an entry exists once its vertices file does
+        for path, array in ((triangles_path, mesh[1]), (vertices_path, mesh[0])):
+            with open(path + tmp_suffix, "wb") as f:
+                np.save(f, array)
+            os.replace(path + tmp_suffix, path)
+
+    def _disk_entries(self):
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(".vertices.npy"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                        size = stat.st_size + os.stat(
+                            path[: -len(".vertices.npy")] + ".triangles.npy"
+                        ).st_size
+                    except FileNotFoundError:
+                        continue
+                    entries.append((path, (stat.st_mtime, size)))
+        return entries
+
+    def _evict(self):
+        entries = self._disk_entries()
+        total = sum(size for _, (_, size) in entries)
+        for path, (_, size) in sorted(entries, key=lambda entry: entry[1][0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(vertices_path):
+        base = vertices_path[: -len(".vertices.npy")]
+        for path in (vertices_path, base + ".triangles.npy"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+mesh_cache = MeshCache(path=os.environ.get("A320_MESH_CACHE_DIR", _default_path))
+mesh_cache.enabled = os.environ.get("A320_MESH_CACHE", "1") != "0"
+
+# Digests of shapes seen in this process, by TShape so instances and
+# repeated calls on the same prototype serialize it only once
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def _unlocated(topods_shape):
+    from OCP.TopLoc import TopLoc_Location
+
+    return topods_shape.Located(TopLoc_Location())
+
+
+def _identity(topods_shape):
+    try:
+        return topods_shape.HashCode(2**31 - 1)
+    except AttributeError:
+        # OCCT 7.8 replaced HashCode with std::hash
+        return hash(topods_shape)
+
+
+def shape_digest(shape) -> str:
+    """Digest of a shape's geometry and topology, independent of location"""
+    from OCP.BRepTools import BRepTools
+    from OCP.TopTools import TopTools_FormatVersion
+
+    topods_shape = _unlocated(getattr(shape, "wrapped", shape))
+    identity = _identity(topods_shape)
+    with _digests_lock:
+        for known, digest in _digests.get(identity, ()):
+            if known.IsPartner(topods_shape):
+                return digest
+
+    stream = io.BytesIO()
+    # Without triangulation, so meshing the shape does not change its digest
+    version = TopTools_FormatVersion.TopTools_FormatVersion_CURRENT
+    BRepTools.Write_s(topods_shape, stream, False, False, version)
+    digest = hashlib.sha256(stream.getvalue()).hexdigest()
+    with _digests_lock:
+        if len(_digests) > 4096:
+            _digests.clear()
+        _digests.setdefault(identity, []).append((topods_shape, digest))
+    return digest
+
+
+def tessellate(shape, tolerance=0.1, angular_tolerance=0.2, cache=None):
+    """
+    (vertices, triangles) of a shape in its own coordinates (location not
+    applied), float32 (n, 3) and uint32 (m, 3), cached
+    """
+    from build123d import Compound
+
+    active_cache = cache or mesh_cache
+    key = None
+    if active_cache.enabled:
+        key = hashlib.sha256(
+            f"{shape_digest(shape)}:{tolerance!r}:{angular_tolerance!r}".encode()
+        ).hexdigest()
+        mesh = active_cache.get(key)
+        if mesh is not None:
+            return mesh
+
+    unlocated = Compound(_unlocated(getattr(shape, "wrapped", shape)))
+    vertices, triangles = unlocated.tessellate(tolerance, angular_tolerance)
+    vertices = np.array([v.to_tuple() for v in vertices], dtype=np.float32)
+    triangles = np.array(triangles, dtype=np.uint32).reshape(-1, 3)
+    if key is None:
+        return vertices.reshape(-1, 3), triangles
+    return active_cache.put(key, vertices, triangles)
@@ -0,0 +1,135 @@
+"""
+Declarative catalogue of the parts and CAM jobs in this repository.
+
+Recipes only name the callable producing them as "module:attribute", the
+module is imported when the recipe runs. Listing the catalogue therefore
+never loads build123d, OCP or FreeCAD.
+
+    python -m cad --list
+    python -m cad autobrake/diffusers --brep out/
+"""
+import importlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+from cad.common.buttons.korry.korry_batch import KORRY_CATALOGUE
+
+
+@dataclass(frozen=True)
+class Recipe:
+    """
+    kind is "part" for geometry and "cam" for G-code jobs. target is
+    "module:function" or, with constructor arguments, "module:Class.method"
+    called on a new instance.
+    """
+
+    name: str
+    kind: str
+    target: str
+    kwargs: dict = field(default_factory=dict)
+    constructor: Optional[dict] = None
+    description: str = ""
+
+    def resolve(self):
+        module_name, attribute = self.target.split(":")
+        obj = importlib.import_module(module_name)
+        path = attribute.split(".")
+        if self.constructor is not None:
+            cls = obj
+            for name in path[:-1]:
+                cls = getattr(cls, name)
+            return getattr(cls(**self.constructor), path[-1])
+        for name in path:
+            obj = getattr(obj, name)
+        return obj
+
+    def run(self, **overrides):
+        return self.resolve()(**{**self.kwargs, **overrides})
+
+
+catalogue = {}
+
+
+def register(*recipes: Recipe):
+    for recipe in recipes:
+        if recipe.name in catalogue:
+            raise ValueError(f"Recipe {recipe.name} registered twice")
+        catalogue[recipe.name] = recipe
+
+
+def find(pattern=None, kind=None):
+    return [
+        recipe
+        for name, recipe in sorted(catalogue.items())
+        if (pattern is None or pattern in name)
+        and (kind is None or recipe.kind == kind)
+    ]
+
+
+_korry = "cad.common.buttons.korry.korry:KorrySwitch"
+_korry_size = dict(width=19.5, height=19.5)
+_autobrake = "cad.glareshield.autobrake.panel.autobrake"
+
+
+def _korry_part(name, method, description="", **kwargs):
+    return Recipe(
+        f"korry/{name}",
+        "part",
+        f"{_korry}.{method}",
+        kwargs,
+        constructor=_korry_size,
+        description=description,
+    )
+
+
+register(
+    _korry_part("sleeve", "sleeve", "Sleeve, 4 mm stock", stock_thickness=4),
+    _korry_part(
+        "slider", "slider", "Slider for 3 mm diffusers", diffuser_stock_thickness=3
+    ),
+    _korry_part("cover", "cover"),
+    _korry_part("diffuser", "diffuser", "Blank diffuser"),
+    _korry_part("pcb", "pcb"),
+    _korry_part("connector", "connector"),
+    _korry_part("assembly", "assembly", "Complete switch"),
+    Recipe(
+        "switch_8x8",
+        "part",
+        "cad.pcb.switches.switch_8x8:Switch8x8.assembly",
+        constructor={},
+    ),
+    Recipe(
+        "autobrake/diffusers",
+        "part",
+        f"{_autobrake}:Autobrake.diffusers",
+        constructor={},
+        description="Grid of autobrake diffusers",
+    ),
+    Recipe(
+        "autobrake/panel",
+        "part",
+        f"{_autobrake}:Autobrake.panel",
+        constructor={},
+        description="LO, MED and MAX switches, built lazily",
+    ),
+    Recipe("autobrake/cam/single_sleeve", "cam", f"{_autobrake}:cnc_single_sleeve"),
+    Recipe("autobrake/cam/single_slider", "cam", f"{_autobrake}:cnc_single_slider"),
+    Recipe("autobrake/cam/diffusers", "cam", f"{_autobrake}:cnc_diffusers"),
+    Recipe(
+        "autobrake/cam/nested_diffusers",
+        "cam",
+        f"{_autobrake}:cnc_nested_diffusers",
+        description="Autobrake legends nested on 150x100 sheets",
+    ),
+)
+
+for _variant in KORRY_CATALOGUE:
+    register(
+        Recipe(
+            _variant.output,
+            "cam",
+            "cad.common.buttons.korry.korry_batch:run_variant",
+            dict(variant=_variant),
+            description=f"Korry {_variant.kind} catalogue entry",
+        )
+    )
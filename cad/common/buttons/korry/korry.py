@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 
 from build123d import *
-from cad.fonts import panel_font_path
+from cad.cache import cached_builder
+from cad.fonts import glyphs, panel_font_path, text_outline
 from cad.dxf import save_dxf
+from cad.tracing import traced
 
 
 @dataclass
@@ -45,6 +47,8 @@ class KorrySwitch:
     def inner_height(self):
         return self.height - self.wall_thickness * 2
 
+    @traced()
+    @cached_builder()
     def sleeve(
         self,
         stock_thickness,
@@ -90,6 +94,8 @@ class KorrySwitch:
         builder.part.color = Color("gray20")
         return builder
 
+    @traced()
+    @cached_builder()
     def slider(
         self,
         diffuser_stock_thickness=3,
@@ -124,6 +130,8 @@ class KorrySwitch:
         builder.part.color = Color("gray40")
         return builder
 
+    @traced()
+    @cached_builder()
     def cover(self):
         width = self.inner_width - self.slider_tolerance * 2
         height = self.inner_height - self.slider_tolerance * 2
@@ -134,6 +142,8 @@ class KorrySwitch:
         builder.part.color = Color(name="white", alpha=0.9)
         return builder
 
+    @traced()
+    @cached_builder(panel_font_path, glyphs.__file__)
     def diffuser(self, stock_thickness=3, text=None, frame=False, triangle=False):
         with BuildPart() as builder:
             with BuildSketch():
@@ -149,22 +159,9 @@ class KorrySwitch:
                 )
             extrude(amount=-stock_thickness / 2, mode=Mode.SUBTRACT)
 
-            if text and not triangle:
+            if (text or frame) and not triangle:
                 with BuildSketch():
-                    Text(text, 5, font_path=panel_font_path)
-                extrude(amount=-0.1, mode=Mode.SUBTRACT)
-            if frame and not triangle:
-                with BuildSketch():
-                    frame_padding = 2
-                    frame_outer_width = self.diffuser_width - frame_padding
-                    frame_outer_height = self.diffuser_height - frame_padding
-                    frame_line_width = 0.5
-                    frame_inner_width = frame_outer_width - (frame_line_width * 2)
-                    frame_inner_height = frame_outer_height - (frame_line_width * 2)
-                    RectangleRounded(frame_outer_width, frame_outer_height, 1)
-                    RectangleRounded(
-                        frame_inner_width, frame_inner_height, 0.5, mode=Mode.SUBTRACT
-                    )
+                    add(self.legend(text, frame))
                 extrude(amount=-0.1, mode=Mode.SUBTRACT)
 
             if triangle:
@@ -188,6 +185,69 @@ class KorrySwitch:
         builder.part.color = Color("gray80")
         return builder
 
+    @traced()
+    def legend(self, text=None, frame=False):
+        """Engraved text and frame of a diffuser, as a sketch"""
+        with BuildSketch() as builder:
+            if text:
+                add(text_outline(text, 5, panel_font_path))
+            if frame:
+                frame_padding = 2
+                frame_outer_width = self.diffuser_width - frame_padding
+                frame_outer_height = self.diffuser_height - frame_padding
+                frame_line_width = 0.5
+                frame_inner_width = frame_outer_width - (frame_line_width * 2)
+                frame_inner_height = frame_outer_height - (frame_line_width * 2)
+                with BuildSketch():
+                    RectangleRounded(frame_outer_width, frame_outer_height, 1)
+                    RectangleRounded(
+                        frame_inner_width, frame_inner_height, 0.5, mode=Mode.SUBTRACT
+                    )
+        return builder.sketch
+
+    @traced()
+    def diffuser_footprint(self):
+        with BuildSketch() as builder:
+            RectangleRounded(
+                self.diffuser_width, self.diffuser_height, self.corner_radius
+            )
+        return builder.sketch
+
+    @traced()
+    def slider_footprint(self, diffuser_ledge=0.5):
+        """Bottom face of the slider, without building the slider"""
+        width = self.inner_width - self.slider_tolerance * 2
+        height = self.inner_height - self.slider_tolerance * 2
+        with BuildSketch() as builder:
+            RectangleRounded(width, height, self.corner_radius)
+            with Locations((0, self.diffuser_offset), (0, -self.diffuser_offset)):
+                RectangleRounded(
+                    self.diffuser_width - diffuser_ledge * 2,
+                    self.diffuser_height - diffuser_ledge * 2,
+                    self.corner_radius,
+                    mode=Mode.SUBTRACT,
+                )
+        return builder.sketch
+
+    @traced()
+    def sleeve_footprint(self, ledge_offset=0.5):
+        """Top view outline of the sleeve: its ledge around the opening"""
+        with BuildSketch() as builder:
+            RectangleRounded(
+                self.width + ledge_offset * 2,
+                self.height + ledge_offset * 2,
+                self.corner_radius,
+            )
+            RectangleRounded(
+                self.inner_width,
+                self.inner_height,
+                self.corner_radius,
+                mode=Mode.SUBTRACT,
+            )
+        return builder.sketch
+
+    @traced()
+    @cached_builder()
     def pcb(self):
         """Mock model for the led circuit board"""
         with BuildPart() as builder:
@@ -200,6 +260,8 @@ class KorrySwitch:
         builder.part.color = Color("yellowgreen")
         return builder
 
+    @traced()
+    @cached_builder()
     def connector(self):
         half_width = self.connector_width / 2
         with BuildPart() as builder:
@@ -230,59 +292,85 @@ class KorrySwitch:
         builder.part.color = Color("gray30")
         return builder
 
-    def assembly(self, upper_text=None, lower_text=None):
+    def assembly_instances(self, upper_text=None, lower_text=None):
+        """
+        (key, factory, location) of every sub-part, for use with
+        InstancedPanel so identical parts across switches are built once
+        """
         from cad.pcb.switches.switch_8x8 import Switch8x8
 
-        sleeve = self.sleeve(3)
-
-        slider = self.slider()
-        slider.part.move(Location((0, 0, -1)))
-        cover = self.cover()
-        upper_diffuser = self.diffuser(text=upper_text)
-        upper_diffuser.part.move(Location((0, self.diffuser_offset, -1)))
-        lower_diffuser = self.diffuser(text=lower_text, frame=True)
-        lower_diffuser.part.move(Location((0, -self.diffuser_offset, -1)))
-        pcb = self.pcb()
-        pcb.part.move(
-            Location(
-                (0, 0, -(self.cover_stock_thickness + self.slider_stock_thickness))
-            )
-        )
-        connector = self.connector()
-        connector.part.move(
-            Location(
+        def key(*args):
+            return (repr(self),) + args
+
+        pcb_z = -(self.cover_stock_thickness + self.slider_stock_thickness)
+        connector_z = pcb_z - self.connector_length
+        instances = [
+            (key("sleeve", 3), lambda: self.sleeve(3), Location()),
+            (key("slider"), self.slider, Location((0, 0, -1))),
+            (key("cover"), self.cover, Location()),
+            (
+                key("diffuser", upper_text, False),
+                lambda: self.diffuser(text=upper_text),
+                Location((0, self.diffuser_offset, -1)),
+            ),
+            (
+                key("diffuser", lower_text, True),
+                lambda: self.diffuser(text=lower_text, frame=True),
+                Location((0, -self.diffuser_offset, -1)),
+            ),
+            # (key("pcb"), self.pcb, Location((0, 0, pcb_z))),
+            # (key("connector"), self.connector, Location((0, 0, connector_z))),
+            ("Switch8x8", lambda: Switch8x8().assembly(), Location((0, 0, -28.2))),
+        ]
+        return instances
+
+    def assembly_node(self, upper_text=None, lower_text=None, name="korry"):
+        """
+        Lazy cad.common.panel Assembly of the switch, with the placements of
+        assembly_instances. Parts are built when first needed and legends
+        can be changed in place: node["diffuser_upper"].update(text="ON")
+        """
+        from cad.common.panel import Assembly, Part
+        from cad.pcb.switches.switch_8x8 import Switch8x8
+
+        diffuser_offset = self.diffuser_offset
+        return Assembly(
+            name,
+            [
+                (Part("sleeve", self.sleeve, 3), Location()),
+                (Part("slider", self.slider), Location((0, 0, -1))),
+                (Part("cover", self.cover), Location()),
                 (
-                    0,
-                    0,
-                    -(
-                        self.cover_stock_thickness
-                        + self.slider_stock_thickness
-                        + self.connector_length
-                    ),
-                )
-            )
+                    Part("diffuser_upper", self.diffuser, text=upper_text),
+                    Location((0, diffuser_offset, -1)),
+                ),
+                (
+                    Part("diffuser_lower", self.diffuser, text=lower_text, frame=True),
+                    Location((0, -diffuser_offset, -1)),
+                ),
+                (
+                    Part("switch_8x8", Switch8x8().assembly, key="Switch8x8"),
+                    Location((0, 0, -28.2)),
+                ),
+            ],
         )
-        switch = Switch8x8().assembly()
-        switch.move(Location((0, 0, -28.2)))
-        builders = [
-            sleeve,
-            slider,
-            cover,
-            upper_diffuser,
-            lower_diffuser,
-            #pcb,
-            #connector,
-        ]
 
-        parts = [builder.part for builder in builders]
-        return Compound(children=parts + [switch])
+    @traced()
+    def assembly(self, upper_text=None, lower_text=None):
+        from cad.common.instancing import InstancedPanel
+
+        instances = self.assembly_instances(upper_text, lower_text)
+        return InstancedPanel().add_all(instances).compound()
 
 
 def slider_svg_footprint():
     korry = KorrySwitch(19.5, 19.5)
-    slider = korry.slider()
-    bottom_face = slider.faces().sort_by()[0]
-    save_dxf(bottom_face, "common/buttons/korry/slider.dxf")
+    save_dxf(
+        korry.slider_footprint(),
+        "common/buttons/korry/slider.dxf",
+        name="korry/slider_footprint",
+        parameters=dict(part=korry, diffuser_ledge=0.5),
+    )
 
 
 if __name__ == "__cq_viewer__":
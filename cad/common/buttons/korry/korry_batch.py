@@ -0,0 +1,228 @@
+"""
+Batch driver regenerating the Korry CAM catalogue in parallel.
+
+    python -m cad.common.buttons.korry.korry_batch --jobs 8
+"""
+import argparse
+import itertools
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional
+
+LEDGES = ((True, True), (False, True), (True, False), (False, False))
+
+
+@dataclass(frozen=True)
+class CamVariant:
+    kind: str
+    width: float
+    height: float
+    stock_thickness: float
+    corner_radius: float = 3.175 / 2
+    left_ledge: bool = True
+    right_ledge: bool = True
+
+    @property
+    def name(self):
+        return f"korry/{self.kind}"
+
+    @property
+    def output(self):
+        from cad.common.buttons.korry.korry_cam import output_name
+
+        if self.kind == "slider":
+            return output_name(
+                self.name,
+                self.width,
+                self.height,
+                self.stock_thickness,
+                self.corner_radius,
+            )
+        return output_name(
+            self.name,
+            self.width,
+            self.height,
+            self.stock_thickness,
+            self.corner_radius,
+            self.left_ledge,
+            self.right_ledge,
+        )
+
+
+@dataclass
+class VariantResult:
+    variant: CamVariant
+    seconds: float
+    path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def variant_matrix(
+    kind,
+    widths,
+    heights,
+    stock_thicknesses,
+    corner_radii=(3.175 / 2,),
+    ledges=LEDGES,
+):
+    """Cartesian product of the given dimensions, sliders ignore ledges"""
+    if kind == "slider":
+        ledges = ((True, True),)
+    return [
+        CamVariant(kind, w, h, t, r, left, right)
+        for w, h, t, r, (left, right) in itertools.product(
+            widths, heights, stock_thicknesses, corner_radii, ledges
+        )
+    ]
+
+
+# Everything currently committed in cad/nc/korry
+KORRY_CATALOGUE = (
+    variant_matrix("sleeve", [19.5], [19.5], [4])
+    + variant_matrix("sleeve", [19.75], [19.5], [4], ledges=LEDGES[1:3])
+    + variant_matrix("sleeve", [19.86], [19.5], [4], ledges=LEDGES[1:])
+    + variant_matrix("slider", [19.5], [19.5], [3])
+)
+
+
+def run_variant(variant: CamVariant, force=False, engine="freecad") -> VariantResult:
+    from cad.common.buttons.korry.korry_cam import cam_sleeve, cam_slider
+
+    start = time.perf_counter()
+    try:
+        if variant.kind == "sleeve":
+            path = cam_sleeve(
+                variant.name,
+                variant.width,
+                variant.height,
+                variant.stock_thickness,
+                corner_radius=variant.corner_radius,
+                left_ledge=variant.left_ledge,
+                right_ledge=variant.right_ledge,
+                save_debug=False,
+                force=force,
+                engine=engine,
+            )
+        elif variant.kind == "slider":
+            path = cam_slider(
+                variant.name,
+                variant.width,
+                variant.height,
+                variant.stock_thickness,
+                corner_radius=variant.corner_radius,
+                force=force,
+                engine=engine,
+            )
+        else:
+            raise ValueError(f"Unknown variant kind: {variant.kind}")
+    except Exception:
+        return VariantResult(
+            variant, time.perf_counter() - start, error=traceback.format_exc()
+        )
+    return VariantResult(variant, time.perf_counter() - start, path=path)
+
+
+def _run_pool(variants, max_workers, on_result, force, engine, isolated):
+    """(results, variants lost to a crashed worker) of one process pool"""
+    results = []
+    broken = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_variant, v, force, engine): v for v in variants}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # Worker died (e.g. OCC segfault), every pending future of the
+                # pool reports it, not only the one that crashed
+                if not isolated:
+                    broken.append(futures[future])
+                    continue
+                result = VariantResult(futures[future], 0.0, error=repr(e))
+            except Exception as e:
+                result = VariantResult(futures[future], 0.0, error=repr(e))
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results, broken
+
+
+def run_batch(
+    variants, max_workers=None, on_result=None, force=False, engine="freecad"
+):
+    """
+    Run every variant in its own task on a process pool. A failing or
+    crashing variant is reported in its result and does not affect others:
+    the variants a crashed worker took down with the pool are run again one
+    process each, so only the one that crashes fails.
+    """
+    if not variants:
+        return []
+    max_workers = max_workers or min(len(variants), os.cpu_count() or 1)
+    results, broken = _run_pool(
+        variants, max_workers, on_result, force, engine, isolated=False
+    )
+    for variant in broken:
+        more, _ = _run_pool([variant], 1, on_result, force, engine, isolated=True)
+        results += more
+    order = {v: i for i, v in enumerate(variants)}
+    return sorted(results, key=lambda r: order[r.variant])
+
+
+def print_result(result: VariantResult):
+    status = "ok" if result.ok else "FAILED"
+    print(f"{result.variant.output:<60} {result.seconds:8.2f}s  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument(
+        "-k", "--filter", default="", help="Only variants whose output contains this"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rebuild even if up to date"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["freecad", "fast"],
+        default="freecad",
+        help="fast generates rounded rectangle profiles without FreeCAD",
+    )
+    args = parser.parse_args(argv)
+
+    variants = [v for v in KORRY_CATALOGUE if args.filter in v.output]
+    if not variants:
+        print(f"no variants match {args.filter!r}")
+        return 0
+    start = time.perf_counter()
+    results = run_batch(
+        variants,
+        args.jobs,
+        on_result=print_result,
+        force=args.force,
+        engine=args.engine,
+    )
+    wall = time.perf_counter() - start
+
+    for result in results:
+        if not result.ok:
+            print(f"\n{result.variant.output}:\n{result.error}")
+    serial = sum(r.seconds for r in results)
+    slowest = max((r.seconds for r in results), default=0.0)
+    print(
+        f"\n{len(results)} variants, {sum(not r.ok for r in results)} failed, "
+        f"wall {wall:.2f}s, serial sum {serial:.2f}s, slowest {slowest:.2f}s"
+    )
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,11 @@
-from cad.common.buttons.korry.korry import KorrySwitch
-from cad.nc import save_gcode
-from ocp_freecad_cam import Job, Endmill
+from cad.cache import source_fingerprint
+from cad.nc import GcodeTarget
 
+# Geometry and CAM libraries are imported by the functions running the jobs,
+# so listing or checking targets stays cheap
 
 
-def cam_sleeve(
+def output_name(
     name,
     width,
     height,
@@ -12,17 +13,40 @@ def cam_sleeve(
     corner_radius=3.175 / 2,
     left_ledge=True,
     right_ledge=True,
-    show_object=None,
 ):
-    j = KorrySwitch(width, height, corner_radius=corner_radius)
+    parts = [name, f"{width}x{height}x{stock_thickness}", f"r{corner_radius}"]
+    if not left_ledge:
+        parts.append("no_left_ledge")
+    if not right_ledge:
+        parts.append("no_right_ledge")
+    return "_".join(parts)
+
+
+def _engine_code(engine):
+    """Modules whose code the output depends on besides this one"""
+    if engine == "fast":
+        from cad.nc import fastcam
+
+        return (fastcam.toolpath,)
+    if engine != "freecad":
+        raise ValueError(f"Unknown CAM engine {engine}")
+    return ()
+
+
+def sleeve_job(j, stock_thickness, left_ledge=True, right_ledge=True, show_object=None):
+    """FreeCAD job of cam_sleeve, the sleeve machined from its bottom face"""
+    from ocp_freecad_cam import Job, Endmill
+
+    from cad.common.topology import TopologyIndex
+
     sleeve = j.sleeve(stock_thickness, left_ledge=left_ledge, right_ledge=right_ledge)
 
-    sorted_faces = sleeve.part.faces().group_by()
-    top = sorted_faces[-1][0]
-    bottom = sorted_faces[0][0]
-    mid = sorted_faces[1]
+    faces = TopologyIndex(sleeve.part)
+    top = faces.top()
+    bottom = faces.bottom()
+    mid = faces.level(1)
     if not left_ledge or not right_ledge:
-        mid += sorted_faces[3]
+        mid += faces.level(3)
 
     if show_object:
         show_object(sleeve)
@@ -36,31 +60,25 @@ def cam_sleeve(
     )
 
     if show_object:
-        pass
         job.show(show_object)
+    return job
 
-    output_name = [name, f"{width}x{height}x{stock_thickness}", f"r{corner_radius}"]
-    if not left_ledge:
-        output_name.append("no_left_ledge")
-    if not right_ledge:
-        output_name.append("no_right_ledge")
-    save_gcode(job, "_".join(output_name))
-    job.save_fcstd("korry_sleeve_debug.fcstd")
 
+def slider_job(j, stock_thickness, show_object=None):
+    """FreeCAD job of cam_slider, the slider machined from its top face"""
+    from ocp_freecad_cam import Job, Endmill
+
+    from cad.common.topology import TopologyIndex
 
-def cam_slider(
-    name, width, height, stock_thickness, corner_radius=3.175 / 2, show_object=None
-):
-    j = KorrySwitch(width, height)
     slider = j.slider(stock_thickness)
 
     if show_object:
         show_object(slider)
 
-    faces = slider.part.faces().group_by()
-    top = faces[-1][0]
-    bottom = faces[0][0]
-    mid = faces[-2]
+    faces = TopologyIndex(slider.part)
+    top = faces.top()
+    bottom = faces.bottom()
+    mid = faces.level(-2)
 
     endmill_1mm = Endmill(diameter=1)
     job = (
@@ -72,26 +90,124 @@ def cam_slider(
     if show_object:
         show_object(mid)
         job.show(show_object)
+    return job
 
-    output_name = [name, f"{width}x{height}x{stock_thickness}", f"r{corner_radius}"]
 
-    save_gcode(job, "_".join(output_name))
+def cam_sleeve(
+    name,
+    width,
+    height,
+    stock_thickness,
+    corner_radius=3.175 / 2,
+    left_ledge=True,
+    right_ledge=True,
+    show_object=None,
+    save_debug=True,
+    force=False,
+    engine="freecad",
+):
+    """
+    engine "fast" computes the contours analytically with cad.nc.fastcam
+    instead of running a FreeCAD job
+    """
+    from cad.common.buttons.korry.korry import KorrySwitch
+    from cad.common.topology import TopologyIndex
 
+    j = KorrySwitch(width, height, corner_radius=corner_radius)
+    target = GcodeTarget(
+        output_name(
+            name, width, height, stock_thickness, corner_radius, left_ledge, right_ledge
+        ),
+        name=name,
+        part=j,
+        sleeve=dict(
+            stock_thickness=stock_thickness,
+            left_ledge=left_ledge,
+            right_ledge=right_ledge,
+        ),
+        tool=dict(endmill=1),
+        operations=["profile mid", "profile top holes"],
+        postprocessor="grbl",
+        engine=engine,
+        code=source_fingerprint(
+            KorrySwitch, TopologyIndex, cam_sleeve, *_engine_code(engine)
+        ),
+    )
+    if not (force or show_object) and target.up_to_date():
+        return target.full_path
 
-if __name__ == "__cq_viewer__":
-    from cq_viewer import show_object
-else:
-    show_object = None
+    if engine == "fast":
+        from cad.nc.fastcam import sleeve_setup, toolpath
 
-#cam_sleeve("korry/sleeve", 19.5, 19.5, 4, left_ledge=True, right_ledge=True)
-cam_sleeve(
-    "korry/sleeve",
-    19.86,
-    19.5,
-    4,
-    left_ledge=False,
-    right_ledge=True,
-)
-#cam_sleeve("korry/sleeve", 19.86, 19.5, 4, left_ledge=True, right_ledge=False)
-#cam_sleeve("korry/sleeve", 19.86, 19.5, 4, left_ledge=False, right_ledge=False)
-cam_slider("korry/slider", 19.5, 19.5, 3, show_object=show_object)
+        setup = sleeve_setup(
+            j, stock_thickness, left_ledge=left_ledge, right_ledge=right_ledge
+        )
+        return target.save(toolpath(setup, tool_diameter=1), strip_header=False)
+
+    job = sleeve_job(j, stock_thickness, left_ledge, right_ledge, show_object)
+    path = target.save(job)
+    if save_debug:
+        job.save_fcstd("korry_sleeve_debug.fcstd")
+    return path
+
+
+def cam_slider(
+    name,
+    width,
+    height,
+    stock_thickness,
+    corner_radius=3.175 / 2,
+    show_object=None,
+    force=False,
+    engine="freecad",
+):
+    from cad.common.buttons.korry.korry import KorrySwitch
+    from cad.common.topology import TopologyIndex
+
+    j = KorrySwitch(width, height, corner_radius=corner_radius)
+    target = GcodeTarget(
+        output_name(name, width, height, stock_thickness, corner_radius),
+        name=name,
+        part=j,
+        slider=dict(diffuser_stock_thickness=stock_thickness),
+        tool=dict(endmill=1),
+        operations=["profile mid in", "profile bottom holes"],
+        postprocessor="grbl",
+        engine=engine,
+        code=source_fingerprint(
+            KorrySwitch, TopologyIndex, cam_slider, *_engine_code(engine)
+        ),
+    )
+    if not (force or show_object) and target.up_to_date():
+        return target.full_path
+
+    if engine == "fast":
+        from cad.nc.fastcam import slider_setup, toolpath
+
+        setup = slider_setup(j, stock_thickness)
+        return target.save(toolpath(setup, tool_diameter=1), strip_header=False)
+
+    job = slider_job(j, stock_thickness, show_object)
+    return target.save(job)
+
+
+# Importing this module must not run any jobs, the batch driver in
+# korry_batch.py imports it in every worker process
+if __name__ in ("__main__", "__cq_viewer__"):
+    if __name__ == "__cq_viewer__":
+        from cq_viewer import show_object
+    else:
+        show_object = None
+
+    # cam_sleeve("korry/sleeve", 19.5, 19.5, 4, left_ledge=True, right_ledge=True)
+    cam_sleeve(
+        "korry/sleeve",
+        19.86,
+        19.5,
+        4,
+        left_ledge=False,
+        right_ledge=True,
+    )
+    # cam_sleeve("korry/sleeve", 19.86, 19.5, 4, left_ledge=True, right_ledge=False)
+    # cam_sleeve("korry/sleeve", 19.86, 19.5, 4, left_ledge=False, right_ledge=False)
+    cam_slider("korry/slider", 19.5, 19.5, 3, show_object=show_object)
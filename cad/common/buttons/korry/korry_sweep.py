@@ -0,0 +1,319 @@
+"""
+Parameter sweeps over KorrySwitch dimensions. The whole grid of
+combinations is validated first with NumPy, the KorrySwitch properties
+evaluated on arrays, so combinations RectangleRounded or the endmill cannot
+handle are rejected before any OCC work. The survivors are built on a
+process pool and tabulated with part volumes, mass and the machining time
+of their sleeve and slider programs.
+
+    python -m cad.common.buttons.korry.korry_sweep \\
+        --width 19.5 19.75 19.86 --height 19.5 --slider-tolerance 0.05 0.1
+
+    report = sweep(
+        width=np.arange(19, 20.01, 0.05), height=19.5, corner_radius=[1, 1.5875]
+    )
+    report.rejected_reasons()   # {"corner radius not above tool radius": n, ...}
+"""
+import argparse
+import itertools
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cad.common.buttons.korry.korry import KorrySwitch
+
+# KorrySwitch dataclass fields and the slider_tolerance class attribute
+SWEEPABLE = tuple(f.name for f in fields(KorrySwitch)) + ("slider_tolerance",)
+
+
+@dataclass
+class SweepSettings:
+    """Part and machining parameters shared by every combination"""
+
+    sleeve_stock_thickness: float = 4.0
+    diffuser_stock_thickness: float = 3.0
+    diffuser_ledge: float = 0.5
+    ledge_offset: float = 0.5
+    tool_diameter: float = 1.0
+    # g/mm^3, cast acrylic
+    density: float = 1.19e-3
+
+
+def grid(**axes) -> Dict[str, np.ndarray]:
+    """Cartesian product of the axes as one column per sweepable name"""
+    unknown = set(axes) - set(SWEEPABLE)
+    if unknown:
+        raise ValueError(f"Not sweepable: {', '.join(sorted(unknown))}")
+    if not {"width", "height"} <= set(axes):
+        raise ValueError("A sweep needs width and height values")
+    names = list(axes)
+    values = [np.atleast_1d(np.asarray(axes[name], dtype=np.float64)) for name in names]
+    mesh = np.meshgrid(*values, indexing="ij") if values else []
+    return {name: column.ravel() for name, column in zip(names, mesh)}
+
+
+def vector_switch(columns) -> KorrySwitch:
+    """
+    KorrySwitch whose dimensions are arrays, so its properties evaluate
+    every combination at once. Unswept dimensions keep their defaults.
+    """
+    korry_fields = {
+        name: column for name, column in columns.items() if name != "slider_tolerance"
+    }
+    korry = KorrySwitch(**korry_fields)
+    if "slider_tolerance" in columns:
+        korry.slider_tolerance = columns["slider_tolerance"]
+    return korry
+
+
+def dimensions(columns, settings: SweepSettings = None) -> Dict[str, np.ndarray]:
+    """
+    (width, height) arrays of every rounded rectangle the switch is built
+    from, named after its feature
+    """
+    settings = settings or SweepSettings()
+    korry = vector_switch(columns)
+    ledge = settings.ledge_offset * 2
+    slider_clearance = korry.slider_tolerance * 2
+    slot = settings.diffuser_ledge * 2
+    return {
+        "outline": (korry.width, korry.height),
+        "ledge": (korry.width + ledge, korry.height + ledge),
+        "opening": (korry.inner_width, korry.inner_height),
+        "slider": (
+            korry.inner_width - slider_clearance,
+            korry.inner_height - slider_clearance,
+        ),
+        "window": (korry.diffuser_width, korry.diffuser_height),
+        "slot": (korry.diffuser_width - slot, korry.diffuser_height - slot),
+        "lens": (korry.diffuser_width - 1.5, korry.diffuser_height - 1.5),
+    }
+
+
+# Features cut by inside profiles, their corners need the tool to fit
+_pockets = ("opening", "window", "slot")
+
+
+def validate(columns, settings: SweepSettings = None) -> Dict[str, np.ndarray]:
+    """Boolean array per reason, True where a combination is invalid"""
+    settings = settings or SweepSettings()
+    korry = vector_switch(columns)
+    count = len(columns["width"])
+    radius = np.broadcast_to(korry.corner_radius, (count,))
+    tool = settings.tool_diameter
+
+    failures = {}
+    for name, (width, height) in dimensions(columns, settings).items():
+        smallest = np.broadcast_to(np.minimum(width, height), (count,))
+        failures[f"{name} not positive"] = smallest <= 0
+        # RectangleRounded requires both sides larger than the diameter
+        failures[f"corner radius too large for {name}"] = smallest <= 2 * radius
+        if name in _pockets:
+            failures[f"{name} narrower than endmill"] = smallest < tool
+    # An inside corner of the tool radius leaves a zero radius arc
+    failures["corner radius not above tool radius"] = radius <= tool / 2
+    failures["wall thinner than endmill"] = np.broadcast_to(
+        np.asarray(korry.wall_thickness) < tool, (count,)
+    )
+    failures["negative slider tolerance"] = np.broadcast_to(
+        np.asarray(korry.slider_tolerance) < 0, (count,)
+    )
+    failures["diffuser pocket through slider"] = np.broadcast_to(
+        settings.diffuser_stock_thickness >= np.asarray(korry.slider_stock_thickness),
+        (count,),
+    )
+    failures["sleeve thinner than its ledge"] = np.broadcast_to(
+        settings.sleeve_stock_thickness <= 1.0, (count,)
+    )
+    return {reason: mask for reason, mask in failures.items() if mask.any()}
+
+
+@dataclass
+class SweepResult:
+    parameters: Dict[str, float]
+    seconds: float = 0.0
+    # mm^3 per part
+    volumes: Dict[str, float] = field(default_factory=dict)
+    mass: float = 0.0
+    # Estimated cycle times of the sleeve and slider programs
+    machining: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def volume(self):
+        return sum(self.volumes.values())
+
+
+def evaluate(parameters, settings: SweepSettings = None) -> SweepResult:
+    """Build one combination's parts and program it, errors in the result"""
+    from cad.nc.analyze import Toolpath, cycle_time
+    from cad.nc.fastcam import sleeve_setup, slider_setup, toolpath
+
+    settings = settings or SweepSettings()
+    start = time.perf_counter()
+    result = SweepResult(dict(parameters))
+    try:
+        korry = KorrySwitch(
+            **{k: v for k, v in parameters.items() if k != "slider_tolerance"}
+        )
+        if "slider_tolerance" in parameters:
+            korry.slider_tolerance = parameters["slider_tolerance"]
+        parts = {
+            "sleeve": korry.sleeve(
+                settings.sleeve_stock_thickness, ledge_offset=settings.ledge_offset
+            ),
+            "slider": korry.slider(
+                settings.diffuser_stock_thickness, settings.diffuser_ledge
+            ),
+            "cover": korry.cover(),
+            "diffuser": korry.diffuser(settings.diffuser_stock_thickness),
+        }
+        result.volumes = {name: part.part.volume for name, part in parts.items()}
+        # Two diffusers per switch
+        result.mass = (result.volume + result.volumes["diffuser"]) * settings.density
+
+        setups = {
+            "sleeve": sleeve_setup(
+                korry,
+                settings.sleeve_stock_thickness,
+                ledge_offset=settings.ledge_offset,
+            ),
+            "slider": slider_setup(
+                korry, settings.diffuser_stock_thickness, settings.diffuser_ledge
+            ),
+        }
+        for name, setup in setups.items():
+            lines = toolpath(setup, tool_diameter=settings.tool_diameter)
+            result.machining[name] = cycle_time(Toolpath.from_lines(lines))
+    except Exception:
+        result.error = traceback.format_exc()
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+@dataclass
+class SweepReport:
+    results: List[SweepResult]
+    # Parameters of each rejected combination and why
+    rejected: List[Dict[str, float]]
+    reasons: List[List[str]]
+    seconds: float
+
+    def rejected_reasons(self) -> Dict[str, int]:
+        counts = {}
+        for reasons in self.reasons:
+            for reason in reasons:
+                counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+
+def sweep(settings: SweepSettings = None, max_workers=None, on_result=None, **axes):
+    """
+    Validate the grid of axes (sweepable name -> values) and evaluate the
+    valid combinations, in parallel unless max_workers is 1
+    """
+    settings = settings or SweepSettings()
+    start = time.perf_counter()
+    columns = grid(**axes)
+    count = len(columns["width"])
+    failures = validate(columns, settings)
+    invalid = np.zeros(count, dtype=bool)
+    for mask in failures.values():
+        invalid |= mask
+
+    def parameters(i):
+        return {name: float(column[i]) for name, column in columns.items()}
+
+    rejected = [parameters(i) for i in np.flatnonzero(invalid)]
+    reasons = [
+        [reason for reason, mask in failures.items() if mask[i]]
+        for i in np.flatnonzero(invalid)
+    ]
+    valid = [parameters(i) for i in np.flatnonzero(~invalid)]
+
+    results = []
+    if max_workers == 1 or len(valid) < 2:
+        for variant in valid:
+            results.append(evaluate(variant, settings))
+            if on_result:
+                on_result(results[-1])
+    else:
+        max_workers = max_workers or min(len(valid), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for result in executor.map(
+                evaluate, valid, itertools.repeat(settings), chunksize=1
+            ):
+                results.append(result)
+                if on_result:
+                    on_result(result)
+    return SweepReport(results, rejected, reasons, time.perf_counter() - start)
+
+
+def _format_parameters(parameters):
+    return " ".join(f"{value:7.3f}" for value in parameters.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for name in SWEEPABLE:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, nargs="+")
+    for name, value in asdict(SweepSettings()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=value)
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument(
+        "--validate-only", action="store_true", help="only count rejections"
+    )
+    args = parser.parse_args(argv)
+    axes = {
+        name: getattr(args, name)
+        for name in SWEEPABLE
+        if getattr(args, name) is not None
+    }
+    settings = SweepSettings(
+        **{name: getattr(args, name) for name in asdict(SweepSettings())}
+    )
+    names = list(axes)
+    header = " ".join(f"{name[:7]:>7}" for name in names)
+
+    if args.validate_only:
+        failures = validate(grid(**axes), settings)
+        for reason, mask in failures.items():
+            print(f"{reason:<45} {int(mask.sum()):8d}")
+        return 0
+
+    print(
+        f"{header} {'volume':>9} {'mass g':>8} {'sleeve':>7} {'slider':>7} "
+        f"{'build':>6}"
+    )
+
+    def print_result(result):
+        row = _format_parameters(result.parameters)
+        if not result.ok:
+            print(f"{row} FAILED {result.error.strip().splitlines()[-1]}")
+            return
+        print(
+            f"{row} {result.volume:9.1f} {result.mass:8.2f} "
+            f"{result.machining['sleeve']:6.0f}s {result.machining['slider']:6.0f}s "
+            f"{result.seconds:5.1f}s"
+        )
+
+    report = sweep(settings, args.jobs, on_result=print_result, **axes)
+    if report.rejected:
+        print(f"{len(report.rejected)} rejected before building:")
+        for reason, count in sorted(report.rejected_reasons().items()):
+            print(f"  {reason:<45} {count:6d}")
+    print(f"{len(report.results)} built in {report.seconds:.1f}s")
+    return 0 if all(r.ok for r in report.results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,467 @@
+"""
+Interference and clearance checks between the parts of an assembly or an
+InstancedPanel. Part bounding boxes go into a bounding volume hierarchy
+that prunes the pairs which cannot come within the clearance; only the
+remaining candidates get an exact BRep distance, and an overlap volume when
+they touch. Candidates repeating the same two parts in the same relative
+placement, as neighbouring switches of a panel do, are checked once.
+
+    report = check_clearance(korry.assembly("DECEL", "ON"), clearance=0.05)
+    for result in report.interferences():
+        print(result)
+
+    python -m cad.common.clearance --width 19.5 --height 19.5 --grid 5x3
+"""
+import argparse
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from cad.cache.mesh import _identity, _unlocated
+from cad.common.mesh import _matrix
+from cad.tracing import span, traced
+
+
+@dataclass
+class Part:
+    name: str
+    # Located OCCT shape, its unlocated prototype and the placing matrix
+    shape: object = field(repr=False)
+    prototype: int = field(repr=False)
+    matrix: np.ndarray = field(repr=False)
+
+
+@dataclass
+class Clearance:
+    """
+    Distance between two parts in mm, 0 when they touch or intersect, and
+    the volume they share in mm^3
+    """
+
+    a: str
+    b: str
+    distance: float
+    overlap: float = 0.0
+    points: Tuple[Tuple[float, ...], Tuple[float, ...]] = ()
+
+    @property
+    def interferes(self):
+        return self.overlap > 0
+
+    def __str__(self):
+        if self.interferes:
+            return f"{self.a} x {self.b}: overlap {self.overlap:.4f} mm^3"
+        if self.distance == 0:
+            return f"{self.a} x {self.b}: touching"
+        return f"{self.a} x {self.b}: gap {self.distance:.4f} mm"
+
+
+@dataclass
+class ClearanceReport:
+    parts: int
+    clearance: float
+    # Part pairs whose boxes come within the clearance, and the exact
+    # checks left after repeated placements were merged
+    candidates: int
+    exact_checks: int
+    seconds: float
+    results: List[Clearance]
+
+    @property
+    def pairs(self):
+        return self.parts * (self.parts - 1) // 2
+
+    @property
+    def min_gap(self):
+        """Smallest distance between parts that do not touch"""
+        gaps = [r.distance for r in self.results if r.distance > 0]
+        return min(gaps, default=None)
+
+    @property
+    def ok(self):
+        return not self.violations()
+
+    def interferences(self) -> List[Clearance]:
+        return [r for r in self.results if r.interferes]
+
+    def contacts(self) -> List[Clearance]:
+        """Pairs touching without overlap, parts stacked on each other"""
+        return [r for r in self.results if r.distance == 0 and not r.interferes]
+
+    def violations(self) -> List[Clearance]:
+        """Pairs overlapping, or apart but closer than the clearance"""
+        return [
+            r for r in self.results if r.interferes or 0 < r.distance < self.clearance
+        ]
+
+    def summary(self):
+        min_gap = "-" if self.min_gap is None else f"{self.min_gap:.4f} mm"
+        return (
+            f"{self.parts} parts, {self.candidates} of {self.pairs} pairs within "
+            f"{self.clearance} mm, {self.exact_checks} exact checks, "
+            f"{len(self.interferences())} interferences, "
+            f"{len(self.contacts())} contacts, min gap {min_gap} "
+            f"({self.seconds:.2f}s)"
+        )
+
+
+class BoxTree:
+    """
+    Bounding volume hierarchy over axis aligned boxes, split at the median
+    of the longest axis. Nodes are stored as arrays.
+    """
+
+    def __init__(self, lows, highs, leaf_size=4):
+        self.lows = np.asarray(lows, dtype=np.float64).reshape(-1, 3)
+        self.highs = np.asarray(highs, dtype=np.float64).reshape(-1, 3)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.lows))
+        self.node_lows = []
+        self.node_highs = []
+        # Children of inner nodes, (start, stop) into order for leaves
+        self.children = []
+        self.ranges = []
+        if len(self.lows):
+            self._build(0, len(self.lows))
+        self.node_lows = np.array(self.node_lows).reshape(-1, 3)
+        self.node_highs = np.array(self.node_highs).reshape(-1, 3)
+
+    def _build(self, start, stop):
+        node = len(self.children)
+        indices = self.order[start:stop]
+        self.node_lows.append(self.lows[indices].min(axis=0))
+        self.node_highs.append(self.highs[indices].max(axis=0))
+        self.children.append(None)
+        self.ranges.append((start, stop))
+        if stop - start <= self.leaf_size:
+            return node
+        centers = self.lows[indices] + self.highs[indices]
+        axis = int(np.argmax(self.node_highs[node] - self.node_lows[node]))
+        middle = (stop - start) // 2
+        split = np.argpartition(centers[:, axis], middle)
+        self.order[start:stop] = indices[split]
+        left = self._build(start, start + middle)
+        right = self._build(start + middle, stop)
+        self.children[node] = (left, right)
+        return node
+
+    def _near(self, a_lows, a_highs, b_lows, b_highs, margin):
+        return np.all(
+            (a_lows <= b_highs + margin) & (b_lows <= a_highs + margin), axis=-1
+        )
+
+    def pairs(self, margin=0.0) -> np.ndarray:
+        """(k, 2) index pairs i < j of boxes no further apart than margin"""
+        if not len(self.children):
+            return np.zeros((0, 2), dtype=np.intp)
+        found = []
+        stack = [(0, 0)]
+        while stack:
+            a, b = stack.pop()
+            if a != b and not self._near(
+                self.node_lows[a],
+                self.node_highs[a],
+                self.node_lows[b],
+                self.node_highs[b],
+                margin,
+            ):
+                continue
+            a_children, b_children = self.children[a], self.children[b]
+            if a_children is None and b_children is None:
+                found.append(self._leaf_pairs(a, b, margin))
+            elif a == b:
+                left, right = a_children
+                stack += [(left, left), (right, right), (left, right)]
+            elif b_children is None or (
+                a_children is not None
+                and self.ranges[a][1] - self.ranges[a][0]
+                >= self.ranges[b][1] - self.ranges[b][0]
+            ):
+                stack += [(a_children[0], b), (a_children[1], b)]
+            else:
+                stack += [(a, b_children[0]), (a, b_children[1])]
+        pairs = np.concatenate(found)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def _leaf_pairs(self, a, b, margin):
+        first = self.order[slice(*self.ranges[a])]
+        second = self.order[slice(*self.ranges[b])]
+        i, j = np.meshgrid(first, second, indexing="ij")
+        i, j = i.ravel(), j.ravel()
+        near = self._near(
+            self.lows[i], self.highs[i], self.lows[j], self.highs[j], margin
+        )
+        pairs = np.column_stack([np.minimum(i, j), np.maximum(i, j)])[near & (i != j)]
+        if a == b:
+            pairs = np.unique(pairs, axis=0)
+        return pairs.reshape(-1, 2)
+
+
+def _part_shapes(topods_shape, node, name):
+    """
+    (name, shape) of the build123d leaves under node, located in the root's
+    coordinates. Assemblies pair build123d children with the compound's
+    sub-shapes by position, copied assemblies keep that order.
+    """
+    from OCP.TopoDS import TopoDS_Iterator
+
+    children = list(getattr(node, "children", ()))
+    shapes = []
+    if children:
+        iterator = TopoDS_Iterator(topods_shape)
+        while iterator.More():
+            shapes.append(iterator.Value())
+            iterator.Next()
+    if not children or len(children) != len(shapes):
+        yield getattr(node, "label", "") or name, topods_shape
+        return
+    for i, (shape, child) in enumerate(zip(shapes, children)):
+        yield from _part_shapes(shape, child, f"{name}.{i}" if name else str(i))
+
+
+def _key_name(key):
+    """Readable name of an InstancedPanel key, parts of tuples without reprs"""
+    if not isinstance(key, tuple):
+        return str(key)
+    return "/".join(str(k) for k in key if "(" not in str(k)) or str(key)
+
+
+def assembly_parts(shape_or_panel) -> List[Part]:
+    """Parts of a shape, assembly or InstancedPanel as located OCCT shapes"""
+    prototypes = {}
+
+    def prototype_id(topods_shape):
+        bucket = prototypes.setdefault(_identity(_unlocated(topods_shape)), [])
+        for known, index in bucket:
+            if known.IsPartner(topods_shape):
+                return index
+        index = sum(len(b) for b in prototypes.values())
+        bucket.append((topods_shape, index))
+        return index
+
+    def part(name, topods_shape):
+        return Part(
+            name,
+            topods_shape,
+            prototype_id(topods_shape),
+            _matrix(topods_shape.Location()),
+        )
+
+    keys = getattr(shape_or_panel, "keys", None)
+    if keys is None:
+        shape = shape_or_panel
+        return [part(n, s) for n, s in _part_shapes(shape.wrapped, shape, "")]
+
+    panel = shape_or_panel
+    parts = []
+    for key in keys():
+        prototype = panel.prototype(key)
+        sub_parts = list(_part_shapes(prototype.wrapped, prototype, ""))
+        for i, location in enumerate(panel.locations(key)):
+            for sub_name, shape in sub_parts:
+                name = f"{_key_name(key)}[{i}]"
+                if len(sub_parts) > 1:
+                    name += f".{sub_name}"
+                parts.append(part(name, shape.Moved(location.wrapped)))
+    return parts
+
+
+def part_boxes(parts: List[Part]):
+    """
+    (lows, highs) of the parts' boxes: the optimal box of every unique part
+    computed once unlocated, then transformed to each placement
+    """
+    from OCP.Bnd import Bnd_Box
+    from OCP.BRepBndLib import BRepBndLib
+
+    boxes = {}
+    lows = np.zeros((len(parts), 3))
+    highs = np.zeros((len(parts), 3))
+    for i, part in enumerate(parts):
+        if part.prototype not in boxes:
+            box = Bnd_Box()
+            BRepBndLib.AddOptimal_s(_unlocated(part.shape), box, False, False)
+            boxes[part.prototype] = box
+        box = boxes[part.prototype]
+        if box.IsVoid():
+            lows[i], highs[i] = np.inf, -np.inf
+            continue
+        placed = box.Transformed(part.shape.Location().Transformation())
+        values = placed.Get()
+        lows[i], highs[i] = values[:3], values[3:]
+    return lows, highs
+
+
+def _serialize(topods_shape):
+    from OCP.BRepTools import BRepTools
+    from OCP.TopTools import TopTools_FormatVersion
+
+    stream = io.BytesIO()
+    version = TopTools_FormatVersion.TopTools_FormatVersion_CURRENT
+    BRepTools.Write_s(topods_shape, stream, False, False, version)
+    return stream.getvalue()
+
+
+def _deserialize(data):
+    from OCP.BRep import BRep_Builder
+    from OCP.BRepTools import BRepTools
+    from OCP.TopoDS import TopoDS_Shape
+
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, io.BytesIO(data), BRep_Builder())
+    return shape
+
+
+def exact_clearance(a, b, tolerance=1e-6):
+    """
+    (distance, overlap volume, nearest points) of two OCCT shapes, the
+    volume only computed when they touch
+    """
+    from OCP.BRepAlgoAPI import BRepAlgoAPI_Common
+    from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+    from OCP.BRepGProp import BRepGProp
+    from OCP.Extrema import Extrema_ExtFlag_MIN
+    from OCP.GProp import GProp_GProps
+
+    extrema = BRepExtrema_DistShapeShape()
+    extrema.SetMultiThread(True)
+    extrema.SetFlag(Extrema_ExtFlag_MIN)
+    extrema.LoadS1(a)
+    extrema.LoadS2(b)
+    extrema.Perform()
+    if not extrema.IsDone():
+        raise RuntimeError("Distance computation failed")
+    distance = extrema.Value()
+    points = ()
+    if extrema.NbSolution():
+        points = tuple(
+            (p.X(), p.Y(), p.Z())
+            for p in (extrema.PointOnShape1(1), extrema.PointOnShape2(1))
+        )
+    if distance > tolerance:
+        return distance, 0.0, points
+
+    common = BRepAlgoAPI_Common(a, b)
+    properties = GProp_GProps()
+    BRepGProp.VolumeProperties_s(common.Shape(), properties)
+    overlap = properties.Mass()
+    return 0.0, overlap if overlap > tolerance else 0.0, points
+
+
+def _exact_serialized(arguments):
+    a, b, tolerance = arguments
+    return exact_clearance(_deserialize(a), _deserialize(b), tolerance)
+
+
+def _placement_key(first: Part, second: Part, decimals=6):
+    """Identical for the same two parts in the same relative placement"""
+    relative = np.linalg.solve(first.matrix, second.matrix)
+    return first.prototype, second.prototype, np.round(relative, decimals).tobytes()
+
+
+@traced()
+def check_clearance(
+    shape_or_panel, clearance=0.0, max_workers=1, tolerance=1e-6
+) -> ClearanceReport:
+    """
+    Exact distances of every pair of parts whose boxes come within the
+    clearance. max_workers > 1 (None: one per CPU) runs the exact checks on
+    a process pool, worthwhile from a few dozen unique pairs.
+    """
+    start = time.perf_counter()
+    with span("parts", "clearance"):
+        parts = assembly_parts(shape_or_panel)
+        lows, highs = part_boxes(parts)
+    with span("candidates", "clearance"):
+        candidates = BoxTree(lows, highs).pairs(clearance)
+
+    unique = {}
+    for i, j in candidates:
+        unique.setdefault(_placement_key(parts[i], parts[j]), (i, j))
+    pairs = list(unique.values())
+
+    with span("exact", "clearance", pairs=len(pairs)):
+        if max_workers == 1 or len(pairs) < 2:
+            exact = [
+                exact_clearance(parts[i].shape, parts[j].shape, tolerance)
+                for i, j in pairs
+            ]
+        else:
+            shapes = {}
+            for i in {index for pair in pairs for index in pair}:
+                shapes[i] = _serialize(parts[i].shape)
+            arguments = [(shapes[i], shapes[j], tolerance) for i, j in pairs]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                exact = list(executor.map(_exact_serialized, arguments))
+    results_by_key = dict(zip(unique, exact))
+
+    results = []
+    for i, j in candidates:
+        key = _placement_key(parts[i], parts[j])
+        distance, overlap, points = results_by_key[key]
+        checked = unique[key][0]
+        if checked != i:
+            # Repeated placement, move the checked pair's nearest points along
+            move = parts[i].matrix @ np.linalg.inv(parts[checked].matrix)
+            points = tuple(tuple((move @ (*p, 1.0))[:3].tolist()) for p in points)
+        results.append(
+            Clearance(parts[i].name, parts[j].name, distance, overlap, points)
+        )
+    results.sort(key=lambda r: (-r.overlap, r.distance))
+    return ClearanceReport(
+        parts=len(parts),
+        clearance=clearance,
+        candidates=len(candidates),
+        exact_checks=len(pairs),
+        seconds=time.perf_counter() - start,
+        results=results,
+    )
+
+
+def korry_panel(width, height, columns=1, rows=1, spacing=2.0, upper=None, lower=None):
+    """InstancedPanel of columns x rows complete Korry switches"""
+    from build123d import Location
+
+    from cad.common.buttons.korry.korry import KorrySwitch
+    from cad.common.instancing import InstancedPanel
+
+    korry = KorrySwitch(width, height)
+    pitch_x, pitch_y = width + spacing, height + spacing
+    panel = InstancedPanel()
+    for row in range(rows):
+        for column in range(columns):
+            panel.add_all(
+                korry.assembly_instances(upper, lower),
+                Location((column * pitch_x, -row * pitch_y, 0)),
+            )
+    return panel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=float, default=19.5)
+    parser.add_argument("--height", type=float, default=19.5)
+    parser.add_argument("--grid", default="1x1", help="columns x rows of switches")
+    parser.add_argument(
+        "--spacing", type=float, default=2.0, help="gap between switches in mm"
+    )
+    parser.add_argument("--clearance", type=float, default=0.05)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--all", action="store_true", help="list every candidate")
+    args = parser.parse_args(argv)
+    columns, rows = (int(n) for n in args.grid.lower().split("x"))
+
+    panel = korry_panel(args.width, args.height, columns, rows, args.spacing)
+    report = check_clearance(panel, args.clearance, max_workers=args.jobs)
+    print(report.summary())
+    for result in report.results if args.all else report.violations():
+        print(f"  {result}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
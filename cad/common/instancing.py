@@ -0,0 +1,177 @@
+"""
+Instanced panels: one prototype shape per unique part plus the locations
+of its instances. Instances are located shapes sharing the prototype's
+TShape, so memory, tessellation and topology queries scale with the number
+of unique parts rather than the number of placed parts.
+
+    panel = InstancedPanel()
+    panel.add("blank", lambda: korry.diffuser().part, Location((22, 0, 0)))
+    panel.add_all(korry.assembly_instances("DECEL", "ON"), Location((0, 40, 0)))
+    compound = panel.compound()
+"""
+import copy
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+from build123d import BoundBox, Compound, Location, Shape, export_brep
+from OCP.Bnd import Bnd_Box
+from OCP.BRepBndLib import BRepBndLib
+
+
+def instance(shape: Shape, location: Location) -> Shape:
+    """Located shallow copy of shape, sharing its TShape"""
+    located = copy.copy(shape)
+    located.locate(location * shape.location)
+    return located
+
+
+def location_matrix(location: Location) -> np.ndarray:
+    trsf = location.wrapped.Transformation()
+    return np.array(
+        [[trsf.Value(r, c) for c in range(1, 5)] for r in range(1, 4)] + [[0, 0, 0, 1]]
+    )
+
+
+class InstancedPanel:
+    def __init__(self):
+        self._factories = OrderedDict()
+        self._prototypes = {}
+        self._locations = OrderedDict()
+        self._meshes = {}
+        self._queries = {}
+
+    def add(self, key, part, location: Location = None):
+        """
+        Add an instance of the part identified by key. part is a shape, a
+        builder or a zero argument callable building it; it is only built
+        the first time the key is seen.
+        """
+        if key not in self._factories:
+            self._factories[key] = part
+            self._locations[key] = []
+        self._locations[key].append(location or Location())
+        return self
+
+    def add_all(self, instances, location: Location = None):
+        """Add (key, part, location) tuples, optionally placed at location"""
+        for key, part, part_location in instances:
+            if location is not None:
+                part_location = location * part_location
+            self.add(key, part, part_location)
+        return self
+
+    def prototype(self, key) -> Shape:
+        if key not in self._prototypes:
+            part = self._factories[key]
+            if callable(part) and not isinstance(part, Shape):
+                part = part()
+            self._prototypes[key] = getattr(part, "part", part)
+        return self._prototypes[key]
+
+    def keys(self):
+        return list(self._locations)
+
+    def locations(self, key):
+        return list(self._locations[key])
+
+    def __len__(self):
+        return sum(len(locations) for locations in self._locations.values())
+
+    def instances(self):
+        """Located instances of every placed part"""
+        return [
+            instance(self.prototype(key), location)
+            for key, locations in self._locations.items()
+            for location in locations
+        ]
+
+    def compound(self) -> Compound:
+        return Compound(children=self.instances())
+
+    def bounding_box(self) -> BoundBox:
+        """Union of the prototypes' boxes transformed to each instance"""
+        box = Bnd_Box()
+        for key, locations in self._locations.items():
+            prototype_box = Bnd_Box()
+            BRepBndLib.Add_s(self.prototype(key).wrapped, prototype_box)
+            for location in locations:
+                box.Add(prototype_box.Transformed(location.wrapped.Transformation()))
+        return BoundBox(box)
+
+    def faces(self, key, query):
+        """
+        Run query (shape -> ShapeList) once on the prototype and return the
+        result located at every instance of it.
+        """
+        cache_key = (key, query)
+        if cache_key not in self._queries:
+            self._queries[cache_key] = query(self.prototype(key))
+        return [
+            instance(face, location)
+            for location in self._locations[key]
+            for face in self._queries[cache_key]
+        ]
+
+    def mesh(self, key, tolerance=0.1, angular_tolerance=0.2):
+        """
+        Prototype tessellation as (vertices, triangles) arrays, in the
+        prototype's coordinates and cached on disk across runs
+        """
+        from cad.cache.mesh import tessellate
+
+        cache_key = (key, tolerance, angular_tolerance)
+        if cache_key not in self._meshes:
+            self._meshes[cache_key] = tessellate(
+                self.prototype(key), tolerance, angular_tolerance
+            )
+        return self._meshes[cache_key]
+
+    def tessellate(self, tolerance=0.1, angular_tolerance=0.2):
+        """
+        Yield (key, vertices, triangles, matrices): each prototype mesh is
+        computed once together with the 4x4 transforms of its instances.
+        """
+        for key, locations in self._locations.items():
+            vertices, triangles = self.mesh(key, tolerance, angular_tolerance)
+            # The mesh excludes the prototype's own location
+            prototype = location_matrix(self.prototype(key).location)
+            matrices = np.array([location_matrix(loc) @ prototype for loc in locations])
+            yield key, vertices, triangles, matrices
+
+    def flat_mesh(self, tolerance=0.1, angular_tolerance=0.2):
+        """Single vertex/triangle array pair with every instance expanded"""
+        all_vertices = []
+        all_triangles = []
+        offset = 0
+        for _, vertices, triangles, matrices in self.tessellate(
+            tolerance, angular_tolerance
+        ):
+            # (instances, vertices, 3) in one batched transform
+            placed = vertices @ matrices[:, :3, :3].transpose(0, 2, 1)
+            placed += matrices[:, None, :3, 3]
+            for block in placed:
+                all_vertices.append(block)
+                all_triangles.append(triangles + offset)
+                offset += len(block)
+        if not all_vertices:
+            return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.uint32)
+        return np.concatenate(all_vertices), np.concatenate(all_triangles)
+
+    def export(self, directory):
+        """Write each prototype once as BREP plus instances.json of locations"""
+        os.makedirs(directory, exist_ok=True)
+        manifest = []
+        for index, (key, locations) in enumerate(self._locations.items()):
+            file_name = f"prototype_{index}.brep"
+            export_brep(self.prototype(key), os.path.join(directory, file_name))
+            manifest.append(
+                {
+                    "key": str(key),
+                    "brep": file_name,
+                    "matrices": [location_matrix(loc).tolist() for loc in locations],
+                }
+            )
+        with open(os.path.join(directory, "instances.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
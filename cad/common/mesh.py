@@ -0,0 +1,323 @@
+"""
+Mesh export of assemblies. Repeated parts, located copies sharing a TShape
+such as the instances of an InstancedPanel, are tessellated once through the
+tessellation cache and written once: glTF gets one mesh per unique part and
+a node per placement, STL streams the placed copies of each mesh.
+
+    export_gltf(korry.assembly("DECEL", "ON"), "korry.glb")
+    export_gltf(panel, "autobrake.gltf")          # plus autobrake.bin
+    export_stl(panel, "autobrake.stl")
+
+glTF is written in meters with Y up, STL in millimeters with Z up.
+"""
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from cad.cache.mesh import _identity, _unlocated, tessellate
+from cad.tracing import traced
+
+
+@dataclass
+class MeshPart:
+    """A mesh in its own coordinates and the (n, 4, 4) transforms placing it"""
+
+    name: str
+    vertices: np.ndarray
+    triangles: np.ndarray
+    matrices: np.ndarray
+    color: Optional[Tuple[float, float, float, float]] = None
+
+
+def _matrix(topods_location):
+    trsf = topods_location.Transformation()
+    return np.array(
+        [[trsf.Value(r, c) for c in range(1, 5)] for r in range(1, 4)] + [[0, 0, 0, 1]]
+    )
+
+
+class _ShapeMap:
+    """Values by TShape, ignoring location and orientation"""
+
+    def __init__(self):
+        self._entries = {}
+
+    def _bucket(self, topods_shape):
+        return self._entries.setdefault(_identity(_unlocated(topods_shape)), [])
+
+    def get(self, topods_shape):
+        for known, value in self._bucket(topods_shape):
+            if known.IsPartner(topods_shape):
+                return value
+        return None
+
+    def set(self, topods_shape, value):
+        self._bucket(topods_shape).append((topods_shape, value))
+
+
+def _leaves(topods_shape, node=None, color=None, label=""):
+    """
+    (shape, color, label) of every non compound sub-shape, located in the
+    root's coordinates. Colors and labels come from the matching build123d
+    node, or the nearest parent that has one.
+    """
+    from OCP.TopAbs import TopAbs_COMPOUND
+    from OCP.TopoDS import TopoDS_Iterator
+
+    if getattr(node, "color", None) is not None:
+        color = tuple(node.color.to_tuple())
+    label = getattr(node, "label", "") or label
+    if topods_shape.ShapeType() != TopAbs_COMPOUND:
+        yield topods_shape, color, label
+        return
+    # Children come with their parents' locations composed in
+    shapes = []
+    iterator = TopoDS_Iterator(topods_shape)
+    while iterator.More():
+        shapes.append(iterator.Value())
+        iterator.Next()
+    # Compound(children=...) keeps the children's order. Copies of an
+    # assembly hold copied children, so pair them by position, not TShape.
+    children = list(getattr(node, "children", ()))
+    if len(children) != len(shapes):
+        children = [None] * len(shapes)
+    for shape, child in zip(shapes, children):
+        yield from _leaves(shape, child, color, label)
+
+
+@traced()
+def shape_parts(shape, tolerance=0.1, angular_tolerance=0.2) -> List[MeshPart]:
+    """Meshes of the unique parts of a shape or assembly and their placements"""
+    groups = _ShapeMap()
+    parts = []
+    for leaf, color, label in _leaves(shape.wrapped, shape):
+        group = groups.get(leaf)
+        if group is None:
+            group = (leaf, color, label, [])
+            groups.set(leaf, group)
+            parts.append(group)
+        group[3].append(_matrix(leaf.Location()))
+
+    mesh_parts = []
+    for index, (leaf, color, label, matrices) in enumerate(parts):
+        vertices, triangles = tessellate(leaf, tolerance, angular_tolerance)
+        if not len(triangles):
+            continue
+        mesh_parts.append(
+            MeshPart(
+                label or f"part_{index}",
+                vertices,
+                triangles,
+                np.array(matrices),
+                color,
+            )
+        )
+    return mesh_parts
+
+
+def mesh_parts(shape_or_panel, tolerance=0.1, angular_tolerance=0.2):
+    """
+    MeshPart list of a shape or an InstancedPanel, whose prototypes are
+    tessellated once for all their instances
+    """
+    from cad.common.instancing import location_matrix
+
+    keys = getattr(shape_or_panel, "keys", None)
+    if keys is None:
+        return shape_parts(shape_or_panel, tolerance, angular_tolerance)
+    panel = shape_or_panel
+    parts = []
+    for key in keys():
+        matrices = np.array([location_matrix(loc) for loc in panel.locations(key)])
+        prototype_parts = shape_parts(
+            panel.prototype(key), tolerance, angular_tolerance
+        )
+        for part in prototype_parts:
+            if len(prototype_parts) == 1:
+                part.name = str(key)
+            # Every placement of the panel instance times every sub-part one
+            part.matrices = (matrices[:, None] @ part.matrices[None]).reshape(-1, 4, 4)
+            parts.append(part)
+    return parts
+
+
+# Z up millimeters to glTF's Y up meters, column major
+_gltf_root = (
+    np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, -1, 0, 0], [0, 0, 0, 1]], dtype=float)
+    @ np.diag([1e-3, 1e-3, 1e-3, 1])
+).T.ravel()
+_default_color = (0.7, 0.7, 0.7, 1.0)
+_FLOAT, _UNSIGNED_INT = 5126, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+
+def _gltf(parts):
+    """glTF document and its binary buffer"""
+    chunks = []
+    offset = 0
+
+    def view(array, target):
+        nonlocal offset
+        data = np.ascontiguousarray(array).tobytes()
+        chunks.append(data)
+        views.append(
+            {
+                "buffer": 0,
+                "byteOffset": offset,
+                "byteLength": len(data),
+                "target": target,
+            }
+        )
+        # float32 and uint32 data keeps every view 4 byte aligned
+        offset += len(data)
+        return len(views) - 1
+
+    views = []
+    accessors = []
+    meshes = []
+    materials = []
+    material_indices = {}
+    nodes = [{"name": "root", "matrix": _gltf_root.tolist(), "children": []}]
+    for part in parts:
+        vertices = np.asarray(part.vertices, dtype=np.float32)
+        triangles = np.asarray(part.triangles, dtype=np.uint32)
+        accessors.append(
+            {
+                "bufferView": view(vertices, _ARRAY_BUFFER),
+                "componentType": _FLOAT,
+                "count": len(vertices),
+                "type": "VEC3",
+                "min": vertices.min(axis=0).tolist(),
+                "max": vertices.max(axis=0).tolist(),
+            }
+        )
+        accessors.append(
+            {
+                "bufferView": view(triangles, _ELEMENT_ARRAY_BUFFER),
+                "componentType": _UNSIGNED_INT,
+                "count": triangles.size,
+                "type": "SCALAR",
+            }
+        )
+        color = tuple(part.color or _default_color)
+        if color not in material_indices:
+            material_indices[color] = len(materials)
+            materials.append(
+                {
+                    "pbrMetallicRoughness": {
+                        "baseColorFactor": list(color),
+                        "metallicFactor": 0.0,
+                        "roughnessFactor": 0.8,
+                    },
+                    "doubleSided": False,
+                }
+            )
+            if color[3] < 1:
+                materials[-1]["alphaMode"] = "BLEND"
+        meshes.append(
+            {
+                "name": part.name,
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": len(accessors) - 2},
+                        "indices": len(accessors) - 1,
+                        "material": material_indices[color],
+                    }
+                ],
+            }
+        )
+        for matrix in part.matrices:
+            nodes[0]["children"].append(len(nodes))
+            nodes.append(
+                {
+                    "name": part.name,
+                    "mesh": len(meshes) - 1,
+                    "matrix": np.asarray(matrix, dtype=float).T.ravel().tolist(),
+                }
+            )
+
+    document = {
+        "asset": {"version": "2.0", "generator": "a320 cad.common.mesh"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "materials": materials,
+        "accessors": accessors,
+        "bufferViews": views,
+        "buffers": [{"byteLength": offset}],
+    }
+    return document, b"".join(chunks)
+
+
+def _padded(data, fill):
+    return data + fill * (-len(data) % 4)
+
+
+@traced()
+def export_gltf(shape_or_panel, path, tolerance=0.1, angular_tolerance=0.2):
+    """
+    Write a .glb, or a .gltf with its buffer in a .bin file next to it. Each
+    unique part is stored once and referenced by a node per placement.
+    """
+    parts = mesh_parts(shape_or_panel, tolerance, angular_tolerance)
+    document, buffer = _gltf(parts)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".gltf"):
+        buffer_path = os.path.splitext(path)[0] + ".bin"
+        document["buffers"][0]["uri"] = os.path.basename(buffer_path)
+        with open(buffer_path, "wb") as f:
+            f.write(buffer)
+        with open(path, "w") as f:
+            json.dump(document, f)
+        return path
+
+    content = _padded(json.dumps(document, separators=(",", ":")).encode(), b" ")
+    buffer = _padded(buffer, b"\0")
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, 28 + len(content) + len(buffer)))
+        f.write(struct.pack("<I4s", len(content), b"JSON"))
+        f.write(content)
+        f.write(struct.pack("<I4s", len(buffer), b"BIN\0"))
+        f.write(buffer)
+    return path
+
+
+_stl_dtype = np.dtype(
+    [("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+
+
+@traced()
+def export_stl(shape_or_panel, path, tolerance=0.1, angular_tolerance=0.2):
+    """
+    Write a binary STL with every placement expanded, one placement at a
+    time so memory stays at the size of the largest part
+    """
+    parts = mesh_parts(shape_or_panel, tolerance, angular_tolerance)
+    count = sum(len(part.triangles) * len(part.matrices) for part in parts)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"a320 cad.common.mesh".ljust(80, b" "))
+        f.write(struct.pack("<I", count))
+        for part in parts:
+            vertices = np.asarray(part.vertices, dtype=np.float64)
+            triangles = np.asarray(part.triangles, dtype=np.intp)
+            records = np.zeros(len(triangles), dtype=_stl_dtype)
+            for matrix in part.matrices:
+                placed = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+                corners = placed[triangles]
+                normals = np.cross(
+                    corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+                )
+                lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+                records["normal"] = np.divide(
+                    normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+                )
+                records["vertices"] = corners
+                f.write(records.tobytes())
+    return path
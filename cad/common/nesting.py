@@ -0,0 +1,269 @@
+"""
+Nesting of multiple parts onto stock sheets for a single CAM job.
+
+    korry = KorrySwitch(19.5, 19.5)
+    sheets = nest(
+        [NestItem(korry.sleeve(4), 6), NestItem(korry.slider(3), 6)],
+        Sheet(150, 100),
+    )
+    job = sheet_job(sheets[0], Endmill(diameter=1))
+"""
+import copy
+from dataclasses import dataclass
+from typing import List, Optional
+
+from build123d import Axis, Compound, Face, Location, Shape
+
+from cad.common.topology import TopologyIndex
+
+
+@dataclass
+class NestItem:
+    part: Shape
+    quantity: int = 1
+    name: str = ""
+
+    def __post_init__(self):
+        # Accept builders as returned by KorrySwitch directly
+        self.part = getattr(self.part, "part", self.part)
+
+
+@dataclass
+class Sheet:
+    """Stock sheet size, edge margin and minimum gap between parts in mm"""
+
+    width: float
+    height: float
+    margin: float = 5.0
+    spacing: float = 3.5
+
+
+@dataclass
+class Placement:
+    item: NestItem
+    x: float
+    y: float
+    rotated: bool = False
+
+    def location(self):
+        return Location((self.x, self.y, 0), (0, 0, 90 if self.rotated else 0))
+
+    def part(self):
+        """Instance of the item's part sharing its geometry"""
+        part = copy.copy(self.item.part)
+        part.locate(self.location() * part.location)
+        return part
+
+
+def footprint(part: Shape) -> Face:
+    """Outer XY outline of a prismatic part as a face, holes filled"""
+    faces = part.faces().filter_by(Axis.Z)
+    largest = max(faces, key=lambda f: Face(f.outer_wire()).area)
+    outline = Face(largest.outer_wire())
+    bottom = outline.bounding_box().min.Z
+    return outline.moved(Location((0, 0, -bottom)))
+
+
+class _Footprint:
+    """Footprint of an item for one orientation, normalized to (0, 0)"""
+
+    def __init__(self, item: NestItem, rotated: bool):
+        face = footprint(item.part)
+        if rotated:
+            face = face.rotate(Axis.Z, 90)
+        box = face.bounding_box()
+        self.item = item
+        self.rotated = rotated
+        self.offset = (-box.min.X, -box.min.Y)
+        self.face = face.moved(Location((*self.offset, 0)))
+        self.width = box.size.X
+        self.height = box.size.Y
+
+    def placement(self, x, y):
+        return Placement(
+            self.item, x + self.offset[0], y + self.offset[1], self.rotated
+        )
+
+
+def _expanded(items):
+    return [item for item in items for _ in range(item.quantity)]
+
+
+def _orientations(items, rotate):
+    orientations = {}
+    for item in items:
+        orientations[id(item)] = [_Footprint(item, False)]
+        if rotate:
+            orientations[id(item)].append(_Footprint(item, True))
+    return orientations
+
+
+def shelf_pack(items: List[NestItem], sheet: Sheet, rotate=True):
+    """
+    First fit decreasing height shelf packing of the items' bounding boxes.
+    Returns a list of sheets, each a list of placements.
+    """
+    usable_width = sheet.width - 2 * sheet.margin
+    usable_height = sheet.height - 2 * sheet.margin
+    footprints = _orientations(items, rotate)
+
+    def best(item):
+        # Prefer the orientation giving the lowest shelf
+        fitting = [
+            f
+            for f in footprints[id(item)]
+            if f.width <= usable_width and f.height <= usable_height
+        ]
+        if not fitting:
+            raise ValueError(f"{item.name or 'part'} does not fit the sheet")
+        return min(fitting, key=lambda f: (f.height, f.width))
+
+    queue = sorted(_expanded(items), key=lambda item: -best(item).height)
+    sheets = []
+    while queue:
+        shelves = []  # [y, height, next_x]
+        placements = []
+        remaining = []
+        for item in queue:
+            fp = best(item)
+            for shelf in shelves:
+                y, height, next_x = shelf
+                if fp.height <= height and next_x + fp.width <= usable_width:
+                    placements.append(
+                        fp.placement(sheet.margin + next_x, sheet.margin + y)
+                    )
+                    shelf[2] += fp.width + sheet.spacing
+                    break
+            else:
+                y = shelves[-1][0] + shelves[-1][1] + sheet.spacing if shelves else 0
+                if y + fp.height <= usable_height:
+                    shelves.append([y, fp.height, fp.width + sheet.spacing])
+                    placements.append(fp.placement(sheet.margin, sheet.margin + y))
+                else:
+                    remaining.append(item)
+        sheets.append(placements)
+        queue = remaining
+    return sheets
+
+
+def outline_pack(
+    items: List[NestItem], sheet: Sheet, rotate=True, resolution=0.5
+) -> List[List[Placement]]:
+    """
+    Bottom-left fill of the true outlines. Each part starts from candidate
+    corners next to already placed parts and is then slid down and left
+    for as long as its outline keeps the required gap to its neighbours.
+    """
+    orientations = _orientations(items, rotate)
+    queue = sorted(
+        _expanded(items), key=lambda item: -orientations[id(item)][0].face.area
+    )
+
+    x_max = sheet.width - sheet.margin
+    y_max = sheet.height - sheet.margin
+    sheets = []
+    while queue:
+        placed = []  # (x, y, footprint)
+        remaining = []
+
+        def fits(fp, x, y):
+            if x < sheet.margin or y < sheet.margin:
+                return False
+            if x + fp.width > x_max or y + fp.height > y_max:
+                return False
+            moved = None
+            for px, py, other in placed:
+                if (
+                    x > px + other.width + sheet.spacing
+                    or px > x + fp.width + sheet.spacing
+                    or y > py + other.height + sheet.spacing
+                    or py > y + fp.height + sheet.spacing
+                ):
+                    continue
+                if moved is None:
+                    moved = fp.face.moved(Location((x, y, 0)))
+                neighbour = other.face.moved(Location((px, py, 0)))
+                if moved.distance_to(neighbour) < sheet.spacing:
+                    return False
+            return True
+
+        def slide(fp, x, y):
+            moved = True
+            while moved:
+                moved = False
+                while fits(fp, x, y - resolution):
+                    y -= resolution
+                    moved = True
+                while fits(fp, x - resolution, y):
+                    x -= resolution
+                    moved = True
+            return x, y
+
+        for item in queue:
+            best = None
+            for fp in orientations[id(item)]:
+                candidates = {(sheet.margin, sheet.margin)}
+                for px, py, other in placed:
+                    candidates.add((px + other.width + sheet.spacing, py))
+                    candidates.add((px, py + other.height + sheet.spacing))
+                    candidates.add((sheet.margin, py + other.height + sheet.spacing))
+                for x, y in sorted(candidates, key=lambda c: (c[1], c[0])):
+                    if fits(fp, x, y):
+                        x, y = slide(fp, x, y)
+                        if best is None or (y, x) < (best[1], best[0]):
+                            best = (x, y, fp)
+                        break
+            if best is None:
+                remaining.append(item)
+            else:
+                placed.append(best)
+
+        if not placed:
+            raise ValueError(f"{queue[0].name or 'part'} does not fit the sheet")
+        sheets.append([fp.placement(x, y) for x, y, fp in placed])
+        queue = remaining
+    return sheets
+
+
+def nest(items: List[NestItem], sheet: Sheet, rotate=True, outline=True):
+    """
+    Shelf pack the bounding boxes, then try true outline packing and keep
+    whichever puts more parts on the first sheet (fewer setups overall).
+    """
+    sheets = shelf_pack(items, sheet, rotate)
+    if outline:
+        candidate = outline_pack(items, sheet, rotate)
+        if (len(candidate[0]), -len(candidate)) > (len(sheets[0]), -len(sheets)):
+            sheets = candidate
+    return sheets
+
+
+def sheet_compound(placements: List[Placement]) -> Compound:
+    return Compound(children=[placement.part() for placement in placements])
+
+
+def sheet_job(
+    placements: List[Placement],
+    endmill,
+    pocket_level: Optional[int] = None,
+    tabs=True,
+    postprocessor="grbl",
+):
+    """
+    One CAM job cutting every part on the sheet: an optional offset pocket
+    of the faces at the given Z level (as in cnc_diffusers) followed by a
+    profile of all top faces, held in place by tabs.
+    """
+    from ocp_freecad_cam import Job
+    from ocp_freecad_cam.api import Tab
+
+    thicknesses = {round(p.item.part.bounding_box().size.Z, 3) for p in placements}
+    if len(thicknesses) > 1:
+        raise ValueError(f"Parts on one sheet need equal stock, got {thicknesses}")
+
+    compound = sheet_compound(placements)
+    faces = TopologyIndex(compound)
+    job = Job(faces.bottom(), compound, postprocessor)
+    if pocket_level is not None:
+        job = job.pocket(faces.level(pocket_level), endmill, pattern="offset")
+    return job.profile(faces.level(-1), endmill, dressups=[Tab()] if tabs else [])
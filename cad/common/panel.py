@@ -0,0 +1,226 @@
+"""
+Lazy panel model. A panel is a tree of Part leaves, which only describe a
+part (the builder method making it and its arguments), and Assembly nodes
+placing their children. Nothing is built until a node's shape is asked
+for; every node then keeps its shape, and parts with the same builder and
+arguments share one prototype anywhere in the tree. Updating a part's
+arguments marks it and its ancestors dirty: the next build rebuilds that
+part alone and re-places the kept shapes of everything else.
+
+    panel = Assembly("autobrake")
+    panel.add(korry.assembly_node("DECEL", "ON", "decel"), Location((0, 0, 0)))
+    panel.add(korry.assembly_node("UNLK", "ON", "unlk"), Location((22, 0, 0)))
+    panel.find("unlk/diffuser_upper").update(text="LO")
+    panel.find("unlk").part                    # builds one switch only
+    export_gltf(panel.instanced(), "autobrake.glb")
+    panel.instanced(lambda p: p.name.startswith("diffuser")).compound()
+"""
+from dataclasses import is_dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from build123d import Compound, Location, Shape
+
+from cad.cache import instance_state
+from cad.common.instancing import InstancedPanel, instance
+from cad.tracing import span
+
+
+class Node:
+    def __init__(self, name: str):
+        self.name = name
+        self.parent: Optional["Assembly"] = None
+        # Number of times the node's own shape was (re)built
+        self.builds = 0
+        self._shape = None
+        self._prototypes = {}
+
+    def __repr__(self):
+        state = "dirty" if self.dirty else "built"
+        return f"{type(self).__name__}({self.path() or self.name!r}, {state})"
+
+    @property
+    def dirty(self) -> bool:
+        return self._shape is None
+
+    def root(self) -> "Node":
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def path(self) -> str:
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+    def invalidate(self):
+        """Drop the shape of this node and of its ancestors"""
+        node = self
+        while node is not None:
+            node._shape = None
+            node = node.parent
+
+    def shape(self) -> Shape:
+        if self._shape is None:
+            with span(self.path() or self.name, "panel", kind=type(self).__name__):
+                self._shape = self._build()
+            self.builds += 1
+        return self._shape
+
+    @property
+    def part(self) -> Shape:
+        """The built shape, as for builders"""
+        return self.shape()
+
+    def _build(self) -> Shape:
+        raise NotImplementedError
+
+
+def _describe(builder, args, kwargs):
+    arguments = ", ".join(
+        [repr(a) for a in args] + [f"{k}={v!r}" for k, v in sorted(kwargs.items())]
+    )
+    owner = getattr(builder, "__self__", None)
+    if is_dataclass(owner):
+        # Class constants like KorrySwitch.slider_tolerance included
+        state = ", ".join(f"{k}={v}" for k, v in instance_state(owner).items())
+        return f"{type(owner).__name__}({state}).{builder.__name__}({arguments})"
+    if owner is not None:
+        return f"{owner!r}.{builder.__name__}({arguments})"
+    name = f"{builder.__module__}.{builder.__qualname__}"
+    if builder.__name__ == "<lambda>":
+        # Distinct lambdas must not share a prototype
+        name += f"@{id(builder):x}"
+    return f"{name}({arguments})"
+
+
+class Part(Node):
+    """
+    Leaf built by calling builder(*args, **kwargs), which returns a shape or
+    a builder. Parts with equal keys share their prototype; the key defaults
+    to a description of the call, reprs of the builder's owner included.
+    """
+
+    def __init__(self, name: str, builder: Callable, *args, key=None, **kwargs):
+        super().__init__(name)
+        self.builder = builder
+        self.args = args
+        self.kwargs = kwargs
+        self._key = key
+
+    @property
+    def key(self) -> str:
+        if self._key is not None:
+            return self._key
+        return _describe(self.builder, self.args, self.kwargs)
+
+    def update(self, *args, **kwargs) -> "Part":
+        """Change the builder's arguments, invalidating only when they differ"""
+        new_args = args or self.args
+        new_kwargs = {**self.kwargs, **kwargs}
+        if new_args != self.args or new_kwargs != self.kwargs:
+            self.args = new_args
+            self.kwargs = new_kwargs
+            self._key = None
+            self.invalidate()
+        return self
+
+    def _build(self) -> Shape:
+        prototypes = self.root()._prototypes
+        key = self.key
+        shape = prototypes.get(key)
+        if shape is None:
+            built = self.builder(*self.args, **self.kwargs)
+            shape = prototypes[key] = getattr(built, "part", built)
+        return shape
+
+
+class Assembly(Node):
+    """Children placed at locations relative to the assembly"""
+
+    def __init__(self, name: str, children=()):
+        super().__init__(name)
+        self.children: List[Tuple[Node, Location]] = []
+        for node, location in children:
+            self.add(node, location)
+
+    def add(self, node: Node, location: Location = None) -> "Assembly":
+        if node.parent is not None:
+            raise ValueError(f"{node.name} is already part of {node.parent.name}")
+        if any(child.name == node.name for child, _ in self.children):
+            raise ValueError(f"{self.name} already has a child named {node.name}")
+        node.parent = self
+        self.children.append((node, location or Location()))
+        self.invalidate()
+        return self
+
+    def remove(self, name: str) -> Node:
+        node = self[name]
+        self.children = [(c, loc) for c, loc in self.children if c is not node]
+        node.parent = None
+        self.invalidate()
+        return node
+
+    def place(self, name: str, location: Location):
+        """Move a child, keeping its shape"""
+        node = self[name]
+        self.children = [
+            (c, location if c is node else loc) for c, loc in self.children
+        ]
+        self.invalidate()
+
+    def __getitem__(self, name: str) -> Node:
+        for node, _ in self.children:
+            if node.name == name:
+                return node
+        raise KeyError(f"{self.path() or self.name} has no child {name}")
+
+    def __iter__(self):
+        return (node for node, _ in self.children)
+
+    def find(self, path: str) -> Node:
+        """Descendant by "/" separated names"""
+        node = self
+        for name in path.split("/"):
+            node = node[name]
+        return node
+
+    def walk(self, location: Location = None) -> Iterator[Tuple[Part, Location]]:
+        """Every Part below the assembly and its location, nothing is built"""
+        location = location or Location()
+        for node, node_location in self.children:
+            if isinstance(node, Assembly):
+                yield from node.walk(location * node_location)
+            else:
+                yield node, location * node_location
+
+    def parts(self) -> List[Part]:
+        return [part for part, _ in self.walk()]
+
+    def dirty_parts(self) -> List[Part]:
+        """Parts without a shape, built or given a shared prototype next time"""
+        return [part for part in self.parts() if part.dirty]
+
+    def _build(self) -> Shape:
+        shapes = []
+        for node, location in self.children:
+            placed = instance(node.shape(), location)
+            placed.label = node.name
+            shapes.append(placed)
+        compound = Compound(children=shapes)
+        compound.label = self.name
+        return compound
+
+    def instanced(self, select: Callable[[Part], bool] = None) -> InstancedPanel:
+        """
+        InstancedPanel of the selected parts, keyed by prototype. Parts are
+        only built when the panel's prototypes are asked for.
+        """
+        panel = InstancedPanel()
+        for part, location in self.walk():
+            if select is None or select(part):
+                panel.add(part.key, part.shape, location)
+        return panel
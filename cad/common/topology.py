@@ -0,0 +1,124 @@
+"""
+Topology index of a part: face centers, normals, areas and geometry types
+computed once into arrays, so the selections of the CAM scripts do not
+recompute every face's center on each group_by()/sort_by() call.
+
+    index = TopologyIndex(sleeve.part)
+    top = index.top()
+    mid = index.level(1) + index.level(3)
+    down = index.facing((0, 0, -1))
+
+Levels are grouped and ordered like ShapeList.group_by(Axis.Z), so
+index.level(n) is faces().group_by()[n] and index.bottom() is
+faces().sort_by()[0].
+"""
+from functools import cached_property
+
+import numpy as np
+from build123d import GeomType, Shape, ShapeList, Vector
+from OCP.BRepGProp import BRepGProp
+from OCP.GProp import GProp_GProps
+
+
+class LevelIndex:
+    """Shapes grouped by the Z coordinate of their centers"""
+
+    def __init__(self, shapes, tol_digits=6, centers=None):
+        self.shapes = ShapeList(shapes)
+        if centers is None:
+            centers = [shape.center().to_tuple() for shape in self.shapes]
+        self.centers = np.array(centers, dtype=np.float64).reshape(-1, 3)
+        self.tol_digits = tol_digits
+        keys = np.round(self.centers[:, 2], tol_digits)
+        # Stable, so shapes keep their order within a level like group_by
+        self.order = np.argsort(keys, kind="stable")
+        self.levels, starts = np.unique(keys[self.order], return_index=True)
+        self._bounds = np.append(starts, len(self.order))
+        self._level_of = np.empty(len(self.order), dtype=np.intp)
+        for n in range(len(self.levels)):
+            self._level_of[self.order[self._bounds[n] : self._bounds[n + 1]]] = n
+
+    def __len__(self):
+        return len(self.levels)
+
+    def _indices(self, n):
+        if n < 0:
+            n += len(self.levels)
+        if not 0 <= n < len(self.levels):
+            raise IndexError(f"Level {n} out of range, {len(self.levels)} levels")
+        return self.order[self._bounds[n] : self._bounds[n + 1]]
+
+    def _select(self, indices):
+        # A new list every time, callers extend the result with +=
+        return ShapeList(self.shapes[i] for i in indices)
+
+    def level(self, n) -> ShapeList:
+        """Shapes at the n-th lowest level, negative n counts from the top"""
+        return self._select(self._indices(n))
+
+    def at_z(self, z, tolerance=1e-6) -> ShapeList:
+        """Shapes whose centers lie at height z"""
+        n = int(np.searchsorted(self.levels, z - tolerance))
+        if n == len(self.levels) or self.levels[n] > z + tolerance:
+            return ShapeList()
+        return self.level(n)
+
+    def level_of(self, shape: Shape) -> int:
+        for i, candidate in enumerate(self.shapes):
+            if candidate.is_same(shape):
+                return int(self._level_of[i])
+        raise KeyError(shape)
+
+    def bottom(self) -> Shape:
+        """First of the lowest shapes, as faces().sort_by()[0]"""
+        return self.shapes[self.order[0]]
+
+    def top(self) -> Shape:
+        """First of the highest shapes, as faces().group_by()[-1][0]"""
+        return self.shapes[self._indices(-1)[0]]
+
+
+class TopologyIndex(LevelIndex):
+    """Faces of a shape by level, plus their normals, areas and types"""
+
+    def __init__(self, shape: Shape, tol_digits=6):
+        self.shape = shape
+        faces = shape.faces()
+        self.types = np.array([face.geom_type for face in faces], dtype=object)
+        self.planar = self.types == GeomType.PLANE
+        self.areas = np.empty(len(faces))
+        # Curved faces have no single normal, they never match facing()
+        self.normals = np.full((len(faces), 3), np.nan)
+        centers = []
+        for i, face in enumerate(faces):
+            # One surface integration gives both the area and, for planar
+            # faces, the same center as Face.center()
+            properties = GProp_GProps()
+            BRepGProp.SurfaceProperties_s(face.wrapped, properties)
+            self.areas[i] = properties.Mass()
+            if self.planar[i]:
+                centers.append(Vector(properties.CentreOfMass()).to_tuple())
+                self.normals[i] = face.normal_at().to_tuple()
+            else:
+                centers.append(face.center().to_tuple())
+        super().__init__(faces, tol_digits, centers)
+
+    @cached_property
+    def edges(self) -> LevelIndex:
+        """Edges of the shape by level, indexed on first use"""
+        return LevelIndex(self.shape.edges(), self.tol_digits)
+
+    def facing(self, direction, tolerance=1e-6) -> ShapeList:
+        """Planar faces whose normal points along direction"""
+        direction = np.array(direction, dtype=np.float64)
+        direction /= np.linalg.norm(direction)
+        matches = self.normals @ direction > 1 - tolerance
+        return self._select(i for i in self.order if matches[i])
+
+    def of_type(self, geom_type: GeomType) -> ShapeList:
+        return self._select(i for i in self.order if self.types[i] == geom_type)
+
+    def largest(self, n=None) -> Shape:
+        """Face with the largest area, or of level n"""
+        indices = self.order if n is None else self._indices(n)
+        return self.shapes[indices[np.argmax(self.areas[indices])]]
@@ -0,0 +1,492 @@
+"""
+Batch export of 2D footprints to DXF and SVG. A Drawing collects named
+shapes and their placements; each shape is converted to lines, arcs,
+circles and polylines once, however often it is placed. Repeated shapes
+become DXF blocks or SVG <use> references in one shared document, or every
+shape is written to its own file on a pool of writer processes.
+
+    drawing = Drawing()
+    drawing.add("slider", korry.slider_footprint, Location((0, 0)), "cut")
+    drawing.add("decel", lambda: korry.legend("DECEL"), Location((30, 0)), "engrave")
+    drawing.write_dxf("overlay.dxf")
+    drawing.write_svg("overlay.svg")
+    drawing.write_files("footprints/", "dxf")
+
+    python -m cad.dxf.drawing --compare     # against one save_dxf per shape
+"""
+import argparse
+import math
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import quoteattr
+
+from cad.tracing import span, traced
+
+# Primitives in the shape's XY plane, plain tuples so writer processes can
+# receive them: ("line", start, end), ("arc", center, radius, start angle,
+# end angle) counterclockwise in degrees, ("circle", center, radius) and
+# ("polyline", points, closed)
+LINE, ARC, CIRCLE, POLYLINE = "line", "arc", "circle", "polyline"
+
+# Curves other than lines and circles are approximated within this
+_deflection = 0.005
+
+
+def _point(vector):
+    return (round(vector.X, 9), round(vector.Y, 9))
+
+
+def _discretized(edge):
+    from OCP.BRepAdaptor import BRepAdaptor_Curve
+    from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+
+    curve = BRepAdaptor_Curve(edge.wrapped)
+    points = GCPnts_QuasiUniformDeflection(curve, _deflection)
+    values = [points.Value(i) for i in range(1, points.NbPoints() + 1)]
+    return [(round(p.X(), 9), round(p.Y(), 9)) for p in values]
+
+
+def edge_primitive(edge):
+    from build123d import GeomType
+
+    if edge.geom_type == GeomType.LINE:
+        return (LINE, _point(edge @ 0), _point(edge @ 1))
+    if edge.geom_type == GeomType.CIRCLE:
+        center = _point(edge.arc_center)
+        if edge.is_closed:
+            return (CIRCLE, center, edge.radius)
+
+        def angle(vector):
+            return math.atan2(vector.Y - center[1], vector.X - center[0])
+
+        start, middle, end = (angle(edge @ t) for t in (0, 0.5, 1))
+        sweep = (end - start) % math.tau
+        counterclockwise = (middle - start) % math.tau < sweep
+        if not counterclockwise:
+            start, end = end, start
+        return (ARC, center, edge.radius, math.degrees(start), math.degrees(end))
+    return (POLYLINE, _discretized(edge), edge.is_closed)
+
+
+def primitives(shape):
+    """Primitives of every edge of a 2D shape, sketch or planar face"""
+    return [edge_primitive(edge) for edge in shape.edges()]
+
+
+def _placement(location):
+    """(x, y, degrees) of a location rotated about Z"""
+    if location is None:
+        return (0.0, 0.0, 0.0)
+    trsf = location.wrapped.Transformation()
+    angle = math.degrees(math.atan2(trsf.Value(2, 1), trsf.Value(1, 1)))
+    return (trsf.Value(1, 4), trsf.Value(2, 4), angle)
+
+
+def _transform(point, placement):
+    x, y, angle = placement
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    return (x + point[0] * cos - point[1] * sin, y + point[0] * sin + point[1] * cos)
+
+
+def _arc_points(center, radius, start, end):
+    """Start, end and the axis extremes a counterclockwise arc passes"""
+    sweep = (end - start) % 360 or 360
+    angles = [start, start + sweep]
+    quadrant = math.floor(start / 90) * 90 + 90
+    angles += range(quadrant, math.ceil(start + sweep), 90)
+    return [
+        (
+            center[0] + radius * math.cos(math.radians(a)),
+            center[1] + radius * math.sin(math.radians(a)),
+        )
+        for a in angles
+    ]
+
+
+def bounds(items, placement=(0.0, 0.0, 0.0)):
+    """((min x, min y), (max x, max y)) of placed primitives"""
+    points = []
+    for item in items:
+        kind = item[0]
+        if kind == LINE:
+            points += item[1:3]
+        elif kind == ARC:
+            points += _arc_points(*item[1:])
+        elif kind == CIRCLE:
+            points += _arc_points(item[1], item[2], 0, 360)
+        else:
+            points += item[1]
+    placed = [_transform(p, placement) for p in points]
+    if not placed:
+        return None
+    xs, ys = zip(*placed)
+    return (min(xs), min(ys)), (max(xs), max(ys))
+
+
+def _block_name(name):
+    return re.sub(r'[<>/\\":;?*|=,`\s]', "_", str(name))
+
+
+def _dxf_entities(layout, items, placement=None, attributes=None):
+    attributes = attributes or {}
+    move = (lambda p: _transform(p, placement)) if placement else (lambda p: p)
+    rotation = placement[2] if placement else 0.0
+    for item in items:
+        kind = item[0]
+        if kind == LINE:
+            layout.add_line(move(item[1]), move(item[2]), dxfattribs=attributes)
+        elif kind == ARC:
+            _, center, radius, start, end = item
+            layout.add_arc(
+                move(center),
+                radius,
+                start + rotation,
+                end + rotation,
+                dxfattribs=attributes,
+            )
+        elif kind == CIRCLE:
+            layout.add_circle(move(item[1]), item[2], dxfattribs=attributes)
+        else:
+            layout.add_lwpolyline(
+                [move(p) for p in item[1]], close=item[2], dxfattribs=attributes
+            )
+
+
+def write_dxf(path, shapes, placements):
+    """
+    DXF of placements, (name, layer, placement) tuples, drawing the named
+    primitives of shapes. Shapes placed more than once become blocks.
+    """
+    import ezdxf
+
+    document = ezdxf.new("R2010", units=ezdxf.units.MM)
+    modelspace = document.modelspace()
+    counts = {}
+    for name, layer, _ in placements:
+        counts[name] = counts.get(name, 0) + 1
+        if layer not in document.layers:
+            document.layers.add(layer)
+    blocks = {}
+    for name, count in counts.items():
+        if count > 1:
+            blocks[name] = _block_name(name)
+            # Entities on layer 0 take the layer of each reference
+            _dxf_entities(document.blocks.new(name=blocks[name]), shapes[name])
+
+    for name, layer, placement in placements:
+        if name in blocks:
+            x, y, angle = placement
+            modelspace.add_blockref(
+                blocks[name], (x, y), dxfattribs={"layer": layer, "rotation": angle}
+            )
+        else:
+            _dxf_entities(modelspace, shapes[name], placement, {"layer": layer})
+    _makedirs(path)
+    document.saveas(path)
+    return path
+
+
+def _number(value):
+    return f"{value:.6f}".rstrip("0").rstrip(".")
+
+
+def _svg_path(items):
+    """Path data in Y up coordinates, the document flips the Y axis"""
+    data = []
+    for item in items:
+        kind = item[0]
+        if kind == LINE:
+            (x0, y0), (x1, y1) = item[1:3]
+            data.append(f"M{_number(x0)} {_number(y0)}L{_number(x1)} {_number(y1)}")
+        elif kind == ARC:
+            _, (cx, cy), radius, start, end = item
+            sweep = (end - start) % 360
+            large = 1 if sweep > 180 else 0
+            (x0, y0), (x1, y1) = (
+                (
+                    cx + radius * math.cos(math.radians(a)),
+                    cy + radius * math.sin(math.radians(a)),
+                )
+                for a in (start, end)
+            )
+            r = _number(radius)
+            data.append(
+                f"M{_number(x0)} {_number(y0)}"
+                f"A{r} {r} 0 {large} 1 {_number(x1)} {_number(y1)}"
+            )
+        elif kind == CIRCLE:
+            (cx, cy), radius = item[1:3]
+            r = _number(radius)
+            data.append(
+                f"M{_number(cx + radius)} {_number(cy)}"
+                f"A{r} {r} 0 1 1 {_number(cx - radius)} {_number(cy)}"
+                f"A{r} {r} 0 1 1 {_number(cx + radius)} {_number(cy)}Z"
+            )
+        else:
+            points, closed = item[1:3]
+            segments = "L".join(f"{_number(x)} {_number(y)}" for x, y in points)
+            data.append(f"M{segments}{'Z' if closed else ''}")
+    return "".join(data)
+
+
+def write_svg(path, shapes, placements, margin=1.0, stroke_width=0.1):
+    """
+    SVG in millimeters of placements, (name, layer, placement) tuples. Each
+    shape is defined once and placed with <use>, layers are Inkscape layers.
+    """
+    lows = []
+    highs = []
+    for name, _, placement in placements:
+        box = bounds(shapes[name], placement)
+        if box is not None:
+            lows.append(box[0])
+            highs.append(box[1])
+    if lows:
+        min_x = min(p[0] for p in lows) - margin
+        min_y = min(p[1] for p in lows) - margin
+        max_x = max(p[0] for p in highs) + margin
+        max_y = max(p[1] for p in highs) + margin
+    else:
+        min_x = min_y = 0.0
+        max_x = max_y = margin
+    width, height = max_x - min_x, max_y - min_y
+
+    ids = {}
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink" '
+        'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+        f'width="{_number(width)}mm" height="{_number(height)}mm" '
+        f'viewBox="{_number(min_x)} {_number(-max_y)} '
+        f'{_number(width)} {_number(height)}">',
+        "<defs>",
+    ]
+    for name in dict.fromkeys(name for name, _, _ in placements):
+        ids[name] = f"shape{len(ids)}-{_block_name(name)}"
+        lines.append(f'<path id={quoteattr(ids[name])} d="{_svg_path(shapes[name])}"/>')
+    lines.append("</defs>")
+    lines.append(
+        f'<g transform="scale(1,-1)" fill="none" stroke="black" '
+        f'stroke-width="{_number(stroke_width)}">'
+    )
+    layers = OrderedDict()
+    for name, layer, placement in placements:
+        layers.setdefault(layer, []).append((name, placement))
+    for layer, uses in layers.items():
+        label = quoteattr(str(layer))
+        lines.append(f'<g inkscape:groupmode="layer" inkscape:label={label}>')
+        for name, (x, y, angle) in uses:
+            transform = f"translate({_number(x)},{_number(y)})"
+            if angle:
+                transform += f" rotate({_number(angle)})"
+            reference = quoteattr("#" + ids[name])
+            lines.append(
+                f"<use href={reference} xlink:href={reference} "
+                f'transform="{transform}"/>'
+            )
+        lines.append("</g>")
+    lines.append("</g>")
+    lines.append("</svg>")
+    _makedirs(path)
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+_writers = {"dxf": write_dxf, "svg": write_svg}
+
+
+def _makedirs(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+
+def _write(arguments):
+    file_format, path, shapes, placements = arguments
+    return _writers[file_format](path, shapes, placements)
+
+
+class Drawing:
+    def __init__(self):
+        self._factories = OrderedDict()
+        self._shapes = {}
+        self._primitives = {}
+        self._placements = []
+
+    def add(self, name, shape, location=None, layer="0"):
+        """
+        Place the shape identified by name. shape is a 2D shape, a sketch
+        builder or a zero argument callable making one; it is only built
+        and converted the first time the name is seen.
+        """
+        if name not in self._factories:
+            self._factories[name] = shape
+        self._placements.append((name, layer, _placement(location)))
+        return self
+
+    def __len__(self):
+        return len(self._placements)
+
+    def names(self):
+        return list(self._factories)
+
+    def placements(self):
+        """(name, layer, (x, y, degrees)) of every placed shape"""
+        return list(self._placements)
+
+    def shape(self, name):
+        if name not in self._shapes:
+            shape = self._factories[name]
+            if callable(shape) and not hasattr(shape, "wrapped"):
+                shape = shape()
+            self._shapes[name] = getattr(shape, "sketch", shape)
+        return self._shapes[name]
+
+    def primitives(self, name):
+        if name not in self._primitives:
+            shape = self.shape(name)
+            with span("primitives", "dxf", shape=str(name)):
+                self._primitives[name] = primitives(shape)
+        return self._primitives[name]
+
+    def shapes(self):
+        return {name: self.primitives(name) for name in self._factories}
+
+    @traced()
+    def write_dxf(self, path):
+        """One DXF, repeated shapes as block references"""
+        return write_dxf(path, self.shapes(), self._placements)
+
+    @traced()
+    def write_svg(self, path, margin=1.0):
+        """One SVG, repeated shapes as <use> references"""
+        return write_svg(path, self.shapes(), self._placements, margin)
+
+    @traced()
+    def write_files(self, directory, file_format="dxf", max_workers=None):
+        """
+        Every shape unplaced in its own file named after it, written on a
+        process pool unless max_workers is 1. Returns the paths.
+        """
+        if file_format not in _writers:
+            raise ValueError(f"Unknown format {file_format}, expected dxf or svg")
+        layers = {}
+        for name, layer, _ in self._placements:
+            layers.setdefault(name, layer)
+        shapes = self.shapes()
+        jobs = [
+            (
+                file_format,
+                os.path.join(directory, f"{_block_name(name)}.{file_format}"),
+                {name: shapes[name]},
+                [(name, layers[name], (0.0, 0.0, 0.0))],
+            )
+            for name in shapes
+        ]
+        if max_workers == 1 or len(jobs) < 2:
+            return [_write(job) for job in jobs]
+        max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_write, jobs))
+
+
+def korry_overlay(width=19.5, height=19.5, legends=("DECEL", "ON", "UNLK"), rows=3):
+    """
+    Laser cutting drawing of a switch panel: sleeve outlines and slider
+    footprints cut, one column of legends per text engraved
+    """
+    from build123d import Location
+
+    from cad.common.buttons.korry.korry import KorrySwitch
+
+    korry = KorrySwitch(width, height)
+    drawing = Drawing()
+    pitch_x, pitch_y = width + 3, height + 3
+    for column, text in enumerate(legends):
+        for row in range(rows):
+            x, y = column * pitch_x, -row * pitch_y
+            drawing.add("sleeve", korry.sleeve_footprint, Location((x, y)), "cut")
+            drawing.add(
+                "slider",
+                korry.slider_footprint,
+                Location((x, y + rows * pitch_y + 10)),
+                "cut",
+            )
+            for sign in (1, -1):
+                location = Location((x, y + sign * korry.diffuser_offset))
+                drawing.add("diffuser", korry.diffuser_footprint, location, "cut")
+            drawing.add(
+                f"legend_{text}",
+                lambda text=text: korry.legend(text, frame=True),
+                Location((x, y + korry.diffuser_offset)),
+                "engrave",
+            )
+    return drawing
+
+
+def compare(drawing, max_workers=None):
+    """Seconds per export path for the same drawing, shapes converted once"""
+    from build123d import Location
+
+    from cad.dxf import save_dxf
+
+    timings = {}
+    drawing.shapes()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for i, (name, _, (x, y, angle)) in enumerate(drawing.placements()):
+            shape = drawing.shape(name).moved(Location((x, y, 0), (0, 0, angle)))
+            save_dxf(shape, os.path.join(tmp, str(i)))
+        timings["save_dxf per placement"] = time.perf_counter() - start
+        for label, write in (
+            ("one DXF with blocks", lambda: drawing.write_dxf(f"{tmp}/all.dxf")),
+            ("one SVG with <use>", lambda: drawing.write_svg(f"{tmp}/all.svg")),
+            (
+                "DXF per shape, pool",
+                lambda: drawing.write_files(f"{tmp}/dxf", "dxf", max_workers),
+            ),
+            (
+                "SVG per shape, pool",
+                lambda: drawing.write_files(f"{tmp}/svg", "svg", max_workers),
+            ),
+        ):
+            start = time.perf_counter()
+            write()
+            timings[label] = time.perf_counter() - start
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=float, default=19.5)
+    parser.add_argument("--height", type=float, default=19.5)
+    parser.add_argument("--legends", nargs="+", default=["DECEL", "ON", "UNLK"])
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--dxf", help="write the overlay as one DXF")
+    parser.add_argument("--svg", help="write the overlay as one SVG")
+    parser.add_argument("--files", metavar="DIR", help="one file per shape")
+    parser.add_argument("--format", choices=sorted(_writers), default="dxf")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--compare", action="store_true", help="time export paths")
+    args = parser.parse_args(argv)
+
+    drawing = korry_overlay(args.width, args.height, args.legends, args.rows)
+    if args.dxf:
+        print(drawing.write_dxf(args.dxf))
+    if args.svg:
+        print(drawing.write_svg(args.svg))
+    if args.files:
+        for path in drawing.write_files(args.files, args.format, args.jobs):
+            print(path)
+    if args.compare:
+        print(f"{len(drawing)} placements of {len(drawing.names())} shapes")
+        for label, seconds in compare(drawing, args.jobs).items():
+            print(f"{label:<25} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
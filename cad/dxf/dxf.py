@@ -1,8 +1,17 @@
 import build123d as b3d
 import os
+import time
 
+from cad.tracing import traced
 
-def save_dxf(obj: b3d.Shape, path: str):
+
+@traced()
+def save_dxf(obj: b3d.Shape, path: str, name=None, parameters=None):
+    """
+    Write a shape's outline to cad/dxf. The file is indexed with the digest
+    of the shape and of the writer code as its input hash, and left as is
+    when the index shows it was written from the same geometry.
+    """
     dirname = os.path.dirname(__file__)
     full_path = os.path.join(dirname, path)
     if not full_path.endswith(".dxf"):
@@ -11,4 +20,31 @@ def save_dxf(obj: b3d.Shape, path: str):
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
-    obj.export_dxf(full_path)
+    from cad.cache import hash_inputs, source_fingerprint
+    from cad.cache.index import artefact_index
+    from cad.cache.mesh import shape_digest
+    from cad.dxf.drawing import primitives, write_dxf
+
+    start = time.perf_counter()
+    input_hash = hash_inputs(
+        shape=shape_digest(obj), code=source_fingerprint(write_dxf, primitives)
+    )
+    known = artefact_index.get(full_path)
+    if (
+        known is not None
+        and known.input_hash == input_hash
+        and known.exists
+        and known.size == os.path.getsize(full_path)
+    ):
+        return full_path
+
+    write_dxf(full_path, {"shape": primitives(obj)}, [("shape", "0", (0, 0, 0))])
+    artefact_index.record(
+        "dxf",
+        name or os.path.splitext(path)[0],
+        full_path,
+        parameters=parameters,
+        input_hash=input_hash,
+        seconds=time.perf_counter() - start,
+    )
+    return full_path
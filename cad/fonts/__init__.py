@@ -5,3 +5,5 @@ _base_path = os.path.dirname(__file__)
 blockschrift_font_path = os.path.join(_base_path, "blockschrift.ttf")
 panel_font_path = os.path.join(_base_path, "xA320PanelFont_V0.2b.ttf")
 fcu_font_path = os.path.join(_base_path, "xAirbusFCU.ttf")
+
+from .glyphs import FontMetrics, font_metrics, glyph, text_outline
@@ -0,0 +1,277 @@
+"""
+Cached text outlines. Glyph faces are built once per (font, glyph, size) and
+stored on disk, text is then composed from them using the font's advance
+widths and kerning pairs, so engraving "DECEL" on a hundred diffusers loads
+the font and builds each letter only once.
+
+    with BuildSketch():
+        add(text_outline("DECEL", 5, panel_font_path))
+"""
+import json
+import os
+import struct
+from functools import lru_cache
+
+from cad.cache import GeometryCache, geometry_cache, hash_inputs, source_fingerprint
+from cad.cache.cache import _file_digest
+from cad.tracing import traced
+
+_cache_path = os.environ.get(
+    "A320_GLYPH_CACHE_DIR", os.path.join(os.path.dirname(__file__), "cache")
+)
+
+glyph_cache = GeometryCache(path=os.path.join(_cache_path, "glyphs"), max_entries=512)
+glyph_cache.enabled = geometry_cache.enabled
+
+
+class FontMetrics:
+    """
+    Horizontal metrics of a TrueType font: units per em, advance widths,
+    the character map and format 0 kerning pairs, all in font units.
+    """
+
+    def __init__(self, units_per_em, advances, cmap, kerning):
+        self.units_per_em = units_per_em
+        self.advances = advances
+        self.cmap = cmap
+        self.kerning = kerning
+
+    def glyph_id(self, char):
+        return self.cmap.get(ord(char), 0)
+
+    def advance(self, char):
+        advances = self.advances
+        glyph_id = self.glyph_id(char)
+        return advances[min(glyph_id, len(advances) - 1)]
+
+    def kern(self, left, right):
+        return self.kerning.get((self.glyph_id(left), self.glyph_id(right)), 0)
+
+    def to_dict(self):
+        return {
+            "units_per_em": self.units_per_em,
+            "advances": self.advances,
+            "cmap": {str(k): v for k, v in self.cmap.items()},
+            "kerning": [[l, r, v] for (l, r), v in self.kerning.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["units_per_em"],
+            data["advances"],
+            {int(k): v for k, v in data["cmap"].items()},
+            {(l, r): v for l, r, v in data["kerning"]},
+        )
+
+    @classmethod
+    def parse(cls, data: bytes):
+        (num_tables,) = struct.unpack_from(">H", data, 4)
+        tables = {}
+        for i in range(num_tables):
+            tag, _, offset, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+            tables[tag.decode("latin-1")] = (offset, length)
+
+        (units_per_em,) = struct.unpack_from(">H", data, tables["head"][0] + 18)
+        (num_h_metrics,) = struct.unpack_from(">H", data, tables["hhea"][0] + 34)
+        hmtx = tables["hmtx"][0]
+        advances = [
+            struct.unpack_from(">H", data, hmtx + 4 * i)[0]
+            for i in range(num_h_metrics)
+        ]
+        cmap = _parse_cmap(data, tables["cmap"][0])
+        kerning = _parse_kern(data, tables["kern"][0]) if "kern" in tables else {}
+        return cls(units_per_em, advances, cmap, kerning)
+
+
+def _parse_cmap(data, cmap_offset):
+    (num_subtables,) = struct.unpack_from(">H", data, cmap_offset + 2)
+    subtables = {}
+    for i in range(num_subtables):
+        platform, encoding, offset = struct.unpack_from(
+            ">HHI", data, cmap_offset + 4 + 8 * i
+        )
+        subtables[(platform, encoding)] = cmap_offset + offset
+    # Prefer full unicode, then BMP unicode, then the symbol encoding used by
+    # some hand made fonts
+    for platform_encoding in ((3, 10), (0, 4), (3, 1), (0, 3), (0, 1), (3, 0)):
+        if platform_encoding in subtables:
+            offset = subtables[platform_encoding]
+            (format,) = struct.unpack_from(">H", data, offset)
+            if format == 4:
+                return _parse_cmap_format4(data, offset, platform_encoding == (3, 0))
+            if format == 12:
+                return _parse_cmap_format12(data, offset)
+    raise ValueError("Font has no supported unicode character map")
+
+
+def _parse_cmap_format4(data, offset, symbol):
+    (seg_count_x2,) = struct.unpack_from(">H", data, offset + 6)
+    seg_count = seg_count_x2 // 2
+    ends_offset = offset + 14
+    starts_offset = ends_offset + seg_count_x2 + 2
+    deltas_offset = starts_offset + seg_count_x2
+    range_offsets_offset = deltas_offset + seg_count_x2
+
+    def read(base, code="H"):
+        return list(struct.unpack_from(f">{seg_count}{code}", data, base))
+
+    ends = read(ends_offset)
+    starts = read(starts_offset)
+    deltas = read(deltas_offset, "h")
+    range_offsets = read(range_offsets_offset)
+
+    cmap = {}
+    for i in range(seg_count):
+        for code in range(starts[i], ends[i] + 1):
+            if code == 0xFFFF:
+                continue
+            if range_offsets[i] == 0:
+                glyph_id = (code + deltas[i]) & 0xFFFF
+            else:
+                address = (
+                    range_offsets_offset
+                    + 2 * i
+                    + range_offsets[i]
+                    + 2 * (code - starts[i])
+                )
+                (glyph_id,) = struct.unpack_from(">H", data, address)
+                if glyph_id:
+                    glyph_id = (glyph_id + deltas[i]) & 0xFFFF
+            if glyph_id:
+                # Symbol fonts map their characters to the 0xF000 page
+                cmap[code - 0xF000 if symbol and code >= 0xF000 else code] = glyph_id
+    return cmap
+
+
+def _parse_cmap_format12(data, offset):
+    (num_groups,) = struct.unpack_from(">I", data, offset + 12)
+    cmap = {}
+    for i in range(num_groups):
+        start, end, glyph_id = struct.unpack_from(">III", data, offset + 16 + 12 * i)
+        for code in range(start, end + 1):
+            cmap[code] = glyph_id + code - start
+    return cmap
+
+
+def _parse_kern(data, offset):
+    """Horizontal format 0 pairs of a Windows style kern table"""
+    version, num_subtables = struct.unpack_from(">HH", data, offset)
+    kerning = {}
+    if version != 0:
+        return kerning
+    position = offset + 4
+    for _ in range(num_subtables):
+        _, length, coverage = struct.unpack_from(">HHH", data, position)
+        horizontal = coverage & 1
+        minimum = coverage & 2
+        if coverage >> 8 == 0 and horizontal and not minimum:
+            (num_pairs,) = struct.unpack_from(">H", data, position + 6)
+            for i in range(num_pairs):
+                left, right, value = struct.unpack_from(
+                    ">HHh", data, position + 14 + 6 * i
+                )
+                kerning[(left, right)] = kerning.get((left, right), 0) + value
+        position += length
+    return kerning
+
+
+@lru_cache(maxsize=None)
+def font_metrics(font_path) -> FontMetrics:
+    """
+    Metrics of a font, parsed once per font version and kept next to the
+    glyph cache as JSON
+    """
+    digest = _file_digest(os.path.abspath(font_path))
+    metrics_path = os.path.join(_cache_path, "metrics", digest + ".json")
+    try:
+        with open(metrics_path) as f:
+            return FontMetrics.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with open(font_path, "rb") as f:
+        metrics = FontMetrics.parse(f.read())
+    if glyph_cache.enabled:
+        os.makedirs(os.path.dirname(metrics_path), exist_ok=True)
+        tmp_path = f"{metrics_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(metrics.to_dict(), f)
+        os.replace(tmp_path, metrics_path)
+    return metrics
+
+
+@traced()
+def glyph(char, size, font_path):
+    """
+    Faces of a single glyph with its origin at the start of the baseline,
+    or None for glyphs without an outline (spaces)
+    """
+    from build123d import Compound
+
+    if char.isspace():
+        return None
+    key = hash_inputs(
+        glyph=char,
+        size=size,
+        font=_file_digest(os.path.abspath(font_path)),
+        code=source_fingerprint(glyph),
+    )
+    if glyph_cache.enabled:
+        shape = glyph_cache.get(key)
+        if shape is not None:
+            return shape if shape.faces() else None
+
+    shape = Compound.make_text(char, size, font_path=font_path, align=None)
+    if glyph_cache.enabled:
+        glyph_cache.put(key, shape)
+    return shape if shape.faces() else None
+
+
+def _align_offset(align, low, high):
+    from build123d import Align
+
+    if align == Align.MIN:
+        return -low
+    if align == Align.MAX:
+        return -high
+    if align == Align.CENTER:
+        return -(low + high) / 2
+    return 0.0
+
+
+@traced()
+def text_outline(text, size, font_path, align=None):
+    """
+    Compound of the text's faces composed from cached glyphs with kerning.
+    align defaults to centering on the bounding box like build123d's Text.
+    """
+    from build123d import Align, Compound, Location
+
+    if align is None:
+        align = (Align.CENTER, Align.CENTER)
+    metrics = font_metrics(font_path)
+    scale = size / metrics.units_per_em
+
+    faces = []
+    pen = 0
+    previous = None
+    for char in text:
+        if previous is not None:
+            pen += metrics.kern(previous, char)
+        shape = glyph(char, size, font_path)
+        if shape is not None:
+            faces += shape.moved(Location((pen * scale, 0, 0))).faces()
+        pen += metrics.advance(char)
+        previous = char
+
+    outline = Compound(children=faces)
+    if faces:
+        box = outline.bounding_box()
+        offset = (
+            _align_offset(align[0], box.min.X, box.max.X),
+            _align_offset(align[1], box.min.Y, box.max.Y),
+            0,
+        )
+        outline = outline.moved(Location(offset))
+    return outline
@@ -2,106 +2,158 @@ import time
 from copy import copy
 
 from build123d import *
-from ocp_freecad_cam.api import Tab
 
+from cad.cache import source_fingerprint
 from cad.common.buttons.korry.korry import KorrySwitch
-from cad.nc import save_gcode
+from cad.common.instancing import InstancedPanel
+from cad.common.panel import Assembly
+from cad.common.topology import TopologyIndex
+from cad.fonts import panel_font_path, text_outline
+from cad.nc import GcodeTarget
+from cad.tracing import traced
 
 
 class Autobrake:
-    def diffusers(self):
+    @traced()
+    def diffusers_panel(self):
         j = KorrySwitch(19.5, 19.5)
-        decel = j.diffuser(text="DECEL").part
-        on = j.diffuser(text="ON", frame=True).part
-        unlk = j.diffuser(text="UNLK").part
-        blank = j.diffuser().part
-        tri = j.diffuser(triangle=True).part
+        parts = {
+            "decel": lambda: j.diffuser(text="DECEL"),
+            "on": lambda: j.diffuser(text="ON", frame=True),
+            "unlk": lambda: j.diffuser(text="UNLK"),
+            "blank": lambda: j.diffuser(),
+            "tri": lambda: j.diffuser(triangle=True),
+        }
         # layout = [
-        #    [decel, on, unlk, tri, on],
-        #    [decel, on, unlk, tri, blank],
-        #    [decel, on, unlk, tri, blank]
+        #    ["decel", "on", "unlk", "tri", "on"],
+        #    ["decel", "on", "unlk", "tri", "blank"],
+        #    ["decel", "on", "unlk", "tri", "blank"]
         # ]
         layout = [
-            [blank, blank, blank, blank, blank],
-            [blank, blank, blank, blank, blank],
-            [blank, blank, blank, blank, blank],
+            ["blank", "blank", "blank", "blank", "blank"],
+            ["blank", "blank", "blank", "blank", "blank"],
+            ["blank", "blank", "blank", "blank", "blank"],
         ]
 
         h_spacing = 22
         v_spacing = 13
-        parts = []
+        panel = InstancedPanel()
         for v, row in enumerate(layout):
-            for h, part in enumerate(row):
-                part_copy = part.copy()
-                part_copy.move(Location((h_spacing * h, v_spacing * -v, 0)))
-                parts.append(part_copy)
+            for h, name in enumerate(row):
+                panel.add(
+                    name, parts[name], Location((h_spacing * h, v_spacing * -v, 0))
+                )
+        return panel
+
+    @traced()
+    def diffusers(self):
+        return self.diffusers_panel().compound()
 
-        return Compound(children=parts)
+    def panel(self):
+        """
+        Lazy model of the LO, MED and MAX switches: nothing is built until
+        a node's part is asked for, and editing a legend only rebuilds it
+        """
+        j = KorrySwitch(19.5, 19.5)
+        h_spacing = 22
+        panel = Assembly("autobrake")
+        for h, name in enumerate(["lo", "med", "max"]):
+            panel.add(
+                j.assembly_node("DECEL", "ON", name), Location((h_spacing * h, 0, 0))
+            )
+        return panel
 
 
 # __name__ = "__cq_viewer__"
 
 
-def cnc_single_sleeve(left_ledge=True, right_ledge=True):
-    from cq_viewer import show_object
-    from ocp_freecad_cam import Job, Endmill
+def cnc_single_sleeve(left_ledge=True, right_ledge=True, force=False, show_object=None):
+    from cad.common.buttons.korry.korry_cam import sleeve_job
 
     j = KorrySwitch(19.5, 19.5)
-    sleeve = j.sleeve(4, left_ledge=left_ledge, right_ledge=right_ledge)
-    show_object(sleeve)
-
-    endmill_1mm = Endmill(diameter=1)
-    sorted_faces = sleeve.part.faces().group_by()
-    sorted_edges = sleeve.part.edges().group_by()
-    top = sorted_faces[-1][0]
-    bottom = sorted_faces[0][0]
-    mid = sorted_faces[1]
-    if not left_ledge or not right_ledge:
-        mid += sorted_faces[3]
-
-    job = (
-        Job(bottom, sleeve.part, "grbl")
-        .profile(mid, endmill_1mm)
-        .profile(top, endmill_1mm, holes=True)
-    )
-    show_object(mid)
-    job.show(show_object)
     name = ["autobrake/single_sleeve"]
     if not left_ledge:
         name.append("no_left_ledge")
     if not right_ledge:
         name.append("no_right_ledge")
-    save_gcode(job, "_".join(name))
+    target = GcodeTarget(
+        "_".join(name),
+        name=name[0],
+        part=j,
+        sleeve=dict(stock_thickness=4, left_ledge=left_ledge, right_ledge=right_ledge),
+        tool=dict(endmill=1),
+        operations=["profile mid", "profile top holes"],
+        postprocessor="grbl",
+        code=source_fingerprint(
+            KorrySwitch, TopologyIndex, cnc_single_sleeve, sleeve_job
+        ),
+    )
+    if not (force or show_object) and target.up_to_date():
+        return target.full_path
+
+    job = sleeve_job(j, 4, left_ledge, right_ledge, show_object)
+    path = target.save(job)
     job.save_fcstd(("sleeve_debug.fcstd"))
+    return path
 
 
-def cnc_single_slider():
-    from cq_viewer import show_object
+def single_slider_job(j, show_object=None):
+    """FreeCAD job of cnc_single_slider: only the bottom holes and outline"""
     from ocp_freecad_cam import Job, Endmill
 
-    j = KorrySwitch(19.5, 19.5)
-    slider = j.slider(4)
-    show_object(slider)
+    slider = j.slider(3)
+    if show_object:
+        show_object(slider)
 
     endmill_1mm = Endmill(diameter=1)
 
-    faces = slider.part.faces().sort_by()
-    top = faces[-1]
-    bottom = faces[0]
+    faces = TopologyIndex(slider.part)
+    top = faces.level(-1)[-1]
+    bottom = faces.bottom()
 
     job = Job(top, slider.part, "grbl").profile(bottom, endmill_1mm, holes=True)
 
-    job.show(show_object)
-    save_gcode(job, "autobrake/single_slider")
-
+    if show_object:
+        job.show(show_object)
+    return job
 
-if __name__ == "__cq_viewer__":
-    cnc_single_sleeve(left_ledge=True, right_ledge=True)
 
+def cnc_single_slider(force=False, show_object=None):
+    j = KorrySwitch(19.5, 19.5)
+    target = GcodeTarget(
+        "autobrake/single_slider",
+        part=j,
+        slider=dict(diffuser_stock_thickness=3),
+        tool=dict(endmill=1),
+        operations=["profile bottom holes"],
+        postprocessor="grbl",
+        code=source_fingerprint(KorrySwitch, TopologyIndex, cnc_single_slider),
+    )
+    if not (force or show_object) and target.up_to_date():
+        return target.full_path
+
+    return target.save(single_slider_job(j, show_object))
+
+
+def cnc_diffusers(force=False, show_object=None):
+    target = GcodeTarget(
+        "autobrake/diffusers",
+        tool=dict(endmill=3.175),
+        operations=["pocket level 1 offset", "profile top tabs"],
+        code=source_fingerprint(
+            KorrySwitch,
+            Autobrake,
+            TopologyIndex,
+            InstancedPanel,
+            text_outline,
+            files=[panel_font_path],
+        ),
+    )
+    if not (force or show_object) and target.up_to_date():
+        return target.full_path
 
-def cnc_diffusers():
-    from cq_viewer import show_object
     from ocp_freecad_cam import Job, Endmill
+    from ocp_freecad_cam.api import Tab
 
     autobrake = Autobrake()
     diffusers = autobrake.diffusers()
@@ -124,7 +176,8 @@ def cnc_diffusers():
     #        Hole(2.5)
     # mounting_hole_faces = (mounting_holes.faces() | GeomType.CYLINDER) << SortBy.AREA
 
-    top_faces = diffusers.faces().group_by()[-1]
+    faces = TopologyIndex(diffusers)
+    top_faces = faces.level(-1)
 
     # mounting_hole_job = (
     #    Job(bottom_plane, diffusers)
@@ -133,12 +186,84 @@ def cnc_diffusers():
 
     endmill_3175mm = Endmill(diameter=3.175)
     profile_job = (
-        Job(diffusers.faces().sort_by()[0], diffusers)
-        .pocket(diffusers.faces().group_by()[1], endmill_3175mm, pattern="offset")
+        Job(faces.bottom(), diffusers)
+        .pocket(faces.level(1), endmill_3175mm, pattern="offset")
         .profile(top_faces, endmill_3175mm, dressups=[Tab()])
     )
 
-    show_object(diffusers)
-    profile_job.show(show_object)
-    with open("autobrake_diffusers.nc", "w") as f:
-        f.write(profile_job.to_gcode())
+    if show_object:
+        show_object(diffusers)
+        profile_job.show(show_object)
+    return target.save(profile_job, strip_header=False)
+
+
+def cnc_nested_diffusers(sheet_width=150, sheet_height=100, force=False):
+    """All autobrake legends nested on as few sheets as possible, one job each"""
+    from cad.common.nesting import NestItem, Sheet, nest, sheet_job
+
+    sheet = Sheet(sheet_width, sheet_height)
+    j = KorrySwitch(19.5, 19.5)
+    # name: (KorrySwitch.diffuser arguments, quantity)
+    legends = {
+        "decel": (dict(text="DECEL"), 3),
+        "on": (dict(text="ON", frame=True), 4),
+        "unlk": (dict(text="UNLK"), 3),
+        "tri": (dict(triangle=True), 3),
+        "blank": (dict(), 2),
+    }
+    job = dict(pocket_level=1, tabs=True, postprocessor="grbl")
+    code = source_fingerprint(
+        KorrySwitch,
+        Autobrake,
+        InstancedPanel,
+        text_outline,
+        nest,
+        files=[panel_font_path],
+    )
+
+    def target(index, sheets):
+        return GcodeTarget(
+            f"autobrake/nested_diffusers_{index + 1}",
+            part=j,
+            sheet=sheet,
+            legends=legends,
+            sheets=sheets,
+            tool=dict(endmill=3.175),
+            operations=["pocket level 1 offset", "profile top tabs"],
+            job=job,
+            code=code,
+        )
+
+    # The inputs decide the number of sheets, at most one per part, so the
+    # programs are checked before building and nesting any geometry
+    parts = sum(quantity for _, quantity in legends.values())
+    for sheets in range(1, parts + 1) if not force else ():
+        if not target(0, sheets).up_to_date():
+            continue
+        targets = [target(index, sheets) for index in range(sheets)]
+        if all(t.up_to_date() for t in targets[1:]):
+            return [t.full_path for t in targets]
+        break
+
+    items = [
+        NestItem(j.diffuser(**arguments), quantity, name)
+        for name, (arguments, quantity) in legends.items()
+    ]
+    placed = nest(items, sheet)
+
+    from ocp_freecad_cam import Endmill
+
+    endmill_3175mm = Endmill(diameter=3.175)
+    paths = []
+    for index, placements in enumerate(placed):
+        sheet_target = target(index, len(placed))
+        if force or not sheet_target.up_to_date():
+            sheet_target.save(sheet_job(placements, endmill_3175mm, **job))
+        paths.append(sheet_target.full_path)
+    return paths
+
+
+if __name__ == "__cq_viewer__":
+    from cq_viewer import show_object
+
+    cnc_single_sleeve(left_ledge=True, right_ledge=True, show_object=show_object)
@@ -1 +1,8 @@
-from .nc import save_gcode
+from .nc import (
+    GcodeTarget,
+    drop_header,
+    gcode_lines,
+    iter_lines,
+    save_gcode,
+    write_gcode,
+)
@@ -0,0 +1,279 @@
+"""
+Cycle time and toolpath statistics for G-code programs.
+
+    python -m cad.nc.analyze                      # cad/nc and the LED pcb programs
+    python -m cad.nc.analyze cad/nc/korry -j 4 --json
+"""
+import argparse
+import json
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+from cad.nc.gcode import (
+    ARC_CCW,
+    ARC_CW,
+    DWELL,
+    RAPID,
+    ModalState,
+    arc_geometry,
+    parse_line,
+)
+
+_base_path = os.path.dirname(__file__)
+default_paths = [
+    _base_path,
+    os.path.join(_base_path, os.pardir, "common", "buttons", "korry", "led-pcb", "nc"),
+]
+extensions = (".nc", ".ngc")
+
+
+@dataclass
+class Machine:
+    """Rates in mm/min, acceleration in mm/s^2, junction deviation in mm"""
+
+    rapid_rate: float = 2000.0
+    default_feed: float = 300.0
+    acceleration: float = 200.0
+    junction_deviation: float = 0.01
+
+
+class Toolpath:
+    """
+    Moves of a program stored column-wise in typed arrays. Directions are
+    the unit tangents at the start and end of each move, used for junction
+    speed limits.
+    """
+
+    def __init__(self):
+        self.motion = array("b")
+        self.length = array("d")
+        self.feed = array("d")
+        self.dwell = array("d")
+        self.start_dir = array("d")
+        self.end_dir = array("d")
+        self.bbox = [math.inf] * 3 + [-math.inf] * 3
+        self.lines = 0
+
+    def __len__(self):
+        return len(self.motion)
+
+    def _extend_bbox(self, point):
+        for i in range(3):
+            self.bbox[i] = min(self.bbox[i], point[i])
+            self.bbox[i + 3] = max(self.bbox[i + 3], point[i])
+
+    def append(self, move, machine: Machine):
+        self.motion.append(move.motion)
+        self.dwell.append(move.dwell)
+        if move.motion == RAPID:
+            self.feed.append(machine.rapid_rate)
+        else:
+            self.feed.append(move.feed or machine.default_feed)
+        self.length.append(move.length)
+        self._extend_bbox(move.end)
+
+        if move.motion in (ARC_CW, ARC_CCW):
+            radius, sweep = arc_geometry(move)
+            cx, cy = move.center
+            a0 = math.atan2(move.start[1] - cy, move.start[0] - cx)
+            a1 = a0 + sweep
+            sign = 1 if sweep > 0 else -1
+            dz = (move.end[2] - move.start[2]) / (move.length or 1)
+            start_dir = (-math.sin(a0) * sign, math.cos(a0) * sign, dz)
+            end_dir = (-math.sin(a1) * sign, math.cos(a1) * sign, dz)
+            # Axis extremes crossed by the arc
+            for quarter in range(4):
+                angle = quarter * math.pi / 2
+                offset = ((angle - a0) * sign) % (2 * math.pi)
+                if offset <= abs(sweep):
+                    point = (
+                        cx + radius * math.cos(angle),
+                        cy + radius * math.sin(angle),
+                        move.start[2],
+                    )
+                    self._extend_bbox(point)
+        else:
+            length = move.length or 1
+            start_dir = end_dir = tuple(
+                (move.end[i] - move.start[i]) / length for i in range(3)
+            )
+        self.start_dir.extend(start_dir)
+        self.end_dir.extend(end_dir)
+
+    @classmethod
+    def from_lines(cls, lines, machine: Machine = None):
+        machine = machine or Machine()
+        toolpath = cls()
+        state = ModalState()
+        for line_no, line in enumerate(lines):
+            toolpath.lines += 1
+            for move in parse_line(state, line, line_no):
+                toolpath.append(move, machine)
+        return toolpath
+
+    @classmethod
+    def from_file(cls, path, machine: Machine = None):
+        with open(path) as f:
+            return cls.from_lines(f, machine)
+
+
+def _junction_speed(toolpath, i, machine):
+    """Max speed (mm/s) through the junction between move i-1 and move i"""
+    if i == 0 or toolpath.motion[i - 1] == DWELL or toolpath.motion[i] == DWELL:
+        return 0.0
+    if toolpath.motion[i - 1] == RAPID or toolpath.motion[i] == RAPID:
+        # Rapids are planned separately from feed moves on most controllers
+        if toolpath.motion[i - 1] != toolpath.motion[i]:
+            return 0.0
+    a = toolpath.end_dir[3 * (i - 1) : 3 * i]
+    b = toolpath.start_dir[3 * i : 3 * i + 3]
+    cos_theta = -(a[0] * b[0] + a[1] * b[1] + a[2] * b[2])
+    if cos_theta > 0.999999:
+        return 0.0
+    if cos_theta < -0.999999:
+        return math.inf
+    sin_half = math.sqrt(0.5 * (1.0 - cos_theta))
+    return math.sqrt(
+        machine.acceleration * machine.junction_deviation * sin_half / (1.0 - sin_half)
+    )
+
+
+def _segment_time(length, v0, v1, vmax, acceleration):
+    if length <= 0:
+        return 0.0
+    accel_distance = (vmax * vmax - v0 * v0) / (2 * acceleration)
+    decel_distance = (vmax * vmax - v1 * v1) / (2 * acceleration)
+    if accel_distance + decel_distance <= length:
+        cruise = length - accel_distance - decel_distance
+        return (vmax - v0) / acceleration + (vmax - v1) / acceleration + cruise / vmax
+    peak = math.sqrt((2 * acceleration * length + v0 * v0 + v1 * v1) / 2)
+    return (peak - v0) / acceleration + (peak - v1) / acceleration
+
+
+def cycle_time(toolpath: Toolpath, machine: Machine = None) -> float:
+    """
+    Seconds to run the toolpath with trapezoidal velocity profiles, junction
+    deviation cornering limits and forward/backward planner passes.
+    """
+    machine = machine or Machine()
+    n = len(toolpath)
+    a = machine.acceleration
+    vmax = [f / 60.0 for f in toolpath.feed]
+    # entry[i] is the speed at the start of move i, entry[n] the final stop
+    entry = [0.0] * (n + 1)
+    for i in range(1, n):
+        entry[i] = min(_junction_speed(toolpath, i, machine), vmax[i - 1], vmax[i])
+
+    for i in range(n - 1, -1, -1):
+        reachable = math.sqrt(entry[i + 1] ** 2 + 2 * a * toolpath.length[i])
+        entry[i] = min(entry[i], reachable)
+    for i in range(n):
+        reachable = math.sqrt(entry[i] ** 2 + 2 * a * toolpath.length[i])
+        entry[i + 1] = min(entry[i + 1], reachable)
+
+    seconds = 0.0
+    for i in range(n):
+        if toolpath.motion[i] == DWELL:
+            seconds += toolpath.dwell[i]
+            continue
+        seconds += _segment_time(toolpath.length[i], entry[i], entry[i + 1], vmax[i], a)
+    return seconds
+
+
+@dataclass
+class ProgramStats:
+    path: str
+    lines: int
+    moves: int
+    cut_length: float
+    rapid_length: float
+    seconds: float
+    bbox: tuple
+
+    def row(self):
+        minutes, seconds = divmod(self.seconds, 60)
+        (x0, y0, z0, x1, y1, z1) = self.bbox
+        return (
+            f"{self.path:<70} {self.lines:6d} {self.cut_length:9.1f} "
+            f"{self.rapid_length:8.1f} {int(minutes):4d}:{seconds:04.1f} "
+            f"{x1 - x0:6.1f}x{y1 - y0:6.1f}x{z1 - z0:5.1f}"
+        )
+
+
+def analyze(path, machine: Machine = None) -> ProgramStats:
+    machine = machine or Machine()
+    toolpath = Toolpath.from_file(path, machine)
+    cut = rapid = 0.0
+    for motion, length in zip(toolpath.motion, toolpath.length):
+        if motion == RAPID:
+            rapid += length
+        elif motion != DWELL:
+            cut += length
+    bbox = tuple(toolpath.bbox) if len(toolpath) else (0.0,) * 6
+    return ProgramStats(
+        path=os.path.relpath(path),
+        lines=toolpath.lines,
+        moves=len(toolpath),
+        cut_length=cut,
+        rapid_length=rapid,
+        seconds=cycle_time(toolpath, machine),
+        bbox=bbox,
+    )
+
+
+def find_programs(paths):
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found += [
+                    os.path.join(root, name)
+                    for name in files
+                    if name.endswith(extensions)
+                ]
+        else:
+            found.append(path)
+    return sorted(os.path.normpath(p) for p in found)
+
+
+def analyze_all(paths, machine: Machine = None, max_workers=None):
+    programs = find_programs(paths)
+    machine = machine or Machine()
+    if max_workers == 1 or len(programs) < 2:
+        return [analyze(path, machine) for path in programs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(analyze, programs, [machine] * len(programs)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=default_paths)
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--json", action="store_true")
+    for name, value in asdict(Machine()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=value)
+    args = parser.parse_args(argv)
+    machine = Machine(**{name: getattr(args, name) for name in asdict(Machine())})
+
+    results = analyze_all(args.paths, machine, args.jobs)
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return
+
+    header = (
+        f"{'program':<70} {'lines':>6} {'cut mm':>9} {'rapid mm':>8} {'time':>7}  size"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(result.row())
+    total = sum(r.seconds for r in results)
+    print("-" * len(header))
+    print(f"{len(results)} programs, total estimated time {total / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,48 +17,48 @@ G54
 (ProfileOp_1)
 (Compensated Tool Path. Diameter: 1.0)
 G0 Z6.000
-G0 X10.954 Y10.954
+G0 X9.636 Y9.637
 G0 Z4.000
-G1 X10.954 Y10.954 Z0.000
-G2 X11.250 Y10.250 Z0.000 I-0.716 J-0.716 K0.000
-G1 X11.250 Y-10.250 Z0.000
-G2 X10.250 Y-11.250 Z0.000 I-1.012 J0.012 K0.000
-G1 X-10.250 Y-11.250 Z0.000
-G2 X-11.250 Y-10.250 Z0.000 I0.012 J1.012 K0.000
-G1 X-11.250 Y10.250 Z0.000
-G2 X-10.250 Y11.250 Z0.000 I1.012 J-0.012 K0.000
-G1 X10.250 Y11.250 Z0.000
-G2 X10.954 Y10.954 Z0.000 I-0.012 J-1.012 K0.000
-G1 X10.954 Y10.954 Z-1.000
-G2 X11.250 Y10.250 Z-1.000 I-0.716 J-0.716 K0.000
-G1 X11.250 Y-10.250 Z-1.000
-G2 X10.250 Y-11.250 Z-1.000 I-1.012 J0.012 K0.000
-G1 X-10.250 Y-11.250 Z-1.000
-G2 X-11.250 Y-10.250 Z-1.000 I0.012 J1.012 K0.000
-G1 X-11.250 Y10.250 Z-1.000
-G2 X-10.250 Y11.250 Z-1.000 I1.012 J-0.012 K0.000
-G1 X10.250 Y11.250 Z-1.000
-G2 X10.954 Y10.954 Z-1.000 I-0.012 J-1.012 K0.000
-G1 X10.954 Y10.954 Z-2.000
-G2 X11.250 Y10.250 Z-2.000 I-0.716 J-0.716 K0.000
-G1 X11.250 Y-10.250 Z-2.000
-G2 X10.250 Y-11.250 Z-2.000 I-1.012 J0.012 K0.000
-G1 X-10.250 Y-11.250 Z-2.000
-G2 X-11.250 Y-10.250 Z-2.000 I0.012 J1.012 K0.000
-G1 X-11.250 Y10.250 Z-2.000
-G2 X-10.250 Y11.250 Z-2.000 I1.012 J-0.012 K0.000
-G1 X10.250 Y11.250 Z-2.000
-G2 X10.954 Y10.954 Z-2.000 I-0.012 J-1.012 K0.000
-G1 X10.954 Y10.954 Z-3.000
-G2 X11.250 Y10.250 Z-3.000 I-0.716 J-0.716 K0.000
-G1 X11.250 Y-10.250 Z-3.000
-G2 X10.250 Y-11.250 Z-3.000 I-1.012 J0.012 K0.000
-G1 X-10.250 Y-11.250 Z-3.000
-G2 X-11.250 Y-10.250 Z-3.000 I0.012 J1.012 K0.000
-G1 X-11.250 Y10.250 Z-3.000
-G2 X-10.250 Y11.250 Z-3.000 I1.012 J-0.012 K0.000
-G1 X10.250 Y11.250 Z-3.000
-G2 X10.954 Y10.954 Z-3.000 I-0.012 J-1.012 K0.000
+G1 X9.636 Y9.637 Z0.000
+G2 X10.247 Y8.218 Z0.000 I-1.478 J-1.477 K0.000
+G1 X10.250 Y-8.162 Z0.000
+G2 X8.218 Y-10.247 Z0.000 I-2.090 J0.005 K0.000
+G1 X-8.162 Y-10.250 Z0.000
+G2 X-10.247 Y-8.218 Z0.000 I0.005 J2.090 K0.000
+G1 X-10.250 Y8.162 Z0.000
+G2 X-8.218 Y10.247 Z0.000 I2.090 J-0.005 K0.000
+G1 X8.162 Y10.250 Z0.000
+G2 X9.636 Y9.637 Z0.000 I-0.005 J-2.090 K0.000
+G1 X9.636 Y9.637 Z-1.000
+G2 X10.247 Y8.218 Z-1.000 I-1.478 J-1.477 K0.000
+G1 X10.250 Y-8.162 Z-1.000
+G2 X8.218 Y-10.247 Z-1.000 I-2.090 J0.005 K0.000
+G1 X-8.162 Y-10.250 Z-1.000
+G2 X-10.247 Y-8.218 Z-1.000 I0.005 J2.090 K0.000
+G1 X-10.250 Y8.162 Z-1.000
+G2 X-8.218 Y10.247 Z-1.000 I2.090 J-0.005 K0.000
+G1 X8.162 Y10.250 Z-1.000
+G2 X9.636 Y9.637 Z-1.000 I-0.005 J-2.090 K0.000
+G1 X9.636 Y9.637 Z-2.000
+G2 X10.247 Y8.218 Z-2.000 I-1.478 J-1.477 K0.000
+G1 X10.250 Y-8.162 Z-2.000
+G2 X8.218 Y-10.247 Z-2.000 I-2.090 J0.005 K0.000
+G1 X-8.162 Y-10.250 Z-2.000
+G2 X-10.247 Y-8.218 Z-2.000 I0.005 J2.090 K0.000
+G1 X-10.250 Y8.162 Z-2.000
+G2 X-8.218 Y10.247 Z-2.000 I2.090 J-0.005 K0.000
+G1 X8.162 Y10.250 Z-2.000
+G2 X9.636 Y9.637 Z-2.000 I-0.005 J-2.090 K0.000
+G1 X9.636 Y9.637 Z-3.000
+G2 X10.247 Y8.218 Z-3.000 I-1.478 J-1.477 K0.000
+G1 X10.250 Y-8.162 Z-3.000
+G2 X8.218 Y-10.247 Z-3.000 I-2.090 J0.005 K0.000
+G1 X-8.162 Y-10.250 Z-3.000
+G2 X-10.247 Y-8.218 Z-3.000 I0.005 J2.090 K0.000
+G1 X-10.250 Y8.162 Z-3.000
+G2 X-8.218 Y10.247 Z-3.000 I2.090 J-0.005 K0.000
+G1 X8.162 Y10.250 Z-3.000
+G2 X9.636 Y9.637 Z-3.000 I-0.005 J-2.090 K0.000
 G0 Z6.000
 G0 Z6.000
 (Finish operation: ProfileOp_1)
@@ -67,113 +67,123 @@ G0 Z6.000
 (ProfileOp_2)
 (Compensated Tool Path. Diameter: 1.0)
 G0 Z6.000
-G0 X9.242 Y9.242
+G0 X7.929 Y7.929
 G0 Z4.000
-G1 X9.242 Y9.242 Z0.000
-G3 X9.201 Y9.250 Z0.000 I-0.027 J-0.027 K0.000
-G1 X-9.201 Y9.250 Z0.000
-G3 X-9.250 Y9.201 Z0.000 I-0.014 J-0.035 K0.000
-G1 X-9.250 Y-9.201 Z0.000
-G3 X-9.201 Y-9.250 Z0.000 I0.035 J-0.014 K0.000
-G1 X9.201 Y-9.250 Z0.000
-G3 X9.250 Y-9.201 Z0.000 I0.014 J0.035 K0.000
-G1 X9.250 Y9.201 Z0.000
-G3 X9.242 Y9.242 Z0.000 I-0.035 J0.014 K0.000
-G1 X9.242 Y9.242 Z-1.000
-G3 X9.201 Y9.250 Z-1.000 I-0.027 J-0.027 K0.000
-G1 X-9.201 Y9.250 Z-1.000
-G3 X-9.250 Y9.201 Z-1.000 I-0.014 J-0.035 K0.000
-G1 X-9.250 Y-9.201 Z-1.000
-G3 X-9.201 Y-9.250 Z-1.000 I0.035 J-0.014 K0.000
-G1 X9.201 Y-9.250 Z-1.000
-G3 X9.250 Y-9.201 Z-1.000 I0.014 J0.035 K0.000
-G1 X9.250 Y9.201 Z-1.000
-G3 X9.242 Y9.242 Z-1.000 I-0.035 J0.014 K0.000
-G1 X9.242 Y9.242 Z-2.000
-G3 X9.201 Y9.250 Z-2.000 I-0.027 J-0.027 K0.000
-G1 X-9.201 Y9.250 Z-2.000
-G3 X-9.250 Y9.201 Z-2.000 I-0.014 J-0.035 K0.000
-G1 X-9.250 Y-9.201 Z-2.000
-G3 X-9.201 Y-9.250 Z-2.000 I0.035 J-0.014 K0.000
-G1 X9.201 Y-9.250 Z-2.000
-G3 X9.250 Y-9.201 Z-2.000 I0.014 J0.035 K0.000
-G1 X9.250 Y9.201 Z-2.000
-G3 X9.242 Y9.242 Z-2.000 I-0.035 J0.014 K0.000
-G1 X9.242 Y9.242 Z-3.000
-G3 X9.201 Y9.250 Z-3.000 I-0.027 J-0.027 K0.000
-G1 X-9.201 Y9.250 Z-3.000
-G3 X-9.250 Y9.201 Z-3.000 I-0.014 J-0.035 K0.000
-G1 X-9.250 Y-9.201 Z-3.000
-G3 X-9.201 Y-9.250 Z-3.000 I0.035 J-0.014 K0.000
-G1 X9.201 Y-9.250 Z-3.000
-G3 X9.250 Y-9.201 Z-3.000 I0.014 J0.035 K0.000
-G1 X9.250 Y9.201 Z-3.000
-G3 X9.242 Y9.242 Z-3.000 I-0.035 J0.014 K0.000
-G1 X9.242 Y9.242 Z-4.000
-G3 X9.201 Y9.250 Z-4.000 I-0.027 J-0.027 K0.000
-G1 X-9.201 Y9.250 Z-4.000
-G3 X-9.250 Y9.201 Z-4.000 I-0.014 J-0.035 K0.000
-G1 X-9.250 Y-9.201 Z-4.000
-G3 X-9.201 Y-9.250 Z-4.000 I0.035 J-0.014 K0.000
-G1 X9.201 Y-9.250 Z-4.000
-G3 X9.250 Y-9.201 Z-4.000 I0.014 J0.035 K0.000
-G1 X9.250 Y9.201 Z-4.000
-G3 X9.242 Y9.242 Z-4.000 I-0.035 J0.014 K0.000
+G1 X7.929 Y7.929 Z0.000
+G3 X7.134 Y8.250 Z0.000 I-0.775 J-0.775 K0.000
+G1 X-7.134 Y8.250 Z0.000
+G3 X-8.250 Y7.134 Z0.000 I-0.020 J-1.096 K0.000
+G1 X-8.250 Y-7.134 Z0.000
+G3 X-7.134 Y-8.250 Z0.000 I1.096 J-0.020 K0.000
+G1 X7.134 Y-8.250 Z0.000
+G3 X8.250 Y-7.134 Z0.000 I0.020 J1.096 K0.000
+G1 X8.250 Y7.134 Z0.000
+G3 X7.929 Y7.929 Z0.000 I-1.096 J0.020 K0.000
+G1 X7.929 Y7.929 Z-1.000
+G3 X7.134 Y8.250 Z-1.000 I-0.775 J-0.775 K0.000
+G1 X-7.134 Y8.250 Z-1.000
+G3 X-8.250 Y7.134 Z-1.000 I-0.020 J-1.096 K0.000
+G1 X-8.250 Y-7.134 Z-1.000
+G3 X-7.134 Y-8.250 Z-1.000 I1.096 J-0.020 K0.000
+G1 X7.134 Y-8.250 Z-1.000
+G3 X8.250 Y-7.134 Z-1.000 I0.020 J1.096 K0.000
+G1 X8.250 Y7.134 Z-1.000
+G3 X7.929 Y7.929 Z-1.000 I-1.096 J0.020 K0.000
+G1 X7.929 Y7.929 Z-2.000
+G3 X7.134 Y8.250 Z-2.000 I-0.775 J-0.775 K0.000
+G1 X-7.134 Y8.250 Z-2.000
+G3 X-8.250 Y7.134 Z-2.000 I-0.020 J-1.096 K0.000
+G1 X-8.250 Y-7.134 Z-2.000
+G3 X-7.134 Y-8.250 Z-2.000 I1.096 J-0.020 K0.000
+G1 X7.134 Y-8.250 Z-2.000
+G3 X8.250 Y-7.134 Z-2.000 I0.020 J1.096 K0.000
+G1 X8.250 Y7.134 Z-2.000
+G3 X7.929 Y7.929 Z-2.000 I-1.096 J0.020 K0.000
+G1 X7.929 Y7.929 Z-3.000
+G3 X7.134 Y8.250 Z-3.000 I-0.775 J-0.775 K0.000
+G1 X-7.134 Y8.250 Z-3.000
+G3 X-8.250 Y7.134 Z-3.000 I-0.020 J-1.096 K0.000
+G1 X-8.250 Y-7.134 Z-3.000
+G3 X-7.134 Y-8.250 Z-3.000 I1.096 J-0.020 K0.000
+G1 X7.134 Y-8.250 Z-3.000
+G3 X8.250 Y-7.134 Z-3.000 I0.020 J1.096 K0.000
+G1 X8.250 Y7.134 Z-3.000
+G3 X7.929 Y7.929 Z-3.000 I-1.096 J0.020 K0.000
+G1 X7.929 Y7.929 Z-4.000
+G3 X7.134 Y8.250 Z-4.000 I-0.775 J-0.775 K0.000
+G1 X-7.134 Y8.250 Z-4.000
+G3 X-8.250 Y7.134 Z-4.000 I-0.020 J-1.096 K0.000
+G1 X-8.250 Y-7.134 Z-4.000
+G3 X-7.134 Y-8.250 Z-4.000 I1.096 J-0.020 K0.000
+G1 X7.134 Y-8.250 Z-4.000
+G3 X8.250 Y-7.134 Z-4.000 I0.020 J1.096 K0.000
+G1 X8.250 Y7.134 Z-4.000
+G3 X7.929 Y7.929 Z-4.000 I-1.096 J0.020 K0.000
 G0 Z6.000
 G0 Z6.000
-G0 X9.242 Y9.242
-G0 X11.741 Y9.243
-G0 X11.741 Y9.243 Z4.000
-G1 X11.741 Y9.243 Z0.000
-G1 X11.750 Y-10.750 Z0.000
-G2 X10.750 Y-11.750 Z0.000 I-1.012 J0.012 K0.000
-G1 X-10.750 Y-11.750 Z0.000
-G2 X-11.250 Y-11.250 Z0.000 I-0.000 J0.500 K0.000
-G1 X-11.250 Y11.250 Z0.000
-G2 X-10.750 Y11.750 Z0.000 I0.500 J0.000 K0.000
-G1 X10.750 Y11.750 Z0.000
-G2 X11.740 Y10.848 Z0.000 I-0.009 J-1.005 K0.000
-G1 X11.741 Y9.243 Z0.000
-G1 X11.741 Y9.243 Z-1.000
-G1 X11.750 Y-10.750 Z-1.000
-G2 X10.750 Y-11.750 Z-1.000 I-1.012 J0.012 K0.000
-G1 X-10.750 Y-11.750 Z-1.000
-G2 X-11.250 Y-11.250 Z-1.000 I-0.000 J0.500 K0.000
-G1 X-11.250 Y11.250 Z-1.000
-G2 X-10.750 Y11.750 Z-1.000 I0.500 J0.000 K0.000
-G1 X10.750 Y11.750 Z-1.000
-G2 X11.740 Y10.848 Z-1.000 I-0.009 J-1.005 K0.000
-G1 X11.741 Y9.243 Z-1.000
-G1 X11.741 Y9.243 Z-2.000
-G1 X11.750 Y-10.750 Z-2.000
-G2 X10.750 Y-11.750 Z-2.000 I-1.012 J0.012 K0.000
-G1 X-10.750 Y-11.750 Z-2.000
-G2 X-11.250 Y-11.250 Z-2.000 I-0.000 J0.500 K0.000
-G1 X-11.250 Y11.250 Z-2.000
-G2 X-10.750 Y11.750 Z-2.000 I0.500 J0.000 K0.000
-G1 X10.750 Y11.750 Z-2.000
-G2 X11.740 Y10.848 Z-2.000 I-0.009 J-1.005 K0.000
-G1 X11.741 Y9.243 Z-2.000
-G1 X11.741 Y9.243 Z-3.000
-G1 X11.750 Y-10.750 Z-3.000
-G2 X10.750 Y-11.750 Z-3.000 I-1.012 J0.012 K0.000
-G1 X-10.750 Y-11.750 Z-3.000
-G2 X-11.250 Y-11.250 Z-3.000 I-0.000 J0.500 K0.000
-G1 X-11.250 Y11.250 Z-3.000
-G2 X-10.750 Y11.750 Z-3.000 I0.500 J0.000 K0.000
-G1 X10.750 Y11.750 Z-3.000
-G2 X11.740 Y10.848 Z-3.000 I-0.009 J-1.005 K0.000
-G1 X11.741 Y9.243 Z-3.000
-G1 X11.741 Y9.243 Z-4.000
-G1 X11.750 Y-10.750 Z-4.000
-G2 X10.750 Y-11.750 Z-4.000 I-1.012 J0.012 K0.000
-G1 X-10.750 Y-11.750 Z-4.000
-G2 X-11.250 Y-11.250 Z-4.000 I-0.000 J0.500 K0.000
-G1 X-11.250 Y11.250 Z-4.000
-G2 X-10.750 Y11.750 Z-4.000 I0.500 J0.000 K0.000
-G1 X10.750 Y11.750 Z-4.000
-G2 X11.740 Y10.848 Z-4.000 I-0.009 J-1.005 K0.000
-G1 X11.741 Y9.243 Z-4.000
+G0 X7.929 Y7.929
+G0 X10.747 Y7.930
+G0 X10.747 Y7.930 Z4.000
+G1 X10.747 Y7.930 Z0.000
+G1 X10.750 Y-8.662 Z0.000
+G2 X8.718 Y-10.747 Z0.000 I-2.090 J0.005 K0.000
+G1 X-8.662 Y-10.750 Z0.000
+G2 X-9.741 Y-10.448 Z0.000 I0.013 J2.124 K0.000
+G2 X-10.250 Y-9.819 Z0.000 I0.353 J0.806 K0.000
+G1 X-10.250 Y9.819 Z0.000
+G1 X-10.184 Y10.066 Z0.000
+G2 X-8.710 Y10.748 Z0.000 I1.476 J-1.258 K0.000
+G1 X8.662 Y10.750 Z0.000
+G2 X10.747 Y8.718 Z0.000 I-0.005 J-2.090 K0.000
+G1 X10.747 Y7.930 Z0.000
+G1 X10.747 Y7.930 Z-1.000
+G1 X10.750 Y-8.662 Z-1.000
+G2 X8.718 Y-10.747 Z-1.000 I-2.090 J0.005 K0.000
+G1 X-8.662 Y-10.750 Z-1.000
+G2 X-9.741 Y-10.448 Z-1.000 I0.013 J2.124 K0.000
+G2 X-10.250 Y-9.819 Z-1.000 I0.353 J0.806 K0.000
+G1 X-10.250 Y9.819 Z-1.000
+G1 X-10.184 Y10.066 Z-1.000
+G2 X-8.710 Y10.748 Z-1.000 I1.476 J-1.258 K0.000
+G1 X8.662 Y10.750 Z-1.000
+G2 X10.747 Y8.718 Z-1.000 I-0.005 J-2.090 K0.000
+G1 X10.747 Y7.930 Z-1.000
+G1 X10.747 Y7.930 Z-2.000
+G1 X10.750 Y-8.662 Z-2.000
+G2 X8.718 Y-10.747 Z-2.000 I-2.090 J0.005 K0.000
+G1 X-8.662 Y-10.750 Z-2.000
+G2 X-9.741 Y-10.448 Z-2.000 I0.013 J2.124 K0.000
+G2 X-10.250 Y-9.819 Z-2.000 I0.353 J0.806 K0.000
+G1 X-10.250 Y9.819 Z-2.000
+G1 X-10.184 Y10.066 Z-2.000
+G2 X-8.710 Y10.748 Z-2.000 I1.476 J-1.258 K0.000
+G1 X8.662 Y10.750 Z-2.000
+G2 X10.747 Y8.718 Z-2.000 I-0.005 J-2.090 K0.000
+G1 X10.747 Y7.930 Z-2.000
+G1 X10.747 Y7.930 Z-3.000
+G1 X10.750 Y-8.662 Z-3.000
+G2 X8.718 Y-10.747 Z-3.000 I-2.090 J0.005 K0.000
+G1 X-8.662 Y-10.750 Z-3.000
+G2 X-9.741 Y-10.448 Z-3.000 I0.013 J2.124 K0.000
+G2 X-10.250 Y-9.819 Z-3.000 I0.353 J0.806 K0.000
+G1 X-10.250 Y9.819 Z-3.000
+G1 X-10.184 Y10.066 Z-3.000
+G2 X-8.710 Y10.748 Z-3.000 I1.476 J-1.258 K0.000
+G1 X8.662 Y10.750 Z-3.000
+G2 X10.747 Y8.718 Z-3.000 I-0.005 J-2.090 K0.000
+G1 X10.747 Y7.930 Z-3.000
+G1 X10.747 Y7.930 Z-4.000
+G1 X10.750 Y-8.662 Z-4.000
+G2 X8.718 Y-10.747 Z-4.000 I-2.090 J0.005 K0.000
+G1 X-8.662 Y-10.750 Z-4.000
+G2 X-9.741 Y-10.448 Z-4.000 I0.013 J2.124 K0.000
+G2 X-10.250 Y-9.819 Z-4.000 I0.353 J0.806 K0.000
+G1 X-10.250 Y9.819 Z-4.000
+G1 X-10.184 Y10.066 Z-4.000
+G2 X-8.710 Y10.748 Z-4.000 I1.476 J-1.258 K0.000
+G1 X8.662 Y10.750 Z-4.000
+G2 X10.747 Y8.718 Z-4.000 I-0.005 J-2.090 K0.000
+G1 X10.747 Y7.930 Z-4.000
 G0 Z6.000
 G0 Z6.000
 (Finish operation: ProfileOp_2)
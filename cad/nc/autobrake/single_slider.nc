@@ -1,218 +1,173 @@
-(Exported by FreeCAD)
+(Generated by cad.nc.fastcam)
 (Begin preamble)
 G17 G90
 G21
-(Begin operation: Fixture)
-(Path: Fixture)
-G54
-(Finish operation: Fixture)
-(Begin operation: TC: )
-(Path: TC: )
-(TC: )
-(Begin toolchange)
-( M6 T1 )
-(Finish operation: TC: )
-(Begin operation: ProfileOp_1)
-(Path: ProfileOp_1)
-(ProfileOp_1)
-(Compensated Tool Path. Diameter: 1.0)
+(Begin operation: profile bottom holes)
+(Compensated Tool Path. Diameter: 1)
 G0 Z6.000
-G0 X7.742 Y-1.508
+G0 X6.431 Y6.431
 G0 Z4.000
-G1 X7.742 Y-1.508 Z0.000
-G3 X7.701 Y-1.500 Z0.000 I-0.027 J-0.027 K0.000
-G1 X-7.701 Y-1.500 Z0.000
-G3 X-7.750 Y-1.549 Z0.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y-7.701 Z0.000
-G3 X-7.701 Y-7.750 Z0.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y-7.750 Z0.000
-G3 X7.750 Y-7.701 Z0.000 I0.014 J0.035 K0.000
-G1 X7.750 Y-1.549 Z0.000
-G3 X7.742 Y-1.508 Z0.000 I-0.035 J0.014 K0.000
-G1 X7.742 Y-1.508 Z-1.000
-G3 X7.701 Y-1.500 Z-1.000 I-0.027 J-0.027 K0.000
-G1 X-7.701 Y-1.500 Z-1.000
-G3 X-7.750 Y-1.549 Z-1.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y-7.701 Z-1.000
-G3 X-7.701 Y-7.750 Z-1.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y-7.750 Z-1.000
-G3 X7.750 Y-7.701 Z-1.000 I0.014 J0.035 K0.000
-G1 X7.750 Y-1.549 Z-1.000
-G3 X7.742 Y-1.508 Z-1.000 I-0.035 J0.014 K0.000
-G1 X7.742 Y-1.508 Z-2.000
-G3 X7.701 Y-1.500 Z-2.000 I-0.027 J-0.027 K0.000
-G1 X-7.701 Y-1.500 Z-2.000
-G3 X-7.750 Y-1.549 Z-2.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y-7.701 Z-2.000
-G3 X-7.701 Y-7.750 Z-2.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y-7.750 Z-2.000
-G3 X7.750 Y-7.701 Z-2.000 I0.014 J0.035 K0.000
-G1 X7.750 Y-1.549 Z-2.000
-G3 X7.742 Y-1.508 Z-2.000 I-0.035 J0.014 K0.000
-G1 X7.742 Y-1.508 Z-3.000
-G3 X7.701 Y-1.500 Z-3.000 I-0.027 J-0.027 K0.000
-G1 X-7.701 Y-1.500 Z-3.000
-G3 X-7.750 Y-1.549 Z-3.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y-7.701 Z-3.000
-G3 X-7.701 Y-7.750 Z-3.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y-7.750 Z-3.000
-G3 X7.750 Y-7.701 Z-3.000 I0.014 J0.035 K0.000
-G1 X7.750 Y-1.549 Z-3.000
-G3 X7.742 Y-1.508 Z-3.000 I-0.035 J0.014 K0.000
-G1 X7.742 Y-1.508 Z-4.000
-G3 X7.701 Y-1.500 Z-4.000 I-0.027 J-0.027 K0.000
-G1 X-7.701 Y-1.500 Z-4.000
-G3 X-7.750 Y-1.549 Z-4.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y-7.701 Z-4.000
-G3 X-7.701 Y-7.750 Z-4.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y-7.750 Z-4.000
-G3 X7.750 Y-7.701 Z-4.000 I0.014 J0.035 K0.000
-G1 X7.750 Y-1.549 Z-4.000
-G3 X7.742 Y-1.508 Z-4.000 I-0.035 J0.014 K0.000
-G1 X7.742 Y-1.508 Z-5.000
-G3 X7.701 Y-1.500 Z-5.000 I-0.027 J-0.027 K0.000
-G1 X-7.701 Y-1.500 Z-5.000
-G3 X-7.750 Y-1.549 Z-5.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y-7.701 Z-5.000
-G3 X-7.701 Y-7.750 Z-5.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y-7.750 Z-5.000
-G3 X7.750 Y-7.701 Z-5.000 I0.014 J0.035 K0.000
-G1 X7.750 Y-1.549 Z-5.000
-G3 X7.742 Y-1.508 Z-5.000 I-0.035 J0.014 K0.000
+G1 X6.431 Y6.431 Z0.000
+G3 X5.662 Y6.750 Z0.000 I-0.769 J-0.769 K0.000
+G1 X-5.662 Y6.750 Z0.000
+G3 X-6.750 Y5.662 Z0.000 I0.000 J-1.088 K0.000
+G1 X-6.750 Y2.587 Z0.000
+G3 X-5.662 Y1.500 Z0.000 I1.088 J0.000 K0.000
+G1 X5.662 Y1.500 Z0.000
+G3 X6.750 Y2.587 Z0.000 I0.000 J1.087 K0.000
+G1 X6.750 Y5.662 Z0.000
+G3 X6.431 Y6.431 Z0.000 I-1.088 J0.000 K0.000
+G1 X6.431 Y6.431 Z-1.000
+G3 X5.662 Y6.750 Z-1.000 I-0.769 J-0.769 K0.000
+G1 X-5.662 Y6.750 Z-1.000
+G3 X-6.750 Y5.662 Z-1.000 I0.000 J-1.088 K0.000
+G1 X-6.750 Y2.587 Z-1.000
+G3 X-5.662 Y1.500 Z-1.000 I1.088 J0.000 K0.000
+G1 X5.662 Y1.500 Z-1.000
+G3 X6.750 Y2.587 Z-1.000 I0.000 J1.087 K0.000
+G1 X6.750 Y5.662 Z-1.000
+G3 X6.431 Y6.431 Z-1.000 I-1.088 J0.000 K0.000
+G1 X6.431 Y6.431 Z-2.000
+G3 X5.662 Y6.750 Z-2.000 I-0.769 J-0.769 K0.000
+G1 X-5.662 Y6.750 Z-2.000
+G3 X-6.750 Y5.662 Z-2.000 I0.000 J-1.088 K0.000
+G1 X-6.750 Y2.587 Z-2.000
+G3 X-5.662 Y1.500 Z-2.000 I1.088 J0.000 K0.000
+G1 X5.662 Y1.500 Z-2.000
+G3 X6.750 Y2.587 Z-2.000 I0.000 J1.087 K0.000
+G1 X6.750 Y5.662 Z-2.000
+G3 X6.431 Y6.431 Z-2.000 I-1.088 J0.000 K0.000
+G1 X6.431 Y6.431 Z-3.000
+G3 X5.662 Y6.750 Z-3.000 I-0.769 J-0.769 K0.000
+G1 X-5.662 Y6.750 Z-3.000
+G3 X-6.750 Y5.662 Z-3.000 I0.000 J-1.088 K0.000
+G1 X-6.750 Y2.587 Z-3.000
+G3 X-5.662 Y1.500 Z-3.000 I1.088 J0.000 K0.000
+G1 X5.662 Y1.500 Z-3.000
+G3 X6.750 Y2.587 Z-3.000 I0.000 J1.087 K0.000
+G1 X6.750 Y5.662 Z-3.000
+G3 X6.431 Y6.431 Z-3.000 I-1.088 J0.000 K0.000
+G1 X6.431 Y6.431 Z-4.000
+G3 X5.662 Y6.750 Z-4.000 I-0.769 J-0.769 K0.000
+G1 X-5.662 Y6.750 Z-4.000
+G3 X-6.750 Y5.662 Z-4.000 I0.000 J-1.088 K0.000
+G1 X-6.750 Y2.587 Z-4.000
+G3 X-5.662 Y1.500 Z-4.000 I1.088 J0.000 K0.000
+G1 X5.662 Y1.500 Z-4.000
+G3 X6.750 Y2.587 Z-4.000 I0.000 J1.087 K0.000
+G1 X6.750 Y5.662 Z-4.000
+G3 X6.431 Y6.431 Z-4.000 I-1.088 J0.000 K0.000
 G0 Z6.000
 G0 Z6.000
-G0 X7.742 Y-1.508
-G0 X7.716 Y1.497
-G0 X7.716 Y1.497 Z4.000
-G1 X7.716 Y1.497 Z0.000
-G3 X7.750 Y1.549 Z0.000 I-0.000 J0.038 K0.000
-G1 X7.750 Y7.701 Z0.000
-G3 X7.701 Y7.750 Z0.000 I-0.035 J0.014 K0.000
-G1 X-7.701 Y7.750 Z0.000
-G3 X-7.750 Y7.701 Z0.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y1.549 Z0.000
-G3 X-7.701 Y1.500 Z0.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y1.500 Z0.000
-G3 X7.716 Y1.497 Z0.000 I0.014 J0.035 K0.000
-G1 X7.716 Y1.497 Z-1.000
-G3 X7.750 Y1.549 Z-1.000 I-0.000 J0.038 K0.000
-G1 X7.750 Y7.701 Z-1.000
-G3 X7.701 Y7.750 Z-1.000 I-0.035 J0.014 K0.000
-G1 X-7.701 Y7.750 Z-1.000
-G3 X-7.750 Y7.701 Z-1.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y1.549 Z-1.000
-G3 X-7.701 Y1.500 Z-1.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y1.500 Z-1.000
-G3 X7.716 Y1.497 Z-1.000 I0.014 J0.035 K0.000
-G1 X7.716 Y1.497 Z-2.000
-G3 X7.750 Y1.549 Z-2.000 I-0.000 J0.038 K0.000
-G1 X7.750 Y7.701 Z-2.000
-G3 X7.701 Y7.750 Z-2.000 I-0.035 J0.014 K0.000
-G1 X-7.701 Y7.750 Z-2.000
-G3 X-7.750 Y7.701 Z-2.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y1.549 Z-2.000
-G3 X-7.701 Y1.500 Z-2.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y1.500 Z-2.000
-G3 X7.716 Y1.497 Z-2.000 I0.014 J0.035 K0.000
-G1 X7.716 Y1.497 Z-3.000
-G3 X7.750 Y1.549 Z-3.000 I-0.000 J0.038 K0.000
-G1 X7.750 Y7.701 Z-3.000
-G3 X7.701 Y7.750 Z-3.000 I-0.035 J0.014 K0.000
-G1 X-7.701 Y7.750 Z-3.000
-G3 X-7.750 Y7.701 Z-3.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y1.549 Z-3.000
-G3 X-7.701 Y1.500 Z-3.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y1.500 Z-3.000
-G3 X7.716 Y1.497 Z-3.000 I0.014 J0.035 K0.000
-G1 X7.716 Y1.497 Z-4.000
-G3 X7.750 Y1.549 Z-4.000 I-0.000 J0.038 K0.000
-G1 X7.750 Y7.701 Z-4.000
-G3 X7.701 Y7.750 Z-4.000 I-0.035 J0.014 K0.000
-G1 X-7.701 Y7.750 Z-4.000
-G3 X-7.750 Y7.701 Z-4.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y1.549 Z-4.000
-G3 X-7.701 Y1.500 Z-4.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y1.500 Z-4.000
-G3 X7.716 Y1.497 Z-4.000 I0.014 J0.035 K0.000
-G1 X7.716 Y1.497 Z-5.000
-G3 X7.750 Y1.549 Z-5.000 I-0.000 J0.038 K0.000
-G1 X7.750 Y7.701 Z-5.000
-G3 X7.701 Y7.750 Z-5.000 I-0.035 J0.014 K0.000
-G1 X-7.701 Y7.750 Z-5.000
-G3 X-7.750 Y7.701 Z-5.000 I-0.014 J-0.035 K0.000
-G1 X-7.750 Y1.549 Z-5.000
-G3 X-7.701 Y1.500 Z-5.000 I0.035 J-0.014 K0.000
-G1 X7.701 Y1.500 Z-5.000
-G3 X7.716 Y1.497 Z-5.000 I0.014 J0.035 K0.000
-G0 Z6.000
+G0 X5.755 Y-1.504
+G0 Z4.000
+G1 X5.755 Y-1.504 Z0.000
+G3 X5.662 Y-1.500 Z0.000 I-0.092 J-1.084 K0.000
+G1 X-5.662 Y-1.500 Z0.000
+G3 X-6.750 Y-2.587 Z0.000 I0.000 J-1.087 K0.000
+G1 X-6.750 Y-5.662 Z0.000
+G3 X-5.662 Y-6.750 Z0.000 I1.088 J0.000 K0.000
+G1 X5.662 Y-6.750 Z0.000
+G3 X6.750 Y-5.662 Z0.000 I0.000 J1.088 K0.000
+G1 X6.750 Y-2.587 Z0.000
+G3 X5.755 Y-1.504 Z0.000 I-1.088 J0.000 K0.000
+G1 X5.755 Y-1.504 Z-1.000
+G3 X5.662 Y-1.500 Z-1.000 I-0.092 J-1.084 K0.000
+G1 X-5.662 Y-1.500 Z-1.000
+G3 X-6.750 Y-2.587 Z-1.000 I0.000 J-1.087 K0.000
+G1 X-6.750 Y-5.662 Z-1.000
+G3 X-5.662 Y-6.750 Z-1.000 I1.088 J0.000 K0.000
+G1 X5.662 Y-6.750 Z-1.000
+G3 X6.750 Y-5.662 Z-1.000 I0.000 J1.088 K0.000
+G1 X6.750 Y-2.587 Z-1.000
+G3 X5.755 Y-1.504 Z-1.000 I-1.088 J0.000 K0.000
+G1 X5.755 Y-1.504 Z-2.000
+G3 X5.662 Y-1.500 Z-2.000 I-0.092 J-1.084 K0.000
+G1 X-5.662 Y-1.500 Z-2.000
+G3 X-6.750 Y-2.587 Z-2.000 I0.000 J-1.087 K0.000
+G1 X-6.750 Y-5.662 Z-2.000
+G3 X-5.662 Y-6.750 Z-2.000 I1.088 J0.000 K0.000
+G1 X5.662 Y-6.750 Z-2.000
+G3 X6.750 Y-5.662 Z-2.000 I0.000 J1.088 K0.000
+G1 X6.750 Y-2.587 Z-2.000
+G3 X5.755 Y-1.504 Z-2.000 I-1.088 J0.000 K0.000
+G1 X5.755 Y-1.504 Z-3.000
+G3 X5.662 Y-1.500 Z-3.000 I-0.092 J-1.084 K0.000
+G1 X-5.662 Y-1.500 Z-3.000
+G3 X-6.750 Y-2.587 Z-3.000 I0.000 J-1.087 K0.000
+G1 X-6.750 Y-5.662 Z-3.000
+G3 X-5.662 Y-6.750 Z-3.000 I1.088 J0.000 K0.000
+G1 X5.662 Y-6.750 Z-3.000
+G3 X6.750 Y-5.662 Z-3.000 I0.000 J1.088 K0.000
+G1 X6.750 Y-2.587 Z-3.000
+G3 X5.755 Y-1.504 Z-3.000 I-1.088 J0.000 K0.000
+G1 X5.755 Y-1.504 Z-4.000
+G3 X5.662 Y-1.500 Z-4.000 I-0.092 J-1.084 K0.000
+G1 X-5.662 Y-1.500 Z-4.000
+G3 X-6.750 Y-2.587 Z-4.000 I0.000 J-1.087 K0.000
+G1 X-6.750 Y-5.662 Z-4.000
+G3 X-5.662 Y-6.750 Z-4.000 I1.088 J0.000 K0.000
+G1 X5.662 Y-6.750 Z-4.000
+G3 X6.750 Y-5.662 Z-4.000 I0.000 J1.088 K0.000
+G1 X6.750 Y-2.587 Z-4.000
+G3 X5.755 Y-1.504 Z-4.000 I-1.088 J0.000 K0.000
 G0 Z6.000
-G0 X7.716 Y1.497
-G0 X10.244 Y1.498
-G0 X10.244 Y1.498 Z4.000
-G1 X10.244 Y1.498 Z0.000
-G1 X10.250 Y-9.250 Z0.000
-G2 X9.348 Y-10.240 Z0.000 I-1.005 J0.009 K0.000
-G1 X-9.250 Y-10.250 Z0.000
-G2 X-10.250 Y-9.250 Z0.000 I0.012 J1.012 K0.000
-G1 X-10.250 Y9.250 Z0.000
-G2 X-9.250 Y10.250 Z0.000 I1.012 J-0.012 K0.000
-G1 X9.250 Y10.250 Z0.000
-G2 X10.240 Y9.348 Z0.000 I-0.009 J-1.005 K0.000
-G1 X10.244 Y1.498 Z0.000
-G1 X10.244 Y1.498 Z-1.000
-G1 X10.250 Y-9.250 Z-1.000
-G2 X9.348 Y-10.240 Z-1.000 I-1.005 J0.009 K0.000
-G1 X-9.250 Y-10.250 Z-1.000
-G2 X-10.250 Y-9.250 Z-1.000 I0.012 J1.012 K0.000
-G1 X-10.250 Y9.250 Z-1.000
-G2 X-9.250 Y10.250 Z-1.000 I1.012 J-0.012 K0.000
-G1 X9.250 Y10.250 Z-1.000
-G2 X10.240 Y9.348 Z-1.000 I-0.009 J-1.005 K0.000
-G1 X10.244 Y1.498 Z-1.000
-G1 X10.244 Y1.498 Z-2.000
-G1 X10.250 Y-9.250 Z-2.000
-G2 X9.348 Y-10.240 Z-2.000 I-1.005 J0.009 K0.000
-G1 X-9.250 Y-10.250 Z-2.000
-G2 X-10.250 Y-9.250 Z-2.000 I0.012 J1.012 K0.000
-G1 X-10.250 Y9.250 Z-2.000
-G2 X-9.250 Y10.250 Z-2.000 I1.012 J-0.012 K0.000
-G1 X9.250 Y10.250 Z-2.000
-G2 X10.240 Y9.348 Z-2.000 I-0.009 J-1.005 K0.000
-G1 X10.244 Y1.498 Z-2.000
-G1 X10.244 Y1.498 Z-3.000
-G1 X10.250 Y-9.250 Z-3.000
-G2 X9.348 Y-10.240 Z-3.000 I-1.005 J0.009 K0.000
-G1 X-9.250 Y-10.250 Z-3.000
-G2 X-10.250 Y-9.250 Z-3.000 I0.012 J1.012 K0.000
-G1 X-10.250 Y9.250 Z-3.000
-G2 X-9.250 Y10.250 Z-3.000 I1.012 J-0.012 K0.000
-G1 X9.250 Y10.250 Z-3.000
-G2 X10.240 Y9.348 Z-3.000 I-0.009 J-1.005 K0.000
-G1 X10.244 Y1.498 Z-3.000
-G1 X10.244 Y1.498 Z-4.000
-G1 X10.250 Y-9.250 Z-4.000
-G2 X9.348 Y-10.240 Z-4.000 I-1.005 J0.009 K0.000
-G1 X-9.250 Y-10.250 Z-4.000
-G2 X-10.250 Y-9.250 Z-4.000 I0.012 J1.012 K0.000
-G1 X-10.250 Y9.250 Z-4.000
-G2 X-9.250 Y10.250 Z-4.000 I1.012 J-0.012 K0.000
-G1 X9.250 Y10.250 Z-4.000
-G2 X10.240 Y9.348 Z-4.000 I-0.009 J-1.005 K0.000
-G1 X10.244 Y1.498 Z-4.000
-G1 X10.244 Y1.498 Z-5.000
-G1 X10.250 Y-9.250 Z-5.000
-G2 X9.348 Y-10.240 Z-5.000 I-1.005 J0.009 K0.000
-G1 X-9.250 Y-10.250 Z-5.000
-G2 X-10.250 Y-9.250 Z-5.000 I0.012 J1.012 K0.000
-G1 X-10.250 Y9.250 Z-5.000
-G2 X-9.250 Y10.250 Z-5.000 I1.012 J-0.012 K0.000
-G1 X9.250 Y10.250 Z-5.000
-G2 X10.240 Y9.348 Z-5.000 I-0.009 J-1.005 K0.000
-G1 X10.244 Y1.498 Z-5.000
 G0 Z6.000
+G0 X9.150 Y-1.504
+G0 Z4.000
+G1 X9.150 Y-1.504 Z0.000
+G1 X9.150 Y-7.062 Z0.000
+G2 X7.062 Y-9.150 Z0.000 I-2.088 J0.000 K0.000
+G1 X-7.062 Y-9.150 Z0.000
+G2 X-9.150 Y-7.062 Z0.000 I0.000 J2.088 K0.000
+G1 X-9.150 Y7.062 Z0.000
+G2 X-7.062 Y9.150 Z0.000 I2.088 J0.000 K0.000
+G1 X7.062 Y9.150 Z0.000
+G2 X9.150 Y7.062 Z0.000 I0.000 J-2.088 K0.000
+G1 X9.150 Y-1.504 Z0.000
+G1 X9.150 Y-1.504 Z-1.000
+G1 X9.150 Y-7.062 Z-1.000
+G2 X7.062 Y-9.150 Z-1.000 I-2.088 J0.000 K0.000
+G1 X-7.062 Y-9.150 Z-1.000
+G2 X-9.150 Y-7.062 Z-1.000 I0.000 J2.088 K0.000
+G1 X-9.150 Y7.062 Z-1.000
+G2 X-7.062 Y9.150 Z-1.000 I2.088 J0.000 K0.000
+G1 X7.062 Y9.150 Z-1.000
+G2 X9.150 Y7.062 Z-1.000 I0.000 J-2.088 K0.000
+G1 X9.150 Y-1.504 Z-1.000
+G1 X9.150 Y-1.504 Z-2.000
+G1 X9.150 Y-7.062 Z-2.000
+G2 X7.062 Y-9.150 Z-2.000 I-2.088 J0.000 K0.000
+G1 X-7.062 Y-9.150 Z-2.000
+G2 X-9.150 Y-7.062 Z-2.000 I0.000 J2.088 K0.000
+G1 X-9.150 Y7.062 Z-2.000
+G2 X-7.062 Y9.150 Z-2.000 I2.088 J0.000 K0.000
+G1 X7.062 Y9.150 Z-2.000
+G2 X9.150 Y7.062 Z-2.000 I0.000 J-2.088 K0.000
+G1 X9.150 Y-1.504 Z-2.000
+G1 X9.150 Y-1.504 Z-3.000
+G1 X9.150 Y-7.062 Z-3.000
+G2 X7.062 Y-9.150 Z-3.000 I-2.088 J0.000 K0.000
+G1 X-7.062 Y-9.150 Z-3.000
+G2 X-9.150 Y-7.062 Z-3.000 I0.000 J2.088 K0.000
+G1 X-9.150 Y7.062 Z-3.000
+G2 X-7.062 Y9.150 Z-3.000 I2.088 J0.000 K0.000
+G1 X7.062 Y9.150 Z-3.000
+G2 X9.150 Y7.062 Z-3.000 I0.000 J-2.088 K0.000
+G1 X9.150 Y-1.504 Z-3.000
+G1 X9.150 Y-1.504 Z-4.000
+G1 X9.150 Y-7.062 Z-4.000
+G2 X7.062 Y-9.150 Z-4.000 I-2.088 J0.000 K0.000
+G1 X-7.062 Y-9.150 Z-4.000
+G2 X-9.150 Y-7.062 Z-4.000 I0.000 J2.088 K0.000
+G1 X-9.150 Y7.062 Z-4.000
+G2 X-7.062 Y9.150 Z-4.000 I2.088 J0.000 K0.000
+G1 X7.062 Y9.150 Z-4.000
+G2 X9.150 Y7.062 Z-4.000 I0.000 J-2.088 K0.000
+G1 X9.150 Y-1.504 Z-4.000
 G0 Z6.000
-(Finish operation: ProfileOp_1)
+(Finish operation: profile bottom holes)
 (Begin postamble)
 M5
 G17 G90
-M2
+M2
\ No newline at end of file
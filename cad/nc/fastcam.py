@@ -0,0 +1,660 @@
+"""
+Direct toolpath generation for parts made of extruded rounded rectangles.
+
+The Korry sleeve, slider and cover are stacks of RectangleRounded profiles,
+so their contour toolpaths can be computed analytically from the
+KorrySwitch parameters: tool radius offsets of lines and arcs, step-downs
+and tabs, written as GRBL G-code in the same layout as the FreeCAD grbl
+post. No solid is built and FreeCAD is not involved.
+
+    python -m cad.nc.fastcam --validate      # compare with cad/nc/korry
+"""
+import argparse
+import math
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from cad.nc.gcode import ARC_CCW, ARC_CW, LINEAR, arc_points, parse_moves
+
+_eps = 1e-9
+
+
+class Line(NamedTuple):
+    start: tuple
+    end: tuple
+
+    @property
+    def length(self):
+        return math.dist(self.start, self.end)
+
+    def point(self, t):
+        return tuple(a + (b - a) * t for a, b in zip(self.start, self.end))
+
+    def reversed(self):
+        return Line(self.end, self.start)
+
+    def transformed(self, fn):
+        return Line(fn(self.start), fn(self.end))
+
+
+class Arc(NamedTuple):
+    start: tuple
+    end: tuple
+    center: tuple
+    ccw: bool
+
+    @property
+    def radius(self):
+        return math.dist(self.start, self.center)
+
+    @property
+    def start_angle(self):
+        dx = self.start[0] - self.center[0]
+        dy = self.start[1] - self.center[1]
+        return math.atan2(dy, dx)
+
+    @property
+    def sweep(self):
+        a0 = self.start_angle
+        a1 = math.atan2(self.end[1] - self.center[1], self.end[0] - self.center[0])
+        sweep = (a1 - a0) % (2 * math.pi)
+        if sweep < _eps:
+            sweep = 2 * math.pi if math.dist(self.start, self.end) < _eps else 0.0
+        if self.ccw or not sweep:
+            return sweep
+        return sweep - 2 * math.pi
+
+    @property
+    def length(self):
+        return self.radius * abs(self.sweep)
+
+    def point(self, t):
+        angle = self.start_angle + self.sweep * t
+        return (
+            self.center[0] + self.radius * math.cos(angle),
+            self.center[1] + self.radius * math.sin(angle),
+        )
+
+    def reversed(self):
+        return Arc(self.end, self.start, self.center, not self.ccw)
+
+    def transformed(self, fn):
+        # fn is a rotation/translation or a mirror, a mirror flips direction
+        start, end, center = fn(self.start), fn(self.end), fn(self.center)
+        probe = fn(self.point(0.5))
+        cross = (start[0] - center[0]) * (probe[1] - center[1]) - (
+            start[1] - center[1]
+        ) * (probe[0] - center[0])
+        return Arc(start, end, center, cross > 0)
+
+
+def _split(segment, t):
+    """Two pieces of a segment split at parameter t"""
+    point = segment.point(t)
+    if isinstance(segment, Line):
+        return Line(segment.start, point), Line(point, segment.end)
+    return (
+        Arc(segment.start, point, segment.center, segment.ccw),
+        Arc(point, segment.end, segment.center, segment.ccw),
+    )
+
+
+def rounded_rectangle(width, height, radius, center=(0.0, 0.0)):
+    """Closed counter-clockwise contour, like build123d's RectangleRounded"""
+    cx, cy = center
+    hw, hh = width / 2, height / 2
+    r = min(radius, hw, hh)
+    corners = [  # arc centers, counter-clockwise from bottom right
+        (cx + hw - r, cy - hh + r),
+        (cx + hw - r, cy + hh - r),
+        (cx - hw + r, cy + hh - r),
+        (cx - hw + r, cy - hh + r),
+    ]
+    contour = []
+    for i, (x, y) in enumerate(corners):
+        # Each corner arc covers one quadrant, starting at angle (i - 1) * 90
+        a0 = (i - 1) * math.pi / 2
+        start = (x + r * math.cos(a0), y + r * math.sin(a0))
+        end = (x + r * math.cos(a0 + math.pi / 2), y + r * math.sin(a0 + math.pi / 2))
+        if contour:
+            contour.append(Line(contour[-1].end, start))
+        if r > _eps:
+            contour.append(Arc(start, end, (x, y), True))
+        else:
+            contour.append(Line(start, start))
+    contour.append(Line(contour[-1].end, contour[0].start))
+    return [s for s in contour if s.length > _eps]
+
+
+def clip_x(contour, x, keep_below=True):
+    """
+    Clip a convex counter-clockwise contour at a vertical line, keeping the
+    side with smaller (keep_below) or larger X. Arcs must each lie within a
+    single quadrant, as the corners of rounded_rectangle do.
+    """
+
+    def inside(point):
+        return point[0] <= x + _eps if keep_below else point[0] >= x - _eps
+
+    def crossing(segment):
+        """Parameter where the segment crosses the clip line"""
+        if isinstance(segment, Line):
+            dx = segment.end[0] - segment.start[0]
+            return (x - segment.start[0]) / dx
+        cos_angle = (x - segment.center[0]) / segment.radius
+        a0, sweep = segment.start_angle, segment.sweep
+        for angle in (math.acos(cos_angle), -math.acos(cos_angle)):
+            delta = (angle - a0) if sweep > 0 else (a0 - angle)
+            t = (delta % (2 * math.pi)) / abs(sweep)
+            if -_eps <= t <= 1 + _eps:
+                return t
+        raise ValueError("Arc does not cross the clip line")
+
+    pieces = []
+    for segment in contour:
+        start_in, end_in = inside(segment.start), inside(segment.end)
+        if start_in and end_in:
+            pieces.append(segment)
+        elif start_in:
+            pieces.append(_split(segment, crossing(segment))[0])
+        elif end_in:
+            pieces.append(_split(segment, crossing(segment))[1])
+
+    clipped = []
+    for i, piece in enumerate(pieces):
+        following = pieces[(i + 1) % len(pieces)]
+        clipped.append(piece)
+        if math.dist(piece.end, following.start) > 1e-7:
+            clipped.append(Line(piece.end, following.start))
+    return [s for s in clipped if s.length > _eps]
+
+
+def offset(contour, distance):
+    """
+    Offset a closed counter-clockwise contour, outwards for a positive
+    distance. Convex corners get an arc around the original vertex.
+    """
+    shifted = []
+    for segment in contour:
+        if isinstance(segment, Line):
+            dx = segment.end[0] - segment.start[0]
+            dy = segment.end[1] - segment.start[1]
+            length = math.hypot(dx, dy)
+            nx, ny = dy / length * distance, -dx / length * distance
+            shifted.append(
+                Line(
+                    (segment.start[0] + nx, segment.start[1] + ny),
+                    (segment.end[0] + nx, segment.end[1] + ny),
+                )
+            )
+        else:
+            radius = segment.radius + (distance if segment.ccw else -distance)
+            if radius <= _eps:
+                raise ValueError(
+                    f"Arc of radius {segment.radius:.3f} vanishes at offset {distance}"
+                )
+            scale = radius / segment.radius
+
+            def moved(point, center=segment.center):
+                return (
+                    center[0] + (point[0] - center[0]) * scale,
+                    center[1] + (point[1] - center[1]) * scale,
+                )
+
+            start, end = moved(segment.start), moved(segment.end)
+            shifted.append(Arc(start, end, segment.center, segment.ccw))
+
+    result = []
+    for i, segment in enumerate(shifted):
+        following = shifted[(i + 1) % len(shifted)]
+        result.append(segment)
+        if math.dist(segment.end, following.start) > 1e-7:
+            if distance < 0:
+                raise ValueError("Inward offset of a sharp corner is not supported")
+            vertex = contour[i].end
+            result.append(Arc(segment.end, following.start, vertex, True))
+    return result
+
+
+def orient(contour, ccw):
+    """Contour with the requested direction of travel"""
+    area = 0.0
+    for segment in contour:
+        points = [segment.point(t / 4) for t in range(4)]
+        for a, b in zip(points, points[1:] + [segment.end]):
+            area += a[0] * b[1] - b[0] * a[1]
+    if (area > 0) == ccw:
+        return contour
+    return [segment.reversed() for segment in reversed(contour)]
+
+
+def _closest(segment, point):
+    """Parameter of the point of a segment closest to point"""
+    if isinstance(segment, Line):
+        dx = segment.end[0] - segment.start[0]
+        dy = segment.end[1] - segment.start[1]
+        px = point[0] - segment.start[0]
+        py = point[1] - segment.start[1]
+        t = (px * dx + py * dy) / (dx * dx + dy * dy)
+        return min(1.0, max(0.0, t))
+    angle = math.atan2(point[1] - segment.center[1], point[0] - segment.center[0])
+    sweep = segment.sweep
+    delta = (angle - segment.start_angle) * (1 if sweep > 0 else -1)
+    t = (delta % (2 * math.pi)) / abs(sweep)
+    if t <= 1:
+        return t
+    return min((0.0, 1.0), key=lambda end: math.dist(segment.point(end), point))
+
+
+def nearest(contour, point):
+    """Index and parameter of the point of the contour closest to point"""
+    candidates = [(i, _closest(segment, point)) for i, segment in enumerate(contour)]
+    return min(candidates, key=lambda c: math.dist(contour[c[0]].point(c[1]), point))
+
+
+def start_at(contour, index, t):
+    """Same closed contour, starting at parameter t of segment index"""
+    if t >= 1 - _eps:
+        index, t = (index + 1) % len(contour), 0.0
+    if t <= _eps:
+        return contour[index:] + contour[:index]
+    head, tail = _split(contour[index], t)
+    return [tail] + contour[index + 1 :] + contour[:index] + [head]
+
+
+@dataclass
+class Tabs:
+    """Bridges holding the part, width along the part edge in mm"""
+
+    count: int = 4
+    width: float = 3.0
+    height: float = 1.0
+
+
+@dataclass
+class Profile:
+    """
+    Contour cut with the tool outside or inside of it. hole marks the
+    inner wires of a face, cut counter-clockwise, outer wires are cut
+    clockwise as in the FreeCAD profile operation.
+    """
+
+    contour: list
+    side: str = "outside"
+    hole: bool = False
+    tabs: Optional[Tabs] = None
+
+
+@dataclass
+class Operation:
+    name: str
+    profiles: List[Profile]
+    final_depth: float
+    start_depth: float = 0.0
+    step_down: float = 1.0
+
+    def levels(self):
+        """Pass depths, the first one at the start depth like FreeCAD"""
+        levels = []
+        depth = self.start_depth
+        while depth > self.final_depth + _eps:
+            levels.append(depth)
+            depth -= self.step_down
+        return levels + [self.final_depth]
+
+
+@dataclass
+class Setup:
+    """Work coordinates: from the top face, or the bottom face (Y mirrored)"""
+
+    operations: List[Operation]
+    flip: bool = False
+    clearance: float = 6.0
+    safe_height: float = 4.0
+    feed: Optional[float] = None
+    plunge_feed: Optional[float] = None
+    comments: List[str] = field(default_factory=list)
+
+
+def _fmt(value):
+    text = f"{value:.3f}"
+    return "0.000" if text == "-0.000" else text
+
+
+class _Writer:
+    def __init__(self, setup):
+        self.setup = setup
+        self.lines = []
+        self.position = None
+
+    def feed(self, plunge=False):
+        feed = self.setup.plunge_feed if plunge else self.setup.feed
+        return f" F{_fmt(feed)}" if feed else ""
+
+    def rapid(self, **axes):
+        words = " ".join(f"{k}{_fmt(v)}" for k, v in axes.items())
+        self.lines.append(f"G0 {words}")
+
+    def linear(self, point, z, plunge=False):
+        self.lines.append(
+            f"G1 X{_fmt(point[0])} Y{_fmt(point[1])} Z{_fmt(z)}{self.feed(plunge)}"
+        )
+        self.position = point
+
+    def segment(self, segment, z):
+        if isinstance(segment, Line):
+            return self.linear(segment.end, z)
+        i = segment.center[0] - segment.start[0]
+        j = segment.center[1] - segment.start[1]
+        self.lines.append(
+            f"G{3 if segment.ccw else 2} X{_fmt(segment.end[0])} "
+            f"Y{_fmt(segment.end[1])} Z{_fmt(z)} I{_fmt(i)} J{_fmt(j)} K0.000"
+            f"{self.feed()}"
+        )
+        self.position = segment.end
+
+
+def _tab_spans(path, tabs: Tabs, tool_diameter):
+    """(segment index, t0, t1) of the tabs, centred on the longest lines"""
+    lines = sorted(
+        (i for i, s in enumerate(path) if isinstance(s, Line)),
+        key=lambda i: -path[i].length,
+    )
+    spans = {}
+    gap = tabs.width + tool_diameter
+    for index in lines[: tabs.count]:
+        length = path[index].length
+        if length > gap:
+            half = gap / 2 / length
+            spans[index] = (0.5 - half, 0.5 + half)
+    return spans
+
+
+def _cut_contour(writer, path, z, tab_spans, tab_top):
+    for index, segment in enumerate(path):
+        span = tab_spans.get(index) if z < tab_top - _eps else None
+        if span is None:
+            writer.segment(segment, z)
+            continue
+        t0, t1 = span
+        writer.linear(segment.point(t0), z)
+        writer.linear(segment.point(t0), tab_top, plunge=True)
+        writer.linear(segment.point(t1), tab_top)
+        writer.linear(segment.point(t1), z, plunge=True)
+        writer.linear(segment.end, z)
+
+
+def toolpath(setup: Setup, tool_diameter: float):
+    """Yield the G-code lines of a setup"""
+    radius = tool_diameter / 2
+    writer = _Writer(setup)
+    transform = (lambda p: (p[0], -p[1])) if setup.flip else (lambda p: p)
+
+    yield "(Generated by cad.nc.fastcam)"
+    yield from (f"({comment})" for comment in setup.comments)
+    yield "(Begin preamble)"
+    yield "G17 G90"
+    yield "G21"
+
+    for operation in setup.operations:
+        writer.lines = [
+            f"(Begin operation: {operation.name})",
+            f"(Compensated Tool Path. Diameter: {tool_diameter})",
+        ]
+        paths = []
+        for profile in operation.profiles:
+            distance = radius if profile.side == "outside" else -radius
+            path = [s.transformed(transform) for s in offset(profile.contour, distance)]
+            paths.append((profile, orient(path, ccw=profile.hole)))
+        # Holes before outer wires, each starting where the previous ended
+        paths.sort(key=lambda item: not item[0].hole)
+
+        for profile, path in paths:
+            if writer.position is None:
+                # Start on the top right corner like FreeCAD
+                point = (1e6, 1e6)
+            else:
+                point = writer.position
+            path = start_at(path, *nearest(path, point))
+            start = path[0].start
+            tab_spans = {}
+            tab_top = -math.inf
+            if profile.tabs:
+                tab_spans = _tab_spans(path, profile.tabs, tool_diameter)
+                tab_top = operation.final_depth + profile.tabs.height
+
+            writer.rapid(Z=setup.clearance)
+            writer.rapid(X=start[0], Y=start[1])
+            writer.rapid(Z=setup.safe_height)
+            for z in operation.levels():
+                writer.linear(start, z, plunge=True)
+                _cut_contour(writer, path, z, tab_spans, tab_top)
+            writer.rapid(Z=setup.clearance)
+        writer.lines.append(f"(Finish operation: {operation.name})")
+        yield from writer.lines
+
+    yield "(Begin postamble)"
+    yield "M5"
+    yield "G17 G90"
+    yield "M2"
+
+
+def sleeve_setup(
+    korry,
+    stock_thickness,
+    ledge_offset=0.5,
+    ledge_thickness=1.0,
+    left_ledge=True,
+    right_ledge=True,
+):
+    """
+    KorrySwitch.sleeve machined from its bottom face as in cam_sleeve: the
+    body outline, then the ledge outline and the opening through.
+    """
+    r = korry.corner_radius
+    ledge = rounded_rectangle(
+        korry.width + ledge_offset * 2, korry.height + ledge_offset * 2, r
+    )
+    if not left_ledge:
+        ledge = clip_x(ledge, -korry.width / 2, keep_below=False)
+    if not right_ledge:
+        ledge = clip_x(ledge, korry.width / 2, keep_below=True)
+    body = rounded_rectangle(korry.width, korry.height, r)
+    opening = rounded_rectangle(korry.inner_width, korry.inner_height, r)
+    return Setup(
+        [
+            Operation(
+                "profile mid",
+                [Profile(body)],
+                final_depth=-(stock_thickness - ledge_thickness),
+            ),
+            Operation(
+                "profile top holes",
+                [Profile(opening, "inside", hole=True), Profile(ledge)],
+                final_depth=-stock_thickness,
+            ),
+        ],
+        flip=True,
+    )
+
+
+def slider_setup(korry, diffuser_stock_thickness=3, diffuser_ledge=0.5):
+    """
+    KorrySwitch.slider machined from its top face as in cam_slider: the
+    diffuser windows, then the lower slots and the outline through.
+    """
+    r = korry.corner_radius
+    offsets = (korry.diffuser_offset, -korry.diffuser_offset)
+    windows = [
+        rounded_rectangle(korry.diffuser_width, korry.diffuser_height, r, (0, y))
+        for y in offsets
+    ]
+    slots = [
+        rounded_rectangle(
+            korry.diffuser_width - diffuser_ledge * 2,
+            korry.diffuser_height - diffuser_ledge * 2,
+            r,
+            (0, y),
+        )
+        for y in offsets
+    ]
+    outline = rounded_rectangle(
+        korry.inner_width - korry.slider_tolerance * 2,
+        korry.inner_height - korry.slider_tolerance * 2,
+        r,
+    )
+    return Setup(
+        [
+            Operation(
+                "profile mid in",
+                [Profile(window, "inside") for window in windows],
+                final_depth=-diffuser_stock_thickness,
+            ),
+            Operation(
+                "profile bottom holes",
+                [Profile(slot, "inside", hole=True) for slot in slots]
+                + [Profile(outline)],
+                final_depth=-korry.slider_stock_thickness,
+            ),
+        ]
+    )
+
+
+def cover_setup(korry, tabs: Optional[Tabs] = None):
+    """KorrySwitch.cover outline cut from sheet stock, held by tabs"""
+    if tabs is None:
+        tabs = Tabs(height=korry.cover_stock_thickness / 2)
+    outline = rounded_rectangle(
+        korry.inner_width - korry.slider_tolerance * 2,
+        korry.inner_height - korry.slider_tolerance * 2,
+        korry.corner_radius,
+    )
+    return Setup(
+        [
+            Operation(
+                "profile outline",
+                [Profile(outline, tabs=tabs)],
+                final_depth=-korry.cover_stock_thickness,
+                step_down=korry.cover_stock_thickness / 2,
+            )
+        ]
+    )
+
+
+def _cut_polylines(lines, chord_length):
+    """{z: (starts, ends)} of the feed moves at constant Z, arcs as chords"""
+    levels = {}
+    for move in parse_moves(lines):
+        if move.motion not in (LINEAR, ARC_CW, ARC_CCW):
+            continue
+        if abs(move.start[2] - move.end[2]) > _eps:
+            continue
+        if move.motion == LINEAR:
+            points = [move.start, move.end]
+        else:
+            points = [move.start] + arc_points(move, chord_length)
+        segments = levels.setdefault(round(move.end[2], 3), [])
+        segments += [(a[:2], b[:2]) for a, b in zip(points, points[1:])]
+    return {
+        z: (np.array([a for a, _ in s]), np.array([b for _, b in s]))
+        for z, s in levels.items()
+    }
+
+
+def _samples(starts, ends, resolution):
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    counts = np.maximum(1, np.ceil(lengths / resolution)).astype(int)
+    index = np.repeat(np.arange(len(starts)), counts + 1)
+    t = np.concatenate([np.linspace(0, 1, n + 1) for n in counts])[:, None]
+    return starts[index] + (ends[index] - starts[index]) * t
+
+
+def _directed_distance(points, starts, ends, chunk=256):
+    """Largest distance from one of the points to the nearest segment"""
+    direction = ends - starts
+    length2 = np.maximum((direction**2).sum(axis=1), 1e-12)
+    worst = 0.0
+    for i in range(0, len(points), chunk):
+        block = points[i : i + chunk, None, :]
+        t = np.clip(((block - starts) * direction).sum(-1) / length2, 0, 1)
+        nearest = starts + t[..., None] * direction
+        distances = np.sqrt(((block - nearest) ** 2).sum(-1)).min(axis=1)
+        worst = max(worst, float(distances.max()))
+    return worst
+
+
+def compare(reference, candidate, resolution=0.1) -> Tuple[dict, set, set]:
+    """
+    Hausdorff distance between the cutting moves of two programs per Z
+    level, plus the levels found in only one of them. Moves are sampled
+    every resolution mm and compared with the other program's segments.
+    """
+    # Chords of 0.2 mm deviate less than 0.005 mm from arcs of 1 mm radius
+    a = _cut_polylines(reference, 0.2)
+    b = _cut_polylines(candidate, 0.2)
+    distances = {}
+    for z in sorted(set(a) & set(b)):
+        distances[z] = max(
+            _directed_distance(_samples(*a[z], resolution), *b[z]),
+            _directed_distance(_samples(*b[z], resolution), *a[z]),
+        )
+    return distances, set(a) - set(b), set(b) - set(a)
+
+
+def variant_program(variant, tool_diameter=1.0):
+    """G-code lines for a korry_batch.CamVariant"""
+    from cad.common.buttons.korry.korry import KorrySwitch
+
+    if variant.kind == "sleeve":
+        korry = KorrySwitch(
+            variant.width, variant.height, corner_radius=variant.corner_radius
+        )
+        setup = sleeve_setup(
+            korry,
+            variant.stock_thickness,
+            left_ledge=variant.left_ledge,
+            right_ledge=variant.right_ledge,
+        )
+    else:
+        korry = KorrySwitch(
+            variant.width, variant.height, corner_radius=variant.corner_radius
+        )
+        setup = slider_setup(korry, variant.stock_thickness)
+    return toolpath(setup, tool_diameter)
+
+
+def validate(variants=None, tolerance=0.1):
+    """Compare the generated programs with the committed FreeCAD ones"""
+    from cad.common.buttons.korry.korry_batch import KORRY_CATALOGUE
+    from cad.nc.nc import gcode_path
+
+    ok = True
+    for variant in variants or KORRY_CATALOGUE:
+        with open(gcode_path(variant.output)) as f:
+            reference = f.read().splitlines()
+        distances, missing, extra = compare(reference, list(variant_program(variant)))
+        worst = max(distances.values(), default=math.inf)
+        passed = worst <= tolerance and not missing and not extra
+        ok &= passed
+        status = "ok" if passed else "FAILED"
+        print(f"{variant.output:<64} max deviation {worst:6.3f} mm  {status}")
+        if missing or extra:
+            print(f"    levels missing {sorted(missing)}, extra {sorted(extra)}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--validate", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    if args.validate:
+        return 0 if validate(tolerance=args.tolerance) else 1
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,211 @@
+"""
+Minimal G-code reader for the programs produced by FreeCAD (grbl post) and
+pcb2gcode. Only the subset those emit is understood: G0-G3 in the XY plane,
+G4 dwell, G20/G21, G90/G91, G80-G83 drilling cycles and F words.
+"""
+import math
+import re
+from typing import NamedTuple, Optional
+
+RAPID, LINEAR, ARC_CW, ARC_CCW, DWELL = 0, 1, 2, 3, 4
+MOTION_CODES = (0, 1, 2, 3)
+DRILL_CODES = (81, 82, 83)
+
+_comment_re = re.compile(r"\([^)]*\)|;.*$")
+_word_re = re.compile(r"([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))")
+
+
+def strip_comment(line: str) -> str:
+    return _comment_re.sub("", line).strip()
+
+
+def parse_words(line: str):
+    """[(letter, value), ...] of a line with comments removed"""
+    return [(l, float(v)) for l, v in _word_re.findall(strip_comment(line).upper())]
+
+
+class Move(NamedTuple):
+    motion: int
+    start: tuple
+    end: tuple
+    center: Optional[tuple] = None
+    feed: Optional[float] = None
+    dwell: float = 0.0
+    line: int = 0
+
+    @property
+    def length(self) -> float:
+        if self.motion in (ARC_CW, ARC_CCW):
+            radius, sweep = arc_geometry(self)
+            planar = radius * abs(sweep)
+            return math.hypot(planar, self.end[2] - self.start[2])
+        return math.dist(self.start, self.end)
+
+
+def arc_geometry(move: Move):
+    """Radius and signed sweep angle (radians) of an XY plane arc"""
+    cx, cy = move.center
+    radius = math.hypot(move.start[0] - cx, move.start[1] - cy)
+    a0 = math.atan2(move.start[1] - cy, move.start[0] - cx)
+    a1 = math.atan2(move.end[1] - cy, move.end[0] - cx)
+    sweep = a1 - a0
+    if move.motion == ARC_CW:
+        if sweep >= -1e-12:
+            sweep -= 2 * math.pi
+    elif sweep <= 1e-12:
+        sweep += 2 * math.pi
+    return radius, sweep
+
+
+class ModalState:
+    """Modal state of the controller while reading a program"""
+
+    def __init__(self):
+        self.motion = RAPID
+        self.absolute = True
+        self.scale = 1.0
+        self.feed = None
+        self.position = (0.0, 0.0, 0.0)
+        # Axes set by an absolute coordinate so far, position is only
+        # assumed (0) for the others
+        self.known = (False, False, False)
+        self.retract_to_r = False
+        self.cycle_z = None
+        self.cycle_r = None
+        self.initial_z = None
+
+    def target(self, axes):
+        target = list(self.position)
+        known = list(self.known)
+        for i, letter in enumerate("XYZ"):
+            if letter in axes:
+                value = axes[letter] * self.scale
+                target[i] = value if self.absolute else target[i] + value
+                known[i] = known[i] or self.absolute
+        self.known = tuple(known)
+        return tuple(target)
+
+
+def _drill_moves(state, axes, line_no):
+    """Expand one hole of a canned drilling cycle into rapid/feed moves"""
+    if "Z" in axes:
+        state.cycle_z = axes["Z"] * state.scale
+    if "R" in axes:
+        state.cycle_r = axes["R"] * state.scale
+    z = state.position[2]
+    hole = state.target({k: v for k, v in axes.items() if k in "XY"})
+    r = state.cycle_r if state.cycle_r is not None else z
+    bottom = state.cycle_z if state.cycle_z is not None else r
+    initial_z = state.initial_z if state.initial_z is not None else z
+    clearance = max(initial_z, r)
+    points = [
+        (RAPID, (hole[0], hole[1], clearance)),
+        (RAPID, (hole[0], hole[1], r)),
+        (LINEAR, (hole[0], hole[1], bottom)),
+        (RAPID, (hole[0], hole[1], r if state.retract_to_r else clearance)),
+    ]
+    moves = []
+    for motion, end in points:
+        if end != state.position:
+            moves.append(
+                Move(motion, state.position, end, feed=state.feed, line=line_no)
+            )
+            state.position = end
+    return moves
+
+
+def parse_line(state: ModalState, line: str, line_no=0):
+    """Update state with a line and return the moves it produces"""
+    words = parse_words(line)
+    if not words:
+        return []
+    axes = {}
+    codes = []
+    dwell = None
+    for letter, value in words:
+        if letter == "G":
+            codes.append(value)
+        elif letter in "XYZIJKR":
+            axes[letter] = value
+        elif letter == "F":
+            state.feed = value * state.scale
+        elif letter == "P":
+            dwell = value
+
+    for code in codes:
+        if code in MOTION_CODES:
+            state.motion = int(code)
+        elif code in DRILL_CODES:
+            state.motion = int(code)
+            state.initial_z = state.position[2]
+        elif code == 80:
+            state.motion = RAPID
+        elif code == 90:
+            state.absolute = True
+        elif code == 91:
+            state.absolute = False
+        elif code == 20:
+            state.scale = 25.4
+        elif code == 21:
+            state.scale = 1.0
+        elif code == 98:
+            state.retract_to_r = False
+        elif code == 99:
+            state.retract_to_r = True
+        elif code == 4:
+            position = state.position
+            return [Move(DWELL, position, position, dwell=dwell or 0.0, line=line_no)]
+
+    if not any(letter in axes for letter in "XYZ"):
+        return []
+    if state.motion in DRILL_CODES:
+        return _drill_moves(state, axes, line_no)
+
+    start = state.position
+    end = state.target(axes)
+    center = None
+    if state.motion in (ARC_CW, ARC_CCW):
+        center = (
+            start[0] + axes.get("I", 0.0) * state.scale,
+            start[1] + axes.get("J", 0.0) * state.scale,
+        )
+    state.position = end
+    return [Move(state.motion, start, end, center, state.feed, line=line_no)]
+
+
+def parse_moves(lines):
+    """Yield the moves of a program given as an iterable of lines"""
+    state = ModalState()
+    for line_no, line in enumerate(lines):
+        yield from parse_line(state, line, line_no)
+
+
+def arc_points(move: Move, segment_length=0.5):
+    """Points along an arc, excluding the start point"""
+    radius, sweep = arc_geometry(move)
+    cx, cy = move.center
+    a0 = math.atan2(move.start[1] - cy, move.start[0] - cx)
+    steps = max(1, math.ceil(radius * abs(sweep) / segment_length))
+    points = []
+    for step in range(1, steps + 1):
+        t = step / steps
+        angle = a0 + sweep * t
+        z = move.start[2] + (move.end[2] - move.start[2]) * t
+        x = cx + radius * math.cos(angle)
+        y = cy + radius * math.sin(angle)
+        points.append((x, y, z))
+    return points
+
+
+def estimate_time(moves, rapid_rate=2000.0, default_feed=300.0) -> float:
+    """Constant velocity cycle time estimate in seconds, rates in mm/min"""
+    minutes = 0.0
+    seconds = 0.0
+    for move in moves:
+        if move.motion == DWELL:
+            seconds += move.dwell
+        elif move.motion == RAPID:
+            minutes += move.length / rapid_rate
+        else:
+            minutes += move.length / (move.feed or default_feed)
+    return minutes * 60 + seconds
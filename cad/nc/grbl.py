@@ -0,0 +1,731 @@
+"""
+Stream G-code to a GRBL controller with the character counting protocol.
+Lines are sent as long as the bytes of the lines not yet acknowledged fit
+in GRBL's serial receive buffer, so the planner is fed while earlier lines
+are parsed instead of waiting for an ok per line. The program is read line
+by line from the file and status reports are polled with the real-time ?
+command while streaming.
+
+SimulatedGrbl answers on a pty like a controller would: a receive buffer,
+a planner queue executing the moves at their feed rate and status reports,
+to measure line throughput, buffer use and planner starvation without a
+machine.
+
+    python -m cad.nc.grbl send cad/nc/korry/slider_19.5x19.5x3_r1.5875.nc \\
+        --port /dev/ttyUSB0
+    python -m cad.nc.grbl simulate cad/common/buttons/korry/led-pcb/nc/front.ngc
+    python -m cad.nc.grbl simulate cad/nc/korry --speed 0 --ping-pong
+
+    async with await Sender.open("/dev/ttyUSB0", on_status=print) as sender:
+        report = await sender.stream_file(path)
+        await sender.wait_idle()
+"""
+import argparse
+import asyncio
+import math
+import os
+import termios
+import time
+import tty
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from cad.nc.analyze import Machine, find_programs
+from cad.nc.gcode import (
+    ARC_CCW,
+    ARC_CW,
+    DWELL,
+    RAPID,
+    ModalState,
+    arc_geometry,
+    arc_points,
+    parse_line,
+    parse_words,
+    strip_comment,
+)
+
+RX_BUFFER_SIZE = 128
+# GRBL 1.1 on an ATmega328p: 16 blocks, one kept free
+PLANNER_BLOCKS = 15
+BAUDRATE = 115200
+# Real-time commands, acted on as soon as received and never buffered
+STATUS_REPORT, FEED_HOLD, CYCLE_START, SOFT_RESET = b"?", b"!", b"~", b"\x18"
+_realtime = frozenset(b"?!~\x18")
+banner = b"Grbl 1.1h ['$' for help]\r\n"
+
+
+class GrblError(Exception):
+    """An error answer to a streamed line, an alarm or a lost connection"""
+
+
+def open_port(path: str, baudrate=BAUDRATE) -> int:
+    """Open a serial device or pty raw, 8N1 at baudrate"""
+    speed = getattr(termios, f"B{baudrate}", None)
+    if speed is None:
+        raise ValueError(f"Unsupported baud rate {baudrate}")
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        # TCSANOW: a controller's startup message may already be waiting
+        tty.setraw(fd, termios.TCSANOW)
+        attributes = termios.tcgetattr(fd)
+        attributes[2] |= termios.CLOCAL | termios.CREAD
+        attributes[4] = attributes[5] = speed
+        termios.tcsetattr(fd, termios.TCSANOW, attributes)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+class SerialStream:
+    """asyncio reader and writer over a tty file descriptor, which it owns"""
+
+    def __init__(self, reader, writer, read_transport):
+        self.reader = reader
+        self.writer = writer
+        self._read_transport = read_transport
+
+    @classmethod
+    async def open(cls, fd: int) -> "SerialStream":
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        read_transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader),
+            os.fdopen(fd, "rb", buffering=0),
+        )
+        # Separate descriptor, each pipe transport closes its own
+        transport, protocol = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin, os.fdopen(os.dup(fd), "wb", buffering=0)
+        )
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        return cls(reader, writer, read_transport)
+
+    def write(self, data: bytes):
+        self.writer.write(data)
+
+    async def readline(self) -> bytes:
+        return await self.reader.readline()
+
+    async def read(self, size: int) -> bytes:
+        return await self.reader.read(size)
+
+    def close(self):
+        self._read_transport.close()
+        self.writer.close()
+
+
+def compact(line: str) -> str:
+    """Line as sent, comments and whitespace removed (GRBL ignores both)"""
+    return "".join(strip_comment(line).split()).upper()
+
+
+@dataclass
+class Status:
+    """A GRBL 1.1 status report, <Run|MPos:1.000,2.000,0.000|Bf:15,128|FS:300,0>"""
+
+    state: str = "Unknown"
+    position: tuple = (0.0, 0.0, 0.0)
+    # Free planner blocks and receive buffer bytes, when reported
+    planner_free: Optional[int] = None
+    rx_free: Optional[int] = None
+    feed: float = 0.0
+
+    @classmethod
+    def parse(cls, report: str) -> "Status":
+        state, *items = report.strip().strip("<>").split("|")
+        status = cls(state)
+        for item in items:
+            name, _, value = item.partition(":")
+            try:
+                values = [float(v) for v in value.split(",")]
+            except ValueError:
+                continue
+            if name in ("MPos", "WPos"):
+                status.position = tuple(values)
+            elif name == "Bf":
+                status.planner_free, status.rx_free = (int(v) for v in values)
+            elif name in ("FS", "F"):
+                status.feed = values[0]
+        return status
+
+
+@dataclass
+class StreamReport:
+    # Lines sent, blank and comment only lines are skipped
+    lines: int = 0
+    bytes: int = 0
+    # First line sent until the last one acknowledged
+    seconds: float = 0.0
+    # Bytes awaiting an ok right after each line was sent
+    peak_fill: int = 0
+    fill_total: int = 0
+    rx_buffer_size: int = RX_BUFFER_SIZE
+    # (line number, line, error:N answer)
+    errors: List[tuple] = field(default_factory=list)
+    status_reports: int = 0
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def mean_fill(self) -> float:
+        """Mean fraction of the receive buffer in use"""
+        if not self.lines:
+            return 0.0
+        return self.fill_total / self.lines / self.rx_buffer_size
+
+    def row(self):
+        return (
+            f"{self.lines:6d} lines {self.bytes:7d} bytes {self.seconds:7.2f}s "
+            f"{self.lines_per_second:8.0f} lines/s  buffer {self.mean_fill:4.0%} "
+            f"mean {self.peak_fill:3d}/{self.rx_buffer_size} peak"
+        )
+
+
+class Sender:
+    """
+    Character counting streamer. With ping_pong every line waits for the ok
+    of the previous one, the simple protocol kept for comparison.
+    """
+
+    def __init__(
+        self,
+        port: SerialStream,
+        rx_buffer_size=RX_BUFFER_SIZE,
+        ping_pong=False,
+        status_interval=0.2,
+        on_status: Callable[[Status], None] = None,
+        stop_on_error=True,
+    ):
+        self.port = port
+        self.rx_buffer_size = rx_buffer_size
+        self.ping_pong = ping_pong
+        self.status_interval = status_interval
+        self.on_status = on_status
+        self.stop_on_error = stop_on_error
+        self.status = Status()
+        self.messages = []
+        self.report = StreamReport(rx_buffer_size=rx_buffer_size)
+        # (bytes, line number, line) of the lines awaiting an answer
+        self._inflight = deque()
+        self._used = 0
+        self._answered = asyncio.Event()
+        self._status_received = asyncio.Event()
+        self._welcomed = asyncio.Event()
+        self._failure = None
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def open(cls, path: str, baudrate=BAUDRATE, timeout=2.0, **options):
+        """
+        Sender on a serial port. Opening resets most boards; the startup
+        message is waited for up to timeout seconds.
+        """
+        sender = cls(await SerialStream.open(open_port(path, baudrate)), **options)
+        try:
+            await asyncio.wait_for(sender._welcomed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return sender
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+        self.port.close()
+
+    @property
+    def buffered(self) -> int:
+        """Bytes sent and not yet acknowledged"""
+        return self._used
+
+    async def _receive(self):
+        try:
+            while raw := await self.port.readline():
+                self._answer(raw.decode("ascii", "replace").strip())
+            self._failure = GrblError("Controller closed the connection")
+        except OSError as error:
+            self._failure = GrblError(f"Connection lost: {error}")
+        self._answered.set()
+        self._status_received.set()
+
+    def _answer(self, text: str):
+        if text == "ok" or text.startswith("error"):
+            if not self._inflight:
+                return  # answer to a line sent before a reset
+            size, line_no, line = self._inflight.popleft()
+            self._used -= size
+            if text != "ok":
+                self.report.errors.append((line_no, line, text))
+                if self.stop_on_error and self._failure is None:
+                    self._failure = GrblError(f"{text} on line {line_no}: {line}")
+            self._answered.set()
+        elif text.startswith("<"):
+            self.status = Status.parse(text)
+            self.report.status_reports += 1
+            self._status_received.set()
+            if self.on_status:
+                self.on_status(self.status)
+        elif text.startswith("ALARM"):
+            self._failure = GrblError(text)
+            self._answered.set()
+        elif text.startswith("Grbl"):
+            # Reset: lines in flight were discarded
+            self._inflight.clear()
+            self._used = 0
+            self._welcomed.set()
+            self._answered.set()
+        elif text:
+            self.messages.append(text)
+
+    async def _until(self, condition):
+        while not condition():
+            if self._failure is not None:
+                raise self._failure
+            self._answered.clear()
+            await self._answered.wait()
+        if self._failure is not None:
+            raise self._failure
+
+    async def _poll_status(self):
+        while True:
+            self.port.write(STATUS_REPORT)
+            await asyncio.sleep(self.status_interval)
+
+    async def stream(self, lines) -> StreamReport:
+        """
+        Send an iterable of lines, returning once every line is acknowledged.
+        An error answer holds the feed and raises GrblError unless
+        stop_on_error is False, in which case it is only reported.
+        """
+        report = self.report = StreamReport(rx_buffer_size=self.rx_buffer_size)
+        poller = None
+        if self.status_interval:
+            poller = asyncio.create_task(self._poll_status())
+        start = None
+        try:
+            for line_no, line in enumerate(lines, 1):
+                text = compact(line)
+                if not text:
+                    continue
+                data = text.encode("ascii") + b"\n"
+                if len(data) > self.rx_buffer_size:
+                    raise ValueError(f"Line {line_no} does not fit the receive buffer")
+                limit = 0 if self.ping_pong else self.rx_buffer_size - len(data)
+                await self._until(lambda: self._used <= limit)
+                if start is None:
+                    start = time.perf_counter()
+                self._inflight.append((len(data), line_no, line.strip()))
+                self._used += len(data)
+                self.port.write(data)
+                report.lines += 1
+                report.bytes += len(data)
+                report.fill_total += self._used
+                report.peak_fill = max(report.peak_fill, self._used)
+            await self._until(lambda: not self._inflight)
+        except GrblError:
+            self.port.write(FEED_HOLD)
+            raise
+        finally:
+            if poller:
+                poller.cancel()
+            if start is not None:
+                report.seconds = time.perf_counter() - start
+        return report
+
+    async def stream_file(self, path: str) -> StreamReport:
+        with open(path) as f:
+            return await self.stream(f)
+
+    async def request_status(self) -> Status:
+        self._status_received.clear()
+        self.port.write(STATUS_REPORT)
+        await self._status_received.wait()
+        if self._failure is not None:
+            raise self._failure
+        return self.status
+
+    async def wait_idle(self, interval=0.1) -> Status:
+        """Poll until the machine has run every planned move"""
+        while (await self.request_status()).state != "Idle":
+            await asyncio.sleep(interval)
+        return self.status
+
+    def feed_hold(self):
+        self.port.write(FEED_HOLD)
+
+    def cycle_start(self):
+        self.port.write(CYCLE_START)
+
+    def reset(self):
+        self.port.write(SOFT_RESET)
+
+
+@dataclass
+class SimulatorStats:
+    lines: int = 0
+    blocks: int = 0
+    # Bytes dropped because the receive buffer was full
+    overflows: int = 0
+    peak_rx: int = 0
+    peak_blocks: int = 0
+    # Machine seconds of the executed blocks
+    busy: float = 0.0
+    # Machine seconds, from the first block to the last, spent waiting for
+    # blocks rather than running them
+    starved: float = 0.0
+
+
+class SimulatedGrbl:
+    """
+    GRBL on a pty. Received bytes go to a receive buffer of rx_buffer_size
+    bytes (overflowing bytes are dropped and counted), each line is parsed
+    and its moves queued as planner blocks, arcs split in segments like
+    GRBL does, and ok is answered once the line fits in the planner. Blocks
+    run at their feed rate without acceleration. The serial link is paced
+    at baudrate and answers arrive latency seconds late (USB serial
+    adapters poll every 1-16 ms). Everything runs speed times faster than
+    real time; speed 0 executes blocks instantly over an ideal link, to
+    measure the sender alone.
+
+        async with SimulatedGrbl(speed=10) as grbl:
+            async with await Sender.open(grbl.path) as sender:
+                await sender.stream_file(path)
+    """
+
+    def __init__(
+        self,
+        rx_buffer_size=RX_BUFFER_SIZE,
+        planner_blocks=PLANNER_BLOCKS,
+        speed=1.0,
+        machine: Machine = None,
+        arc_tolerance=0.002,
+        baudrate=BAUDRATE,
+        latency=0.002,
+    ):
+        self.rx_buffer_size = rx_buffer_size
+        self.planner_blocks = planner_blocks
+        self.speed = speed
+        self.machine = machine or Machine()
+        self.arc_tolerance = arc_tolerance
+        self.baudrate = baudrate
+        self.latency = latency
+        self.path = None
+        self.stats = SimulatorStats()
+        self.position = (0.0, 0.0, 0.0)
+        self.feed = 0.0
+        self.holding = False
+        self._rx = bytearray()
+        # (machine seconds, end point, rate) of each queued block
+        self._planner = deque()
+        self._state = ModalState()
+        self._master = self._slave = None
+        self._port = None
+        self._tasks = []
+        self._received = asyncio.Event()
+        self._queued = asyncio.Event()
+        self._executed = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._server = None
+
+    async def __aenter__(self):
+        self.open()
+        self._server = asyncio.create_task(self.serve())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+        await self._server
+
+    def open(self) -> str:
+        """Create the pty, returning the device path to connect to"""
+        self._master, self._slave = os.openpty()
+        # No echo or newline translation; the slave end stays open so the
+        # master never reads end of file between clients
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+        return self.path
+
+    def close(self):
+        self._closed.set()
+
+    async def serve(self):
+        if self._master is None:
+            self.open()
+        self._port = await SerialStream.open(self._master)
+        self._port.write(banner)
+        self._tasks = [
+            asyncio.create_task(self._receive()),
+            asyncio.create_task(self._protocol()),
+            asyncio.create_task(self._run_planner()),
+        ]
+        try:
+            await self._closed.wait()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._port.close()
+            os.close(self._slave)
+            self._master = self._slave = None
+
+    async def _receive(self):
+        loop = asyncio.get_running_loop()
+        # When the last byte received so far is through the link
+        arrival = loop.time()
+        while data := await self._port.read(1024):
+            if self.speed:
+                # 8N1, ten bits a byte; up to 10 ms of timer overshoot is
+                # caught up rather than lost
+                arrival = max(arrival, loop.time() - 0.01)
+                arrival += len(data) * 10 / self.baudrate / self.speed
+                await asyncio.sleep(arrival - loop.time())
+            for byte in data:
+                if byte in _realtime:
+                    self._realtime_command(byte)
+                elif len(self._rx) < self.rx_buffer_size:
+                    self._rx.append(byte)
+                else:
+                    self.stats.overflows += 1
+            self.stats.peak_rx = max(self.stats.peak_rx, len(self._rx))
+            self._received.set()
+
+    def _realtime_command(self, byte):
+        if byte == STATUS_REPORT[0]:
+            self._port.write(self.status_report().encode() + b"\r\n")
+        elif byte == FEED_HOLD[0]:
+            self.holding = True
+        elif byte == CYCLE_START[0]:
+            self.holding = False
+            self._queued.set()
+        elif byte == SOFT_RESET[0]:
+            self._rx.clear()
+            self._planner.clear()
+            self._state = ModalState()
+            self._state.position = self.position
+            self.holding = False
+            # Drop the line being planned
+            self._tasks[1].cancel()
+            self._tasks[1] = asyncio.create_task(self._protocol())
+            self._executed.set()
+            self._port.write(banner)
+
+    def status_report(self) -> str:
+        if self.holding:
+            state = "Hold:0"
+        else:
+            state = "Run" if self._planner else "Idle"
+        position = ",".join(f"{v:.3f}" for v in self.position)
+        planner_free = self.planner_blocks - len(self._planner)
+        rx_free = self.rx_buffer_size - len(self._rx)
+        return (
+            f"<{state}|MPos:{position}|Bf:{planner_free},{rx_free}|"
+            f"FS:{self.feed:.0f},0>"
+        )
+
+    async def _protocol(self):
+        while True:
+            end = self._rx.find(b"\n")
+            if end < 0:
+                self._received.clear()
+                await self._received.wait()
+                continue
+            line = self._rx[:end].decode("ascii", "replace").strip()
+            del self._rx[: end + 1]
+            answer = await self._execute_line(line)
+            if self.speed and self.latency:
+                loop = asyncio.get_running_loop()
+                loop.call_later(self.latency / self.speed, self._port.write, answer)
+            else:
+                self._port.write(answer)
+
+    async def _execute_line(self, line: str) -> bytes:
+        self.stats.lines += 1
+        if not line or line.startswith("$"):
+            return b"ok\r\n"
+        if not parse_words(line):
+            # Expected command letter
+            return b"error:1\r\n"
+        for move in parse_line(self._state, line, self.stats.lines):
+            for block in self._blocks(move):
+                while len(self._planner) >= self.planner_blocks:
+                    self._executed.clear()
+                    await self._executed.wait()
+                self._planner.append(block)
+                self.stats.peak_blocks = max(self.stats.peak_blocks, len(self._planner))
+                self._queued.set()
+        return b"ok\r\n"
+
+    def _blocks(self, move):
+        if move.motion == DWELL:
+            return [(move.dwell, move.end, 0.0)]
+        length = move.length
+        if length == 0:
+            return []
+        if move.motion == RAPID:
+            rate = self.machine.rapid_rate
+        else:
+            rate = move.feed or self.machine.default_feed
+        points = [move.end]
+        if move.motion in (ARC_CW, ARC_CCW):
+            radius, sweep = arc_geometry(move)
+            tolerance = min(self.arc_tolerance, radius)
+            # GRBL's segment count for its arc tolerance
+            chord = 2 * math.sqrt(tolerance * (2 * radius - tolerance))
+            if radius * abs(sweep) > chord:
+                points = arc_points(move, chord)
+        seconds = length / (rate / 60) / len(points)
+        return [(seconds, point, rate) for point in points]
+
+    async def _run_planner(self):
+        loop = asyncio.get_running_loop()
+        started = None
+        # End of the running block; sleeping until it rather than for the
+        # block's duration keeps timer overshoot from adding up
+        deadline = loop.time()
+        while True:
+            if not self._planner or self.holding:
+                while not self._planner or self.holding:
+                    self.feed = 0.0
+                    self._queued.clear()
+                    await self._queued.wait()
+                deadline = loop.time()
+            if started is None:
+                started = loop.time()
+            seconds, end, self.feed = self._planner[0]
+            if self.speed:
+                deadline += seconds / self.speed
+            # A hold takes effect between blocks
+            await asyncio.sleep(deadline - loop.time())
+            if not self._planner:
+                continue  # reset while running
+            self._planner.popleft()
+            self.position = end
+            self.stats.blocks += 1
+            self.stats.busy += seconds
+            if self.speed:
+                elapsed = (loop.time() - started) * self.speed
+                self.stats.starved = max(0.0, elapsed - self.stats.busy)
+            self._executed.set()
+
+
+async def simulate(
+    path: str,
+    speed=0.0,
+    ping_pong=False,
+    rx_buffer_size=RX_BUFFER_SIZE,
+    planner_blocks=PLANNER_BLOCKS,
+    latency=0.002,
+    on_status=None,
+):
+    """Stream a program to a SimulatedGrbl, returning both sides' figures"""
+    grbl = SimulatedGrbl(rx_buffer_size, planner_blocks, speed, latency=latency)
+    async with grbl:
+        sender = await Sender.open(
+            grbl.path,
+            rx_buffer_size=rx_buffer_size,
+            ping_pong=ping_pong,
+            on_status=on_status,
+        )
+        async with sender:
+            report = await sender.stream_file(path)
+            await sender.wait_idle(interval=0.01)
+    return report, grbl.stats
+
+
+def _print_status(status: Status):
+    x, y, z = status.position
+    print(
+        f"\r{status.state:<8} X{x:8.3f} Y{y:8.3f} Z{z:7.3f} "
+        f"F{status.feed:5.0f} blocks free {status.planner_free}",
+        end="",
+        flush=True,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    send_parser = commands.add_parser("send")
+    send_parser.add_argument("path")
+    send_parser.add_argument("--port", required=True)
+    send_parser.add_argument("--baud", type=int, default=BAUDRATE)
+
+    simulate_parser = commands.add_parser("simulate")
+    simulate_parser.add_argument("paths", nargs="+")
+    simulate_parser.add_argument(
+        "--speed", type=float, default=0.0, help="times real time, 0 instantly"
+    )
+    simulate_parser.add_argument("--planner-blocks", type=int, default=PLANNER_BLOCKS)
+    simulate_parser.add_argument(
+        "--latency", type=float, default=0.002, help="seconds per answer"
+    )
+    for command in (send_parser, simulate_parser):
+        command.add_argument("--rx-buffer", type=int, default=RX_BUFFER_SIZE)
+        command.add_argument(
+            "--ping-pong", action="store_true", help="wait for each ok"
+        )
+    args = parser.parse_args(argv)
+
+    if args.command == "send":
+
+        async def send():
+            sender = await Sender.open(
+                args.port,
+                args.baud,
+                rx_buffer_size=args.rx_buffer,
+                ping_pong=args.ping_pong,
+                on_status=_print_status,
+            )
+            async with sender:
+                try:
+                    report = await sender.stream_file(args.path)
+                    await sender.wait_idle()
+                finally:
+                    print()
+            print(report.row())
+            return report
+
+        try:
+            asyncio.run(send())
+        except GrblError as error:
+            print(f"Stopped: {error}")
+            return 1
+        return 0
+
+    failed = 0
+    for path in find_programs(args.paths):
+        try:
+            report, stats = asyncio.run(
+                simulate(
+                    path,
+                    args.speed,
+                    args.ping_pong,
+                    args.rx_buffer,
+                    args.planner_blocks,
+                    args.latency,
+                )
+            )
+        except GrblError as error:
+            print(f"{os.path.relpath(path):<70} {error}")
+            failed += 1
+            continue
+        starved = f" starved {stats.starved:6.2f}s" if args.speed else ""
+        print(f"{os.path.relpath(path):<70} {report.row()}{starved}")
+        failed += bool(report.errors or stats.overflows)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
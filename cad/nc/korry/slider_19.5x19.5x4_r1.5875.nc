@@ -1,218 +0,0 @@
-(Exported by FreeCAD)
-(Begin preamble)
-G17 G90
-G21
-(Begin operation: Fixture)
-(Path: Fixture)
-G54
-(Finish operation: Fixture)
-(Begin operation: TC: )
-(Path: TC: )
-(TC: )
-(Begin toolchange)
-( M6 T1 )
-(Finish operation: TC: )
-(Begin operation: ProfileOp_1)
-(Path: ProfileOp_1)
-(ProfileOp_1)
-(Compensated Tool Path. Diameter: 1.0)
-G0 Z6.000
-G0 X6.429 Y-1.821
-G0 Z4.000
-G1 X6.429 Y-1.821 Z0.000
-G3 X5.634 Y-1.500 Z0.000 I-0.775 J-0.775 K0.000
-G1 X-5.634 Y-1.500 Z0.000
-G3 X-6.750 Y-2.616 Z0.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y-5.634 Z0.000
-G3 X-5.634 Y-6.750 Z0.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y-6.750 Z0.000
-G3 X6.750 Y-5.634 Z0.000 I0.020 J1.096 K0.000
-G1 X6.750 Y-2.616 Z0.000
-G3 X6.429 Y-1.821 Z0.000 I-1.096 J0.020 K0.000
-G1 X6.429 Y-1.821 Z-1.000
-G3 X5.634 Y-1.500 Z-1.000 I-0.775 J-0.775 K0.000
-G1 X-5.634 Y-1.500 Z-1.000
-G3 X-6.750 Y-2.616 Z-1.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y-5.634 Z-1.000
-G3 X-5.634 Y-6.750 Z-1.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y-6.750 Z-1.000
-G3 X6.750 Y-5.634 Z-1.000 I0.020 J1.096 K0.000
-G1 X6.750 Y-2.616 Z-1.000
-G3 X6.429 Y-1.821 Z-1.000 I-1.096 J0.020 K0.000
-G1 X6.429 Y-1.821 Z-2.000
-G3 X5.634 Y-1.500 Z-2.000 I-0.775 J-0.775 K0.000
-G1 X-5.634 Y-1.500 Z-2.000
-G3 X-6.750 Y-2.616 Z-2.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y-5.634 Z-2.000
-G3 X-5.634 Y-6.750 Z-2.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y-6.750 Z-2.000
-G3 X6.750 Y-5.634 Z-2.000 I0.020 J1.096 K0.000
-G1 X6.750 Y-2.616 Z-2.000
-G3 X6.429 Y-1.821 Z-2.000 I-1.096 J0.020 K0.000
-G1 X6.429 Y-1.821 Z-3.000
-G3 X5.634 Y-1.500 Z-3.000 I-0.775 J-0.775 K0.000
-G1 X-5.634 Y-1.500 Z-3.000
-G3 X-6.750 Y-2.616 Z-3.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y-5.634 Z-3.000
-G3 X-5.634 Y-6.750 Z-3.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y-6.750 Z-3.000
-G3 X6.750 Y-5.634 Z-3.000 I0.020 J1.096 K0.000
-G1 X6.750 Y-2.616 Z-3.000
-G3 X6.429 Y-1.821 Z-3.000 I-1.096 J0.020 K0.000
-G1 X6.429 Y-1.821 Z-4.000
-G3 X5.634 Y-1.500 Z-4.000 I-0.775 J-0.775 K0.000
-G1 X-5.634 Y-1.500 Z-4.000
-G3 X-6.750 Y-2.616 Z-4.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y-5.634 Z-4.000
-G3 X-5.634 Y-6.750 Z-4.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y-6.750 Z-4.000
-G3 X6.750 Y-5.634 Z-4.000 I0.020 J1.096 K0.000
-G1 X6.750 Y-2.616 Z-4.000
-G3 X6.429 Y-1.821 Z-4.000 I-1.096 J0.020 K0.000
-G1 X6.429 Y-1.821 Z-5.000
-G3 X5.634 Y-1.500 Z-5.000 I-0.775 J-0.775 K0.000
-G1 X-5.634 Y-1.500 Z-5.000
-G3 X-6.750 Y-2.616 Z-5.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y-5.634 Z-5.000
-G3 X-5.634 Y-6.750 Z-5.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y-6.750 Z-5.000
-G3 X6.750 Y-5.634 Z-5.000 I0.020 J1.096 K0.000
-G1 X6.750 Y-2.616 Z-5.000
-G3 X6.429 Y-1.821 Z-5.000 I-1.096 J0.020 K0.000
-G0 Z6.000
-G0 Z6.000
-G0 X6.429 Y-1.821
-G0 X5.844 Y1.516
-G0 X5.844 Y1.516 Z4.000
-G1 X5.844 Y1.516 Z0.000
-G3 X6.750 Y2.616 Z0.000 I-0.189 J1.079 K0.000
-G1 X6.750 Y5.634 Z0.000
-G3 X5.634 Y6.750 Z0.000 I-1.096 J0.020 K0.000
-G1 X-5.634 Y6.750 Z0.000
-G3 X-6.750 Y5.634 Z0.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y2.616 Z0.000
-G3 X-5.634 Y1.500 Z0.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y1.500 Z0.000
-G3 X5.844 Y1.516 Z0.000 I0.020 J1.096 K0.000
-G1 X5.844 Y1.516 Z-1.000
-G3 X6.750 Y2.616 Z-1.000 I-0.189 J1.079 K0.000
-G1 X6.750 Y5.634 Z-1.000
-G3 X5.634 Y6.750 Z-1.000 I-1.096 J0.020 K0.000
-G1 X-5.634 Y6.750 Z-1.000
-G3 X-6.750 Y5.634 Z-1.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y2.616 Z-1.000
-G3 X-5.634 Y1.500 Z-1.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y1.500 Z-1.000
-G3 X5.844 Y1.516 Z-1.000 I0.020 J1.096 K0.000
-G1 X5.844 Y1.516 Z-2.000
-G3 X6.750 Y2.616 Z-2.000 I-0.189 J1.079 K0.000
-G1 X6.750 Y5.634 Z-2.000
-G3 X5.634 Y6.750 Z-2.000 I-1.096 J0.020 K0.000
-G1 X-5.634 Y6.750 Z-2.000
-G3 X-6.750 Y5.634 Z-2.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y2.616 Z-2.000
-G3 X-5.634 Y1.500 Z-2.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y1.500 Z-2.000
-G3 X5.844 Y1.516 Z-2.000 I0.020 J1.096 K0.000
-G1 X5.844 Y1.516 Z-3.000
-G3 X6.750 Y2.616 Z-3.000 I-0.189 J1.079 K0.000
-G1 X6.750 Y5.634 Z-3.000
-G3 X5.634 Y6.750 Z-3.000 I-1.096 J0.020 K0.000
-G1 X-5.634 Y6.750 Z-3.000
-G3 X-6.750 Y5.634 Z-3.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y2.616 Z-3.000
-G3 X-5.634 Y1.500 Z-3.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y1.500 Z-3.000
-G3 X5.844 Y1.516 Z-3.000 I0.020 J1.096 K0.000
-G1 X5.844 Y1.516 Z-4.000
-G3 X6.750 Y2.616 Z-4.000 I-0.189 J1.079 K0.000
-G1 X6.750 Y5.634 Z-4.000
-G3 X5.634 Y6.750 Z-4.000 I-1.096 J0.020 K0.000
-G1 X-5.634 Y6.750 Z-4.000
-G3 X-6.750 Y5.634 Z-4.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y2.616 Z-4.000
-G3 X-5.634 Y1.500 Z-4.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y1.500 Z-4.000
-G3 X5.844 Y1.516 Z-4.000 I0.020 J1.096 K0.000
-G1 X5.844 Y1.516 Z-5.000
-G3 X6.750 Y2.616 Z-5.000 I-0.189 J1.079 K0.000
-G1 X6.750 Y5.634 Z-5.000
-G3 X5.634 Y6.750 Z-5.000 I-1.096 J0.020 K0.000
-G1 X-5.634 Y6.750 Z-5.000
-G3 X-6.750 Y5.634 Z-5.000 I-0.020 J-1.096 K0.000
-G1 X-6.750 Y2.616 Z-5.000
-G3 X-5.634 Y1.500 Z-5.000 I1.096 J-0.020 K0.000
-G1 X5.634 Y1.500 Z-5.000
-G3 X5.844 Y1.516 Z-5.000 I0.020 J1.096 K0.000
-G0 Z6.000
-G0 Z6.000
-G0 X5.844 Y1.516
-G0 X9.148 Y1.517
-G0 X9.148 Y1.517 Z4.000
-G1 X9.148 Y1.517 Z0.000
-G1 X9.150 Y-7.062 Z0.000
-G2 X7.118 Y-9.147 Z0.000 I-2.090 J0.005 K0.000
-G1 X-7.062 Y-9.150 Z0.000
-G2 X-9.147 Y-7.118 Z0.000 I0.005 J2.090 K0.000
-G1 X-9.150 Y7.062 Z0.000
-G2 X-7.118 Y9.147 Z0.000 I2.090 J-0.005 K0.000
-G1 X7.062 Y9.150 Z0.000
-G2 X9.147 Y7.118 Z0.000 I-0.005 J-2.090 K0.000
-G1 X9.148 Y1.517 Z0.000
-G1 X9.148 Y1.517 Z-1.000
-G1 X9.150 Y-7.062 Z-1.000
-G2 X7.118 Y-9.147 Z-1.000 I-2.090 J0.005 K0.000
-G1 X-7.062 Y-9.150 Z-1.000
-G2 X-9.147 Y-7.118 Z-1.000 I0.005 J2.090 K0.000
-G1 X-9.150 Y7.062 Z-1.000
-G2 X-7.118 Y9.147 Z-1.000 I2.090 J-0.005 K0.000
-G1 X7.062 Y9.150 Z-1.000
-G2 X9.147 Y7.118 Z-1.000 I-0.005 J-2.090 K0.000
-G1 X9.148 Y1.517 Z-1.000
-G1 X9.148 Y1.517 Z-2.000
-G1 X9.150 Y-7.062 Z-2.000
-G2 X7.118 Y-9.147 Z-2.000 I-2.090 J0.005 K0.000
-G1 X-7.062 Y-9.150 Z-2.000
-G2 X-9.147 Y-7.118 Z-2.000 I0.005 J2.090 K0.000
-G1 X-9.150 Y7.062 Z-2.000
-G2 X-7.118 Y9.147 Z-2.000 I2.090 J-0.005 K0.000
-G1 X7.062 Y9.150 Z-2.000
-G2 X9.147 Y7.118 Z-2.000 I-0.005 J-2.090 K0.000
-G1 X9.148 Y1.517 Z-2.000
-G1 X9.148 Y1.517 Z-3.000
-G1 X9.150 Y-7.062 Z-3.000
-G2 X7.118 Y-9.147 Z-3.000 I-2.090 J0.005 K0.000
-G1 X-7.062 Y-9.150 Z-3.000
-G2 X-9.147 Y-7.118 Z-3.000 I0.005 J2.090 K0.000
-G1 X-9.150 Y7.062 Z-3.000
-G2 X-7.118 Y9.147 Z-3.000 I2.090 J-0.005 K0.000
-G1 X7.062 Y9.150 Z-3.000
-G2 X9.147 Y7.118 Z-3.000 I-0.005 J-2.090 K0.000
-G1 X9.148 Y1.517 Z-3.000
-G1 X9.148 Y1.517 Z-4.000
-G1 X9.150 Y-7.062 Z-4.000
-G2 X7.118 Y-9.147 Z-4.000 I-2.090 J0.005 K0.000
-G1 X-7.062 Y-9.150 Z-4.000
-G2 X-9.147 Y-7.118 Z-4.000 I0.005 J2.090 K0.000
-G1 X-9.150 Y7.062 Z-4.000
-G2 X-7.118 Y9.147 Z-4.000 I2.090 J-0.005 K0.000
-G1 X7.062 Y9.150 Z-4.000
-G2 X9.147 Y7.118 Z-4.000 I-0.005 J-2.090 K0.000
-G1 X9.148 Y1.517 Z-4.000
-G1 X9.148 Y1.517 Z-5.000
-G1 X9.150 Y-7.062 Z-5.000
-G2 X7.118 Y-9.147 Z-5.000 I-2.090 J0.005 K0.000
-G1 X-7.062 Y-9.150 Z-5.000
-G2 X-9.147 Y-7.118 Z-5.000 I0.005 J2.090 K0.000
-G1 X-9.150 Y7.062 Z-5.000
-G2 X-7.118 Y9.147 Z-5.000 I2.090 J-0.005 K0.000
-G1 X7.062 Y9.150 Z-5.000
-G2 X9.147 Y7.118 Z-5.000 I-0.005 J-2.090 K0.000
-G1 X9.148 Y1.517 Z-5.000
-G0 Z6.000
-G0 Z6.000
-(Finish operation: ProfileOp_1)
-(Begin postamble)
-M5
-G17 G90
-M2
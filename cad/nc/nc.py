@@ -1,17 +1,251 @@
-from ocp_freecad_cam import Job
+from itertools import islice
+from typing import TYPE_CHECKING
+import json
 import os
+import shutil
+import time
 
+from cad.cache import hash_inputs, source_fingerprint
+from cad.cache.index import artefact_index
+from cad.tracing import traced
 
-def save_gcode(job: Job, path: str):
-    dirname = os.path.dirname(__file__)
-    full_path = os.path.join(dirname, path)
+if TYPE_CHECKING:
+    from ocp_freecad_cam import Job
+
+_base_path = os.path.dirname(__file__)
+manifest_path = os.path.join(_base_path, "manifest.json")
+
+
+def gcode_path(path: str) -> str:
+    full_path = os.path.join(_base_path, path)
     if not full_path.endswith(".nc"):
         full_path += ".nc"
+    return full_path
+
+
+def iter_lines(text: str):
+    """Split text into lines lazily, without building an intermediate list"""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def gcode_lines(source):
+    """Lines of a Job, a G-code string or any iterable of lines"""
+    if hasattr(source, "to_gcode"):
+        source = source.to_gcode()
+    if isinstance(source, str):
+        return iter_lines(source)
+    return iter(source)
+
+
+def drop_header(lines):
+    """Drop the two lines following the first one (FreeCAD export timestamp)"""
+    lines = iter(lines)
+    yield from islice(lines, 1)
+    yield from islice(lines, 2, None)
+
+
+def write_gcode(lines, full_path: str, buffer_size=2**16, chunk_lines=1024):
+    """Stream lines into a file, newline separated without a trailing newline"""
+    lines = iter(lines)
+    separator = ""
+    with open(full_path, "w", buffering=buffer_size) as f:
+        # Joining small chunks keeps memory bounded while avoiding a write
+        # call per line
+        while chunk := list(islice(lines, chunk_lines)):
+            f.write(separator)
+            f.write("\n".join(chunk))
+            separator = "\n"
+
+
+@traced()
+def save_gcode(
+    job: "Job",
+    path: str,
+    strip_header=True,
+    stages=(),
+    name=None,
+    parameters=None,
+    input_hash=None,
+    tool=None,
+):
+    """
+    Write a job (or any G-code source accepted by gcode_lines) to cad/nc.
+    Each stage is a generator function taking and returning an iterable of
+    lines, applied in order after the header has been dropped. The program
+    is recorded in the artefact index under name (the path by default) with
+    the parameters, input hash and tool given; its time includes the CAM
+    work the source does while it is read.
+    """
+    start = time.perf_counter()
+    full_path = gcode_path(path)
     dir_path = os.path.dirname(full_path)
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
-    with open(full_path, "w") as f:
-        gcode_lines = job.to_gcode().split("\n")
-        gcode = "\n".join(gcode_lines[:1] + gcode_lines[3:])
 
-        f.write(gcode)
+    lines = gcode_lines(job)
+    if strip_header:
+        lines = drop_header(lines)
+    for stage in stages:
+        lines = stage(lines)
+    write_gcode(lines, full_path)
+    artefact_index.record(
+        "gcode",
+        name or _manifest_key(full_path),
+        full_path,
+        parameters=parameters,
+        input_hash=input_hash,
+        tool=tool,
+        seconds=time.perf_counter() - start,
+    )
+    return full_path
+
+
+def _manifest_key(full_path):
+    relative = os.path.relpath(full_path, _base_path)
+    if relative.startswith(os.pardir):
+        return os.path.abspath(full_path)
+    return relative.replace(os.sep, "/")
+
+
+class _ManifestLock:
+    """Serializes manifest updates between batch worker processes"""
+
+    def __enter__(self):
+        self.f = open(manifest_path + ".lock", "w")
+        try:
+            import fcntl
+
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        except ImportError:
+            pass
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+
+def load_manifest() -> dict:
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _record(key, input_hash):
+    with _ManifestLock():
+        manifest = load_manifest()
+        manifest[key] = input_hash
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+
+def stage_identity(stage) -> dict:
+    """
+    What a save_gcode stage contributes to an input hash: its name, the
+    options it was made with (an options attribute, if any) and its code
+    """
+    return dict(
+        stage=f"{stage.__module__}.{stage.__qualname__}",
+        options=getattr(stage, "options", None),
+        code=source_fingerprint(stage),
+    )
+
+
+class GcodeTarget:
+    """
+    Make style build target for a G-code file. The input hash covers the
+    keyword arguments (part parameters, tool, operations, post processor)
+    and the stages the program is written through, plus the CAM library
+    version and this module's own code, and is stored in
+    cad/nc/manifest.json once the file has been written. The inputs are
+    also the parameters of the program's artefact index record, name (the
+    path by default) its name there.
+
+        target = GcodeTarget("korry/sleeve_...", name="korry/sleeve", part=...)
+        if not target.up_to_date():
+            target.save(build_job())
+    """
+
+    def __init__(self, path: str, name: str = None, stages=(), **inputs):
+        self.path = path
+        self.full_path = gcode_path(path)
+        self.name = name or self.key
+        self.inputs = inputs
+        self.stages = tuple(stages)
+        self.input_hash = self._hash()
+
+    def _hash(self):
+        from cad.cache.cache import _library_version
+
+        return hash_inputs(
+            nc=source_fingerprint(save_gcode),
+            ocp_freecad_cam=_library_version("ocp_freecad_cam"),
+            stages=[stage_identity(stage) for stage in self.stages],
+            **self.inputs,
+        )
+
+    @property
+    def key(self):
+        return _manifest_key(self.full_path)
+
+    def up_to_date(self) -> bool:
+        """
+        Whether the file was written from the current inputs. A missing or
+        stale file is first restored from an indexed program with the same
+        input hash, if there is one (e.g. written under another name).
+        """
+        if os.path.exists(self.full_path):
+            if load_manifest().get(self.key) == self.input_hash:
+                if artefact_index.get(self.full_path) is None:
+                    self._index()
+                return True
+        return self._restore()
+
+    def _index(self, seconds=None):
+        artefact_index.record(
+            "gcode",
+            self.name,
+            self.full_path,
+            parameters=self.inputs,
+            input_hash=self.input_hash,
+            tool=self.inputs.get("tool"),
+            seconds=seconds,
+        )
+
+    def _restore(self) -> bool:
+        found = artefact_index.lookup(self.input_hash, kind="gcode")
+        if found is None or found.full_path == os.path.abspath(self.full_path):
+            return False
+        os.makedirs(os.path.dirname(self.full_path), exist_ok=True)
+        shutil.copyfile(found.full_path, self.full_path)
+        _record(self.key, self.input_hash)
+        self._index(found.seconds)
+        return True
+
+    def save(self, job: "Job", strip_header=True, stages=None) -> str:
+        """Write the program through the target's stages, or the ones given"""
+        if stages is not None and tuple(stages) != self.stages:
+            self.stages = tuple(stages)
+            self.input_hash = self._hash()
+        full_path = save_gcode(
+            job,
+            self.path,
+            strip_header=strip_header,
+            stages=self.stages,
+            name=self.name,
+            parameters=self.inputs,
+            input_hash=self.input_hash,
+            tool=self.inputs.get("tool"),
+        )
+        _record(self.key, self.input_hash)
+        return full_path
@@ -0,0 +1,457 @@
+"""
+Post-optimizer for generated G-code.
+
+Programs are split into groups at every line that is not a plain G0-G3
+motion or a comment (tool changes, spindle, canned cycles, ...). Within a
+group the contiguous runs of feed moves ("cuts") are reordered to minimize
+rapid travel, with nearest neighbour followed by 2-opt. Cuts whose XY
+extents overlap keep their original relative order so step-downs, holes
+before outlines and pocket before profile stay intact. The rapids between
+cuts are regenerated as retract, traverse and descend at the group's
+highest rapid Z.
+
+    python -m cad.nc.optimize cad/nc/korry/slider_19.5x19.5x3_r1.5875.nc
+    save_gcode(job, path, stages=[optimizer(report=report)])
+"""
+import argparse
+import math
+import re
+from dataclasses import dataclass, field
+
+from cad.nc.gcode import (
+    ARC_CCW,
+    ARC_CW,
+    LINEAR,
+    RAPID,
+    ModalState,
+    estimate_time,
+    parse_line,
+    parse_words,
+)
+
+_motion_letters = set("GXYZIJKF")
+_decimals_re = re.compile(r"[XYZIJ][-+]?\d*\.(\d+)")
+_inline_comment_re = re.compile(r"\([^)]*\)|;.*$")
+
+
+@dataclass
+class OptimizeReport:
+    lines_before: int = 0
+    lines_after: int = 0
+    rapid_before: float = 0.0
+    rapid_after: float = 0.0
+    cut_before: float = 0.0
+    cut_after: float = 0.0
+    seconds_before: float = 0.0
+    seconds_after: float = 0.0
+    _moves: dict = field(default_factory=lambda: {"before": [], "after": []})
+
+    @property
+    def saved_seconds(self):
+        return self.seconds_before - self.seconds_after
+
+    def __str__(self):
+        return (
+            f"lines {self.lines_before} -> {self.lines_after}, "
+            f"rapid {self.rapid_before:.1f} -> {self.rapid_after:.1f} mm, "
+            f"cut {self.cut_before:.1f} -> {self.cut_after:.1f} mm, "
+            f"estimated {self.seconds_before:.0f} -> {self.seconds_after:.0f} s "
+            f"({self.saved_seconds:.0f} s saved)"
+        )
+
+
+def _measure(lines, report, key):
+    """Pass lines through while accumulating statistics into the report"""
+    state = ModalState()
+    moves = report._moves[key]
+    count = 0
+    for line_no, line in enumerate(lines):
+        count += 1
+        moves.extend(parse_line(state, line, line_no))
+        yield line
+    rapid = sum(m.length for m in moves if m.motion == RAPID)
+    cut = sum(m.length for m in moves if m.motion in (LINEAR, ARC_CW, ARC_CCW))
+    setattr(report, f"lines_{key}", count)
+    setattr(report, f"rapid_{key}", rapid)
+    setattr(report, f"cut_{key}", cut)
+    setattr(report, f"seconds_{key}", estimate_time(moves))
+    moves.clear()
+
+
+def _comment(line):
+    return " ".join(_inline_comment_re.findall(line))
+
+
+class _Cut:
+    __slots__ = ("entry", "exit", "body", "comments", "bbox")
+
+    def __init__(self, entry, comments):
+        self.entry = entry
+        self.exit = entry
+        self.body = []
+        self.comments = comments
+        self.bbox = [entry[0], entry[1], entry[0], entry[1]]
+
+    def add(self, move, comment):
+        self.body.append((move, comment))
+        self.exit = move.end
+        points = [move.end]
+        if move.center is not None:
+            cx, cy = move.center
+            r = math.hypot(move.start[0] - cx, move.start[1] - cy)
+            points += [(cx - r, cy - r), (cx + r, cy + r)]
+        for x, y, *_ in points:
+            self.bbox[0] = min(self.bbox[0], x)
+            self.bbox[1] = min(self.bbox[1], y)
+            self.bbox[2] = max(self.bbox[2], x)
+            self.bbox[3] = max(self.bbox[3], y)
+
+    def overlaps(self, other, tolerance):
+        a, b = self.bbox, other.bbox
+        return not (
+            a[2] + tolerance < b[0]
+            or b[2] + tolerance < a[0]
+            or a[3] + tolerance < b[1]
+            or b[3] + tolerance < a[1]
+        )
+
+
+def _xy_distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def order_cuts(cuts, start, tolerance=1e-3, max_sweeps=50):
+    """Visiting order of cuts (indices) respecting overlap precedence"""
+    n = len(cuts)
+    preds = [
+        {i for i in range(j) if cuts[i].overlaps(cuts[j], tolerance)} for j in range(n)
+    ]
+
+    # Nearest neighbour
+    order = []
+    done = set()
+    position = start
+    while len(order) < n:
+        candidates = [k for k in range(n) if k not in done and preds[k] <= done]
+        k = min(candidates, key=lambda k: _xy_distance(position, cuts[k].entry))
+        order.append(k)
+        done.add(k)
+        position = cuts[k].exit
+
+    # 2-opt on the open, asymmetric tour. Node -1 is the start position.
+    def d(a, b):
+        origin = start if a == -1 else cuts[a].exit
+        return _xy_distance(origin, cuts[b].entry)
+
+    for _ in range(max_sweeps):
+        improved = False
+        for i in range(n - 1):
+            before = order[i - 1] if i > 0 else -1
+            internal = 0.0
+            in_slice = {order[i]}
+            for j in range(i + 1, n):
+                if preds[order[j]] & in_slice:
+                    break
+                in_slice.add(order[j])
+                internal += d(order[j], order[j - 1]) - d(order[j - 1], order[j])
+                after = order[j + 1] if j + 1 < n else None
+                old = d(before, order[i])
+                new = d(before, order[j])
+                if after is not None:
+                    old += d(order[j], after)
+                    new += d(order[i], after)
+                if new + internal < old - 1e-9:
+                    order[i : j + 1] = order[i : j + 1][::-1]
+                    improved = True
+                    break
+        if not improved:
+            break
+    return order
+
+
+def merge_collinear(body, tolerance):
+    """Merge runs of uncommented G1 moves with equal feed lying on a line"""
+    merged = []
+    run = []
+
+    def flush():
+        if run:
+            first, last = run[0], run[-1]
+            merged.append((first._replace(end=last.end), None))
+            run.clear()
+
+    def on_line(start, end, points):
+        """Every point within tolerance of start-end, advancing towards end"""
+        dx, dy, dz = (end[i] - start[i] for i in range(3))
+        length = math.sqrt(dx * dx + dy * dy + dz * dz)
+        if length == 0:
+            return False
+        along = 0.0
+        for point in points:
+            px, py, pz = (point[i] - start[i] for i in range(3))
+            # Distance along the line, a move doubling back never lies on it
+            t = (px * dx + py * dy + pz * dz) / length
+            if t <= along or t > length:
+                return False
+            along = t
+            cross = (py * dz - pz * dy, pz * dx - px * dz, px * dy - py * dx)
+            if math.sqrt(sum(c * c for c in cross)) / length > tolerance:
+                return False
+        return True
+
+    for move, comment in body:
+        if move.motion != LINEAR or comment:
+            flush()
+            merged.append((move, comment))
+            continue
+        if run and run[0].feed == move.feed:
+            start = run[0].start
+            if on_line(start, move.end, [m.end for m in run] + [move.end]):
+                run.append(move)
+                continue
+        flush()
+        run.append(move)
+    flush()
+    return merged
+
+
+class _Renderer:
+    def __init__(self, state, drop_modal, precision):
+        # Always state the motion mode on the first line of a group
+        self.motion = None
+        self.feed = state.feed
+        self.position = state.position
+        self.drop_modal = drop_modal
+        self.precision = precision
+
+    def number(self, value):
+        text = f"{value:.{self.precision}f}"
+        return text[1:] if text.startswith("-") and not float(text) else text
+
+    def move(self, motion, end, center=None, feed=None, comment=""):
+        words = []
+        if motion != self.motion or not self.drop_modal:
+            words.append(f"G{motion}")
+        axes = []
+        for i, letter in enumerate("XYZ"):
+            value = self.number(end[i])
+            changed = value != self.number(self.position[i])
+            arc_xy = center is not None and letter != "Z"
+            if changed or arc_xy or not self.drop_modal:
+                axes.append(f"{letter}{value}")
+        if center is not None:
+            axes.append(f"I{self.number(center[0] - self.position[0])}")
+            axes.append(f"J{self.number(center[1] - self.position[1])}")
+        self.position = end
+        if not axes:
+            return comment or None
+        if motion != RAPID and feed is not None and feed != self.feed:
+            axes.append(f"F{feed:g}")
+            self.feed = feed
+        self.motion = motion
+        line = " ".join(words + axes)
+        return f"{line} {comment}" if comment else line
+
+
+def _precision(lines):
+    decimals = [len(d) for line in lines for d in _decimals_re.findall(line)]
+    return max(decimals, default=3)
+
+
+def _render_group(group, start_state, reorder, merge, drop_modal, tolerance):
+    """group is a list of (line, moves) for comment and motion lines"""
+    cuts = []
+    pending = []
+    trailing = []
+    current = None
+    for line, moves in group:
+        if not moves:
+            # Comment or feed-only line. F is carried by the moves and the
+            # motion word is re-emitted as needed, so only comments remain.
+            text = _comment(line) if parse_words(line) else line
+            if not text:
+                continue
+            if current is not None:
+                current.body.append((None, text))
+            else:
+                pending.append(text)
+            continue
+        for move in moves:
+            if move.motion == RAPID:
+                if current is not None:
+                    cuts.append(current)
+                    current = None
+                trailing.append((move, _comment(line)))
+                continue
+            if current is None:
+                current = _Cut(move.start, pending)
+                pending = []
+                trailing = []
+            current.add(move, _comment(line))
+    if current is not None:
+        cuts.append(current)
+        trailing = []
+
+    if not cuts:
+        yield from (line for line, _ in group)
+        return
+
+    heights = [m.end[2] for _, moves in group for m in moves]
+    safe_z = max([start_state.position[2]] + heights)
+    renderer = _Renderer(start_state, drop_modal, _precision(line for line, _ in group))
+    order = list(range(len(cuts)))
+    if reorder and len(cuts) > 1:
+        order = order_cuts(cuts, start_state.position, tolerance)
+
+    for index in order:
+        cut = cuts[index]
+        yield from cut.comments
+        x, y, z = renderer.position
+        if (x, y) != cut.entry[:2] or z != cut.entry[2]:
+            if renderer.number(z) != renderer.number(safe_z):
+                yield renderer.move(RAPID, (x, y, safe_z))
+            line = renderer.move(RAPID, (cut.entry[0], cut.entry[1], safe_z))
+            if line:
+                yield line
+            line = renderer.move(RAPID, cut.entry)
+            if line:
+                yield line
+        body = cut.body
+        if merge:
+            body = _merge_body(body, tolerance)
+        for move, comment in body:
+            if move is None:
+                yield comment
+                continue
+            line = renderer.move(move.motion, move.end, move.center, move.feed, comment)
+            if line:
+                yield line
+
+    x, y, z = renderer.position
+    if trailing and renderer.number(z) != renderer.number(safe_z):
+        yield renderer.move(RAPID, (x, y, safe_z))
+    for move, comment in trailing:
+        end = move.end
+        if move.start[:2] == move.end[:2]:
+            # Pure retract, stay above wherever the last cut ended
+            end = (renderer.position[0], renderer.position[1], move.end[2])
+        line = renderer.move(RAPID, end, comment=comment)
+        if line:
+            yield line
+    yield from pending
+
+
+def _merge_body(body, tolerance):
+    merged = []
+    chunk = []
+    for move, comment in body:
+        if move is None:
+            merged += merge_collinear(chunk, tolerance)
+            chunk = []
+            merged.append((move, comment))
+        else:
+            chunk.append((move, comment))
+    return merged + merge_collinear(chunk, tolerance)
+
+
+def _is_motion_line(line, state):
+    words = parse_words(line)
+    if not all(letter in _motion_letters for letter, _ in words):
+        return False
+    codes = [value for letter, value in words if letter == "G"]
+    if any(code not in (0, 1, 2, 3) for code in codes):
+        return False
+    return bool(codes) or state.motion in (0, 1, 2, 3)
+
+
+def optimize_gcode(
+    lines, reorder=True, merge=True, drop_modal=True, tolerance=1e-3, report=None
+):
+    """Generator stage optimizing a program given as an iterable of lines"""
+    if report is not None:
+        lines = _measure(lines, report, "before")
+
+    def optimized():
+        state = ModalState()
+        group = []
+        group_state = None
+        for line_no, line in enumerate(lines):
+            # Until every axis has been set the machine position is unknown,
+            # lines before that are left as written
+            optimizable = state.absolute and state.scale == 1.0 and all(state.known)
+            if optimizable and _is_motion_line(line, state):
+                if group_state is None:
+                    group_state = _snapshot(state)
+                group.append((line, parse_line(state, line, line_no)))
+                continue
+            if group:
+                yield from _render_group(
+                    group, group_state, reorder, merge, drop_modal, tolerance
+                )
+                group = []
+                group_state = None
+            parse_line(state, line, line_no)
+            yield line
+        if group:
+            yield from _render_group(
+                group, group_state, reorder, merge, drop_modal, tolerance
+            )
+
+    output = optimized()
+    if report is not None:
+        output = _measure(output, report, "after")
+    yield from output
+
+
+def _snapshot(state):
+    snapshot = ModalState()
+    snapshot.__dict__.update(state.__dict__)
+    return snapshot
+
+
+def optimizer(**options):
+    """save_gcode stage: save_gcode(job, path, stages=[optimizer()])"""
+
+    def stage(lines):
+        return optimize_gcode(lines, **options)
+
+    # Part of GcodeTarget input hashes, the report does not change the output
+    stage.options = {k: v for k, v in options.items() if k != "report"}
+    return stage
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("-o", "--output", help="Output path (single input only)")
+    parser.add_argument("--in-place", action="store_true")
+    parser.add_argument("--no-reorder", action="store_true")
+    parser.add_argument("--no-merge", action="store_true")
+    parser.add_argument("--keep-modal", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1e-3)
+    args = parser.parse_args(argv)
+
+    from cad.nc.nc import write_gcode
+
+    for path in args.paths:
+        with open(path) as f:
+            lines = f.read().split("\n")
+        report = OptimizeReport()
+        optimized = list(
+            optimize_gcode(
+                lines,
+                reorder=not args.no_reorder,
+                merge=not args.no_merge,
+                drop_modal=not args.keep_modal,
+                tolerance=args.tolerance,
+                report=report,
+            )
+        )
+        print(f"{path}: {report}")
+        output = path if args.in_place else args.output
+        if output:
+            write_gcode(optimized, output)
+
+
+if __name__ == "__main__":
+    main()
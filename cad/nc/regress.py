@@ -0,0 +1,492 @@
+"""
+Golden file regression of the catalogued programs. Every program is
+regenerated in memory and compared with the committed file in cad/nc by
+its motion, not its text: comments, headers and modal words are ignored,
+moves are aligned by hashes of their coordinates snapped to the
+tolerance, and moves that hash differently are compared geometrically, so
+only toolpath changes beyond the tolerance are reported. Rapids have to
+end at the reference's rapid heights, and any rapid the reference does
+not make sideways or down through the stock fails the program.
+
+Programs are regenerated through build123d and FreeCAD by default, the
+pipeline whose upgrades this is meant to catch. The fast engine computes
+them with cad.nc.fastcam from the dimensions alone, in seconds, so it only
+checks the committed files against the intended geometry.
+
+    python -m cad.nc.regress -k sleeve_19.86
+    python -m cad.nc.regress --engine fast      # no build123d or FreeCAD
+    python -m cad.nc.regress --diff old.nc new.nc
+
+    diff = compare_files("korry/slider_19.5x19.5x3_r1.5875.nc", lines)
+    diff.ok, diff.max_deviation, diff.differences[:3]
+"""
+import argparse
+import math
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import partial
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from cad.nc.fastcam import _directed_distance, _samples
+from cad.nc.gcode import (
+    ARC_CCW,
+    ARC_CW,
+    DWELL,
+    RAPID,
+    Move,
+    arc_points,
+    parse_moves,
+)
+from cad.nc.nc import drop_header, gcode_lines, gcode_path
+
+_base_path = os.path.dirname(__file__)
+_motion_names = {RAPID: "G0", 1: "G1", ARC_CW: "G2", ARC_CCW: "G3", DWELL: "G4"}
+
+
+class _Motion:
+    """A move reduced to what the machine does, hashed on a tolerance grid"""
+
+    __slots__ = ("motion", "start", "end", "center", "dwell", "line", "signature")
+
+    def __init__(self, move, tolerance):
+        self.motion = move.motion
+        self.start = move.start
+        self.end = move.end
+        self.center = move.center
+        self.dwell = move.dwell
+        self.line = move.line
+
+        # Half tolerance cells: equal hashes are less than tolerance apart
+        def snap(values):
+            return tuple(round(v * 2 / tolerance) for v in values)
+
+        self.signature = hash(
+            (
+                self.motion,
+                snap(self.end),
+                snap(self.center) if self.center else None,
+                round(self.dwell, 3),
+            )
+        )
+
+    def deviation(self, other) -> float:
+        """Distance between two moves of the same kind, inf otherwise"""
+        if self.motion != other.motion or abs(self.dwell - other.dwell) > 1e-3:
+            return math.inf
+        distance = math.dist(self.end, other.end)
+        if self.center:
+            distance = max(distance, math.dist(self.center, other.center))
+        return distance
+
+    @property
+    def level(self):
+        """Z of a feed move at constant height, None for the others"""
+        if self.motion in (RAPID, DWELL) or abs(self.start[2] - self.end[2]) > 1e-9:
+            return None
+        return round(self.end[2], 3)
+
+    def chord_points(self, chord_length):
+        """XY points along the move, arcs as chords"""
+        if self.motion in (ARC_CW, ARC_CCW):
+            move = Move(self.motion, self.start, self.end, self.center)
+            return [self.start[:2]] + [p[:2] for p in arc_points(move, chord_length)]
+        return [self.start[:2], self.end[:2]]
+
+    def describe(self):
+        x, y, z = self.end
+        text = f"{_motion_names[self.motion]} X{x:.3f} Y{y:.3f} Z{z:.3f}"
+        if self.center:
+            text += f" center ({self.center[0]:.3f}, {self.center[1]:.3f})"
+        if self.motion == DWELL:
+            text += f" P{self.dwell:g}"
+        return text
+
+
+def motions(lines, tolerance=0.1) -> List[_Motion]:
+    """Moves of a program, lines read as they are iterated"""
+    result = []
+    for move in parse_moves(lines):
+        # Moves to where the tool already is, e.g. FreeCAD's plunge to the
+        # start point, do nothing
+        if move.motion != DWELL and move.start == move.end:
+            continue
+        result.append(_Motion(move, tolerance))
+    return result
+
+
+@dataclass
+class Difference:
+    kind: str
+    # 0 based line numbers in the committed and the regenerated program
+    reference_line: Optional[int]
+    candidate_line: Optional[int]
+    description: str
+    deviation: float = math.inf
+
+    def __str__(self):
+        a = "-" if self.reference_line is None else self.reference_line + 1
+        b = "-" if self.candidate_line is None else self.candidate_line + 1
+        return f"{self.kind:<8} line {a} -> {b}: {self.description}"
+
+
+@dataclass
+class ProgramDiff:
+    path: str
+    reference_moves: int = 0
+    candidate_moves: int = 0
+    # Largest distance between moves accepted as equal
+    max_deviation: float = 0.0
+    differences: List[Difference] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None and not self.differences
+
+
+class _Levels:
+    """
+    Cutting segments of a program per Z level, its rapid ends per Z and its
+    dwells, for geometric comparisons
+    """
+
+    def __init__(self, motions, chord_length):
+        segments = {}
+        rapids = {}
+        self.dwells = []
+        for motion in motions:
+            if motion.level is not None:
+                points = motion.chord_points(chord_length)
+                segments.setdefault(motion.level, []).extend(zip(points, points[1:]))
+            elif motion.motion == RAPID:
+                rapids.setdefault(round(motion.end[2], 3), []).append(motion.end[:2])
+            elif motion.motion == DWELL:
+                self.dwells.append(motion)
+        self.levels = {
+            z: (np.array([a for a, _ in s]), np.array([b for _, b in s]))
+            for z, s in segments.items()
+        }
+        self.rapids = {z: np.array(ends) for z, ends in rapids.items()}
+        # All cuts seen from above, where traverses end before plunging
+        cuts = list(self.levels.values())
+        self.outline = tuple(np.concatenate(c) for c in zip(*cuts)) if cuts else None
+
+    def distance(self, motion, chord_length, resolution) -> float:
+        """
+        Largest distance from the move to this program's cuts at its level.
+        Plunges and ramps only need their end on the cuts they lead to.
+        Rapids need to end at one of this program's rapid heights, above
+        one of its rapid ends or cuts, dwells at one of its equal dwells.
+        """
+        if motion.motion == DWELL:
+            return min(
+                (
+                    math.dist(motion.end, other.end)
+                    for other in self.dwells
+                    if abs(motion.dwell - other.dwell) <= 1e-3
+                ),
+                default=math.inf,
+            )
+        if motion.motion == RAPID:
+            if not self.rapids:
+                return math.inf
+            z = min(self.rapids, key=lambda level: abs(level - motion.end[2]))
+            point = np.array(motion.end[:2])
+            distance = float(np.linalg.norm(self.rapids[z] - point, axis=1).min())
+            if self.outline is not None:
+                outline = _directed_distance(point[None, :], *self.outline)
+                distance = min(distance, outline)
+            return max(abs(z - motion.end[2]), distance)
+        level = motion.level
+        if level is None:
+            level = round(motion.end[2], 3)
+            points = np.array([motion.end[:2]])
+        else:
+            points = np.array(motion.chord_points(chord_length))
+            points = _samples(points[:-1], points[1:], resolution)
+        if level not in self.levels:
+            return math.inf
+        return _directed_distance(points, *self.levels[level])
+
+
+def _stock_top(motions):
+    """Highest Z level cut, None without level cuts"""
+    return max((m.level for m in motions if m.level is not None), default=None)
+
+
+def unsafe_rapids(reference, candidate, tolerance=0.1) -> List[Difference]:
+    """
+    Rapids of the candidate through the stock, sideways or down below the
+    highest level the reference cuts, that the reference does not make
+    """
+    top = _stock_top(reference)
+    if top is None:
+        top = _stock_top(candidate)
+    if top is None:
+        return []
+
+    def unsafe(motion):
+        if motion.motion != RAPID:
+            return False
+        (x0, y0, z0), (x1, y1, z1) = motion.start, motion.end
+        sideways = math.hypot(x1 - x0, y1 - y0) > tolerance
+        low = min(z0, z1) < top - tolerance
+        down = z1 < z0 - tolerance and z1 < top - tolerance
+        return (low and sideways) or down
+
+    known = [m for m in reference if unsafe(m)]
+    differences = []
+    for motion in candidate:
+        if not unsafe(motion) or any(
+            math.dist(motion.start, m.start) <= tolerance
+            and math.dist(motion.end, m.end) <= tolerance
+            for m in known
+        ):
+            continue
+        z = min(motion.start[2], motion.end[2])
+        description = (
+            f"{motion.describe()} rapid at Z{z:.3f}, below the stock top Z{top:.3f}"
+        )
+        differences.append(Difference("unsafe", None, motion.line, description))
+    return differences
+
+
+def diff_motions(reference, candidate, tolerance=0.1) -> Tuple[float, list]:
+    """
+    (max deviation of the matched moves, differences) of two motion lists.
+    Runs with equal hashes are matched move by move. Moves in the runs that
+    differ are compared with the other program's cuts at the same level,
+    so contours split or started differently are not reported. Unsafe
+    rapids of the candidate are always reported.
+    """
+    matcher = SequenceMatcher(
+        None,
+        [m.signature for m in reference],
+        [m.signature for m in candidate],
+        autojunk=False,
+    )
+    worst = 0.0
+    differences = []
+    levels = {}
+    chord_length = math.sqrt(8 * tolerance / 4)
+    resolution = tolerance / 2
+
+    def distance(motion, other):
+        if other not in levels:
+            levels[other] = _Levels(
+                reference if other == "reference" else candidate, chord_length
+            )
+        return levels[other].distance(motion, chord_length, resolution)
+
+    for tag, a0, a1, b0, b1 in matcher.get_opcodes():
+        if tag == "equal":
+            for a, b in zip(reference[a0:a1], candidate[b0:b1]):
+                worst = max(worst, a.deviation(b))
+            continue
+        pairs = min(a1 - a0, b1 - b0) if tag == "replace" else 0
+        for a, b in zip(reference[a0 : a0 + pairs], candidate[b0 : b0 + pairs]):
+            deviation = a.deviation(b)
+            if deviation > tolerance:
+                deviation = max(distance(a, "candidate"), distance(b, "reference"))
+            if deviation <= tolerance:
+                worst = max(worst, deviation)
+                continue
+            description = f"{a.describe()} became {b.describe()}"
+            differences.append(
+                Difference("changed", a.line, b.line, description, deviation)
+            )
+        for kind, motions, other in (
+            ("missing", reference[a0 + pairs : a1], "candidate"),
+            ("extra", candidate[b0 + pairs : b1], "reference"),
+        ):
+            for motion in motions:
+                deviation = distance(motion, other)
+                if deviation <= tolerance:
+                    worst = max(worst, deviation)
+                    continue
+                lines = (
+                    (motion.line, None) if kind == "missing" else (None, motion.line)
+                )
+                differences.append(
+                    Difference(kind, *lines, motion.describe(), deviation)
+                )
+    differences += unsafe_rapids(reference, candidate, tolerance)
+    return worst, differences
+
+
+def compare_files(reference, candidate, tolerance=0.1, path=None) -> ProgramDiff:
+    """
+    Compare two programs, each a path (relative to cad/nc if it does not
+    exist as given), a G-code string or an iterable of lines
+    """
+    start = time.perf_counter()
+    parsed = []
+    for source in (reference, candidate):
+        if isinstance(source, str) and "\n" not in source:
+            full_path = source if os.path.exists(source) else gcode_path(source)
+            with open(full_path) as f:
+                parsed.append(motions(f, tolerance))
+        else:
+            parsed.append(motions(gcode_lines(source), tolerance))
+    worst, differences = diff_motions(*parsed, tolerance)
+    return ProgramDiff(
+        path=path or str(reference),
+        reference_moves=len(parsed[0]),
+        candidate_moves=len(parsed[1]),
+        max_deviation=worst,
+        differences=differences,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _variant_lines(variant, engine):
+    if engine == "fast":
+        from cad.nc.fastcam import variant_program
+
+        return variant_program(variant)
+
+    from cad.common.buttons.korry.korry import KorrySwitch
+    from cad.common.buttons.korry.korry_cam import sleeve_job, slider_job
+
+    if variant.kind == "sleeve":
+        korry = KorrySwitch(
+            variant.width, variant.height, corner_radius=variant.corner_radius
+        )
+        job = sleeve_job(
+            korry, variant.stock_thickness, variant.left_ledge, variant.right_ledge
+        )
+    else:
+        korry = KorrySwitch(
+            variant.width, variant.height, corner_radius=variant.corner_radius
+        )
+        job = slider_job(korry, variant.stock_thickness)
+    return drop_header(gcode_lines(job))
+
+
+def _single_slider_lines(engine):
+    from cad.common.buttons.korry.korry import KorrySwitch
+
+    korry = KorrySwitch(19.5, 19.5)
+    if engine == "fast":
+        from cad.nc.fastcam import Setup, slider_setup, toolpath
+
+        # cnc_single_slider only cuts the bottom holes and the outline
+        operations = slider_setup(korry, 3).operations[-1:]
+        return toolpath(Setup(operations), tool_diameter=1)
+
+    from cad.glareshield.autobrake.panel.autobrake import single_slider_job
+
+    return drop_header(gcode_lines(single_slider_job(korry)))
+
+
+def catalogue_programs(engine="freecad"):
+    """(path relative to cad/nc, function returning its regenerated lines)"""
+    from cad.common.buttons.korry.korry_batch import LEDGES, KORRY_CATALOGUE, CamVariant
+
+    programs = [
+        (variant.output + ".nc", partial(_variant_lines, variant, engine))
+        for variant in KORRY_CATALOGUE
+    ]
+    # cnc_single_sleeve runs the cam_sleeve job on a 19.5 mm sleeve
+    for left_ledge, right_ledge in LEDGES:
+        name = ["autobrake/single_sleeve"]
+        if not left_ledge:
+            name.append("no_left_ledge")
+        if not right_ledge:
+            name.append("no_right_ledge")
+        variant = CamVariant(
+            "sleeve", 19.5, 19.5, 4, 3.175 / 2, left_ledge, right_ledge
+        )
+        programs.append(
+            ("_".join(name) + ".nc", partial(_variant_lines, variant, engine))
+        )
+    programs.append(
+        ("autobrake/single_slider.nc", partial(_single_slider_lines, engine))
+    )
+    return programs
+
+
+def check(program, tolerance=0.1) -> ProgramDiff:
+    """Regenerate one (path, generate) program and compare it with cad/nc"""
+    path, generate = program
+    start = time.perf_counter()
+    try:
+        diff = compare_files(path, generate(), tolerance, path=path)
+    except Exception:
+        diff = ProgramDiff(path, error=traceback.format_exc())
+    diff.seconds = time.perf_counter() - start
+    return diff
+
+
+def check_all(engine="freecad", tolerance=0.1, pattern="", max_workers=None):
+    programs = [p for p in catalogue_programs(engine) if pattern in p[0]]
+    if max_workers == 1 or len(programs) < 2:
+        return [check(program, tolerance) for program in programs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(check, programs, [tolerance] * len(programs), chunksize=4)
+        )
+
+
+def print_diff(diff: ProgramDiff, limit=10):
+    if diff.error:
+        print(f"{diff.path:<70} ERROR {diff.error.strip().splitlines()[-1]}")
+        return
+    status = "ok" if diff.ok else f"{len(diff.differences)} differences"
+    print(
+        f"{diff.path:<70} {diff.reference_moves:5d} {diff.candidate_moves:5d} "
+        f"{diff.max_deviation:6.3f} {diff.seconds:6.2f}s  {status}"
+    )
+    for difference in diff.differences[:limit]:
+        print(f"    {difference}")
+    if len(diff.differences) > limit:
+        print(f"    ... {len(diff.differences) - limit} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--engine",
+        choices=["freecad", "fast"],
+        default="freecad",
+        help="fast regenerates with cad.nc.fastcam, bypassing build123d and FreeCAD, "
+        "so library upgrades go unnoticed",
+    )
+    parser.add_argument("-k", "--filter", default="", help="only paths containing")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1)
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=10, help="differences shown")
+    parser.add_argument(
+        "--diff", nargs=2, metavar=("REFERENCE", "CANDIDATE"), help="two files"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.diff:
+        results = [compare_files(*args.diff, args.tolerance)]
+    else:
+        results = check_all(args.engine, args.tolerance, args.filter, args.jobs)
+    header = f"{'program':<70} {'ref':>5} {'new':>5} {'noise':>6} {'time':>7}"
+    print(header)
+    print("-" * len(header))
+    for diff in results:
+        print_diff(diff, args.limit)
+    print("-" * len(header))
+    errors = sum(diff.error is not None for diff in results)
+    failed = sum(not diff.ok for diff in results)
+    print(
+        f"{len(results)} programs, {failed - errors} changed, {errors} errors, "
+        f"{time.perf_counter() - start:.1f}s"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
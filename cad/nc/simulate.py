@@ -0,0 +1,607 @@
+"""
+Material removal simulation of the programs in cad/nc. The stock is a
+heightmap (one Z dexel per grid cell), the flat endmill is swept along
+every move in array operations, and the result is compared with a
+heightmap of the intended KorrySwitch part rasterized from its mesh, in the
+machine coordinates of its setup (sleeves are cut from their bottom face).
+
+    python -m cad.nc.simulate                       # every program in cad/nc
+    python -m cad.nc.simulate cad/nc/korry -r 0.025 --segments
+
+    result = verify("cad/nc/korry/sleeve_19.5x19.5x4_r1.5875.nc")
+    result.gouge_volume, result.leftover_volume, result.segments[0].rate
+
+Gouges are cells of the part cut below their intended height, leftovers
+are cells of the part (and of the stock still attached to it) left above
+it. Cells within xy_tolerance of a wall of the part are ignored.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from cad.nc.analyze import Machine, find_programs
+from cad.nc.gcode import ARC_CCW, ARC_CW, DWELL, RAPID, arc_points, parse_moves
+
+_base_path = os.path.dirname(__file__)
+_tool_re = re.compile(r"Diameter:\s*([0-9.]+)")
+_eps = 1e-6
+
+
+@dataclass
+class Heightmap:
+    """Top of the material per cell, cells of resolution mm from origin"""
+
+    origin: tuple
+    resolution: float
+    heights: np.ndarray
+    bottom: float
+
+    @classmethod
+    def stock(cls, bounds, resolution, thickness, top=0.0):
+        """Uncut stock covering bounds (x0, y0, x1, y1)"""
+        x0, y0, x1, y1 = bounds
+        nx = int(math.ceil((x1 - x0) / resolution)) + 1
+        ny = int(math.ceil((y1 - y0) / resolution)) + 1
+        heights = np.full((ny, nx), top, dtype=np.float64)
+        return cls((x0, y0), resolution, heights, top - thickness)
+
+    @property
+    def cell_area(self):
+        return self.resolution**2
+
+    def centers(self):
+        """(x, y) arrays of the cell centers"""
+        ny, nx = self.heights.shape
+        x = self.origin[0] + np.arange(nx) * self.resolution
+        y = self.origin[1] + np.arange(ny) * self.resolution
+        return np.meshgrid(x, y)
+
+    def material(self):
+        """Cells with material left above the stock bottom"""
+        return self.heights > self.bottom + _eps
+
+    def volume(self):
+        return float((self.heights - self.bottom).sum() * self.cell_area)
+
+    def sweep(self, points, radius) -> float:
+        """
+        Lower the cells under a flat endmill of radius placed at each of the
+        (n, 3) points, returning the removed volume
+        """
+        h = self.resolution
+        ny, nx = self.heights.shape
+        reach = int(math.ceil(radius / h)) + 1
+        offsets = np.arange(-reach, reach + 1)
+        di, dj = (a.ravel() for a in np.meshgrid(offsets, offsets))
+
+        ix = np.rint((points[:, 0] - self.origin[0]) / h).astype(np.int64)
+        iy = np.rint((points[:, 1] - self.origin[1]) / h).astype(np.int64)
+        cx = ix[:, None] + di[None]
+        cy = iy[:, None] + dj[None]
+        dx = self.origin[0] + cx * h - points[:, 0, None]
+        dy = self.origin[1] + cy * h - points[:, 1, None]
+        inside = (dx**2 + dy**2 <= radius**2 + _eps) & (cx >= 0) & (cy >= 0)
+        inside &= (cx < nx) & (cy < ny)
+        if not inside.any():
+            return 0.0
+        flat = (cy * nx + cx)[inside]
+        z = np.broadcast_to(points[:, 2, None], inside.shape)[inside]
+
+        cells, index = np.unique(flat, return_inverse=True)
+        lowest = np.full(len(cells), np.inf)
+        np.minimum.at(lowest, index, z)
+        heights = self.heights.reshape(-1)
+        before = heights[cells]
+        after = np.maximum(np.minimum(before, lowest), self.bottom)
+        heights[cells] = after
+        return float((before - after).sum() * self.cell_area)
+
+
+def _move_points(move, step):
+    """(n, 3) tool positions along a move, its start included"""
+    if move.motion in (ARC_CW, ARC_CCW):
+        return np.array([move.start] + arc_points(move, step))
+    start = np.asarray(move.start, dtype=np.float64)
+    end = np.asarray(move.end, dtype=np.float64)
+    count = max(1, int(math.ceil(math.dist(move.start[:2], move.end[:2]) / step)))
+    t = np.linspace(0, 1, count + 1)[:, None]
+    return start + (end - start) * t
+
+
+@dataclass
+class SegmentRemoval:
+    """Material removed by one move, rate in mm^3/min at its feed"""
+
+    line: int
+    motion: int
+    length: float
+    volume: float
+    seconds: float
+
+    @property
+    def rate(self):
+        return self.volume / self.seconds * 60 if self.seconds > 0 else 0.0
+
+
+def tool_diameter(lines, default=1.0):
+    """Diameter from FreeCAD's "(Compensated Tool Path. Diameter: d)" comment"""
+    for line in lines:
+        match = _tool_re.search(line)
+        if match:
+            return float(match.group(1))
+    return default
+
+
+def simulate(
+    lines,
+    tool_diameter=1.0,
+    resolution=0.05,
+    stock: Heightmap = None,
+    thickness=None,
+    machine: Machine = None,
+    margin=2.0,
+):
+    """
+    Replay a program on stock, by default a block with its top at Z0
+    covering the cutting moves, thickness deep (the deepest cut if None).
+    Returns the heightmap and a SegmentRemoval per move.
+    """
+    machine = machine or Machine()
+    moves = [move for move in parse_moves(lines) if move.motion != DWELL]
+    radius = tool_diameter / 2
+    if stock is None:
+        cuts = [m for m in moves if m.motion != RAPID] or moves
+        ends = np.array([m.start for m in cuts] + [m.end for m in cuts])
+        if thickness is None:
+            thickness = max(-float(ends[:, 2].min()), resolution)
+        low = ends[:, :2].min(axis=0) - radius - margin
+        high = ends[:, :2].max(axis=0) + radius + margin
+        # Cells aligned on the resolution grid, so X0 Y0 is a cell center
+        low = np.floor(low / resolution) * resolution
+        stock = Heightmap.stock((*low, *high), resolution, thickness)
+
+    top = float(stock.heights.max())
+    # Tool positions close enough that the scallop between two of them
+    # stays under a quarter of a cell
+    step = max(math.sqrt(2 * radius * resolution), resolution)
+    segments = []
+    for move in moves:
+        volume = 0.0
+        if min(move.start[2], move.end[2]) < top - _eps:
+            volume = stock.sweep(_move_points(move, step), radius)
+        rate = machine.rapid_rate if move.motion == RAPID else None
+        rate = rate or move.feed or machine.default_feed
+        segments.append(
+            SegmentRemoval(
+                move.line, move.motion, move.length, volume, move.length / rate * 60
+            )
+        )
+    return stock, segments
+
+
+def _triangles(shape, flip):
+    """(n, 3, 3) triangles of a part in the machine coordinates of its setup"""
+    from cad.common.mesh import mesh_parts
+
+    corners = []
+    for part in mesh_parts(shape, tolerance=0.01, angular_tolerance=0.1):
+        vertices = np.asarray(part.vertices, dtype=np.float64)
+        triangles = np.asarray(part.triangles, dtype=np.intp)
+        for matrix in part.matrices:
+            placed = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+            corners.append(placed[triangles])
+    corners = np.concatenate(corners)
+    if flip:
+        # Turned over around X, as fastcam's Setup.flip
+        corners = corners * (1, -1, -1)
+    return corners - (0, 0, corners[..., 2].max())
+
+
+def part_heightmap(shape, like: Heightmap, flip=False) -> Heightmap:
+    """
+    Heightmap of a part on the grid of like, the top of its highest face
+    over each cell, the stock bottom where it has no material
+    """
+    return _rasterize(_triangles(shape, flip), like)
+
+
+def _rasterize(corners, like):
+    thickness = -float(corners[..., 2].min())
+    heights = np.full(like.heights.shape, -thickness)
+    ny, nx = heights.shape
+    h = like.resolution
+    ox, oy = like.origin
+
+    a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (
+        b[:, 1] - a[:, 1]
+    )
+    # Walls have no extent from above
+    for i in np.flatnonzero(np.abs(area) > 1e-9):
+        tri = corners[i]
+        i0 = max(int(math.ceil((tri[:, 0].min() - ox) / h - _eps)), 0)
+        i1 = min(int(math.floor((tri[:, 0].max() - ox) / h + _eps)), nx - 1)
+        j0 = max(int(math.ceil((tri[:, 1].min() - oy) / h - _eps)), 0)
+        j1 = min(int(math.floor((tri[:, 1].max() - oy) / h + _eps)), ny - 1)
+        if i1 < i0 or j1 < j0:
+            continue
+        x, y = np.meshgrid(
+            ox + np.arange(i0, i1 + 1) * h, oy + np.arange(j0, j1 + 1) * h
+        )
+        # Barycentric coordinates of the cell centers
+        w1 = (x - a[i, 0]) * (c[i, 1] - a[i, 1]) - (c[i, 0] - a[i, 0]) * (y - a[i, 1])
+        w2 = (b[i, 0] - a[i, 0]) * (y - a[i, 1]) - (x - a[i, 0]) * (b[i, 1] - a[i, 1])
+        w1, w2 = w1 / area[i], w2 / area[i]
+        inside = (w1 >= -_eps) & (w2 >= -_eps) & (w1 + w2 <= 1 + _eps)
+        z = a[i, 2] + w1 * (b[i, 2] - a[i, 2]) + w2 * (c[i, 2] - a[i, 2])
+        window = heights[j0 : j1 + 1, i0 : i1 + 1]
+        np.maximum(window, np.where(inside, z, -np.inf), out=window)
+    return Heightmap(like.origin, h, heights, -thickness)
+
+
+def _components(mask):
+    """Label of each cell of mask, 4-connected, -1 outside of it"""
+    ny, nx = mask.shape
+    labels = np.where(mask, np.arange(mask.size).reshape(mask.shape), mask.size)
+    while True:
+        previous = labels
+        labels = labels.copy()
+        # Smallest label among the neighbours within the mask
+        np.minimum(
+            labels[1:], np.where(mask[:-1], labels[:-1], mask.size), out=labels[1:]
+        )
+        np.minimum(
+            labels[:-1], np.where(mask[1:], labels[1:], mask.size), out=labels[:-1]
+        )
+        np.minimum(
+            labels[:, 1:],
+            np.where(mask[:, :-1], labels[:, :-1], mask.size),
+            out=labels[:, 1:],
+        )
+        np.minimum(
+            labels[:, :-1],
+            np.where(mask[:, 1:], labels[:, 1:], mask.size),
+            out=labels[:, :-1],
+        )
+        labels = np.where(mask, labels, mask.size)
+        # Pointer jumping: follow each label to the label of that cell
+        flat = np.append(labels.ravel(), mask.size)
+        for _ in range(8):
+            flat[:-1] = flat[flat[:-1]]
+        labels = flat[:-1].reshape(ny, nx)
+        if np.array_equal(labels, previous):
+            return np.where(mask, labels, -1)
+
+
+def _near_walls(heights, cells, tolerance):
+    """Cells with a step higher than tolerance within cells cells of them"""
+    padded = np.pad(heights, cells, mode="edge")
+    high = heights.copy()
+    low = heights.copy()
+    ny, nx = heights.shape
+    for dy in range(2 * cells + 1):
+        for dx in range(2 * cells + 1):
+            window = padded[dy : dy + ny, dx : dx + nx]
+            np.maximum(high, window, out=high)
+            np.minimum(low, window, out=low)
+    return high - low > tolerance
+
+
+@dataclass
+class SimulationResult:
+    path: str
+    tool_diameter: float
+    resolution: float
+    # mm^3
+    removed_volume: float
+    segments: List[SegmentRemoval] = field(default_factory=list)
+    # Source lines of rapid moves that removed material
+    rapid_collisions: List[int] = field(default_factory=list)
+    part: Optional[str] = None
+    # Why the part a program is named after could not be built
+    part_error: Optional[str] = None
+    gouge_volume: float = 0.0
+    gouge_depth: float = 0.0
+    # mm^2
+    gouge_area: float = 0.0
+    gouge_at: Optional[tuple] = None
+    leftover_volume: float = 0.0
+    leftover_height: float = 0.0
+    leftover_area: float = 0.0
+    leftover_at: Optional[tuple] = None
+    # Pieces cut loose from the part (slugs of holes, the outer stock)
+    dropped_pieces: int = 0
+    seconds: float = 0.0
+
+    @property
+    def status(self):
+        """
+        "ok", "FAILED", or "unchecked" for programs without a known part,
+        which are not ok either: only the rapids could be checked
+        """
+        if (
+            self.rapid_collisions
+            or self.part_error
+            or self.gouge_depth > 0.0
+            or self.leftover_height > 0.0
+        ):
+            return "FAILED"
+        return "unchecked" if self.part is None else "ok"
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    @property
+    def peak_rate(self):
+        return max((s.rate for s in self.segments), default=0.0)
+
+    def row(self):
+        if self.part is None:
+            comparison = f"{'no part':>31}"
+        else:
+            comparison = (
+                f"{self.gouge_depth:6.3f} {self.gouge_area:6.2f} "
+                f"{self.leftover_height:6.3f} {self.leftover_area:6.2f} "
+                f"{self.dropped_pieces:3d}"
+            )
+        return (
+            f"{self.path:<70} {self.removed_volume:8.1f} {self.peak_rate:8.1f} "
+            f"{comparison} {len(self.rapid_collisions):3d} {self.seconds:5.2f}s "
+            f"{self.status}"
+        )
+
+
+_program_re = re.compile(
+    r"(?P<kind>sleeve|slider)_(?P<width>[0-9.]+)x(?P<height>[0-9.]+)"
+    r"x(?P<stock>[0-9.]+)_r(?P<radius>[0-9.]+)(?P<options>(_no_\w+_ledge)*)$"
+)
+_single_re = re.compile(r"single_(?P<kind>sleeve|slider)(?P<options>(_no_\w+_ledge)*)$")
+
+
+def intended_part(path):
+    """
+    (description, part, flip) of the KorrySwitch part a program in cad/nc
+    cuts, from its file name as written by cam_sleeve, cam_slider and the
+    autobrake panel, or None
+    """
+    from cad.common.buttons.korry.korry import KorrySwitch
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    match = _program_re.match(name)
+    if match:
+        korry = KorrySwitch(
+            float(match["width"]),
+            float(match["height"]),
+            corner_radius=float(match["radius"]),
+        )
+        stock = float(match["stock"])
+    else:
+        match = _single_re.match(name)
+        if not match:
+            return None
+        korry = KorrySwitch(19.5, 19.5)
+        stock = 4
+    options = match["options"]
+    if match["kind"] == "slider" and name.startswith("single_"):
+        # cnc_single_slider only cuts the lower slots and the outline through
+        from build123d import extrude
+
+        thickness = korry.slider_stock_thickness
+        part = extrude(korry.slider_footprint(), amount=-thickness)
+        return "slider bottom holes", part, False
+    if match["kind"] == "slider":
+        return f"slider({stock:g})", korry.slider(stock).part, False
+    ledges = dict(
+        left_ledge="no_left_ledge" not in options,
+        right_ledge="no_right_ledge" not in options,
+    )
+    flags = "".join(f", {k}=False" for k, v in ledges.items() if not v)
+    return f"sleeve({stock:g}{flags})", korry.sleeve(stock, **ledges).part, True
+
+
+def compare(
+    simulated: Heightmap,
+    intended: Heightmap,
+    tool_diameter,
+    z_tolerance=0.01,
+    xy_tolerance=0.05,
+):
+    """
+    Gouges and leftovers of a simulated heightmap against the intended one
+    on the same grid, as a dict of SimulationResult fields
+    """
+    h = simulated.resolution
+    area = simulated.cell_area
+    target = np.maximum(intended.heights, simulated.bottom)
+    part = target > simulated.bottom + _eps
+    cells = int(math.ceil(xy_tolerance / h - _eps))
+    checked = ~_near_walls(target, cells, z_tolerance) if cells else True
+
+    material = simulated.material()
+    labels = _components(material)
+    kept = np.unique(labels[material & part])
+    attached = np.isin(labels, kept) & material
+    dropped = len(np.unique(labels[material])) - len(kept)
+    # The part and the stock it still holds around it within a tool diameter
+    rows, columns = np.nonzero(part)
+    reach = int(math.ceil(tool_diameter / h))
+    region = np.zeros_like(part)
+    if len(rows):
+        region[
+            max(rows.min() - reach, 0) : rows.max() + reach + 1,
+            max(columns.min() - reach, 0) : columns.max() + reach + 1,
+        ] = True
+
+    x, y = simulated.centers()
+    depth = np.where(part & checked, target - simulated.heights, 0.0)
+    depth[depth <= z_tolerance] = 0.0
+    excess = np.where(attached & region & checked, simulated.heights - target, 0.0)
+    excess[excess <= z_tolerance] = 0.0
+
+    result = dict(dropped_pieces=int(dropped))
+    for name, values in (("gouge", depth), ("leftover", excess)):
+        worst = np.unravel_index(np.argmax(values), values.shape)
+        found = values[worst] > 0
+        result.update(
+            {
+                f"{name}_volume": float(values.sum() * area),
+                f"{name}_area": float(np.count_nonzero(values) * area),
+                f"{name}_{'depth' if name == 'gouge' else 'height'}": float(
+                    values[worst]
+                ),
+                f"{name}_at": (
+                    (round(float(x[worst]), 3), round(float(y[worst]), 3))
+                    if found
+                    else None
+                ),
+            }
+        )
+    return result
+
+
+def verify(
+    path,
+    resolution=0.05,
+    tool=None,
+    machine: Machine = None,
+    z_tolerance=0.01,
+    xy_tolerance=0.05,
+) -> SimulationResult:
+    """
+    Simulate a program and compare it with the part it is named after.
+    Paths are relative to cad/nc unless they exist as given.
+    """
+    start = time.perf_counter()
+    if not os.path.exists(path):
+        path = os.path.join(_base_path, path)
+        if not path.endswith(".nc"):
+            path += ".nc"
+    with open(path) as f:
+        lines = f.read().splitlines()
+    diameter = tool or tool_diameter(lines)
+    description = corners = thickness = part_error = None
+    try:
+        intended = intended_part(path)
+    except Exception as error:
+        # Programs for parameters KorrySwitch no longer builds
+        intended = None
+        part_error = f"{type(error).__name__}: {error}"
+    if intended is not None:
+        description, part, flip = intended
+        corners = _triangles(part, flip)
+        # The stock is as thick as the part, so cuts through end at its bottom
+        thickness = -float(corners[..., 2].min())
+
+    heightmap, segments = simulate(
+        lines, diameter, resolution, thickness=thickness, machine=machine
+    )
+    result = SimulationResult(
+        path=os.path.relpath(path),
+        tool_diameter=diameter,
+        resolution=resolution,
+        removed_volume=sum(s.volume for s in segments),
+        segments=segments,
+        rapid_collisions=[
+            s.line for s in segments if s.motion == RAPID and s.volume > 0
+        ],
+        part=description,
+        part_error=part_error,
+    )
+    if corners is not None:
+        target = _rasterize(corners, heightmap)
+        for name, value in compare(
+            heightmap, target, diameter, z_tolerance, xy_tolerance
+        ).items():
+            setattr(result, name, value)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _verify(arguments):
+    path, options = arguments
+    return verify(path, **options)
+
+
+def verify_all(paths=(_base_path,), max_workers=None, **options):
+    """SimulationResult of every program found in paths, in parallel"""
+    programs = find_programs(paths)
+    if max_workers == 1 or len(programs) < 2:
+        return [verify(path, **options) for path in programs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_verify, [(p, options) for p in programs]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[_base_path])
+    parser.add_argument("-r", "--resolution", type=float, default=0.05)
+    parser.add_argument("--tool", type=float, default=None, help="endmill diameter")
+    parser.add_argument("--z-tolerance", type=float, default=0.01)
+    parser.add_argument("--xy-tolerance", type=float, default=0.05)
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--segments", action="store_true", help="removal per move")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = verify_all(
+        args.paths,
+        args.jobs,
+        resolution=args.resolution,
+        tool=args.tool,
+        z_tolerance=args.z_tolerance,
+        xy_tolerance=args.xy_tolerance,
+    )
+    if args.json:
+        print(
+            json.dumps([{**asdict(r), "status": r.status} for r in results], indent=2)
+        )
+        return 0 if all(r.ok for r in results) else 1
+
+    header = (
+        f"{'program':<70} {'removed':>8} {'mm3/min':>8} {'gouge':>6} {'mm2':>6} "
+        f"{'left':>6} {'mm2':>6} {'drp':>3} {'rpd':>3} {'time':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(result.row())
+        if result.gouge_at:
+            print(f"    deepest gouge at {result.gouge_at}")
+        if result.part_error:
+            print(f"    part not built, {result.part_error}")
+        elif result.part is None:
+            print("    not compared, no known part for this program")
+        if result.leftover_at:
+            print(f"    highest leftover at {result.leftover_at}")
+        for line in result.rapid_collisions:
+            print(f"    rapid into material on line {line + 1}")
+        if args.segments:
+            for s in result.segments:
+                if s.volume > 0:
+                    print(
+                        f"    line {s.line + 1:4d} G{s.motion} {s.length:7.2f} mm "
+                        f"{s.volume:8.2f} mm3 {s.rate:8.1f} mm3/min"
+                    )
+    print("-" * len(header))
+    total = sum(r.seconds for r in results)
+    failed = sum(r.status == "FAILED" for r in results)
+    unchecked = sum(r.status == "unchecked" for r in results)
+    print(
+        f"{len(results)} programs simulated in {total:.1f}s, {failed} failed, "
+        f"{unchecked} unchecked"
+    )
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,307 @@
+"""
+Drill programs for the Korry LED board regenerated from its Excellon files:
+holes grouped by tool, each group ordered by nearest neighbour plus 2-opt
+to shorten spindle travel, optionally panelized as a grid of boards on one
+blank. The output follows the layout of pcb2gcode's drill.ngc and uses the
+settings of the board's pcb2gcode.conf.
+
+    python -m cad.pcb.drill                     # travel report, 1 board
+    python -m cad.pcb.drill --columns 3 --rows 2 --save
+"""
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from cad.cache import source_fingerprint
+from cad.nc import GcodeTarget
+from cad.nc.gcode import LINEAR, parse_moves
+from cad.pcb.excellon import Drill
+from cad.pcb.gerber import Gerber
+
+led_pcb_path = os.path.join(
+    os.path.dirname(__file__), os.pardir, "common", "buttons", "korry", "led-pcb"
+)
+_gerbers = os.path.join(led_pcb_path, "gerbers")
+led_pcb_files = {
+    "pth": os.path.join(_gerbers, "korry-led-pcb-PTH.drl"),
+    "npth": os.path.join(_gerbers, "korry-led-pcb-NPTH.drl"),
+    "outline": os.path.join(_gerbers, "korry-led-pcb-Edge_Cuts.gbr"),
+    "conf": os.path.join(led_pcb_path, "nc", "pcb2gcode.conf"),
+    "drill": os.path.join(led_pcb_path, "nc", "drill.ngc"),
+}
+
+
+def read_pcb2gcode_conf(path) -> Dict[str, str]:
+    options = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                options[key.strip()] = value.strip()
+    return options
+
+
+@dataclass
+class DrillSettings:
+    """Millimeters and mm/min, defaults as in the LED board's pcb2gcode.conf"""
+
+    feed: float = 500.0
+    speed: float = 20000.0
+    z_drill: float = -2.5
+    z_safe: float = 5.0
+    z_change: float = 10.0
+    cutter_diameter: float = 1.0
+
+    @classmethod
+    def from_conf(cls, path):
+        options = read_pcb2gcode_conf(path)
+        defaults = cls()
+
+        def option(name, default):
+            return float(options.get(name, default))
+
+        return cls(
+            feed=option("drill-feed", defaults.feed),
+            speed=option("drill-speed", defaults.speed),
+            z_drill=option("zdrill", defaults.z_drill),
+            z_safe=option("zsafe", defaults.z_safe),
+            z_change=option("zchange", defaults.z_change),
+            cutter_diameter=option("cutter-diameter", defaults.cutter_diameter),
+        )
+
+
+def board_frame(outline: Gerber, settings: DrillSettings):
+    """
+    Origin and size of a board as pcb2gcode's zero-start places it: the
+    outline's extent grown by the outline cutter diameter on every side
+    """
+    (min_x, min_y), (max_x, max_y) = outline.bounds()
+    margin = settings.cutter_diameter
+    origin = np.array([min_x - margin, min_y - margin])
+    size = np.array([max_x - min_x + 2 * margin, max_y - min_y + 2 * margin])
+    return origin, size
+
+
+def panelize(groups, board_size, columns=1, rows=1, spacing=0.0):
+    """Hole groups repeated on a columns x rows grid, board by board"""
+    pitch = np.asarray(board_size) + spacing
+    offsets = np.array(
+        [(c * pitch[0], r * pitch[1]) for r in range(rows) for c in range(columns)]
+    )
+    return {
+        diameter: (holes[None, :, :] + offsets[:, None, :]).reshape(-1, 2)
+        for diameter, holes in groups.items()
+    }
+
+
+def path_length(points, start=(0.0, 0.0)) -> float:
+    """XY length of the open path from start through points in order"""
+    if not len(points):
+        return 0.0
+    path = np.vstack([start, points])
+    return float(np.hypot(*np.diff(path, axis=0).T).sum())
+
+
+def order_holes(points, start=(0.0, 0.0), max_sweeps=100):
+    """
+    Visiting order (indices into points) of an open tour from start:
+    nearest neighbour construction improved by 2-opt segment reversals
+    """
+    n = len(points)
+    if n < 2:
+        return np.arange(n)
+    nodes = np.vstack([start, points])
+    distances = np.hypot(*(nodes[:, None, :] - nodes[None, :, :]).transpose(2, 0, 1))
+
+    # Node 0 is the start position, tour holds node numbers
+    tour = [0]
+    unvisited = np.ones(n + 1, dtype=bool)
+    unvisited[0] = False
+    for _ in range(n):
+        row = np.where(unvisited, distances[tour[-1]], np.inf)
+        nearest = int(np.argmin(row))
+        tour.append(nearest)
+        unvisited[nearest] = False
+    tour = np.array(tour)
+
+    for _ in range(max_sweeps):
+        improved = False
+        for i in range(1, n):
+            # Gain of reversing tour[i:j + 1] for every j > i at once. The
+            # last node has no following edge, its terms are masked out.
+            before, first = tour[i - 1], tour[i]
+            ends = tour[i + 1 :]
+            following = np.append(tour[i + 2 :], 0)
+            has_following = np.arange(len(ends)) < len(ends) - 1
+            old = distances[before, first] + np.where(
+                has_following, distances[ends, following], 0.0
+            )
+            new = distances[before, ends] + np.where(
+                has_following, distances[first, following], 0.0
+            )
+            k = int(np.argmin(new - old))
+            if new[k] - old[k] < -1e-9:
+                tour[i : i + k + 2] = tour[i : i + k + 2][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return tour[1:] - 1
+
+
+def order_groups(groups, start=(0.0, 0.0)):
+    """
+    Holes of every diameter, smallest first, each group ordered starting
+    from where the previous one ended
+    """
+    ordered = {}
+    position = np.asarray(start, dtype=np.float64)
+    for diameter in sorted(groups):
+        holes = groups[diameter]
+        ordered[diameter] = holes[order_holes(holes, position)]
+        if len(holes):
+            position = ordered[diameter][-1]
+    return ordered
+
+
+def drill_program(groups, settings: DrillSettings):
+    """G-code lines drilling groups in order, one tool change per diameter"""
+    sizes = ", ".join(f"{diameter:.4f}mm" for diameter in groups)
+    yield "( Generated by cad.pcb.drill )"
+    yield "( Software-independent Gcode )"
+    yield ""
+    yield f"( This file uses {len(groups)} drill bit sizes. )"
+    yield f"( Bit sizes: [{sizes}] )"
+    yield ""
+    yield "G94       (Millimeters per minute feed rate.)"
+    yield "G21       (Units == Millimeters.)"
+    yield "G91.1     (Incremental arc distance mode.)"
+    yield "G90       (Absolute coordinates.)"
+    yield f"G00 S{settings.speed:.0f}     (RPM spindle speed.)"
+    yield ""
+    for tool, (diameter, holes) in enumerate(groups.items(), 1):
+        yield f"G00 Z{settings.z_change:.5f} (Retract)"
+        yield f"T{tool}"
+        yield "M5      (Spindle stop.)"
+        yield "G04 P1.00000"
+        yield f"(MSG, Change tool bit to drill size {diameter:.4f}mm)"
+        yield "M6      (Tool change.)"
+        yield "M0      (Temporary machine stop.)"
+        yield "M3      (Spindle on clockwise.)"
+        yield f"G0 Z{settings.z_safe:.5f}"
+        yield "G04 P1.00000"
+        yield ""
+        for i, (x, y) in enumerate(holes):
+            if i == 0:
+                yield (
+                    f"G81 R{settings.z_safe:.5f} Z{settings.z_drill:.5f} "
+                    f"F{settings.feed:.5f} X{x:.5f} Y{y:.5f}"
+                )
+            else:
+                yield f"X{x:.5f} Y{y:.5f}"
+        yield "G80"
+        yield ""
+    yield f"G00 Z{settings.z_change:.3f} ( All done -- retract )"
+    yield ""
+    yield "M5      (Spindle off.)"
+    yield "G04 P1.000000"
+    yield "M9      (Coolant off.)"
+    yield "M2      (Program end.)"
+    yield ""
+
+
+def led_pcb_holes(settings: DrillSettings):
+    """Hole groups of the LED board in pcb2gcode's coordinates, and its size"""
+    drill = Drill.read(led_pcb_files["pth"]).merged(
+        Drill.read(led_pcb_files["npth"])
+    )
+    origin, size = board_frame(Gerber.read(led_pcb_files["outline"]), settings)
+    groups = {d: holes - origin for d, holes in drill.by_diameter().items()}
+    return groups, size
+
+
+def _drill_program_holes(path):
+    """Holes of an existing drill program, in program order"""
+    with open(path) as f:
+        moves = parse_moves(f)
+        holes = []
+        for move in moves:
+            if move.motion == LINEAR and move.end[2] < move.start[2]:
+                holes.append(move.end[:2])
+    return np.array(holes).reshape(-1, 2)
+
+
+@dataclass
+class TravelReport:
+    boards: int
+    holes: int
+    baseline: float
+    optimized: float
+
+    @property
+    def saved(self):
+        return 1 - self.optimized / self.baseline if self.baseline else 0.0
+
+
+def led_pcb_drill(columns=1, rows=1, spacing=2.0, save=False, force=False):
+    """
+    Optimized drill program for a panel of LED boards. The baseline repeats
+    the committed drill.ngc's hole order board by board.
+    """
+    settings = DrillSettings.from_conf(led_pcb_files["conf"])
+    groups, size = led_pcb_holes(settings)
+    panel = panelize(groups, size, columns, rows, spacing)
+    ordered = order_groups(panel)
+
+    baseline_holes = panelize(
+        {0: _drill_program_holes(led_pcb_files["drill"])}, size, columns, rows, spacing
+    )[0]
+    report = TravelReport(
+        boards=columns * rows,
+        holes=sum(len(holes) for holes in ordered.values()),
+        baseline=path_length(baseline_holes),
+        optimized=path_length(np.concatenate(list(ordered.values()))),
+    )
+
+    path = None
+    if save:
+        target = GcodeTarget(
+            f"pcb/led_pcb_drill_{columns}x{rows}",
+            settings=vars(settings),
+            panel=dict(columns=columns, rows=rows, spacing=spacing),
+            code=source_fingerprint(
+                drill_program, files=[led_pcb_files[k] for k in ("pth", "npth")]
+            ),
+        )
+        path = target.full_path
+        if force or not target.up_to_date():
+            target.save(drill_program(ordered, settings), strip_header=False)
+    return report, path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--columns", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=1)
+    parser.add_argument(
+        "--spacing", type=float, default=2.0, help="gap between boards in mm"
+    )
+    parser.add_argument("--save", action="store_true", help="write to cad/nc/pcb")
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args(argv)
+
+    report, path = led_pcb_drill(
+        args.columns, args.rows, args.spacing, save=args.save, force=args.force
+    )
+    print(f"{report.boards} boards, {report.holes} holes")
+    print(f"drill.ngc order  {report.baseline:9.1f} mm")
+    print(f"optimized        {report.optimized:9.1f} mm  ({report.saved:.0%} less)")
+    if path:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Reader for Excellon drill files as exported by KiCad (and most other EDA
+tools): tool table in the M48 header, decimal or implied-zero coordinates,
+inch or metric. Hole coordinates are resolved as arrays in millimeters.
+
+    pth = Drill.read("korry-led-pcb-PTH.drl")
+    for diameter, holes in pth.by_diameter().items():
+        ...
+
+Routed slots (G85, M15/M16) are not supported.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from cad.pcb.gerber import _forward_fill
+
+_tool_re = re.compile(r"T(\d+)(?:[FS][\d.]+)*C([\d.]+)")
+_select_re = re.compile(r"T(\d+)$")
+_coordinate_re = re.compile(r"([XY])([-+]?[\d.]+)")
+
+
+@dataclass
+class Drill:
+    """
+    tools maps tool numbers to diameters, holes is an (n, 2) array and
+    hole_tools the tool of each hole, all in millimeters
+    """
+
+    tools: Dict[int, float]
+    holes: np.ndarray
+    hole_tools: np.ndarray
+    plated: Optional[bool] = None
+
+    @classmethod
+    def read(cls, path):
+        with open(path) as f:
+            return cls.parse(f.read())
+
+    @classmethod
+    def parse(cls, text: str) -> "Drill":
+        return _parse(text)
+
+    def by_tool(self) -> Dict[int, np.ndarray]:
+        return {
+            tool: self.holes[self.hole_tools == tool]
+            for tool in self.tools
+            if (self.hole_tools == tool).any()
+        }
+
+    def by_diameter(self, decimals=4) -> Dict[float, np.ndarray]:
+        """Holes grouped by diameter, tools of equal size merged"""
+        groups = {}
+        for tool, holes in self.by_tool().items():
+            diameter = round(self.tools[tool], decimals)
+            groups.setdefault(diameter, []).append(holes)
+        return {d: np.concatenate(groups[d]) for d in sorted(groups)}
+
+    def merged(self, other: "Drill") -> "Drill":
+        """Holes of both files, the other's tools renumbered after these"""
+        offset = max(self.tools, default=0)
+        tools = dict(self.tools)
+        tools.update({t + offset: d for t, d in other.tools.items()})
+        return Drill(
+            tools,
+            np.concatenate([self.holes, other.holes]),
+            np.concatenate([self.hole_tools, other.hole_tools + offset]),
+        )
+
+
+def _parse(text):
+    scale = 25.4
+    # Digits before the decimal point and whether leading zeros are kept,
+    # for coordinates without a decimal point
+    integer_digits = 2
+    decimal_digits = 4
+    leading_zeros = False
+    plated = None
+    tools = {}
+    tool = 0
+    x_values = []
+    y_values = []
+    hole_tools = []
+
+    in_header = False
+    for raw in text.splitlines():
+        line = raw.strip()
+        if line.startswith(";"):
+            if "TF.FileFunction" in line:
+                plated = "NonPlated" not in line
+            continue
+        if line == "M48":
+            in_header = True
+            continue
+        if in_header and line in ("%", "M95"):
+            in_header = False
+            continue
+        if line.startswith(("INCH", "METRIC")):
+            metric = line.startswith("METRIC")
+            scale = 1.0 if metric else 25.4
+            integer_digits, decimal_digits = (3, 3) if metric else (2, 4)
+            options = line.split(",")[1:]
+            leading_zeros = "LZ" in options
+            for option in options:
+                if "." in option:
+                    integer, decimal = option.split(".")
+                    integer_digits, decimal_digits = len(integer), len(decimal)
+            continue
+        if in_header:
+            match = _tool_re.match(line)
+            if match:
+                tools[int(match.group(1))] = float(match.group(2)) * scale
+            continue
+
+        match = _select_re.match(line)
+        if match:
+            tool = int(match.group(1))
+            continue
+        if "G85" in line or line in ("M15", "M16"):
+            raise ValueError(f"Routed slots are not supported: {line}")
+        coordinates = dict(_coordinate_re.findall(line))
+        if not coordinates or not line.startswith(("X", "Y")):
+            continue
+        x_values.append(coordinates.get("X"))
+        y_values.append(coordinates.get("Y"))
+        hole_tools.append(tool)
+
+    def convert(values):
+        return _forward_fill(
+            np.array(
+                [
+                    _coordinate(v, integer_digits, decimal_digits, leading_zeros)
+                    for v in values
+                ],
+                dtype=np.float64,
+            )
+        )
+
+    holes = np.column_stack([convert(x_values), convert(y_values)]) * scale
+    return Drill(
+        tools,
+        holes.reshape(-1, 2),
+        np.array(hole_tools, dtype=np.int32),
+        plated,
+    )
+
+
+def _coordinate(value, integer_digits, decimal_digits, leading_zeros):
+    if value is None:
+        return math.nan
+    if "." in value:
+        return float(value)
+    sign = -1 if value.startswith("-") else 1
+    digits = value.lstrip("+-")
+    if leading_zeros:
+        # Trailing zeros omitted, the integer part is always complete
+        return sign * int(digits) / 10 ** (len(digits) - integer_digits)
+    return sign * int(digits) / 10**decimal_digits
+
@@ -0,0 +1,281 @@
+"""
+Reader for the RS-274X Gerber files KiCad exports. Operations are collected
+in one pass and their coordinates resolved as arrays: omitted (modal)
+coordinates are forward filled and the whole file is scaled to millimeters
+at once.
+
+    outline = Gerber.read("korry-led-pcb-Edge_Cuts.gbr")
+    (min_x, min_y), (max_x, max_y) = outline.bounds()
+
+Aperture macros are recorded but not evaluated, their flashes count as
+points. Step and repeat and the deprecated G54/G55 forms are not supported.
+"""
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+INTERPOLATE, MOVE, FLASH = 1, 2, 3
+LINEAR, CLOCKWISE, COUNTERCLOCKWISE = 1, 2, 3
+
+_extended_re = re.compile(r"%([^%]*)%")
+_format_re = re.compile(r"FS([LT])([AI])X(\d)(\d)Y(\d)(\d)")
+_aperture_re = re.compile(r"ADD(\d+)([^,]+),?(.*)")
+_word_re = re.compile(r"([XYIJDGM])([-+]?\d+)")
+
+
+@dataclass
+class Aperture:
+    template: str
+    parameters: List[float] = field(default_factory=list)
+
+    @property
+    def radius(self):
+        """Half the largest extent, 0 for macros"""
+        if self.template == "C":
+            return self.parameters[0] / 2
+        if self.template in ("R", "O"):
+            return math.hypot(*self.parameters[:2]) / 2
+        if self.template == "P":
+            return self.parameters[0] / 2
+        return 0.0
+
+
+@dataclass
+class Gerber:
+    """
+    Geometry of a Gerber file in millimeters. lines and arcs are (n, 4)
+    arrays of start and end points, arc_centers and arc_directions belong
+    to arcs, flashes is (n, 2). Each row has its aperture number in the
+    matching *_apertures array. Regions (G36/G37) are drawn with aperture 0.
+    """
+
+    apertures: Dict[int, Aperture]
+    lines: np.ndarray
+    line_apertures: np.ndarray
+    arcs: np.ndarray
+    arc_centers: np.ndarray
+    arc_directions: np.ndarray
+    arc_apertures: np.ndarray
+    flashes: np.ndarray
+    flash_apertures: np.ndarray
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def read(cls, path):
+        with open(path) as f:
+            return cls.parse(f.read())
+
+    @classmethod
+    def parse(cls, text: str) -> "Gerber":
+        return _Parser().parse(text)
+
+    @property
+    def file_function(self) -> Optional[str]:
+        return self.attributes.get("FileFunction")
+
+    def _aperture_radii(self, numbers):
+        radii = {n: a.radius for n, a in self.apertures.items()}
+        return np.array([radii.get(n, 0.0) for n in numbers], dtype=np.float64)
+
+    def bounds(self, include_apertures=True):
+        """((min_x, min_y), (max_x, max_y)) of everything drawn"""
+        lows = []
+        highs = []
+        for points, apertures in (
+            (self.lines[:, :2], self.line_apertures),
+            (self.lines[:, 2:], self.line_apertures),
+            (self.flashes, self.flash_apertures),
+        ):
+            radii = self._aperture_radii(apertures) if include_apertures else 0.0
+            radii = np.reshape(radii, (-1, 1))
+            lows.append(points - radii)
+            highs.append(points + radii)
+        arc_low, arc_high = _arc_bounds(
+            self.arcs, self.arc_centers, self.arc_directions
+        )
+        if include_apertures:
+            radii = self._aperture_radii(self.arc_apertures)[:, None]
+            arc_low, arc_high = arc_low - radii, arc_high + radii
+        lows.append(arc_low)
+        highs.append(arc_high)
+        low = np.concatenate(lows)
+        high = np.concatenate(highs)
+        if not len(low):
+            raise ValueError("Gerber file draws nothing")
+        return tuple(low.min(axis=0).tolist()), tuple(high.max(axis=0).tolist())
+
+
+def _arc_bounds(arcs, centers, directions):
+    """Per arc bounding boxes including the axis extremes the arcs sweep over"""
+    if not len(arcs):
+        return np.zeros((0, 2)), np.zeros((0, 2))
+    start = arcs[:, :2] - centers
+    end = arcs[:, 2:] - centers
+    radius = np.hypot(start[:, 0], start[:, 1])
+    a0 = np.arctan2(start[:, 1], start[:, 0])
+    a1 = np.arctan2(end[:, 1], end[:, 0])
+    # Sweep measured counterclockwise from the arc's counterclockwise start
+    ccw = directions == COUNTERCLOCKWISE
+    low_angle = np.where(ccw, a0, a1)
+    sweep = np.mod(np.where(ccw, a1 - a0, a0 - a1), 2 * np.pi)
+    full = np.isclose(arcs[:, :2], arcs[:, 2:]).all(axis=1)
+    sweep[full] = 2 * np.pi
+
+    low = np.minimum(arcs[:, :2], arcs[:, 2:])
+    high = np.maximum(arcs[:, :2], arcs[:, 2:])
+    quadrants = ((0, 0, 1), (np.pi / 2, 1, 1), (np.pi, 0, -1), (3 * np.pi / 2, 1, -1))
+    for angle, axis, sign in quadrants:
+        crosses = np.mod(angle - low_angle, 2 * np.pi) <= sweep
+        extreme = centers[:, axis] + sign * radius
+        if sign > 0:
+            high[:, axis] = np.where(crosses, extreme, high[:, axis])
+        else:
+            low[:, axis] = np.where(crosses, extreme, low[:, axis])
+    return low, high
+
+
+class _Parser:
+    def __init__(self):
+        self.x_decimals = self.y_decimals = 6
+        self.scale = 1.0
+        self.apertures = {}
+        self.macros = {}
+        self.attributes = {}
+        self.interpolation_mode = LINEAR
+        self.current_aperture = 0
+        self.region = False
+        # Operations as parallel lists, coordinates raw integers or nan
+        self.x = []
+        self.y = []
+        self.i = []
+        self.j = []
+        self.operation = []
+        self.interpolation = []
+        self.aperture = []
+
+    def parse(self, text):
+        position = 0
+        for match in _extended_re.finditer(text):
+            self._words(text[position : match.start()])
+            self._extended(match.group(1))
+            position = match.end()
+        self._words(text[position:])
+        return self._resolve()
+
+    def _extended(self, block):
+        for command in filter(None, (c.strip() for c in block.split("*"))):
+            if command.startswith("FS"):
+                match = _format_re.match(command)
+                if match is None:
+                    raise ValueError(f"Unsupported format {command}")
+                if match.group(1) != "L" or match.group(2) != "A":
+                    raise ValueError(f"Only absolute, leading zero omitted: {command}")
+                self.x_decimals = int(match.group(4))
+                self.y_decimals = int(match.group(6))
+            elif command.startswith("MO"):
+                self.scale = 25.4 if command[2:4] == "IN" else 1.0
+            elif command.startswith("ADD"):
+                match = _aperture_re.match(command)
+                number, template, parameters = match.groups()
+                values = [float(p) for p in parameters.split("X") if p]
+                if template in ("C", "R", "O"):
+                    values = [v * self.scale for v in values]
+                elif template == "P":
+                    # Diameter, vertex count, rotation and hole diameter
+                    values = [
+                        v * self.scale if k in (0, 3) else v
+                        for k, v in enumerate(values)
+                    ]
+                self.apertures[int(number)] = Aperture(template, values)
+            elif command.startswith("AM"):
+                self.macros[command[2:]] = block
+                return
+            elif command.startswith("TF."):
+                name, _, value = command[3:].partition(",")
+                self.attributes[name] = value
+
+    def _words(self, text):
+        for statement in text.split("*"):
+            statement = statement.strip()
+            if not statement or statement.startswith("G04"):
+                continue
+            coordinates = {}
+            for letter, value in _word_re.findall(statement):
+                number = int(value)
+                if letter == "G":
+                    if number in (1, 2, 3):
+                        self.interpolation_mode = number
+                    elif number == 36:
+                        self.region = True
+                    elif number == 37:
+                        self.region = False
+                elif letter == "D":
+                    if number >= 10:
+                        self.current_aperture = number
+                    else:
+                        coordinates["D"] = number
+                elif letter in "XYIJ":
+                    coordinates[letter] = number
+            if "D" not in coordinates and not set(coordinates) & set("XY"):
+                continue
+            # Coordinates without an operation code repeat D01 (deprecated)
+            self.x.append(coordinates.get("X", math.nan))
+            self.y.append(coordinates.get("Y", math.nan))
+            self.i.append(coordinates.get("I", 0))
+            self.j.append(coordinates.get("J", 0))
+            self.operation.append(coordinates.get("D", INTERPOLATE))
+            self.interpolation.append(self.interpolation_mode)
+            self.aperture.append(0 if self.region else self.current_aperture)
+
+    def _resolve(self):
+        x_unit = self.scale / 10**self.x_decimals
+        y_unit = self.scale / 10**self.y_decimals
+        points = np.column_stack(
+            [
+                _forward_fill(np.array(self.x, dtype=np.float64)) * x_unit,
+                _forward_fill(np.array(self.y, dtype=np.float64)) * y_unit,
+            ]
+        ).reshape(-1, 2)
+        offsets = np.column_stack(
+            [
+                np.array(self.i, dtype=np.float64) * x_unit,
+                np.array(self.j, dtype=np.float64) * y_unit,
+            ]
+        ).reshape(-1, 2)
+        operation = np.array(self.operation, dtype=np.int8)
+        interpolation = np.array(self.interpolation, dtype=np.int8)
+        aperture = np.array(self.aperture, dtype=np.int32)
+        # The current point before each operation is the previous end point
+        starts = np.vstack([[0.0, 0.0], points[:-1]]) if len(points) else points
+
+        draws = operation == INTERPOLATE
+        straight = draws & (interpolation == LINEAR)
+        curved = draws & (interpolation != LINEAR)
+        flashed = operation == FLASH
+        return Gerber(
+            apertures=self.apertures,
+            lines=np.hstack([starts[straight], points[straight]]),
+            line_apertures=aperture[straight],
+            arcs=np.hstack([starts[curved], points[curved]]),
+            arc_centers=starts[curved] + offsets[curved],
+            arc_directions=interpolation[curved],
+            arc_apertures=aperture[curved],
+            flashes=points[flashed],
+            flash_apertures=aperture[flashed],
+            attributes=self.attributes,
+        )
+
+
+def _forward_fill(values):
+    """Replace nan with the last preceding value, leading nans with 0"""
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    indices = np.where(missing, 0, np.arange(len(values)))
+    np.maximum.accumulate(indices, out=indices)
+    filled = values[indices]
+    filled[np.isnan(filled)] = 0.0
+    return filled
@@ -1,5 +1,4 @@
 from build123d import *
-from cq_viewer import show_object
 
 
 class Switch8x8:
@@ -47,5 +46,7 @@ class Switch8x8:
 
 
 if __name__ == "__main__":
+    from cq_viewer import show_object
+
     switch = Switch8x8()
     show_object(switch.assembly())
@@ -0,0 +1,386 @@
+"""
+Opt-in timing spans for the build -> CAM -> export pipeline.
+
+Functions decorated with @traced and blocks wrapped in span() record nested
+timing events, optionally with the peak Python heap and resident memory
+growth during each span. Disabled (the default) a traced call costs one
+attribute check.
+
+    with tracing.session("trace.json", memory=True):
+        cam_sleeve("korry/sleeve", 19.5, 19.5, 4, force=True)
+    print(tracing.format_summary())
+
+The JSON opens in chrome://tracing or https://ui.perfetto.dev. Setting
+A320_TRACE=trace.json traces a whole process and writes the file at exit,
+instrument() additionally wraps build123d operations and ocp_freecad_cam
+Job methods.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class Event:
+    name: str
+    category: str
+    start: int
+    duration: int = 0
+    thread: int = 0
+    depth: int = 0
+    # Time spent in child spans, for self time in the summary
+    children: int = 0
+    # Python heap growth at its highest and growth of the process' resident
+    # high water mark, both in bytes
+    peak_memory: int = 0
+    rss_growth: int = 0
+    args: dict = field(default_factory=dict)
+    heap_start: int = field(default=0, repr=False)
+    heap_max: int = field(default=0, repr=False)
+
+
+def _max_rss():
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.events = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enable(self, memory=False):
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memory = False
+
+    def clear(self):
+        with self._lock:
+            self.events = []
+
+    @contextmanager
+    def span(self, name, category="", **args):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        event = Event(
+            name,
+            category,
+            0,
+            thread=threading.get_ident(),
+            depth=len(stack),
+            args=args,
+        )
+        memory = self.memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                # Fold the parent's peak so far in before resetting it
+                parent.heap_max = max(parent.heap_max, peak)
+            tracemalloc.reset_peak()
+            event.heap_start = event.heap_max = current
+            rss = _max_rss()
+        stack.append(event)
+        event.start = time.perf_counter_ns()
+        try:
+            yield event
+        finally:
+            event.duration = time.perf_counter_ns() - event.start
+            stack.pop()
+            if memory:
+                _, peak = tracemalloc.get_traced_memory()
+                event.heap_max = max(event.heap_max, peak)
+                event.peak_memory = event.heap_max - event.heap_start
+                event.rss_growth = _max_rss() - rss
+            if parent is not None:
+                parent.children += event.duration
+                parent.heap_max = max(parent.heap_max, event.heap_max)
+            with self._lock:
+                self.events.append(event)
+
+    def annotate(self, **args):
+        """Add arguments to the innermost open span"""
+        if self.enabled:
+            stack = self._stack()
+            if stack:
+                stack[-1].args.update(args)
+
+
+tracer = Tracer()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_span = _NullSpan()
+
+
+def span(name, category="", **args):
+    """Context manager timing a block, a no-op unless tracing is enabled"""
+    if not tracer.enabled:
+        return _null_span
+    return tracer.span(name, category, **args)
+
+
+def annotate(**args):
+    tracer.annotate(**args)
+
+
+def traced(name=None, category=None):
+    """
+    Decorator recording a span per call, named after the function's
+    qualified name unless given
+    """
+
+    def decorator(func):
+        label = name or func.__qualname__
+        group = category or func.__module__.rsplit(".", 1)[-1]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(label, group):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def session(path=None, memory=False, instrument_libraries=True):
+    """
+    Trace everything inside the block, writing a Chrome trace to path at the
+    end if given
+    """
+    tracer.clear()
+    if instrument_libraries:
+        instrument()
+    tracer.enable(memory)
+    try:
+        yield tracer
+    finally:
+        tracer.disable()
+        if path:
+            save_chrome_trace(path)
+
+
+def chrome_trace(events=None) -> dict:
+    """Complete ("X") events in the Chrome trace event format"""
+    pid = os.getpid()
+    trace_events = []
+    for event in events if events is not None else tracer.events:
+        args = dict(event.args)
+        if event.peak_memory or event.rss_growth:
+            args["peak_memory"] = event.peak_memory
+            args["rss_growth"] = event.rss_growth
+        trace_events.append(
+            {
+                "name": event.name,
+                "cat": event.category,
+                "ph": "X",
+                "ts": event.start / 1000,
+                "dur": event.duration / 1000,
+                "pid": pid,
+                "tid": event.thread,
+                "args": {k: _jsonable(v) for k, v in args.items()},
+            }
+        )
+    trace_events.sort(key=lambda e: (e["tid"], e["ts"]))
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def save_chrome_trace(path, events=None):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(chrome_trace(events), f)
+    return path
+
+
+@dataclass
+class Stage:
+    name: str
+    category: str
+    calls: int = 0
+    total: float = 0.0
+    self_time: float = 0.0
+    max: float = 0.0
+    peak_memory: int = 0
+    rss_growth: int = 0
+
+    @property
+    def mean(self):
+        return self.total / self.calls if self.calls else 0.0
+
+
+def summary(events=None):
+    """Per span name totals in seconds, sorted by self time"""
+    stages = {}
+    for event in events if events is not None else tracer.events:
+        stage = stages.get(event.name)
+        if stage is None:
+            stage = stages[event.name] = Stage(event.name, event.category)
+        seconds = event.duration / 1e9
+        stage.calls += 1
+        stage.total += seconds
+        stage.self_time += (event.duration - event.children) / 1e9
+        stage.max = max(stage.max, seconds)
+        stage.peak_memory = max(stage.peak_memory, event.peak_memory)
+        stage.rss_growth += event.rss_growth
+    return sorted(stages.values(), key=lambda s: s.self_time, reverse=True)
+
+
+def format_summary(events=None) -> str:
+    lines = [
+        f"{'stage':<40} {'calls':>6} {'total s':>9} {'self s':>9} "
+        f"{'max s':>8} {'peak MB':>8}"
+    ]
+    for stage in summary(events):
+        lines.append(
+            f"{stage.name:<40} {stage.calls:>6} {stage.total:>9.3f} "
+            f"{stage.self_time:>9.3f} {stage.max:>8.3f} "
+            f"{stage.peak_memory / 2**20:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+# Third party callables wrapped by instrument(), by module
+_library_functions = {
+    "build123d": [
+        "extrude",
+        "revolve",
+        "loft",
+        "sweep",
+        "fillet",
+        "chamfer",
+        "offset",
+        "mirror",
+        "split",
+        "make_face",
+        "add",
+        "export_brep",
+        "import_brep",
+    ],
+}
+_library_classes = {
+    "build123d": [
+        "Rectangle",
+        "RectangleRounded",
+        "Circle",
+        "Polygon",
+        "Text",
+        "Box",
+        "Cylinder",
+        "Hole",
+    ],
+    "ocp_freecad_cam": ["Job"],
+}
+_job_methods = ["profile", "pocket", "drill", "helix", "adaptive", "to_gcode"]
+_instrumented = set()
+
+
+def _wrap_function(module_name, name):
+    module = sys.modules[module_name]
+    original = getattr(module, name, None)
+    if original is None or getattr(original, "__traced__", False):
+        return
+    wrapper = traced(name, module_name)(original)
+    wrapper.__traced__ = True
+    setattr(module, name, wrapper)
+    # Modules using "from build123d import *" hold their own reference
+    for other in list(sys.modules.values()):
+        namespace = getattr(other, "__dict__", None)
+        if namespace is not None and namespace.get(name) is original:
+            namespace[name] = wrapper
+
+
+def _wrap_method(cls, method_name, label, category):
+    original = cls.__dict__.get(method_name)
+    if original is None or getattr(original, "__traced__", False):
+        return
+    wrapper = traced(label, category)(original)
+    wrapper.__traced__ = True
+    setattr(cls, method_name, wrapper)
+
+
+def instrument():
+    """
+    Wrap build123d operations and sketch/part objects plus ocp_freecad_cam
+    Job operations in spans. Libraries that are not installed are skipped;
+    calling it again is a no-op.
+    """
+    import importlib
+
+    for module_name in set(_library_functions) | set(_library_classes):
+        if module_name in _instrumented:
+            continue
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        for name in _library_functions.get(module_name, []):
+            _wrap_function(module_name, name)
+        for name in _library_classes.get(module_name, []):
+            cls = getattr(module, name, None)
+            if cls is None:
+                continue
+            _wrap_method(cls, "__init__", name, module_name)
+            if name == "Job":
+                for method in _job_methods:
+                    _wrap_method(cls, method, f"Job.{method}", module_name)
+        _instrumented.add(module_name)
+
+
+def _trace_from_environment():
+    path = os.environ.get("A320_TRACE")
+    if not path:
+        return
+    instrument()
+    tracer.enable(memory=os.environ.get("A320_TRACE_MEMORY", "0") != "0")
+    atexit.register(save_chrome_trace, path)
+
+
+_trace_from_environment()
@@ -0,0 +1,2 @@
+from .client import WorkerClient, WorkerError, build
+from .server import WorkerServer, default_socket_path, serve
@@ -0,0 +1,71 @@
+import argparse
+import json
+import sys
+import time
+
+from cad.worker import WorkerClient, WorkerError, default_socket_path, serve
+from cad.worker.server import __doc__ as server_doc
+from cad.worker.server import formats
+
+
+def parse_kwargs(pairs):
+    """key=value pairs, values parsed as JSON where possible"""
+    kwargs = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            kwargs[key] = json.loads(value)
+        except ValueError:
+            kwargs[key] = value
+    return kwargs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=server_doc.strip().splitlines()[0])
+    parser.add_argument("--socket", default=default_socket_path)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve")
+    serve_parser.add_argument("-j", "--jobs", type=int, default=None)
+
+    request_parser = commands.add_parser("request")
+    request_parser.add_argument("recipe")
+    request_parser.add_argument("kwargs", nargs="*", help="key=value arguments")
+    request_parser.add_argument("--format", choices=formats, default="brep")
+    request_parser.add_argument("--force", action="store_true")
+
+    commands.add_parser("status")
+    commands.add_parser("list")
+    commands.add_parser("shutdown")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.jobs)
+        return 0
+
+    try:
+        with WorkerClient(args.socket) as worker:
+            if args.command == "request":
+                start = time.perf_counter()
+                path = worker.build(
+                    args.recipe,
+                    format=args.format,
+                    force=args.force,
+                    **parse_kwargs(args.kwargs),
+                )
+                print(f"{path} ({time.perf_counter() - start:.2f}s)")
+            elif args.command == "list":
+                for recipe in worker.recipes():
+                    print(f"{recipe['name']:<64} {recipe['kind']}")
+            else:
+                print(json.dumps(getattr(worker, args.command)(), indent=2))
+    except (ConnectionRefusedError, FileNotFoundError):
+        sys.exit(f"No worker on {args.socket}, run python -m cad.worker serve")
+    except WorkerError as error:
+        print(error.response.get("traceback", ""), file=sys.stderr)
+        sys.exit(str(error))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import itertools
+import json
+import socket
+
+from cad.worker.server import default_socket_path
+
+
+class WorkerError(RuntimeError):
+    def __init__(self, response):
+        super().__init__(response.get("error"))
+        self.response = response
+
+
+class WorkerClient:
+    """
+    Blocking client for the worker socket. Connections are reused, so a
+    script issuing many requests pays the connect cost once.
+
+        with WorkerClient() as worker:
+            path = worker.build("korry/diffuser", text="DECEL", format="dxf")
+    """
+
+    def __init__(self, socket_path=default_socket_path, timeout=None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._ids = itertools.count()
+        self._socket = None
+        self._file = None
+
+    def connect(self):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.socket_path)
+            self._file = self._socket.makefile("rb")
+        return self
+
+    def close(self):
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = self._file = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def call(self, op, **message):
+        self.connect()
+        message.update(op=op, id=next(self._ids))
+        self._socket.sendall(json.dumps(message).encode() + b"\n")
+        line = self._file.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("Worker closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise WorkerError(response)
+        return response
+
+    def build(self, recipe, format="brep", force=False, **kwargs):
+        """Path of the artefact of a catalogue recipe, built by the worker"""
+        response = self.call(
+            "build", recipe=recipe, kwargs=kwargs, format=format, force=force
+        )
+        return response["path"]
+
+    def status(self):
+        return self.call("status")
+
+    def recipes(self):
+        return self.call("list")["recipes"]
+
+    def shutdown(self):
+        return self.call("shutdown")
+
+
+def build(recipe, format="brep", force=False, socket_path=default_socket_path, **kw):
+    with WorkerClient(socket_path) as worker:
+        return worker.build(recipe, format=format, force=force, **kw)
@@ -0,0 +1,291 @@
+"""
+Long lived worker keeping build123d, OCP, ocp_freecad_cam and the fonts
+loaded. Requests for catalogue recipes arrive as JSON lines on a unix
+socket, run on a bounded process pool and return the path of the artefact
+written: BREP or DXF for parts, G-code for CAM jobs.
+
+    python -m cad.worker serve -j 4
+    python -m cad.worker request korry/sleeve --format dxf
+"""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from cad.cache import hash_inputs, source_fingerprint
+
+default_socket_path = os.environ.get(
+    "A320_WORKER_SOCKET",
+    os.path.join(tempfile.gettempdir(), f"a320-worker-{os.getuid()}.sock"),
+)
+default_artefact_path = os.environ.get(
+    "A320_WORKER_ARTEFACTS", os.path.join(os.path.dirname(__file__), "artefacts")
+)
+formats = ("brep", "dxf", "gcode")
+
+
+def _warm_up():
+    """Pool initializer, pays the import and font loading cost once"""
+    import build123d  # noqa: F401
+
+    from cad.fonts import glyph, panel_font_path
+
+    try:
+        import ocp_freecad_cam  # noqa: F401
+    except ImportError:
+        pass
+    glyph("A", 5, panel_font_path)
+
+
+def artefact_path(recipe, builder, kwargs, format, directory):
+    """
+    Path of a part artefact. The key covers the recipe (target, defaults,
+    constructor), the request arguments and the source of the builder, so
+    edits to the part code are not served from files written before them.
+    """
+    key = hash_inputs(recipe=recipe, kwargs=kwargs, code=source_fingerprint(builder))[
+        :16
+    ]
+    return os.path.join(directory, f"{recipe.name.replace('/', '_')}_{key}.{format}")
+
+
+def _execute(name, kwargs, format, force, directory):
+    """Run a recipe in a pool process and write its artefact"""
+    from cad.catalogue import catalogue
+
+    recipe = catalogue[name]
+    if recipe.kind == "cam":
+        if format != "gcode":
+            raise ValueError(f"{name} is a CAM job and only produces gcode")
+        result = recipe.run(**kwargs, force=force)
+        # Batch variants return a VariantResult, the autobrake jobs paths
+        if getattr(result, "error", None):
+            raise RuntimeError(result.error)
+        return getattr(result, "path", result)
+
+    if format == "gcode":
+        raise ValueError(f"{name} is a part, use brep or dxf")
+    builder = recipe.resolve()
+    path = artefact_path(recipe, builder, kwargs, format, directory)
+    if force or not os.path.exists(path):
+        # Only build the part when the artefact has to be written
+        result = builder(**{**recipe.kwargs, **kwargs})
+        shape = getattr(result, "part", result)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.{format}"
+        if format == "brep":
+            from build123d import export_brep
+
+            export_brep(shape, tmp_path)
+        else:
+            from cad.dxf import save_dxf
+
+            # Bottom face outline, as cut from sheet stock
+            save_dxf(shape.faces().sort_by()[0], tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+class WorkerServer:
+    def __init__(
+        self,
+        socket_path=default_socket_path,
+        max_workers=None,
+        max_pending=64,
+        artefact_path=default_artefact_path,
+    ):
+        self.socket_path = socket_path
+        self.max_workers = max_workers
+        self.artefact_path = artefact_path
+        self._pending = asyncio.Semaphore(max_pending)
+        self._inflight = {}
+        self._pool = None
+        self._server = None
+        self._stopped = None
+        self._connections = {}
+        self.started = time.time()
+        self.completed = 0
+        self.deduplicated = 0
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_up)
+
+    async def run(self, request):
+        """Run a request, sharing the result with identical requests in flight"""
+        name = request["recipe"]
+        kwargs = dict(request.get("kwargs", {}))
+        format = request.get("format", "brep")
+        # force=true among the key=value arguments would reach the recipe twice
+        force = kwargs.pop("force", False) or request.get("force", False)
+        from cad.catalogue import catalogue
+
+        if name not in catalogue:
+            raise ValueError(f"Unknown recipe {name}")
+        if format not in formats:
+            raise ValueError(f"Unknown format {format}, expected one of {formats}")
+
+        key = hash_inputs(recipe=name, kwargs=kwargs, format=format, force=force)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            async with self._pending:
+                path = await self._submit(name, kwargs, format, force)
+            future.set_result(path)
+            self.completed += 1
+            return path, False
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark retrieved, waiters (if any) get the exception themselves
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _submit(self, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._pool, _execute, *args, self.artefact_path
+            )
+        except BrokenProcessPool:
+            # A crashed worker (e.g. OCC segfault) takes the pool down with it
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+            raise
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "workers": self._pool._max_workers,
+            "inflight": len(self._inflight),
+            "completed": self.completed,
+            "deduplicated": self.deduplicated,
+        }
+
+    async def _respond(self, message):
+        op = message.get("op", "build")
+        response = {"id": message.get("id"), "ok": True}
+        start = time.perf_counter()
+        try:
+            if op == "build":
+                path, shared = await self.run(message)
+                response.update(path=path, shared=shared)
+            elif op == "status":
+                response.update(self.status())
+            elif op == "list":
+                from cad.catalogue import find
+
+                response["recipes"] = [
+                    {"name": r.name, "kind": r.kind, "description": r.description}
+                    for r in find()
+                ]
+            elif op == "shutdown":
+                pass  # stopped once the answer is sent
+            else:
+                raise ValueError(f"Unknown op {op}")
+        except Exception as error:
+            response.update(
+                ok=False,
+                error=f"{type(error).__name__}: {error}",
+                traceback=traceback.format_exc(limit=5),
+            )
+        response["seconds"] = time.perf_counter() - start
+        return response
+
+    async def _handle(self, reader, writer):
+        lock = asyncio.Lock()
+
+        async def answer(message):
+            response = await self._respond(message)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+            if response["ok"] and message.get("op") == "shutdown":
+                self._stopped.set()
+
+        self._connections[asyncio.current_task()] = writer
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError as error:
+                    message = {"op": "invalid", "error": str(error)}
+                # Requests on one connection run concurrently, answers carry
+                # the request id
+                task = asyncio.create_task(answer(message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            del self._connections[asyncio.current_task()]
+
+    def _claim_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(self.socket_path)  # left behind by a dead server
+        else:
+            raise RuntimeError(f"A worker is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def serve(self, on_ready=None):
+        self._claim_socket()
+        self._stopped = asyncio.Event()
+        self._pool = self._new_pool()
+        # Start (and warm up) the workers now rather than on the first request
+        loop = asyncio.get_running_loop()
+        workers = self._pool._max_workers
+        await asyncio.gather(
+            *(loop.run_in_executor(self._pool, os.getpid) for _ in range(workers))
+        )
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopped.set)
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=self.socket_path
+        )
+        os.chmod(self.socket_path, 0o600)
+        if on_ready:
+            on_ready(self)
+        try:
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            # Idle clients keep their connection open, end them so the
+            # handlers return instead of being cancelled
+            handlers = list(self._connections)
+            for writer in self._connections.values():
+                writer.transport.abort()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def serve(socket_path=default_socket_path, max_workers=None):
+    def ready(server):
+        print(f"Worker listening on {server.socket_path}", flush=True)
+
+    asyncio.run(WorkerServer(socket_path, max_workers).serve(on_ready=ready))
@@ -1,3 +1,7 @@
 from setuptools import find_packages, setup
 
-setup(name="a320", version="1.0", packages=find_packages())
+setup(
+    name="a320",
+    version="1.0",
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
+)
@@ -0,0 +1,45 @@
+import importlib
+import os
+import sys
+
+from cad.cache.cache import GeometryCache, source_fingerprint
+from cad.catalogue import catalogue
+from cad.worker.server import artefact_path
+
+
+def _module(tmp_path, monkeypatch, body):
+    path = tmp_path / "edited_part.py"
+    path.write_text(body)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("edited_part", None)
+    return importlib.import_module("edited_part"), path
+
+
+def _edit(path, body):
+    stat = os.stat(path)
+    path.write_text(body)
+    # Make sure the edit is visible even on coarse timestamp filesystems
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_source_edit_changes_fingerprint(tmp_path, monkeypatch):
+    module, path = _module(tmp_path, monkeypatch, "def part():\n    return 1\n")
+    before = source_fingerprint(module.part)
+    assert source_fingerprint(module.part) == before
+    _edit(path, "def part():\n    return 2\n")
+    assert source_fingerprint(module.part) != before
+
+
+def test_source_edit_changes_artefact_path(tmp_path, monkeypatch):
+    module, path = _module(tmp_path, monkeypatch, "def part():\n    return 1\n")
+    recipe = catalogue["korry/sleeve"]
+    before = artefact_path(recipe, module.part, {}, "brep", "artefacts")
+    _edit(path, "def part():\n    return 10\n")
+    assert artefact_path(recipe, module.part, {}, "brep", "artefacts") != before
+
+
+def test_entry_path_is_inside_cache(tmp_path):
+    cache = GeometryCache(str(tmp_path))
+    path = cache.entry_path("abcdef")
+    assert path.startswith(str(tmp_path))
+    assert path.endswith("abcdef.brep")
@@ -0,0 +1,16 @@
+import pytest
+
+from cad.catalogue import catalogue, find
+
+
+@pytest.mark.parametrize("name", [recipe.name for recipe in find(kind="part")])
+def test_part_recipe_builds(name):
+    result = catalogue[name].run()
+    shape = getattr(result, "part", result)
+    assert shape.is_valid()
+    assert sum(solid.volume for solid in shape.solids()) > 0
+
+
+@pytest.mark.parametrize("name", [recipe.name for recipe in find(kind="cam")])
+def test_cam_recipe_resolves(name):
+    assert callable(catalogue[name].resolve())
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from cad.cache.index import ArtefactIndex
+from cad.nc import GcodeTarget, nc
+from cad.nc.optimize import optimizer
+
+PROGRAM = "G0 Z5\nG0 X0 Y0\nG1 Z-1 F100\nG1 X5\nG1 X10\nG0 Z5"
+
+
+@pytest.fixture(autouse=True)
+def scratch(tmp_path, monkeypatch):
+    monkeypatch.setattr(nc, "_base_path", str(tmp_path))
+    monkeypatch.setattr(nc, "manifest_path", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(nc, "artefact_index", ArtefactIndex(str(tmp_path / "db")))
+
+
+def test_up_to_date_after_save():
+    target = GcodeTarget("part", tool=dict(endmill=1))
+    assert not target.up_to_date()
+    target.save(PROGRAM, strip_header=False)
+    assert GcodeTarget("part", tool=dict(endmill=1)).up_to_date()
+
+
+def test_changed_inputs_are_stale():
+    GcodeTarget("part", tool=dict(endmill=1)).save(PROGRAM, strip_header=False)
+    assert not GcodeTarget("part", tool=dict(endmill=2)).up_to_date()
+
+
+def test_deleted_file_is_stale():
+    target = GcodeTarget("part", tool=dict(endmill=1))
+    target.save(PROGRAM, strip_header=False)
+    os.remove(target.full_path)
+    assert not GcodeTarget("part", tool=dict(endmill=1)).up_to_date()
+
+
+def test_stages_are_part_of_the_inputs():
+    plain = GcodeTarget("part", tool=dict(endmill=1))
+    plain.save(PROGRAM, strip_header=False)
+    optimized = GcodeTarget("part", tool=dict(endmill=1), stages=[optimizer()])
+    assert not optimized.up_to_date()
+    optimized.save(PROGRAM, strip_header=False)
+    assert GcodeTarget("part", tool=dict(endmill=1), stages=[optimizer()]).up_to_date()
+    assert not GcodeTarget("part", tool=dict(endmill=1)).up_to_date()
+    other = GcodeTarget("part", tool=dict(endmill=1), stages=[optimizer(merge=False)])
+    assert not other.up_to_date()
+
+
+def test_stages_given_to_save_are_recorded():
+    GcodeTarget("part").save(PROGRAM, strip_header=False, stages=[optimizer()])
+    assert GcodeTarget("part", stages=[optimizer()]).up_to_date()
+    assert not GcodeTarget("part").up_to_date()
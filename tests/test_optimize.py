@@ -0,0 +1,66 @@
+from cad.nc.gcode import RAPID, ModalState, parse_line
+from cad.nc.optimize import optimize_gcode
+
+
+def test_unknown_start_keeps_xy_positioning():
+    lines = list(optimize_gcode(["G0 X0 Y0 Z5", "G1 Z-1"]))
+    plunge = next(i for i, line in enumerate(lines) if line.startswith("G1"))
+    positioning = " ".join(lines[:plunge])
+    assert "X0" in positioning
+    assert "Y0" in positioning
+    assert "Z-1" in lines[plunge]
+
+
+def test_reversal_is_not_merged():
+    lines = list(optimize_gcode(["G0 X0 Y0 Z0", "G1 X10 F100", "G1 X5"]))
+    cuts = [line for line in lines if line.startswith("G1") or line.startswith("X")]
+    assert any("X10" in line for line in cuts)
+    assert "X5" in cuts[-1]
+
+
+def test_collinear_moves_are_merged():
+    lines = list(optimize_gcode(["G0 X0 Y0 Z0", "G1 X5 F100", "G1 X10"]))
+    assert not any("X5" in line for line in lines)
+    assert any("X10" in line for line in lines)
+
+
+def _cut_segments(lines):
+    state = ModalState()
+    moves = [m for i, line in enumerate(lines) for m in parse_line(state, line, i)]
+    return sorted(
+        (m.motion, tuple(round(v, 3) for v in m.start + m.end))
+        for m in moves
+        if m.motion != RAPID
+    )
+
+
+def test_header_and_program_without_initial_rapid():
+    program = [
+        "(header)",
+        "G21",
+        "G90",
+        "G1 F100",
+        "G1 X10 Y0 Z-1",
+        "(first pocket)",
+        "G1 X20",
+        "G0 Z5",
+        "G0 X40 Y0",
+        "G1 Z-1",
+        "G1 X50",
+        "G0 Z5",
+        "G0 X0 Y10",
+        "G1 Z-1",
+        "G1 X10 Y10",
+        "G0 Z5",
+        "M5",
+    ]
+    lines = list(optimize_gcode(program))
+    assert lines[:5] == program[:5]
+    assert lines[-1] == "M5"
+    assert "(first pocket)" in lines
+    assert _cut_segments(lines) == _cut_segments(program)
+
+
+def test_group_without_cuts_is_unchanged():
+    program = ["G21", "G90", "G1 F100", "(comment)", "G0 Z5"]
+    assert list(optimize_gcode(program)) == program
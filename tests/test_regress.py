@@ -0,0 +1,51 @@
+from cad.nc.regress import compare_files
+
+REFERENCE = [
+    "G0 Z6",
+    "G0 X0 Y0",
+    "G0 Z4",
+    "G1 Z0 F100",
+    "G1 X10",
+    "G1 X10 Y10",
+    "G1 Z-1",
+    "G1 X0 Y10",
+    "G1 X0 Y0",
+    "G0 Z6",
+    "G0 X20 Y0",
+    "G0 Z4",
+    "G1 Z-1",
+    "G1 X30",
+    "G0 Z6",
+]
+
+
+def _compare(candidate):
+    return compare_files("\n".join(REFERENCE), "\n".join(candidate))
+
+
+def test_identical_program_is_ok():
+    assert _compare(REFERENCE).ok
+
+
+def test_rapid_at_cutting_depth_fails():
+    candidate = list(REFERENCE)
+    # Retract replaced by a traverse through the stock
+    candidate[9] = "G0 X20 Y0 Z-1"
+    diff = _compare(candidate)
+    assert not diff.ok
+    assert any(d.kind == "unsafe" for d in diff.differences)
+
+
+def test_rapid_to_another_height_fails():
+    candidate = [line.replace("Z6", "Z5") for line in REFERENCE]
+    diff = _compare(candidate)
+    assert not diff.ok
+    assert all(d.kind != "unsafe" for d in diff.differences)
+
+
+def test_extra_traverse_fails():
+    # Cuts unchanged, a detour at the safe height
+    candidate = REFERENCE[:10] + ["G0 X50 Y50"] + REFERENCE[10:]
+    diff = _compare(candidate)
+    assert not diff.ok
+    assert [d.kind for d in diff.differences] == ["extra"]
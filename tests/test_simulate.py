@@ -0,0 +1,23 @@
+from cad.nc.simulate import SimulationResult, verify
+
+
+def _result(**fields):
+    return SimulationResult("program.nc", 1.0, 0.05, 0.0, **fields)
+
+
+def test_program_without_part_is_not_ok():
+    result = _result()
+    assert result.status == "unchecked"
+    assert not result.ok
+
+
+def test_part_that_does_not_build_fails():
+    result = _result(part_error="Standard_ConstructionError: ...")
+    assert result.status == "FAILED"
+    assert not result.ok
+
+
+def test_committed_sleeve_matches_its_part():
+    result = verify("korry/sleeve_19.5x19.5x4_r1.5875.nc", resolution=0.1)
+    assert result.part is not None
+    assert result.status == "ok"
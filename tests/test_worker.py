@@ -0,0 +1,37 @@
+import os
+from dataclasses import replace
+
+from cad.catalogue import catalogue
+from cad.worker.server import _execute, artefact_path
+
+
+def _path(recipe, kwargs=None, format="brep", directory="artefacts"):
+    return artefact_path(recipe, recipe.resolve(), kwargs or {}, format, directory)
+
+
+def test_artefact_path_is_stable():
+    recipe = catalogue["korry/sleeve"]
+    assert _path(recipe) == _path(recipe)
+    assert os.path.basename(_path(recipe)).startswith("korry_sleeve_")
+
+
+def test_artefact_path_covers_request_and_recipe():
+    recipe = catalogue["korry/sleeve"]
+    paths = {
+        _path(recipe),
+        _path(recipe, dict(stock_thickness=3)),
+        _path(recipe, format="dxf"),
+        _path(replace(recipe, kwargs=dict(stock_thickness=3))),
+        _path(replace(recipe, constructor=dict(width=20, height=20))),
+    }
+    assert len(paths) == 5
+
+
+def test_existing_artefact_is_not_rebuilt(tmp_path):
+    recipe = catalogue["korry/sleeve"]
+    path = _path(recipe, directory=str(tmp_path))
+    with open(path, "w") as f:
+        f.write("cached")
+    assert _execute(recipe.name, {}, "brep", False, str(tmp_path)) == path
+    with open(path) as f:
+        assert f.read() == "cached"